@@ -125,6 +125,7 @@ CREATE INDEX idx_elections_election_year ON elections(election_year);
 CREATE INDEX idx_elections_election_type ON elections(election_type);
 CREATE INDEX idx_elections_election_date ON elections(election_date);
 CREATE INDEX idx_elections_related ON elections(related_election_id);
+CREATE INDEX idx_elections_seat_year ON elections(seat_id, election_year);  -- live_elections() RPC
 
 -- ============================================================
 -- 5. CANDIDATES
@@ -171,6 +172,7 @@ CREATE TABLE candidacies (
                         'Withdrawn', 'Disqualified', 'Pending'
                     )),
     endorsements    TEXT,
+    running_mate_candidacy_id INTEGER REFERENCES candidacies(id),  -- Gov↔Lt Gov joint ticket partner
     notes           TEXT
 );
 
@@ -400,6 +402,24 @@ CREATE TABLE state_redistricting (
 
 CREATE INDEX idx_state_redistricting_state ON state_redistricting(state_id);
 
+-- ============================================================
+-- 13b. DISTRICT HISTORY SOURCES (fingerprints of parsed BP district pages)
+-- ============================================================
+-- One row per Ballotpedia district reconciled by populate_district_history.py:
+-- a hash of the parsed results and the elections they were matched/inserted as.
+-- Re-runs skip districts whose fingerprint is unchanged and whose elections still exist.
+CREATE TABLE district_history_sources (
+    id              SERIAL PRIMARY KEY,
+    state_id        INTEGER NOT NULL REFERENCES states(id) ON DELETE CASCADE,
+    chamber         TEXT NOT NULL,
+    district_identifier TEXT NOT NULL,
+    seat_id         INTEGER REFERENCES seats(id) ON DELETE CASCADE,
+    fingerprint     TEXT NOT NULL,       -- sha256 of the parsed district JSON
+    election_ids    INTEGER[] NOT NULL DEFAULT '{}',
+    reconciled_at   TIMESTAMPTZ NOT NULL DEFAULT now(),
+    UNIQUE(state_id, chamber, district_identifier)
+);
+
 -- ============================================================
 -- 14. DASHBOARD VIEW (auto-generated, read-only)
 -- ============================================================
@@ -468,6 +488,14 @@ SELECT
 FROM ballot_measures bm
 JOIN states st ON bm.state_id = st.id;
 
+-- ============================================================
+-- 15. LIVE RESULTS RPC
+-- ============================================================
+-- live_elections(p_seat_ids integer[], p_year integer DEFAULT 2026) RETURNS jsonb
+-- Election-night results for district pages, already in the site's JSON
+-- shape with recount flags. Generated from RECOUNT_THRESHOLDS and installed
+-- by scripts/install_live_elections_rpc.py (re-run it after threshold changes).
+
 -- ============================================================
 -- 11. HELPER: Enable Row Level Security (Supabase default)
 -- ============================================================
@@ -486,6 +514,7 @@ ALTER TABLE seat_terms ENABLE ROW LEVEL SECURITY;
 ALTER TABLE chamber_control ENABLE ROW LEVEL SECURITY;
 ALTER TABLE party_switches ENABLE ROW LEVEL SECURITY;
 ALTER TABLE state_redistricting ENABLE ROW LEVEL SECURITY;
+ALTER TABLE district_history_sources ENABLE ROW LEVEL SECURITY;
 
 -- Create permissive policies for authenticated access
 -- (adjust these based on your actual auth needs)
@@ -501,6 +530,7 @@ CREATE POLICY "Allow full access" ON seat_terms FOR ALL USING (true) WITH CHECK
 CREATE POLICY "Allow full access" ON chamber_control FOR ALL USING (true) WITH CHECK (true);
 CREATE POLICY "Allow full access" ON party_switches FOR ALL USING (true) WITH CHECK (true);
 CREATE POLICY "Allow full access" ON state_redistricting FOR ALL USING (true) WITH CHECK (true);
+CREATE POLICY "Allow full access" ON district_history_sources FOR ALL USING (true) WITH CHECK (true);
 
 -- ============================================================
 -- TRIGGERS
@@ -533,3 +563,138 @@ CREATE TRIGGER trg_sync_seat_on_term_change
   AFTER INSERT OR UPDATE ON seat_terms
   FOR EACH ROW
   EXECUTE FUNCTION sync_seat_on_term_change();
+
+-- Change tracking for on-disk caches (state_context, candidate_lookup,
+-- election_briefing): counters per (table, operation, state, shard), bumped
+-- in the same transaction as the write, so a watermark read alongside the
+-- data always agrees with it. Generated by and installed on existing
+-- databases with scripts/install_data_versions.py (--schema prints this).
+CREATE TABLE data_versions (
+    table_name      TEXT NOT NULL,
+    operation       TEXT NOT NULL,
+    state_id        INTEGER NOT NULL DEFAULT 0,   -- 0 = all states
+    shard           SMALLINT NOT NULL DEFAULT 0,
+    version         BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (table_name, operation, state_id, shard)
+);
+ALTER TABLE data_versions ENABLE ROW LEVEL SECURITY;
+
+-- TG_ARGV[0], when given, selects the state_id of each changed row from
+-- the statement's transition table(s); without it the write is scoped to
+-- every state (0).
+CREATE OR REPLACE FUNCTION bump_data_version()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_NARGS = 0 THEN
+    INSERT INTO data_versions (table_name, operation, state_id, shard, version)
+    VALUES (TG_TABLE_NAME, TG_OP, 0, pg_backend_pid() % 16, 1)
+    ON CONFLICT (table_name, operation, state_id, shard)
+    DO UPDATE SET version = data_versions.version + 1;
+  ELSE
+    EXECUTE format(
+      'INSERT INTO data_versions (table_name, operation, state_id, shard, version)
+       SELECT DISTINCT %L, %L, scope.state_id, pg_backend_pid() %% 16, 1
+       FROM (%s) scope WHERE scope.state_id IS NOT NULL
+       ON CONFLICT (table_name, operation, state_id, shard)
+       DO UPDATE SET version = data_versions.version + 1',
+      TG_TABLE_NAME, TG_OP, TG_ARGV[0]);
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+CREATE TRIGGER trg_data_version_insert AFTER INSERT ON states
+  REFERENCING NEW TABLE AS changed
+  FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version('SELECT r.id AS state_id FROM changed r');
+CREATE TRIGGER trg_data_version_update AFTER UPDATE ON states
+  REFERENCING OLD TABLE AS changed_old NEW TABLE AS changed
+  FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version('SELECT r.id AS state_id FROM changed r UNION SELECT r.id AS state_id FROM changed_old r');
+CREATE TRIGGER trg_data_version_delete AFTER DELETE ON states
+  REFERENCING OLD TABLE AS changed
+  FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version('SELECT r.id AS state_id FROM changed r');
+CREATE TRIGGER trg_data_version_truncate AFTER TRUNCATE ON states
+  FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
+CREATE TRIGGER trg_data_version_insert AFTER INSERT ON districts
+  REFERENCING NEW TABLE AS changed
+  FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version('SELECT r.state_id FROM changed r');
+CREATE TRIGGER trg_data_version_update AFTER UPDATE ON districts
+  REFERENCING OLD TABLE AS changed_old NEW TABLE AS changed
+  FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version('SELECT r.state_id FROM changed r UNION SELECT r.state_id FROM changed_old r');
+CREATE TRIGGER trg_data_version_delete AFTER DELETE ON districts
+  REFERENCING OLD TABLE AS changed
+  FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version('SELECT r.state_id FROM changed r');
+CREATE TRIGGER trg_data_version_truncate AFTER TRUNCATE ON districts
+  FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
+CREATE TRIGGER trg_data_version_insert AFTER INSERT ON seats
+  REFERENCING NEW TABLE AS changed
+  FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version('SELECT d.state_id FROM changed r JOIN districts d ON d.id = r.district_id');
+CREATE TRIGGER trg_data_version_update AFTER UPDATE ON seats
+  REFERENCING OLD TABLE AS changed_old NEW TABLE AS changed
+  FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version('SELECT d.state_id FROM changed r JOIN districts d ON d.id = r.district_id UNION SELECT d.state_id FROM changed_old r JOIN districts d ON d.id = r.district_id');
+CREATE TRIGGER trg_data_version_delete AFTER DELETE ON seats
+  REFERENCING OLD TABLE AS changed
+  FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version('SELECT d.state_id FROM changed r JOIN districts d ON d.id = r.district_id');
+CREATE TRIGGER trg_data_version_truncate AFTER TRUNCATE ON seats
+  FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
+CREATE TRIGGER trg_data_version_insert AFTER INSERT ON elections
+  REFERENCING NEW TABLE AS changed
+  FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version('SELECT d.state_id FROM changed r JOIN seats s ON s.id = r.seat_id JOIN districts d ON d.id = s.district_id');
+CREATE TRIGGER trg_data_version_update AFTER UPDATE ON elections
+  REFERENCING OLD TABLE AS changed_old NEW TABLE AS changed
+  FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version('SELECT d.state_id FROM changed r JOIN seats s ON s.id = r.seat_id JOIN districts d ON d.id = s.district_id UNION SELECT d.state_id FROM changed_old r JOIN seats s ON s.id = r.seat_id JOIN districts d ON d.id = s.district_id');
+CREATE TRIGGER trg_data_version_delete AFTER DELETE ON elections
+  REFERENCING OLD TABLE AS changed
+  FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version('SELECT d.state_id FROM changed r JOIN seats s ON s.id = r.seat_id JOIN districts d ON d.id = s.district_id');
+CREATE TRIGGER trg_data_version_truncate AFTER TRUNCATE ON elections
+  FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
+CREATE TRIGGER trg_data_version_insert AFTER INSERT ON seat_terms
+  REFERENCING NEW TABLE AS changed
+  FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version('SELECT d.state_id FROM changed r JOIN seats s ON s.id = r.seat_id JOIN districts d ON d.id = s.district_id');
+CREATE TRIGGER trg_data_version_update AFTER UPDATE ON seat_terms
+  REFERENCING OLD TABLE AS changed_old NEW TABLE AS changed
+  FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version('SELECT d.state_id FROM changed r JOIN seats s ON s.id = r.seat_id JOIN districts d ON d.id = s.district_id UNION SELECT d.state_id FROM changed_old r JOIN seats s ON s.id = r.seat_id JOIN districts d ON d.id = s.district_id');
+CREATE TRIGGER trg_data_version_delete AFTER DELETE ON seat_terms
+  REFERENCING OLD TABLE AS changed
+  FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version('SELECT d.state_id FROM changed r JOIN seats s ON s.id = r.seat_id JOIN districts d ON d.id = s.district_id');
+CREATE TRIGGER trg_data_version_truncate AFTER TRUNCATE ON seat_terms
+  FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
+CREATE TRIGGER trg_data_version_insert AFTER INSERT ON candidates
+  FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
+CREATE TRIGGER trg_data_version_update AFTER UPDATE ON candidates
+  FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
+CREATE TRIGGER trg_data_version_delete AFTER DELETE ON candidates
+  FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
+CREATE TRIGGER trg_data_version_truncate AFTER TRUNCATE ON candidates
+  FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
+CREATE TRIGGER trg_data_version_insert AFTER INSERT ON candidacies
+  REFERENCING NEW TABLE AS changed
+  FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version('SELECT d.state_id FROM changed r JOIN elections e ON e.id = r.election_id JOIN seats s ON s.id = e.seat_id JOIN districts d ON d.id = s.district_id');
+CREATE TRIGGER trg_data_version_update AFTER UPDATE ON candidacies
+  REFERENCING OLD TABLE AS changed_old NEW TABLE AS changed
+  FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version('SELECT d.state_id FROM changed r JOIN elections e ON e.id = r.election_id JOIN seats s ON s.id = e.seat_id JOIN districts d ON d.id = s.district_id UNION SELECT d.state_id FROM changed_old r JOIN elections e ON e.id = r.election_id JOIN seats s ON s.id = e.seat_id JOIN districts d ON d.id = s.district_id');
+CREATE TRIGGER trg_data_version_delete AFTER DELETE ON candidacies
+  REFERENCING OLD TABLE AS changed
+  FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version('SELECT d.state_id FROM changed r JOIN elections e ON e.id = r.election_id JOIN seats s ON s.id = e.seat_id JOIN districts d ON d.id = s.district_id');
+CREATE TRIGGER trg_data_version_truncate AFTER TRUNCATE ON candidacies
+  FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
+CREATE TRIGGER trg_data_version_insert AFTER INSERT ON ballot_measures
+  REFERENCING NEW TABLE AS changed
+  FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version('SELECT r.state_id FROM changed r');
+CREATE TRIGGER trg_data_version_update AFTER UPDATE ON ballot_measures
+  REFERENCING OLD TABLE AS changed_old NEW TABLE AS changed
+  FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version('SELECT r.state_id FROM changed r UNION SELECT r.state_id FROM changed_old r');
+CREATE TRIGGER trg_data_version_delete AFTER DELETE ON ballot_measures
+  REFERENCING OLD TABLE AS changed
+  FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version('SELECT r.state_id FROM changed r');
+CREATE TRIGGER trg_data_version_truncate AFTER TRUNCATE ON ballot_measures
+  FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
+CREATE TRIGGER trg_data_version_insert AFTER INSERT ON forecasts
+  REFERENCING NEW TABLE AS changed
+  FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version('SELECT d.state_id FROM changed r JOIN elections e ON e.id = r.election_id JOIN seats s ON s.id = e.seat_id JOIN districts d ON d.id = s.district_id UNION ALL SELECT m.state_id FROM changed r JOIN ballot_measures m ON m.id = r.measure_id');
+CREATE TRIGGER trg_data_version_update AFTER UPDATE ON forecasts
+  REFERENCING OLD TABLE AS changed_old NEW TABLE AS changed
+  FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version('SELECT d.state_id FROM changed r JOIN elections e ON e.id = r.election_id JOIN seats s ON s.id = e.seat_id JOIN districts d ON d.id = s.district_id UNION ALL SELECT m.state_id FROM changed r JOIN ballot_measures m ON m.id = r.measure_id UNION SELECT d.state_id FROM changed_old r JOIN elections e ON e.id = r.election_id JOIN seats s ON s.id = e.seat_id JOIN districts d ON d.id = s.district_id UNION ALL SELECT m.state_id FROM changed_old r JOIN ballot_measures m ON m.id = r.measure_id');
+CREATE TRIGGER trg_data_version_delete AFTER DELETE ON forecasts
+  REFERENCING OLD TABLE AS changed
+  FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version('SELECT d.state_id FROM changed r JOIN elections e ON e.id = r.election_id JOIN seats s ON s.id = e.seat_id JOIN districts d ON d.id = s.district_id UNION ALL SELECT m.state_id FROM changed r JOIN ballot_measures m ON m.id = r.measure_id');
+CREATE TRIGGER trg_data_version_truncate AFTER TRUNCATE ON forecasts
+  FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
@@ -18,12 +18,20 @@ Usage:
     python3 scripts/analyze_uncontested.py --state TX --summary-only
     python3 scripts/analyze_uncontested.py --dry-run
     python3 scripts/analyze_uncontested.py --all-closed --margin-threshold 10
+    python3 scripts/analyze_uncontested.py --all-states --year 2024 --output   # site/data/uncontested_2024.json
+    python3 scripts/analyze_uncontested.py --all-closed --output /tmp/uncontested.json
+
+--all-closed and --all-states run each analysis once for a whole group of
+states (STATES_PER_QUERY per statement, all states at once for
+--summary-only), grouped by state server-side, and report each group as it
+arrives — a handful of round trips instead of three per state.
 """
 import sys
 import os
 import json
 import time
 import argparse
+from datetime import datetime, timezone
 
 import httpx
 import sys as _sys, os as _os
@@ -45,6 +53,12 @@ ALL_STATES = [
 DEFAULT_MARGIN_THRESHOLD = 15
 DEFAULT_YEAR = 2026
 
+# States per all-states statement when detail rows are included (keeps each
+# response well under API limits); summary-only runs do every state at once
+STATES_PER_QUERY = 10
+
+SITE_DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'site', 'data')
+
 # Election types to analyze: primaries always, generals when data exists
 PRIMARY_TYPES = ('Primary_D', 'Primary_R')
 ALL_ELECTION_TYPES = ('Primary_D', 'Primary_R', 'General')
@@ -76,9 +90,20 @@ EP = ("CASE WHEN s.current_holder_caucus = 'C' THEN s.current_holder_party "
       "ELSE COALESCE(s.current_holder_caucus, s.current_holder_party) END")
 
 
+# Numeric districts in numeric order, named ones after (seat label breaks ties
+# between seats of a multi-member district)
+DISTRICT_ORDER = ("CASE WHEN district_number SIMILAR TO '[0-9]+' THEN district_number::int ELSE 99999 END,\n"
+                  "        district_number, seat_label")
+
+
 def build_election_counts_cte(state_abbr, year=2026):
-    """Build the common CTE for uncontested analysis across primaries and generals."""
+    """Build the common CTE for uncontested analysis across primaries and generals.
+
+    state_abbr is one abbreviation or a list of them.
+    """
     type_list = "','".join(ALL_ELECTION_TYPES)
+    states = [state_abbr] if isinstance(state_abbr, str) else list(state_abbr)
+    state_list = "','".join(states)
     return f"""
     WITH election_counts AS (
         SELECT
@@ -111,7 +136,7 @@ def build_election_counts_cte(state_abbr, year=2026):
         WHERE e.election_year = {year}
           AND e.election_type IN ('{type_list}')
           AND s.office_level = 'Legislative'
-          AND st.abbreviation = '{state_abbr}'
+          AND st.abbreviation IN ('{state_list}')
         GROUP BY e.id, st.abbreviation, e.election_type, d.chamber, d.district_number,
                  s.seat_label, d.pres_2024_margin, d.pres_2024_winner, s.current_holder,
                  s.current_holder_caucus, s.current_holder_party, e.is_open_seat
@@ -125,17 +150,13 @@ def query_uncontested_detail(state_abbr, year=2026):
     return f"""{cte}
     SELECT * FROM election_counts WHERE active_count <= 1
     ORDER BY election_type, chamber,
-        CASE WHEN district_number SIMILAR TO '[0-9]+' THEN district_number::int ELSE 99999 END,
-        district_number
+        {DISTRICT_ORDER}
     """
 
 
-def query_missed_opportunities(state_abbr, threshold, year=2026):
-    """Query 2: Competitive districts with 0 candidates filed for one party (primaries only)."""
-    cte = build_election_counts_cte(state_abbr, year)
-    return f"""{cte}
-    SELECT * FROM election_counts
-    WHERE active_count = 0
+def missed_opportunity_filter(threshold):
+    """WHERE clause on election_counts: no candidate for a party in a competitive/favorable district."""
+    return f"""active_count = 0
       AND election_type IN ('Primary_D','Primary_R')
       AND pres_2024_margin IS NOT NULL
       AND (
@@ -148,10 +169,17 @@ def query_missed_opportunities(state_abbr, threshold, year=2026):
               pres_2024_winner = 'R'
               OR ABS(pres_2024_margin::numeric) <= {threshold}
           ))
-      )
+      )"""
+
+
+def query_missed_opportunities(state_abbr, threshold, year=2026):
+    """Query 2: Competitive districts with 0 candidates filed for one party (primaries only)."""
+    cte = build_election_counts_cte(state_abbr, year)
+    return f"""{cte}
+    SELECT * FROM election_counts
+    WHERE {missed_opportunity_filter(threshold)}
     ORDER BY election_type, chamber,
-        CASE WHEN district_number SIMILAR TO '[0-9]+' THEN district_number::int ELSE 99999 END,
-        district_number
+        {DISTRICT_ORDER}
     """
 
 
@@ -169,6 +197,59 @@ def query_summary(state_abbr, year=2026):
     """
 
 
+def query_states(states, threshold, year=2026, summary_only=False):
+    """All three analyses for many states in one statement: one row per state with data.
+
+    Each row carries summary, uncontested_detail and missed_opportunities as
+    JSON arrays shaped like the rows of the per-state queries above.
+    """
+    cte = build_election_counts_cte(states, year)
+    detail = ''
+    columns = "'[]'::json AS uncontested_detail, '[]'::json AS missed_opportunities"
+    joins = ''
+    if not summary_only:
+        columns = ("COALESCE(detail.rows, '[]') AS uncontested_detail, "
+                   "COALESCE(missed.rows, '[]') AS missed_opportunities")
+        joins = 'LEFT JOIN detail USING (state) LEFT JOIN missed USING (state)'
+        detail = f""",
+    detail AS (
+        SELECT state, json_agg(ec ORDER BY election_type, chamber,
+            {DISTRICT_ORDER}) AS rows
+        FROM election_counts ec
+        WHERE active_count <= 1
+        GROUP BY state
+    ),
+    missed AS (
+        SELECT state, json_agg(ec ORDER BY election_type, chamber,
+            {DISTRICT_ORDER}) AS rows
+        FROM election_counts ec
+        WHERE {missed_opportunity_filter(threshold)}
+        GROUP BY state
+    )"""
+    return f"""{cte},
+    summary AS (
+        SELECT state, json_agg(json_build_object(
+                   'election_type', election_type, 'chamber', chamber,
+                   'total_with_data', total_with_data, 'uncontested', uncontested,
+                   'no_candidates', no_candidates)
+               ORDER BY election_type, chamber) AS rows
+        FROM (
+            SELECT state, election_type, chamber,
+                COUNT(*) as total_with_data,
+                COUNT(*) FILTER (WHERE active_count <= 1) as uncontested,
+                COUNT(*) FILTER (WHERE active_count = 0) as no_candidates
+            FROM election_counts
+            GROUP BY state, election_type, chamber
+        ) t
+        GROUP BY state
+    ){detail}
+    SELECT summary.state, summary.rows AS summary, {columns}
+    FROM summary
+    {joins}
+    ORDER BY summary.state
+    """
+
+
 def format_margin(margin_str):
     """Format a pres_2024_margin string like '+12.3' or '-5.7' into 'R+12.3' or 'D+5.7'."""
     if not margin_str:
@@ -282,9 +363,6 @@ def print_detail(detail_rows):
 def analyze_state(state_abbr, threshold, year=2026, summary_only=False,
                   output_json=False, dry_run=False):
     """Run full analysis for a single state."""
-    # For 2026, show filing date if available
-    filing_date = CLOSED_FILING_STATES.get(state_abbr) if year == 2026 else None
-
     q_summary = query_summary(state_abbr, year)
     q_detail = query_uncontested_detail(state_abbr, year)
     q_missed = query_missed_opportunities(state_abbr, threshold, year)
@@ -308,6 +386,16 @@ def analyze_state(state_abbr, threshold, year=2026, summary_only=False,
     detail_rows = [] if summary_only else (run_sql(q_detail) or [])
     missed_rows = [] if summary_only else (run_sql(q_missed) or [])
 
+    return report_state(state_abbr, summary_rows, detail_rows, missed_rows, threshold,
+                        year=year, summary_only=summary_only, output_json=output_json)
+
+
+def report_state(state_abbr, summary_rows, detail_rows, missed_rows, threshold, year=2026,
+                 summary_only=False, output_json=False):
+    """Print (or, for JSON, package) one state's analysis; returns its result dict."""
+    # For 2026, show filing date if available
+    filing_date = CLOSED_FILING_STATES.get(state_abbr) if year == 2026 else None
+
     if output_json:
         result = {
             'state': state_abbr,
@@ -337,6 +425,65 @@ def analyze_state(state_abbr, threshold, year=2026, summary_only=False,
     }
 
 
+def analyze_states(states, threshold, year=2026, summary_only=False,
+                   output_json=False, dry_run=False):
+    """
+    Run the analysis for many states, a group per statement.
+
+    Each group's rows are grouped by state server-side and reported as soon
+    as the group arrives, in the same per-state form as analyze_state.
+    Returns the per-state result dicts for states with data.
+    """
+    step = len(states) if summary_only else STATES_PER_QUERY
+    results = []
+    for i in range(0, len(states), step):
+        group = states[i:i + step]
+        q = query_states(group, threshold, year, summary_only)
+        if dry_run:
+            print(f'\n--- {group[0]}–{group[-1]} {year}: All-states query ---')
+            print(q.strip())
+            continue
+
+        print(f'  [{i + len(group)}/{len(states)}] Analyzing {", ".join(group)}...')
+        rows = run_sql(q) or []
+        by_state = {}
+        for r in rows:
+            by_state[r['state']] = [json.loads(v) if isinstance(v, str) else v
+                                    for v in (r['summary'], r['uncontested_detail'],
+                                              r['missed_opportunities'])]
+        for state in group:
+            if state not in by_state:
+                print(f'  {state}: No candidacy data for {year} — skipping')
+                continue
+            summary_rows, detail_rows, missed_rows = by_state[state]
+            results.append(report_state(state, summary_rows, detail_rows, missed_rows, threshold,
+                                        year=year, summary_only=summary_only,
+                                        output_json=output_json))
+    return results
+
+
+def write_dataset(results, year, threshold, path):
+    """Write the multi-state results as one JSON file for the site."""
+    totals = {}
+    for r in results:
+        for s in r['summary']:
+            t = totals.setdefault(s['election_type'], {'total_with_data': 0, 'uncontested': 0,
+                                                       'no_candidates': 0})
+            for k in t:
+                t[k] += s[k]
+    data = {
+        'generated_at': datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z'),
+        'year': year,
+        'margin_threshold': threshold,
+        'totals': totals,
+        'states': results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(data, f, separators=(',', ':'), default=str)
+    print(f'Wrote {len(results)} states to {path}')
+
+
 def print_multi_state_summary(results, year):
     """Print a cross-state summary table."""
     print()
@@ -435,6 +582,9 @@ def main():
     parser.add_argument('--dry-run', action='store_true', help='Print queries without executing')
     parser.add_argument('--margin-threshold', type=float, default=DEFAULT_MARGIN_THRESHOLD,
                         help=f'Margin threshold for missed opportunities (default: {DEFAULT_MARGIN_THRESHOLD})')
+    parser.add_argument('--output', nargs='?', const='', metavar='PATH',
+                        help='With --all-closed/--all-states: write the results as a JSON dataset '
+                             '(default path: site/data/uncontested_{year}.json)')
     args = parser.parse_args()
 
     threshold = args.margin_threshold
@@ -457,55 +607,29 @@ def main():
         if args.json and result:
             print(json.dumps(result, indent=2, default=str))
 
-    elif args.all_closed:
-        # 2026 only — use CLOSED_FILING_STATES
-        if args.dry_run:
-            print('DRY RUN — queries that would be executed:\n')
-
-        results = []
-        states_sorted = sorted(CLOSED_FILING_STATES.keys())
-        for i, state in enumerate(states_sorted, 1):
-            if not args.dry_run:
-                print(f'  [{i}/{len(states_sorted)}] Analyzing {state}...')
-            result = analyze_state(state, threshold, year=year,
-                                   summary_only=args.summary_only,
-                                   output_json=args.json,
-                                   dry_run=args.dry_run)
-            if result:
-                results.append(result)
-
-        if args.dry_run:
-            return
-
-        if args.json:
-            print(json.dumps(results, indent=2, default=str))
-        elif args.summary_only:
-            print_multi_state_summary(results, year)
-
     else:
-        # --all-states
+        if args.all_closed:
+            # 2026 only — use CLOSED_FILING_STATES
+            states = sorted(CLOSED_FILING_STATES.keys())
+        else:
+            states = ALL_STATES
         if args.dry_run:
             print('DRY RUN — queries that would be executed:\n')
 
-        results = []
-        for i, state in enumerate(ALL_STATES, 1):
-            if not args.dry_run:
-                print(f'  [{i}/{len(ALL_STATES)}] Analyzing {state}...')
-            result = analyze_state(state, threshold, year=year,
-                                   summary_only=args.summary_only,
-                                   output_json=args.json,
-                                   dry_run=args.dry_run)
-            if result:
-                results.append(result)
-
+        results = analyze_states(states, threshold, year=year,
+                                 summary_only=args.summary_only,
+                                 output_json=args.json or args.output is not None,
+                                 dry_run=args.dry_run)
         if args.dry_run:
             return
 
-        if args.json:
+        if args.output is not None:
+            write_dataset(results, year, threshold,
+                          args.output or os.path.join(SITE_DATA_DIR, f'uncontested_{year}.json'))
+        elif args.json:
             print(json.dumps(results, indent=2, default=str))
         elif args.summary_only:
             print_multi_state_summary(results, year)
 
-
 if __name__ == '__main__':
     main()
@@ -29,6 +29,10 @@ from collections import Counter, defaultdict
 
 import httpx
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from db_config import TOKEN, PROJECT_REF
+from state_context import load_state_contexts
+
 INPUT_PATH = '/tmp/legislature_members.json'
 OUTPUT_PATH = '/tmp/seat_gaps_report.json'
 
@@ -53,49 +57,48 @@ def run_query(sql):
 
 def load_db_seats(state_filter=None):
     """
-    Load current seat data from DB.
+    Load current seat data from the shared state context (one row per seat).
 
-    Returns dict: (state_abbrev, chamber, district_number) -> {
-        seat_id, seat_label, current_holder, current_holder_party,
-        office_type, seat_term_id, candidate_id, start_date, start_reason,
-        election_id, district_id
-    }
+    Returns list of dicts: state, chamber, district_number, seat_id, seat_label,
+    current_holder, current_holder_party, current_holder_caucus, office_type,
+    seat_designator, district_id, seat_term_id, candidate_id, start_date,
+    start_reason, term_party, election_id, candidate_name
     """
-    where = ""
     if state_filter:
-        where = f"AND st.abbreviation = '{state_filter}'"
-
-    sql = f"""
-    SELECT
-        st.abbreviation AS state,
-        d.chamber,
-        d.district_number,
-        s.id AS seat_id,
-        s.seat_label,
-        s.current_holder,
-        s.current_holder_party,
-        s.current_holder_caucus,
-        s.office_type,
-        s.seat_designator,
-        d.id AS district_id,
-        t.id AS seat_term_id,
-        t.candidate_id,
-        t.start_date,
-        t.start_reason,
-        t.party AS term_party,
-        t.election_id,
-        c.full_name AS candidate_name
-    FROM seats s
-    JOIN districts d ON s.district_id = d.id
-    JOIN states st ON d.state_id = st.id
-    LEFT JOIN seat_terms t ON t.seat_id = s.id AND t.end_date IS NULL
-    LEFT JOIN candidates c ON t.candidate_id = c.id
-    WHERE d.office_level = 'Legislative'
-      AND s.selection_method = 'Elected'
-      {where}
-    ORDER BY st.abbreviation, d.chamber, d.district_number, s.seat_designator
-    """
-    return run_query(sql)
+        states = [state_filter]
+    else:
+        states = [r['abbreviation'] for r in run_query(
+            "SELECT abbreviation FROM states ORDER BY abbreviation")]
+    contexts = load_state_contexts(states, run_query)
+
+    rows = []
+    for st in states:
+        ctx = contexts.get(st)
+        if not ctx:
+            continue
+        for s in ctx.seats_for(office_level='Legislative', selection_method='Elected'):
+            t = ctx.current_terms.get(s['seat_id']) or {}
+            rows.append({
+                'state': st,
+                'chamber': s['chamber'],
+                'district_number': s['district_number'],
+                'seat_id': s['seat_id'],
+                'seat_label': s['seat_label'],
+                'current_holder': s['current_holder'],
+                'current_holder_party': s['current_holder_party'],
+                'current_holder_caucus': s['current_holder_caucus'],
+                'office_type': s['office_type'],
+                'seat_designator': s['seat_designator'],
+                'district_id': s['district_id'],
+                'seat_term_id': t.get('seat_term_id'),
+                'candidate_id': t.get('candidate_id'),
+                'start_date': t.get('start_date'),
+                'start_reason': t.get('start_reason'),
+                'term_party': t.get('party'),
+                'election_id': t.get('election_id'),
+                'candidate_name': t.get('full_name'),
+            })
+    return rows
 
 def load_existing_specials(state_filter=None):
     """Load existing special elections to cross-reference."""
@@ -143,9 +146,6 @@ def normalize_name(name):
     name = re.sub(r"'[^']*'", '', name)
     # Normalize accented characters
     import unicodedata
-import sys as _sys, os as _os
-_sys.path.insert(0, _os.path.join(_os.path.dirname(_os.path.abspath(__file__)), '..'))
-from db_config import TOKEN, PROJECT_REF, API_URL
     name = unicodedata.normalize('NFD', name)
     name = ''.join(c for c in name if unicodedata.category(c) != 'Mn')
     # Normalize curly quotes/apostrophes to straight
@@ -2,26 +2,51 @@
 """
 Audit seat_terms integrity.
 
-Checks for:
-1. Seats with current_holder but no open seat_term (missing seat_term)
-2. Open seat_terms where candidate name != current_holder (name mismatch)
-3. Open seat_terms on seats with no current_holder (stale seat_term)
-4. Duplicate open seat_terms on the same seat
-5. Seats with current_holder but NULL caucus (missing caucus)
+Pulls every seat with its seat_terms in one query, then checks each seat in
+a single pass over its terms (sorted by start_date):
+
+  missing_term     seat has current_holder but no open seat_term
+  name_mismatch    open seat_term's candidate != seats.current_holder
+  party_mismatch   open seat_term's party/caucus != seats.current_holder_party/caucus
+  stale_term       open seat_term on a seat with no current_holder
+  multiple_open    more than one open seat_term on the seat
+  missing_caucus   current_holder set but current_holder_caucus NULL
+  bad_dates        term with no start_date, or end_date <= start_date
+  overlap          term starts before an earlier term on the seat has ended
+  gap              more than --gap-days between one term ending and the next
+                   starting (vacancies are normal; long ones usually mean a
+                   missing term)
+
+Findings are printed per check and written to OUTPUT_PATH as JSON, along
+with a fingerprint per seat (md5 of its holder fields and terms). With
+--since, only seats whose fingerprint changed since that report are pulled
+and re-audited; findings for untouched seats are carried over.
 
 Usage:
     python3 scripts/audit_seat_terms.py
     python3 scripts/audit_seat_terms.py --state FL
+    python3 scripts/audit_seat_terms.py --since
+    python3 scripts/audit_seat_terms.py --gap-days 180 --check overlap --check gap
 """
 import sys
 import os
+import json
 import argparse
 import time
+from datetime import date, datetime
 
 import httpx
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
 from db_config import TOKEN, PROJECT_REF
 
+OUTPUT_PATH = '/tmp/seat_terms_audit.json'
+
+CHECKS = [
+    'missing_term', 'name_mismatch', 'party_mismatch', 'stale_term',
+    'multiple_open', 'missing_caucus', 'bad_dates', 'overlap', 'gap',
+]
+DEFAULT_GAP_DAYS = 90
+
 
 def run_sql(query, max_retries=5):
     for attempt in range(max_retries):
@@ -53,143 +78,237 @@ def run_sql(query, max_retries=5):
     return None
 
 
-def main():
-    parser = argparse.ArgumentParser(description='Audit seat_terms integrity')
-    parser.add_argument('--state', help='Filter to a specific state')
-    args = parser.parse_args()
-
-    state_filter = f"AND s.abbreviation = '{args.state}'" if args.state else ""
-    issues = 0
+# ══════════════════════════════════════════════════════════════════════
+# QUERIES
+# ══════════════════════════════════════════════════════════════════════
 
-    # ── Check 1: current_holder with no open seat_term ────────────
-    print('=' * 60)
-    print('CHECK 1: Seats with current_holder but no open seat_term')
-    print('=' * 60)
-    rows = run_sql(f"""
-        SELECT s.abbreviation as state, se.seat_label, se.current_holder
+FINGERPRINT_CTE = """
+    fp AS (
+        SELECT se.id AS seat_id,
+               md5(concat_ws('|', se.current_holder, se.current_holder_party,
+                             se.current_holder_caucus,
+                             string_agg(concat_ws(',', t.id, t.candidate_id, c.full_name,
+                                                  t.party, t.caucus, t.start_date, t.end_date),
+                                        ';' ORDER BY t.id))) AS fingerprint
         FROM seats se
         JOIN districts d ON se.district_id = d.id
         JOIN states s ON d.state_id = s.id
-        WHERE se.current_holder IS NOT NULL
-          AND NOT EXISTS (
-            SELECT 1 FROM seat_terms st WHERE st.seat_id = se.id AND st.end_date IS NULL
-          )
-          {state_filter}
-        ORDER BY s.abbreviation, se.seat_label
-    """)
-    if rows:
-        issues += len(rows)
-        print(f'  FOUND {len(rows)} seats with current_holder but no seat_term:')
-        for r in rows:
-            print(f'    {r["state"]} {r["seat_label"]}: {r["current_holder"]}')
-    else:
-        print('  OK — all seats with holders have matching seat_terms')
+        LEFT JOIN seat_terms t ON t.seat_id = se.id
+        LEFT JOIN candidates c ON t.candidate_id = c.id
+        WHERE TRUE {filters}
+        GROUP BY se.id
+    )
+"""
 
-    # ── Check 2: seat_term name != current_holder ─────────────────
-    print('\n' + '=' * 60)
-    print('CHECK 2: Open seat_terms where name != current_holder')
-    print('=' * 60)
-    rows = run_sql(f"""
-        SELECT s.abbreviation as state, se.seat_label,
-               se.current_holder, c.full_name as term_holder
-        FROM seat_terms st
-        JOIN seats se ON st.seat_id = se.id
-        JOIN candidates c ON st.candidate_id = c.id
-        JOIN districts d ON se.district_id = d.id
-        JOIN states s ON d.state_id = s.id
-        WHERE st.end_date IS NULL
-          AND se.current_holder IS NOT NULL
-          AND se.current_holder != c.full_name
-          {state_filter}
-        ORDER BY s.abbreviation, se.seat_label
-    """)
-    if rows:
-        issues += len(rows)
-        print(f'  FOUND {len(rows)} name mismatches:')
-        for r in rows:
-            print(f'    {r["state"]} {r["seat_label"]}: holder="{r["current_holder"]}" vs term="{r["term_holder"]}"')
-    else:
-        print('  OK — all names match')
 
-    # ── Check 3: open seat_terms on vacant seats ──────────────────
-    print('\n' + '=' * 60)
-    print('CHECK 3: Open seat_terms on seats with no current_holder')
-    print('=' * 60)
-    rows = run_sql(f"""
-        SELECT s.abbreviation as state, se.seat_label, c.full_name, st.start_date
-        FROM seat_terms st
-        JOIN seats se ON st.seat_id = se.id
-        JOIN candidates c ON st.candidate_id = c.id
-        JOIN districts d ON se.district_id = d.id
-        JOIN states s ON d.state_id = s.id
-        WHERE st.end_date IS NULL AND se.current_holder IS NULL
-          {state_filter}
-        ORDER BY s.abbreviation, se.seat_label
-    """)
-    if rows:
-        issues += len(rows)
-        print(f'  FOUND {len(rows)} stale seat_terms on vacant seats:')
-        for r in rows:
-            print(f'    {r["state"]} {r["seat_label"]}: {r["full_name"]} (started {r["start_date"]})')
-    else:
-        print('  OK — no stale seat_terms')
+def load_fingerprints(state_filter):
+    rows = run_sql(f"WITH {FINGERPRINT_CTE.format(filters=state_filter)} "
+                   "SELECT seat_id, fingerprint FROM fp")
+    if rows is None:
+        sys.exit(1)
+    return {str(r['seat_id']): r['fingerprint'] for r in rows}
 
-    # ── Check 4: duplicate open seat_terms ────────────────────────
-    print('\n' + '=' * 60)
-    print('CHECK 4: Duplicate open seat_terms (multiple holders)')
-    print('=' * 60)
-    rows = run_sql(f"""
-        SELECT s.abbreviation as state, se.seat_label, COUNT(*) as cnt
-        FROM seat_terms st
-        JOIN seats se ON st.seat_id = se.id
-        JOIN districts d ON se.district_id = d.id
-        JOIN states s ON d.state_id = s.id
-        WHERE st.end_date IS NULL
-          {state_filter}
-        GROUP BY s.abbreviation, se.seat_label
-        HAVING COUNT(*) > 1
-        ORDER BY s.abbreviation, se.seat_label
-    """)
-    if rows:
-        issues += len(rows)
-        print(f'  FOUND {len(rows)} seats with multiple open seat_terms:')
-        for r in rows:
-            print(f'    {r["state"]} {r["seat_label"]}: {r["cnt"]} open terms')
-    else:
-        print('  OK — no duplicates')
 
-    # ── Check 5: current_holder with NULL caucus ──────────────────
-    print('\n' + '=' * 60)
-    print('CHECK 5: Seats with current_holder but NULL caucus')
-    print('=' * 60)
+def load_seat_rows(state_filter, seat_ids=None):
+    """One row per (seat, term); seats without terms get one row with NULL term columns."""
+    filters = state_filter
+    if seat_ids is not None:
+        filters += f" AND se.id IN ({','.join(str(int(s)) for s in seat_ids)})"
     rows = run_sql(f"""
-        SELECT s.abbreviation as state, se.seat_label, se.current_holder, se.current_holder_party
+        WITH {FINGERPRINT_CTE.format(filters=filters)}
+        SELECT s.abbreviation AS state, se.id AS seat_id, se.seat_label,
+               se.current_holder, se.current_holder_party, se.current_holder_caucus,
+               fp.fingerprint,
+               t.id AS term_id, c.full_name AS term_holder, t.party, t.caucus,
+               t.start_date, t.end_date
         FROM seats se
+        JOIN fp ON fp.seat_id = se.id
         JOIN districts d ON se.district_id = d.id
         JOIN states s ON d.state_id = s.id
-        WHERE se.current_holder IS NOT NULL
-          AND se.current_holder_caucus IS NULL
-          {state_filter}
-        ORDER BY s.abbreviation, se.seat_label
+        LEFT JOIN seat_terms t ON t.seat_id = se.id
+        LEFT JOIN candidates c ON t.candidate_id = c.id
+        ORDER BY se.id, t.start_date NULLS FIRST, t.id
     """)
-    if rows:
-        issues += len(rows)
-        print(f'  FOUND {len(rows)} seats with NULL caucus:')
-        for r in rows[:20]:
-            print(f'    {r["state"]} {r["seat_label"]}: {r["current_holder"]} (party={r["current_holder_party"]})')
+    if rows is None:
+        sys.exit(1)
+    return rows
+
+
+# ══════════════════════════════════════════════════════════════════════
+# CHECKS
+# ══════════════════════════════════════════════════════════════════════
+
+def _days_between(d1, d2):
+    return (date.fromisoformat(d2[:10]) - date.fromisoformat(d1[:10])).days
+
+
+def audit_seat(seat, terms, gap_days):
+    """All findings for one seat. terms are sorted by start_date (NULLs first)."""
+    findings = []
+
+    def add(check, detail, term_ids=()):
+        findings.append({'check': check, 'state': seat['state'], 'seat_id': seat['seat_id'],
+                         'seat_label': seat['seat_label'], 'detail': detail,
+                         'term_ids': list(term_ids)})
+
+    holder = seat['current_holder']
+    open_terms = []
+    latest = None  # term with the latest end_date so far (None end = open)
+    for t in terms:
+        start, end = t['start_date'], t['end_date']
+        if end is None:
+            open_terms.append(t)
+        if not start:
+            add('bad_dates', f'{t["term_holder"]}: no start_date', [t['term_id']])
+            continue
+        if end and end <= start:
+            add('bad_dates', f'{t["term_holder"]}: ends {end} before starting {start}',
+                [t['term_id']])
+            continue
+        if latest is not None:
+            prev_end = latest['end_date']
+            if prev_end is None or prev_end > start:
+                add('overlap', f'{t["term_holder"]} starts {start} while '
+                    f'{latest["term_holder"]} serves until {prev_end or "present"}',
+                    [latest['term_id'], t['term_id']])
+            elif gap_days is not None and _days_between(prev_end, start) > gap_days:
+                add('gap', f'{_days_between(prev_end, start)} days between '
+                    f'{latest["term_holder"]} ({prev_end}) and {t["term_holder"]} ({start})',
+                    [latest['term_id'], t['term_id']])
+        if latest is None or latest['end_date'] is not None and (end is None or end > latest['end_date']):
+            latest = t
+
+    if len(open_terms) > 1:
+        add('multiple_open', f'{len(open_terms)} open terms: '
+            + ', '.join(t['term_holder'] or '?' for t in open_terms),
+            [t['term_id'] for t in open_terms])
+    if holder:
+        if not open_terms:
+            add('missing_term', f'current_holder {holder} has no open seat_term')
+        elif all(t['term_holder'] != holder for t in open_terms):
+            add('name_mismatch', f'holder="{holder}" vs term="{open_terms[-1]["term_holder"]}"',
+                [open_terms[-1]['term_id']])
+        else:
+            t = next(t for t in open_terms if t['term_holder'] == holder)
+            if (t['party'], t['caucus']) != (seat['current_holder_party'], seat['current_holder_caucus']) \
+                    and not (t['caucus'] is None and t['party'] == seat['current_holder_party']):
+                add('party_mismatch', f'seat {seat["current_holder_party"]}/{seat["current_holder_caucus"]} '
+                    f'vs term {t["party"]}/{t["caucus"]}', [t['term_id']])
+        if not seat['current_holder_caucus']:
+            add('missing_caucus', f'{holder} (party={seat["current_holder_party"]})')
+    elif open_terms:
+        add('stale_term', ', '.join(f'{t["term_holder"]} (started {t["start_date"]})'
+                                    for t in open_terms),
+            [t['term_id'] for t in open_terms])
+    return findings
+
+
+def audit_rows(rows, gap_days):
+    """Single pass over rows ordered by seat_id, start_date. Returns (findings, fingerprints)."""
+    findings, fingerprints = [], {}
+    seat, terms = None, []
+    for r in rows + [None]:
+        if seat is not None and (r is None or r['seat_id'] != seat['seat_id']):
+            findings.extend(audit_seat(seat, terms, gap_days))
+            fingerprints[str(seat['seat_id'])] = seat['fingerprint']
+            seat, terms = None, []
+        if r is None:
+            break
+        if seat is None:
+            seat = r
+        if r['term_id'] is not None:
+            terms.append(r)
+    return findings, fingerprints
+
+
+# ══════════════════════════════════════════════════════════════════════
+# MAIN
+# ══════════════════════════════════════════════════════════════════════
+
+def print_findings(findings, checks):
+    by_check = {c: [] for c in checks}
+    for f in findings:
+        if f['check'] in by_check:
+            by_check[f['check']].append(f)
+    total = 0
+    for check in checks:
+        rows = sorted(by_check[check], key=lambda f: (f['state'], f['seat_label']))
+        total += len(rows)
+        print('=' * 60)
+        print(f'{check}: {len(rows)}')
+        for f in rows[:20]:
+            print(f'    {f["state"]} {f["seat_label"]}: {f["detail"]}')
         if len(rows) > 20:
             print(f'    ... and {len(rows) - 20} more')
-    else:
-        print('  OK — all holders have caucus set')
-
-    # ── Summary ───────────────────────────────────────────────────
     print('\n' + '=' * 60)
-    if issues:
-        print(f'TOTAL ISSUES: {issues}')
-    else:
-        print('ALL CHECKS PASSED')
+    print(f'TOTAL ISSUES: {total}' if total else 'ALL CHECKS PASSED')
     print('=' * 60)
 
 
+def main():
+    parser = argparse.ArgumentParser(description='Audit seat_terms integrity')
+    parser.add_argument('--state', help='Filter to a specific state')
+    parser.add_argument('--since', action='store_true',
+                        help=f'Re-audit only seats changed since the last report ({OUTPUT_PATH})')
+    parser.add_argument('--gap-days', type=int, default=DEFAULT_GAP_DAYS,
+                        help=f'Flag gaps longer than this between terms (default {DEFAULT_GAP_DAYS})')
+    parser.add_argument('--check', action='append', choices=CHECKS,
+                        help='Only report these checks (repeatable; default all)')
+    parser.add_argument('--output', default=OUTPUT_PATH, help='Report path')
+    args = parser.parse_args()
+
+    state_filter = f"AND s.abbreviation = '{args.state.upper()}'" if args.state else ""
+    t0 = time.time()
+
+    previous = None
+    if args.since:
+        if os.path.exists(args.output):
+            with open(args.output) as f:
+                previous = json.load(f)
+        else:
+            print(f'No previous report at {args.output} — running a full audit')
+
+    if previous is not None:
+        current = load_fingerprints(state_filter)
+        old = previous['fingerprints']
+        scope = set(current) if args.state else set(current) | set(old)
+        changed = {s for s in current if old.get(s) != current[s]}
+        gone = {s for s in scope - set(current)}
+        print(f'{len(changed):,} of {len(current):,} seats changed since '
+              f'{previous["generated_at"]}, {len(gone):,} removed')
+        rows = load_seat_rows(state_filter, changed) if changed else []
+        new_findings, fingerprints = audit_rows(rows, args.gap_days)
+        stale = changed | gone
+        findings = [f for f in previous['findings'] if str(f['seat_id']) not in stale] + new_findings
+        fingerprints = {**{s: fp for s, fp in old.items() if s not in gone}, **fingerprints}
+    else:
+        rows = load_seat_rows(state_filter)
+        findings, fingerprints = audit_rows(rows, args.gap_days)
+        if args.state and os.path.exists(args.output):
+            # Keep other states' results so --since still covers them
+            with open(args.output) as f:
+                prev = json.load(f)
+            audited = set(fingerprints)
+            findings = [f for f in prev['findings'] if str(f['seat_id']) not in audited
+                        and f['state'] != args.state.upper()] + findings
+            fingerprints = {**prev['fingerprints'], **fingerprints}
+    print(f'Audited {len(rows):,} term rows in {time.time() - t0:.1f}s\n')
+
+    checks = args.check or CHECKS
+    shown = [f for f in findings if not args.state or f['state'] == args.state.upper()]
+    print_findings(shown, checks)
+
+    findings.sort(key=lambda f: (f['state'], f['seat_label'], f['check']))
+    with open(args.output, 'w') as f:
+        json.dump({
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'gap_days': args.gap_days,
+            'counts': {c: sum(1 for x in findings if x['check'] == c) for c in CHECKS},
+            'findings': findings,
+            'fingerprints': fingerprints,
+        }, f, indent=1)
+    print(f'\nReport: {args.output}')
+
+
 if __name__ == '__main__':
     main()
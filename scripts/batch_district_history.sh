@@ -1,6 +1,8 @@
 #!/bin/bash
 # Batch process district history for all states.
 # Downloads + parses from Ballotpedia, then populates the DB.
+# Re-runs only reconcile districts whose parsed results changed since the last
+# populate (fingerprints in district_history_sources); the rest are skipped.
 #
 # Usage:
 #   bash scripts/batch_district_history.sh           # all states
@@ -73,8 +75,9 @@ for STATE in "${STATES[@]}"; do
     INSERTED=$(echo "$OUTPUT" | grep "Elections inserted:" | awk '{print $NF}')
     CANDS=$(echo "$OUTPUT" | grep "Candidacies inserted:" | awk '{print $NF}')
     CREATED=$(echo "$OUTPUT" | grep "Candidates created:" | awk '{print $NF}')
+    CHANGED=$(echo "$OUTPUT" | grep "Districts to reconcile:" | awk '{print $NF}')
 
-    echo "  [$STATE] Elections: ${INSERTED:-0}, Candidacies: ${CANDS:-0}, New candidates: ${CREATED:-0}" | tee -a "$LOGFILE"
+    echo "  [$STATE] Districts changed: ${CHANGED:-0}, Elections: ${INSERTED:-0}, Candidacies: ${CANDS:-0}, New candidates: ${CREATED:-0}" | tee -a "$LOGFILE"
 
     TOTAL_ELECTIONS=$((TOTAL_ELECTIONS + ${INSERTED:-0}))
     TOTAL_CANDIDACIES=$((TOTAL_CANDIDACIES + ${CANDS:-0}))
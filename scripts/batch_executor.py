@@ -0,0 +1,423 @@
+"""
+Shared adaptive batch executor for write-heavy scripts.
+
+Replaces the per-script "N statements, BEGIN…COMMIT, sleep(1)" loops. Work is
+queued, packed into transactions by payload size, and sent through the
+Management API; the batch size and the pause between batches follow what the
+API is actually doing rather than fixed constants:
+
+  - a batch that comes back fast grows the byte budget (×1.25) and halves
+    any pacing delay; a slow one shrinks the budget towards TARGET_LATENCY,
+  - a 429 halves the budget, backs off (Retry-After when given, otherwise
+    doubling from 1s), and resends the same batch,
+  - timeouts / 5xx are retried with the same backoff only when every
+    statement in the batch is idempotent (coalesced UPDATE / DELETE, or a
+    raw statement with an ON CONFLICT / NOT EXISTS guard, or one queued with
+    add(sql, idempotent=True)). A timed-out request may still have
+    committed, so a batch with plain INSERTs is never resent: it is reported
+    as failed with its SQL, for checking by hand.
+
+Homogeneous writes are coalesced instead of sent one statement per row:
+
+    update('districts', {'id': 7}, {'pres_2024_margin': '+3.1'})
+        → UPDATE districts AS t SET pres_2024_margin = v.pres_2024_margin
+          FROM (VALUES (7, '+3.1'), …) AS v(id, pres_2024_margin)
+          WHERE t.id = v.id;
+    insert('seat_terms', {...})   → one multi-row INSERT … VALUES
+    delete('candidacies', 123)    → DELETE … WHERE id IN (…)
+
+VALUES columns take their type from the literals (ints, numerics, text). Pass
+types={'col': 'date'} for anything else — it becomes a cast in the SET list.
+A column that is NULL in every row is set to a typed NULL (NULL::type, or a
+bare NULL that takes the target column's type) instead of through VALUES,
+where it would be text.
+
+Usage:
+    from batch_executor import BatchExecutor
+
+    with BatchExecutor('AR 2024 updates') as ex:
+        for row in rows:
+            ex.update('candidacies', {'id': row['id']}, {'votes_received': row['votes']})
+        ex.add("UPDATE seats SET ...;")      # raw statements keep their order
+    # → prints statements, rows, batches, bytes, rows/s, 429s on exit
+"""
+
+import sys
+import os
+import re
+import time
+import datetime
+from decimal import Decimal
+
+import httpx
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from db_config import TOKEN, API_URL
+
+START_BYTES = 64_000
+MIN_BYTES = 4_000
+MAX_BYTES = 512_000
+TARGET_LATENCY = 3.0   # seconds per batch we are happy to wait on
+MAX_RETRIES = 6
+
+# Raw statements that are safe to resend after a timeout
+IDEMPOTENT_RE = re.compile(r'\bON\s+CONFLICT\b|\bNOT\s+EXISTS\b', re.IGNORECASE)
+
+
+def sql_literal(value):
+    """Render a Python value as a SQL literal."""
+    if value is None:
+        return 'NULL'
+    if isinstance(value, bool):
+        return 'TRUE' if value else 'FALSE'
+    if isinstance(value, (int, Decimal)):
+        return str(value)
+    if isinstance(value, float):
+        return repr(value)
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return f"'{value.isoformat()}'"
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+class _Chunk:
+    """One statement in a batch: head + rows joined by sep + tail.
+
+    Raw statements are a single row with no head/tail. Coalesced statements
+    keep their rows separate so a failing statement can be split.
+    """
+    __slots__ = ('head', 'rows', 'tail', 'sep', 'idempotent')
+
+    def __init__(self, head, rows, tail='', sep='', idempotent=False):
+        self.head, self.rows, self.tail, self.sep = head, rows, tail, sep
+        self.idempotent = idempotent
+
+    def render(self):
+        return self.head + self.sep.join(self.rows) + self.tail
+
+    def split(self):
+        mid = len(self.rows) // 2
+        return (_Chunk(self.head, self.rows[:mid], self.tail, self.sep, self.idempotent),
+                _Chunk(self.head, self.rows[mid:], self.tail, self.sep, self.idempotent))
+
+
+class BatchExecutor:
+    """Queue writes, send them in adaptively sized transactions, report throughput.
+
+    on_error='exit' prints the SQL error and exits (like run_sql).
+    on_error='skip' bisects a failing batch down to the offending statement
+    (or VALUES row), skips it, and keeps going; skipped SQL is kept in
+    self.failed.
+    """
+
+    def __init__(self, label='batch', dry_run=False, transactional=True,
+                 on_error='exit', start_bytes=START_BYTES, min_bytes=MIN_BYTES,
+                 max_bytes=MAX_BYTES, target_latency=TARGET_LATENCY, verbose=False):
+        self.label = label
+        self.dry_run = dry_run
+        self.transactional = transactional
+        self.on_error = on_error
+        self.budget = start_bytes
+        self.min_bytes = min_bytes
+        self.max_bytes = max_bytes
+        self.target_latency = target_latency
+        self.verbose = verbose
+        self.delay = 0.0
+        self.failed = []
+        self.stats = {'statements': 0, 'rows': 0, 'batches': 0, 'bytes': 0,
+                      'rate_limited': 0, 'retries': 0, 'failed': 0, 'api_seconds': 0.0}
+        self._sealed = []          # [_Chunk] ready to send, in order
+        self._sealed_bytes = 0
+        self._groups = {}          # signature → {'kind', 'rows': {key: row_sql}, ...}
+        self._group_bytes = 0
+        self._update_keys = {}     # (table, key) → signature of the group holding it
+        self._delete_keys = set()  # (table, key column, value) queued for DELETE
+        self._open_kinds = {}      # table → kinds of the open groups writing it
+        self._t0 = time.time()
+
+    # ── queueing ──────────────────────────────────────────────────────
+
+    def add(self, sql, idempotent=None):
+        """Queue a raw statement. Earlier coalesced writes are sealed first.
+
+        idempotent: whether the statement may be resent after a timeout or
+        5xx. Defaults to True only for statements with an ON CONFLICT or
+        NOT EXISTS guard.
+        """
+        sql = sql.strip()
+        if not sql.endswith(';'):
+            sql += ';'
+        if idempotent is None:
+            idempotent = bool(IDEMPOTENT_RE.search(sql))
+        self._seal()
+        self._sealed.append(_Chunk('', [sql], idempotent=idempotent))
+        self._sealed_bytes += len(sql)
+        self.stats['statements'] += 1
+        self.stats['rows'] += 1
+        self._maybe_flush()
+
+    def execute(self, statements):
+        """Queue a list of raw statements and flush."""
+        for sql in statements:
+            self.add(sql)
+        self.flush()
+
+    def update(self, table, key, values, types=None):
+        """Queue UPDATE table SET values WHERE key; coalesced per column set.
+
+        A later update of the same row with the same columns replaces the
+        earlier one.
+        """
+        key_cols = tuple(key)
+        set_cols = tuple(values)
+        sig = ('update', table, key_cols, set_cols, tuple(sorted((types or {}).items())))
+        row_key = tuple(key[c] for c in key_cols)
+        held_by = self._update_keys.get((table, row_key))
+        if held_by is not None and held_by != sig:
+            self._seal()  # keep statement order for a row touched with different columns
+        elif len(key_cols) == 1 and (table, key_cols[0], row_key[0]) in self._delete_keys:
+            self._seal()  # the row was deleted first
+        group = self._groups.get(sig)
+        if group is None:
+            group = self._groups[sig] = {'rows': {}, 'types': types or {}, 'values': {}}
+        group['values'][row_key] = tuple(values[c] for c in set_cols)
+        row = '(' + ', '.join(sql_literal(key[c]) for c in key_cols) + ', ' \
+            + ', '.join(sql_literal(values[c]) for c in set_cols) + ')'
+        old = group['rows'].get(row_key)
+        if old is not None:
+            self._group_bytes -= len(old)
+        else:
+            self.stats['rows'] += 1
+        group['rows'][row_key] = row
+        self._group_bytes += len(row) + 2
+        self._update_keys[(table, row_key)] = sig
+        self._open_kinds.setdefault(table, set()).add('update')
+        self._maybe_flush()
+
+    def insert(self, table, values):
+        """Queue one row for a multi-row INSERT INTO table (columns) VALUES …"""
+        cols = tuple(values)
+        sig = ('insert', table, cols)
+        if self._open_kinds.get(table, set()) - {'insert'}:
+            self._seal()  # the new row may be one an open UPDATE/DELETE targets
+        group = self._groups.get(sig)
+        if group is None:
+            group = self._groups[sig] = {'rows': {}}
+        row = '(' + ', '.join(sql_literal(values[c]) for c in cols) + ')'
+        group['rows'][len(group['rows'])] = row
+        self._group_bytes += len(row) + 2
+        self.stats['rows'] += 1
+        self._open_kinds.setdefault(table, set()).add('insert')
+        self._maybe_flush()
+
+    def delete(self, table, key_value, key='id'):
+        """Queue DELETE FROM table WHERE key = key_value, coalesced into IN (…)."""
+        sig = ('delete', table, key)
+        held_by = self._update_keys.get((table, (key_value,)))
+        if 'insert' in self._open_kinds.get(table, ()) or (held_by and held_by[2] == (key,)):
+            self._seal()  # an earlier INSERT/UPDATE of the row must land first
+        group = self._groups.get(sig)
+        if group is None:
+            group = self._groups[sig] = {'rows': {}}
+        if key_value not in group['rows']:
+            lit = sql_literal(key_value)
+            group['rows'][key_value] = lit
+            self._group_bytes += len(lit) + 1
+            self.stats['rows'] += 1
+        self._delete_keys.add((table, key, key_value))
+        self._open_kinds.setdefault(table, set()).add('delete')
+        self._maybe_flush()
+
+    # ── sealing / flushing ────────────────────────────────────────────
+
+    def _seal(self):
+        """Turn open coalescing groups into statements, in creation order.
+
+        insert/update/delete seal first when the new row could interact with
+        a different-kind group already open on the table, so creation order
+        never reorders writes to the same row.
+        """
+        for sig, group in self._groups.items():
+            rows = list(group['rows'].values())
+            if not rows:
+                continue
+            kind, table = sig[0], sig[1]
+            if kind == 'update':
+                key_cols, set_cols, types = sig[2], sig[3], group['types']
+                all_null = {c for i, c in enumerate(set_cols)
+                            if all(v[i] is None for v in group['values'].values())}
+                sets = ', '.join(self._set_expr(c, types.get(c), c in all_null)
+                                 for c in set_cols)
+                where = ' AND '.join(f't.{c} = v.{c}' for c in key_cols)
+                chunk = _Chunk(
+                    f'UPDATE {table} AS t SET {sets}\nFROM (VALUES\n', rows,
+                    f'\n) AS v({", ".join(key_cols + set_cols)})\nWHERE {where};', ',\n',
+                    idempotent=True)
+            elif kind == 'insert':
+                chunk = _Chunk(f'INSERT INTO {table} ({", ".join(sig[2])}) VALUES\n',
+                               rows, ';', ',\n')
+            else:
+                chunk = _Chunk(f'DELETE FROM {table} WHERE {sig[2]} IN (', rows, ');', ',',
+                               idempotent=True)
+            self._sealed.append(chunk)
+            self._sealed_bytes += len(chunk.head) + len(chunk.tail) + sum(map(len, rows)) \
+                + len(chunk.sep) * len(rows)
+            self.stats['statements'] += 1
+        self._groups = {}
+        self._group_bytes = 0
+        self._update_keys = {}
+        self._delete_keys = set()
+        self._open_kinds = {}
+
+    @staticmethod
+    def _set_expr(col, sql_type, all_null):
+        if all_null:
+            return f'{col} = NULL::{sql_type}' if sql_type else f'{col} = NULL'
+        return f'{col} = v.{col}::{sql_type}' if sql_type else f'{col} = v.{col}'
+
+    def _maybe_flush(self):
+        if self._sealed_bytes + self._group_bytes >= self.budget:
+            self.flush()
+
+    def flush(self):
+        """Send everything queued as one transaction."""
+        self._seal()
+        if not self._sealed:
+            return
+        chunks, self._sealed, self._sealed_bytes = self._sealed, [], 0
+        self._send(chunks)
+
+    def close(self):
+        self.flush()
+        self.report()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        return False
+
+    # ── sending ───────────────────────────────────────────────────────
+
+    def _render(self, chunks):
+        body = '\n'.join(c.render() for c in chunks)
+        if self.transactional and (len(chunks) > 1 or len(chunks[0].rows) > 1):
+            return 'BEGIN;\n' + body + '\nCOMMIT;'
+        return body
+
+    def _send(self, chunks):
+        sql = self._render(chunks)
+        if self.dry_run:
+            self.stats['batches'] += 1
+            self.stats['bytes'] += len(sql)
+            return
+        if self.delay:
+            time.sleep(self.delay)
+        ok, error, uncertain = self._post(sql, all(c.idempotent for c in chunks))
+        if ok:
+            return
+        if self.on_error != 'skip':
+            print(f'  [{self.label}] SQL ERROR: {error}')
+            if uncertain:
+                print(f'  [{self.label}] the batch may have committed; check before re-running')
+            sys.exit(1)
+        if uncertain:
+            # Resending any part of it could apply it twice
+            print(f'  [{self.label}] batch not retried, may have committed: {error}')
+            self.stats['failed'] += 1
+            self.failed.append(sql)
+            return
+        # Bisect to isolate the failing statement / VALUES row
+        if len(chunks) > 1:
+            mid = len(chunks) // 2
+            self._send(chunks[:mid])
+            self._send(chunks[mid:])
+        elif len(chunks[0].rows) > 1:
+            left, right = chunks[0].split()
+            self._send([left])
+            self._send([right])
+        else:
+            print(f'  [{self.label}] skipped failing statement: {error}')
+            self.stats['failed'] += 1
+            self.failed.append(sql)
+
+    def _post(self, sql, idempotent=False):
+        """POST one batch, adapting budget/delay.
+
+        Returns (ok, error_text, uncertain); uncertain means a timeout or
+        5xx on a batch that is not idempotent, so it was not resent and may
+        or may not have been applied.
+        """
+        backoff = 1.0
+        for attempt in range(MAX_RETRIES):
+            t0 = time.time()
+            try:
+                resp = httpx.post(
+                    API_URL,
+                    headers={'Authorization': f'Bearer {TOKEN}', 'Content-Type': 'application/json'},
+                    json={'query': sql},
+                    timeout=120,
+                )
+            except httpx.TransportError as e:
+                resp, error = None, f'{type(e).__name__}: {e}'
+            elapsed = time.time() - t0
+            self.stats['api_seconds'] += elapsed
+
+            if resp is not None and resp.status_code == 201:
+                self.stats['batches'] += 1
+                self.stats['bytes'] += len(sql)
+                self._adapt(elapsed)
+                if self.verbose:
+                    print(f'  [{self.label}] batch {self.stats["batches"]}: '
+                          f'{len(sql) / 1024:.0f} KB in {elapsed:.2f}s')
+                return True, None, False
+
+            if resp is not None and resp.status_code == 429:
+                self.stats['rate_limited'] += 1
+                self.budget = max(self.min_bytes, self.budget // 2)
+                retry_after = resp.headers.get('retry-after')
+                try:
+                    wait = float(retry_after)
+                except (TypeError, ValueError):
+                    wait = max(backoff, self.delay * 2)
+                self.delay = max(self.delay, wait / 2)
+                print(f'  [{self.label}] rate limited, waiting {wait:.1f}s '
+                      f'(batch budget now {self.budget // 1024} KB)')
+            elif resp is not None and resp.status_code < 500:
+                return False, f'{resp.status_code} - {resp.text[:500]}', False
+            else:
+                if resp is not None:
+                    error = f'{resp.status_code} - {resp.text[:200]}'
+                if not idempotent:
+                    return False, error, True
+                self.budget = max(self.min_bytes, self.budget // 2)
+                wait = backoff
+                print(f'  [{self.label}] {error}; retrying in {wait:.1f}s')
+
+            self.stats['retries'] += 1
+            time.sleep(wait)
+            backoff *= 2
+        return False, f'gave up after {MAX_RETRIES} attempts', False
+
+    def _adapt(self, elapsed):
+        if elapsed < self.target_latency / 2:
+            self.budget = min(self.max_bytes, int(self.budget * 1.25))
+        elif elapsed > self.target_latency:
+            self.budget = max(self.min_bytes, int(self.budget * self.target_latency / elapsed))
+        self.delay = self.delay / 2 if self.delay > 0.05 else 0.0
+
+    # ── reporting ─────────────────────────────────────────────────────
+
+    def report(self):
+        s = self.stats
+        wall = time.time() - self._t0
+        rate = s['rows'] / wall if wall > 0 else 0
+        prefix = '[DRY RUN] ' if self.dry_run else ''
+        line = (f'  {prefix}[{self.label}] {s["rows"]:,} rows in {s["statements"]:,} statements, '
+                f'{s["batches"]:,} batches, {s["bytes"] / 1024:.0f} KB')
+        if not self.dry_run:
+            line += (f' — {wall:.1f}s ({s["api_seconds"]:.1f}s in API), {rate:,.0f} rows/s, '
+                     f'{s["rate_limited"]} rate-limited, final batch {self.budget // 1024} KB')
+        if s['failed']:
+            line += f', {s["failed"]} failed'
+        print(line)
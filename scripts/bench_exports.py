@@ -0,0 +1,993 @@
+#!/usr/bin/env python3
+"""
+Reproducible benchmark for the site exporters against a local database.
+
+Production exports talk to Supabase over the Management API, so their
+timings include network latency and whatever else the project is doing at
+the time. This benchmark loads schema.sql into a local Postgres, fills it
+with a deterministic synthetic 50-state dataset, and times the exporters
+end to end against it:
+
+    export_site_data, export_district_data, export_candidate_data,
+    export_statewide_pages
+
+Each exporter runs unmodified in its own subprocess. httpx.post is answered
+from the local database with the same JSON rows the Management API returns,
+output goes to a scratch directory, and the numbers come from the
+exporter's own --profile report (profiling.py). One line per run (wall
+time, query count, rows, bytes written, peak RSS for each exporter) is
+appended to the results file, tagged with the git commit, and compared
+with the previous run on the same fixture.
+
+Synthetic dataset (same --seed/--scale/--years → identical rows):
+  - 50 states with their real chamber layout (NE unicameral, Assembly and
+    House of Delegates names, multi-member lower houses), chamber sizes
+    multiplied by --scale
+  - three district maps (2002/2012/2022 cycles) plus a Statewide district
+    with Governor, Lt. Governor (joint tickets linked), AG and SoS seats
+  - --years of even-year cycles up to 2024 with D/R primaries (top-two in
+    CA/WA), generals, incumbents who run again, retirements, specials,
+    party switches and seat_terms; 2026 primaries decided and generals
+    filed with forecasts
+  - chamber_control, trifectas, supermajority_thresholds,
+    state_redistricting and ballot_measures to match
+
+Needs psycopg2 (pip install psycopg2-binary) and a Postgres database whose
+public schema may be dropped — --generate refuses Supabase hosts.
+
+Usage:
+    python3 scripts/bench_exports.py --generate                  # build fixture, then run
+    python3 scripts/bench_exports.py                             # rerun on the existing fixture
+    python3 scripts/bench_exports.py --generate --scale 0.25 --years 10 --seed 7
+    python3 scripts/bench_exports.py --only export_district_data --repeat 3
+    python3 scripts/bench_exports.py --cprofile                  # keep .prof files per stage
+    python3 scripts/bench_exports.py --history                   # list recorded runs
+"""
+
+import io
+import os
+import sys
+import csv
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import importlib
+import subprocess
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.join(SCRIPTS_DIR, '..')
+SCHEMA_PATH = os.path.join(REPO_DIR, 'schema.sql')
+
+DEFAULT_DSN = os.environ.get('BENCH_DSN', 'postgresql://localhost/elections_bench')
+BENCH_DIR = '/tmp/bench'
+RESULTS_PATH = os.path.join(BENCH_DIR, 'results.jsonl')
+
+EXPORTERS = (
+    'export_site_data',
+    'export_district_data',
+    'export_candidate_data',
+    'export_statewide_pages',
+)
+
+UPCOMING_YEAR = 2026   # primaries decided, generals filed but not held
+LAST_RESULTS_YEAR = 2024
+
+# ═══════════════════════════════════════════════════════════════════════
+# Synthetic dataset
+# ═══════════════════════════════════════════════════════════════════════
+
+# abbr, name, senate seats, lower seats, lower chamber, senate term, lower term
+STATES = [
+    ('AL', 'Alabama', 35, 105, 'House', 4, 4),
+    ('AK', 'Alaska', 20, 40, 'House', 4, 2),
+    ('AZ', 'Arizona', 30, 60, 'House', 2, 2),
+    ('AR', 'Arkansas', 35, 100, 'House', 4, 2),
+    ('CA', 'California', 40, 80, 'Assembly', 4, 2),
+    ('CO', 'Colorado', 35, 65, 'House', 4, 2),
+    ('CT', 'Connecticut', 36, 151, 'House', 2, 2),
+    ('DE', 'Delaware', 21, 41, 'House', 4, 2),
+    ('FL', 'Florida', 40, 120, 'House', 4, 2),
+    ('GA', 'Georgia', 56, 180, 'House', 2, 2),
+    ('HI', 'Hawaii', 25, 51, 'House', 4, 2),
+    ('ID', 'Idaho', 35, 70, 'House', 2, 2),
+    ('IL', 'Illinois', 59, 118, 'House', 4, 2),
+    ('IN', 'Indiana', 50, 100, 'House', 4, 2),
+    ('IA', 'Iowa', 50, 100, 'House', 4, 2),
+    ('KS', 'Kansas', 40, 125, 'House', 4, 2),
+    ('KY', 'Kentucky', 38, 100, 'House', 4, 2),
+    ('LA', 'Louisiana', 39, 105, 'House', 4, 4),
+    ('ME', 'Maine', 35, 151, 'House', 2, 2),
+    ('MD', 'Maryland', 47, 141, 'House of Delegates', 4, 4),
+    ('MA', 'Massachusetts', 40, 160, 'House', 2, 2),
+    ('MI', 'Michigan', 38, 110, 'House', 4, 2),
+    ('MN', 'Minnesota', 67, 134, 'House', 4, 2),
+    ('MS', 'Mississippi', 52, 122, 'House', 4, 4),
+    ('MO', 'Missouri', 34, 163, 'House', 4, 2),
+    ('MT', 'Montana', 50, 100, 'House', 4, 2),
+    ('NE', 'Nebraska', 49, 0, None, 4, None),
+    ('NV', 'Nevada', 21, 42, 'Assembly', 4, 2),
+    ('NH', 'New Hampshire', 24, 400, 'House', 2, 2),
+    ('NJ', 'New Jersey', 40, 80, 'Assembly', 4, 2),
+    ('NM', 'New Mexico', 42, 70, 'House', 4, 2),
+    ('NY', 'New York', 63, 150, 'Assembly', 2, 2),
+    ('NC', 'North Carolina', 50, 120, 'House', 2, 2),
+    ('ND', 'North Dakota', 47, 94, 'House', 4, 4),
+    ('OH', 'Ohio', 33, 99, 'House', 4, 2),
+    ('OK', 'Oklahoma', 48, 101, 'House', 4, 2),
+    ('OR', 'Oregon', 30, 60, 'House', 4, 2),
+    ('PA', 'Pennsylvania', 50, 203, 'House', 4, 2),
+    ('RI', 'Rhode Island', 38, 75, 'House', 2, 2),
+    ('SC', 'South Carolina', 46, 124, 'House', 4, 2),
+    ('SD', 'South Dakota', 35, 70, 'House', 2, 2),
+    ('TN', 'Tennessee', 33, 99, 'House', 4, 2),
+    ('TX', 'Texas', 31, 150, 'House', 4, 2),
+    ('UT', 'Utah', 29, 75, 'House', 4, 2),
+    ('VT', 'Vermont', 30, 150, 'House', 2, 2),
+    ('VA', 'Virginia', 40, 100, 'House of Delegates', 4, 2),
+    ('WA', 'Washington', 49, 98, 'House', 4, 2),
+    ('WV', 'West Virginia', 34, 100, 'House of Delegates', 4, 2),
+    ('WI', 'Wisconsin', 33, 99, 'Assembly', 4, 2),
+    ('WY', 'Wyoming', 31, 62, 'House', 4, 2),
+]
+MULTIMEMBER_LOWER = {'AZ': 2, 'ID': 2, 'NJ': 2, 'ND': 2, 'SD': 2, 'WA': 2}
+TOP_TWO = {'CA', 'WA'}
+HAS_RUNOFFS = {'AL', 'AR', 'GA', 'MS', 'OK', 'SC', 'TX'}
+GOV_MIDTERM_OFFSET = {   # governors elected in presidential (or odd, folded in) years
+    'DE', 'IN', 'KY', 'LA', 'MO', 'MS', 'MT', 'NC', 'ND', 'NJ', 'UT', 'VA', 'WA', 'WV',
+}
+TWO_YEAR_GOVERNOR = {'NH', 'VT'}
+NO_LT_GOV = {'AZ', 'ME', 'NH', 'OR', 'WY'}
+JOINT_TICKET_LT_GOV = {
+    'AK', 'CO', 'CT', 'FL', 'HI', 'IL', 'IA', 'KS', 'MD', 'MA', 'MI', 'MN',
+    'NJ', 'NM', 'NY', 'ND', 'OH', 'PA', 'SC', 'SD', 'UT', 'WI',
+}
+APPOINTED_OFFICES = {
+    'Attorney General': {'AK', 'HI', 'ME', 'NH', 'NJ', 'TN', 'WY'},
+    'Secretary of State': {'DE', 'FL', 'MD', 'ME', 'NH', 'NJ', 'NY', 'OK', 'PA', 'TN', 'TX', 'VA'},
+}
+NO_SOS = {'AK', 'HI', 'UT'}
+
+# (redistricting_cycle, first election year, last election year)
+MAPS = (('2002', 2002, 2010), ('2012', 2012, 2020), ('2022', 2022, UPCOMING_YEAR))
+
+FIRST_NAMES = (
+    'James Mary Robert Patricia John Jennifer Michael Linda David Elizabeth William '
+    'Barbara Richard Susan Joseph Jessica Thomas Sarah Charles Karen Daniel Lisa '
+    'Matthew Nancy Anthony Betty Mark Sandra Donald Ashley Steven Kimberly Paul '
+    'Emily Andrew Donna Joshua Michelle Kenneth Carol Kevin Amanda Brian Melissa '
+    'George Deborah Timothy Stephanie Ronald Rebecca Jason Laura Edward Helen '
+    'Jeffrey Sharon Ryan Cynthia Jacob Kathleen Gary Amy Nicholas Angela Eric '
+    'Shirley Jonathan Brenda Stephen Emma Larry Anna Justin Pamela Scott Nicole'
+).split()
+FEMALE_FIRST = set(FIRST_NAMES[1::2])
+LAST_NAMES = (
+    'Smith Johnson Williams Brown Jones Garcia Miller Davis Rodriguez Martinez '
+    'Hernandez Lopez Gonzalez Wilson Anderson Thomas Taylor Moore Jackson Martin '
+    'Lee Perez Thompson White Harris Sanchez Clark Ramirez Lewis Robinson Walker '
+    'Young Allen King Wright Scott Torres Nguyen Hill Flores Green Adams Nelson '
+    'Baker Hall Rivera Campbell Mitchell Carter Roberts Gomez Phillips Evans '
+    'Turner Diaz Parker Cruz Edwards Collins Reyes Stewart Morris Morales Murphy '
+    'Cook Rogers Gutierrez Ortiz Morgan Cooper Peterson Bailey Reed Kelly Howard '
+    'Ramos Kim Cox Ward Richardson Watson Brooks Chavez Wood James Bennett Gray '
+    'Mendoza Ruiz Hughes Price Alvarez Castillo Sanders Patel Myers Long Ross Foster'
+).split()
+TOWNS = ('Springfield Franklin Greenville Bristol Clinton Fairview Salem Madison '
+         'Georgetown Arlington Ashland Dover Oxford Jackson Milton Newport Riverside '
+         'Centerville Lebanon Kingston Auburn Dayton Lexington Marion Oakland').split()
+MEASURE_TYPES = ('Initiated Constitutional Amendment', 'Initiated State Statute',
+                 'Legislative Constitutional Amendment', 'Legislative Referendum',
+                 'Bond Measure', 'Tax Measure')
+MEASURE_SUBJECTS = ('Abortion', 'Minimum Wage', 'Elections', 'Taxes', 'Marijuana',
+                    'Education', 'Housing', 'Criminal Justice', 'Redistricting', 'Energy')
+FORECAST_SOURCES = ('Cook Political Report', "Sabato's Crystal Ball")
+
+# Column order for COPY; every table has a SERIAL id that the generator assigns
+TABLES = {
+    'states': ('id', 'state_name', 'abbreviation', 'senate_seats', 'house_seats',
+               'senate_term_years', 'house_term_years', 'uses_jungle_primary',
+               'has_runoffs', 'has_multimember_districts', 'gov_term_years',
+               'gov_term_limit', 'next_gov_election_year'),
+    'districts': ('id', 'state_id', 'office_level', 'chamber', 'district_number',
+                  'district_name', 'num_seats', 'is_floterial', 'pres_2024_margin',
+                  'pres_2024_winner', 'partisan_lean', 'redistricting_cycle'),
+    'seats': ('id', 'district_id', 'office_level', 'office_type', 'seat_label',
+              'seat_designator', 'term_length_years', 'election_class',
+              'next_regular_election_year', 'current_holder', 'current_holder_party',
+              'current_holder_caucus', 'selection_method'),
+    'candidates': ('id', 'full_name', 'first_name', 'last_name', 'gender', 'hometown'),
+    'elections': ('id', 'seat_id', 'election_date', 'election_year', 'election_type',
+                  'related_election_id', 'filing_deadline', 'forecast_rating',
+                  'forecast_source', 'result_status', 'total_votes_cast',
+                  'is_open_seat', 'linked_election_id'),
+    'candidacies': ('id', 'election_id', 'candidate_id', 'party', 'caucus',
+                    'candidate_status', 'is_incumbent', 'is_major', 'is_write_in',
+                    'votes_received', 'vote_percentage', 'result',
+                    'running_mate_candidacy_id'),
+    'seat_terms': ('id', 'seat_id', 'candidate_id', 'party', 'start_date', 'end_date',
+                   'start_reason', 'end_reason', 'caucus', 'election_id'),
+    'party_switches': ('id', 'candidate_id', 'seat_id', 'state_id', 'chamber',
+                       'old_party', 'new_party', 'old_caucus', 'new_caucus',
+                       'switch_date', 'switch_year', 'is_current'),
+    'ballot_measures': ('id', 'state_id', 'election_date', 'election_year', 'measure_type',
+                        'measure_number', 'short_title', 'subject_category', 'sponsor_type',
+                        'status', 'votes_yes', 'votes_no', 'yes_percentage', 'result',
+                        'passage_threshold'),
+    'forecasts': ('id', 'election_id', 'source', 'rating', 'date_of_forecast',
+                  'previous_rating'),
+    'chamber_control': ('id', 'state_id', 'chamber', 'effective_date', 'control_status',
+                        'd_seats', 'r_seats', 'other_seats', 'vacant_seats',
+                        'total_seats', 'majority_threshold'),
+    'supermajority_thresholds': ('id', 'state_id', 'chamber', 'veto_override',
+                                 'budget_passage', 'taxes', 'const_amend', 'quorum'),
+    'trifectas': ('id', 'state_id', 'year', 'governor_party', 'legislature_status',
+                  'trifecta_status'),
+    'state_redistricting': ('id', 'state_id', 'chamber', 'effective_year',
+                            'effective_date', 'census_year', 'is_mid_decade'),
+}
+PARTY_NAMES = {'D': 'Democrat', 'R': 'Republican'}
+
+
+def general_day(year):
+    """Tuesday after the first Monday in November."""
+    d = date(year, 11, 2)
+    return d + timedelta(days=(1 - d.weekday()) % 7)
+
+
+def first_tuesday(year, month):
+    d = date(year, month, 1)
+    return d + timedelta(days=(1 - d.weekday()) % 7)
+
+
+def rating_for(margin):
+    """Forecast rating for an expected D-minus-R margin in points."""
+    side = 'D' if margin > 0 else 'R'
+    m = abs(margin)
+    if m < 3:
+        return 'Toss-up'
+    if m < 7:
+        return f'Lean {side}'
+    if m < 12:
+        return f'Likely {side}'
+    return f'Safe {side}'
+
+
+class _Seat:
+    """Simulation state for one seat; its row is written when generation ends."""
+    __slots__ = ('id', 'district_id', 'state', 'state_id', 'chamber', 'office_level',
+                 'office_type', 'label', 'designator', 'term', 'cls', 'lean', 'cycle',
+                 'selection', 'holder', 'party', 'term_start', 'term_reason',
+                 'term_election')
+
+    def __init__(self, **kw):
+        for k in self.__slots__:
+            setattr(self, k, kw.get(k))
+
+    def up(self, year):
+        if self.term == 2:
+            return True
+        if self.office_type == 'Governor' and self.state in TWO_YEAR_GOVERNOR:
+            return True
+        return (year // 2 + self.cls) % 2 == 0
+
+
+class Fixture:
+    """Deterministic synthetic dataset; rows are tuples in TABLES column order."""
+
+    def __init__(self, scale=1.0, years=20, seed=2026):
+        self.scale = scale
+        self.years = years
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.rows = {t: [] for t in TABLES}
+        self._next = {t: 0 for t in TABLES}
+        self.names = {}
+        self.cycles = list(range(LAST_RESULTS_YEAR - years + 2, LAST_RESULTS_YEAR + 1, 2))
+        self.cycles.append(UPCOMING_YEAR)
+
+    def new_id(self, table):
+        self._next[table] += 1
+        return self._next[table]
+
+    def add(self, table, **values):
+        if 'id' not in values:
+            values['id'] = self.new_id(table)
+        self.rows[table].append(tuple(values.get(c) for c in TABLES[table]))
+        return values['id']
+
+    # ── people and terms ──────────────────────────────────────────────
+
+    def person(self, state):
+        rng = self.rng
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        full = f'{first} {chr(65 + rng.randrange(26))}. {last}' if rng.random() < 0.3 else f'{first} {last}'
+        cid = self.add('candidates', full_name=full, first_name=first, last_name=last,
+                       gender='F' if first in FEMALE_FIRST else 'M',
+                       hometown=f'{rng.choice(TOWNS)}, {state}')
+        self.names[cid] = full
+        return cid
+
+    def caucus(self, seat, party):
+        return party if seat.state == 'NE' else None
+
+    def start_term(self, seat, cand, party, start, reason, election_id=None):
+        seat.holder, seat.party = cand, party
+        seat.term_start, seat.term_reason, seat.term_election = start, reason, election_id
+
+    def end_term(self, seat, end, reason):
+        if seat.holder is not None and seat.term_start is not None:
+            self.add('seat_terms', seat_id=seat.id, candidate_id=seat.holder, party=seat.party,
+                     start_date=seat.term_start, end_date=end, start_reason=seat.term_reason,
+                     end_reason=reason, caucus=self.caucus(seat, seat.party),
+                     election_id=seat.term_election)
+        seat.holder = seat.party = seat.term_start = None
+
+    # ── structure ─────────────────────────────────────────────────────
+
+    def build(self):
+        self.seats = []
+        self.era_seats = {}     # (state, cycle) -> [legislative _Seat]
+        self.statewide = {}     # state -> {office_type: _Seat}
+        for i, (st, name, senate, lower, lower_chamber, s_term, l_term) in enumerate(STATES):
+            self.build_state(i, st, name, senate, lower, lower_chamber, s_term, l_term)
+        self.simulate()
+        self.write_seats()
+        return self
+
+    def build_state(self, idx, st, name, senate, lower, lower_chamber, s_term, l_term):
+        rng = self.rng
+        n_senate = max(1, round(senate * self.scale))
+        per = MULTIMEMBER_LOWER.get(st, 1)
+        n_lower = max(1, round(lower / per * self.scale)) if lower else 0
+        gov_cycle = 0 if st in GOV_MIDTERM_OFFSET else 1
+        state_id = self.add(
+            'states', state_name=name, abbreviation=st, senate_seats=n_senate,
+            house_seats=n_lower * per or None, senate_term_years=s_term,
+            house_term_years=l_term, uses_jungle_primary=st in TOP_TWO | {'LA'},
+            has_runoffs=st in HAS_RUNOFFS, has_multimember_districts=st in MULTIMEMBER_LOWER,
+            gov_term_years=2 if st in TWO_YEAR_GOVERNOR else 4, gov_term_limit='2 terms',
+            next_gov_election_year=UPCOMING_YEAR + (2 if gov_cycle == 0 else 0))
+        lean = rng.gauss(0, 12)
+
+        chambers = [('Legislature', 'State Legislature', 'LD', n_senate, 1, s_term)] if st == 'NE' else [
+            ('Senate', 'State Senate', 'SD', n_senate, 1, s_term),
+            (lower_chamber, 'State House', 'AD' if lower_chamber == 'Assembly' else 'HD',
+             n_lower, per, l_term)]
+        for cycle, _first, _last in MAPS:
+            seats = self.era_seats[(st, cycle)] = []
+            for chamber, office_type, prefix, n, per_district, term in chambers:
+                for num in range(1, n + 1):
+                    d_lean = lean + rng.gauss(0, 18)
+                    current = cycle == MAPS[-1][0]
+                    district_id = self.add(
+                        'districts', state_id=state_id, office_level='Legislative',
+                        chamber=chamber, district_number=str(num),
+                        district_name=f'{prefix}-{num}', num_seats=per_district,
+                        is_floterial=False, redistricting_cycle=cycle,
+                        pres_2024_margin=f'{-d_lean:+.1f}' if current else None,
+                        pres_2024_winner=('D' if d_lean > 0 else 'R') if current else None,
+                        partisan_lean=(f'{"D" if d_lean > 0 else "R"}+{abs(round(d_lean))}'
+                                       if current else None))
+                    for k in range(per_district):
+                        seat = _Seat(
+                            id=self.new_id('seats'), district_id=district_id, state=st,
+                            state_id=state_id, chamber=chamber, office_level='Legislative',
+                            office_type=office_type, term=term, cls=num % 2 if term == 4 and office_type != 'State House' else 0,
+                            label=f'{st} {chamber} {num}{chr(65 + k) if per_district > 1 else ""}',
+                            designator=chr(65 + k) if per_district > 1 else None,
+                            lean=d_lean, cycle=cycle, selection='Elected')
+                        seats.append(seat)
+                        self.seats.append(seat)
+
+        district_id = self.add('districts', state_id=state_id, office_level='Statewide',
+                               chamber='Statewide', district_number='Statewide',
+                               district_name='Statewide', num_seats=1, is_floterial=False,
+                               redistricting_cycle='permanent')
+        offices = self.statewide[st] = {}
+        for office in ('Governor', 'Lt. Governor', 'Attorney General', 'Secretary of State'):
+            if office == 'Lt. Governor' and st in NO_LT_GOV or office == 'Secretary of State' and st in NO_SOS:
+                continue
+            selection = 'Appointed' if st in APPOINTED_OFFICES.get(office, ()) else (
+                'Joint_Ticket' if office == 'Lt. Governor' and st in JOINT_TICKET_LT_GOV else 'Elected')
+            seat = offices[office] = _Seat(
+                id=self.new_id('seats'), district_id=district_id, state=st, state_id=state_id,
+                chamber='Statewide', office_level='Statewide', office_type=office, term=4,
+                cls=gov_cycle, label=f'{st} {office}', lean=lean + rng.gauss(0, 4),
+                cycle='permanent', selection=selection)
+            self.seats.append(seat)
+
+        for chamber, *_ in chambers:
+            self.add('supermajority_thresholds', state_id=state_id, chamber=chamber,
+                     veto_override=rng.choice(('2/3 Elected (66.67%)', '3/5 Elected (60%)',
+                                               'Majority Elected (50%)')),
+                     budget_passage='Majority Present', taxes='Majority Present',
+                     const_amend='3/5 Elected (60%)', quorum='Majority Elected')
+            for cycle, first, _last in MAPS[1:]:
+                self.add('state_redistricting', state_id=state_id, chamber=chamber,
+                         effective_year=first, effective_date=date(first - 1, 12, 31),
+                         census_year=first - 2, is_mid_decade=False)
+
+    # ── elections ─────────────────────────────────────────────────────
+
+    def simulate(self):
+        rng = self.rng
+        first = self.cycles[0]
+        start = date(first - 1, 1, 10)
+        for seat in self.seats:
+            if seat.cycle in (self.era_for(first), 'permanent'):
+                party = 'D' if seat.lean + rng.gauss(0, 6) > 0 else 'R'
+                self.start_term(seat, self.person(seat.state), party, start,
+                                'appointed' if seat.selection == 'Appointed' else 'elected')
+
+        era = self.era_for(first)
+        for year in self.cycles:
+            prev_era, era = era, self.era_for(year)
+            for st, *_ in STATES:
+                seats = self.era_seats[(st, era)]
+                if era != prev_era:
+                    self.redistrict(st, year, prev_era, era)
+                for seat in seats:
+                    if seat.up(year):
+                        self.contest(seat, year)
+                self.statewide_contests(st, year)
+                if year <= LAST_RESULTS_YEAR:
+                    self.between_cycles(st, year, seats)
+            if year <= LAST_RESULTS_YEAR:
+                self.measures(year)
+        self.measures(UPCOMING_YEAR)
+
+    def era_for(self, year):
+        for cycle, first, last in MAPS:
+            if first <= year <= last:
+                return cycle
+        return MAPS[0][0]
+
+    def redistrict(self, st, year, prev_era, era):
+        """New map: old seats' terms end, incumbents carry over to the same-numbered seat."""
+        for old, new in zip(self.era_seats[(st, prev_era)], self.era_seats[(st, era)]):
+            holder, party = old.holder, old.party
+            self.end_term(old, date(year + 1, 1, 9), 'redistricted')
+            if holder is None:
+                continue
+            if new.up(year):
+                new.holder, new.party = holder, party  # incumbent on the ballot, no term yet
+            else:
+                self.start_term(new, holder, party, date(year + 1, 1, 10), 'redistricted')
+
+    def primary_date(self, st, year):
+        return first_tuesday(year, 3 + [s[0] for s in STATES].index(st) % 6)
+
+    def contest(self, seat, year):
+        """Primaries and general for one seat; the incumbent runs again 80% of the time."""
+        gen_id = self.new_id('elections')
+        incumbent = seat.holder if seat.holder and self.rng.random() < 0.8 else None
+        nominees = self.primaries(seat, year, self.primary_date(seat.state, year), gen_id, incumbent)
+        self.general(seat, year, gen_id, nominees, incumbent, incumbent is None)
+
+    def primaries(self, seat, year, p_date, gen_id, incumbent):
+        rng = self.rng
+        strong = 'D' if seat.lean > 0 else 'R'
+        fields = {}
+        for party in ('D', 'R'):
+            field = []
+            if incumbent and seat.party == party:
+                field.append(incumbent)
+                n = rng.choice((0, 0, 0, 1))
+            elif party == strong or abs(seat.lean) < 15:
+                n = rng.choice((1, 1, 2, 3)) if incumbent is None else rng.choice((1, 1, 2))
+            else:
+                n = rng.choice((0, 1, 1))
+            field += [self.person(seat.state) for _ in range(n)]
+            if field:
+                fields[party] = field
+
+        if seat.state in TOP_TWO:
+            field = [(c, p) for p, cs in fields.items() for c in cs]
+            if not field:
+                return []
+            eid = self.add_election(seat, year, 'Primary', p_date, related=gen_id)
+            ranked = self.tally(eid, field, incumbent, 0.25, seat, advance=2)
+            return ranked[:2]
+
+        nominees = []
+        for party, field in fields.items():
+            eid = self.add_election(seat, year, f'Primary_{party}', p_date, related=gen_id)
+            ranked = self.tally(eid, [(c, party) for c in field], incumbent, 0.2, seat)
+            nominees.append(ranked[0])
+        return nominees
+
+    def tally(self, election_id, field, incumbent, turnout, seat, advance=1):
+        """Add candidacies with random vote shares; returns [(candidate, party)] by votes."""
+        rng = self.rng
+        weights = [rng.uniform(0.5, 1.5) * (3 if c == incumbent else 1) for c, _ in field]
+        total = round(self.turnout(seat) * turnout)
+        votes = [round(total * w / sum(weights)) for w in weights]
+        order = sorted(range(len(field)), key=lambda i: -votes[i])
+        uncontested = len(field) == 1
+        for rank, i in enumerate(order):
+            cand, party = field[i]
+            self.add('candidacies', election_id=election_id, candidate_id=cand, party=party,
+                     caucus=self.caucus(seat, party), is_incumbent=cand == incumbent,
+                     is_major=party in PARTY_NAMES, is_write_in=False,
+                     votes_received=None if uncontested else votes[i],
+                     vote_percentage=None if uncontested else round(votes[i] * 100 / total, 2),
+                     result=('Advanced' if advance > 1 else 'Won') if rank < advance else 'Lost')
+        self.set_total(election_id, None if uncontested else sum(votes))
+        return [field[i] for i in order]
+
+    def turnout(self, seat):
+        base = {'State House': 22000, 'State Senate': 60000, 'State Legislature': 38000}
+        return int(base.get(seat.office_type, 1500000) * self.rng.uniform(0.6, 1.4))
+
+    def add_election(self, seat, year, etype, edate, related=None, eid=None, **extra):
+        upcoming = year == UPCOMING_YEAR and edate > date(year, 9, 1)
+        values = dict(seat_id=seat.id, election_date=edate, election_year=year,
+                      election_type=etype, related_election_id=related,
+                      result_status=None if upcoming else 'Certified', **extra)
+        if upcoming:
+            values['filing_deadline'] = self.primary_date(seat.state, year) - timedelta(days=75)
+        if eid is not None:
+            values['id'] = eid
+        eid = self.add('elections', **values)
+        self._last_election = len(self.rows['elections']) - 1
+        return eid
+
+    def set_total(self, election_id, total):
+        rows = self.rows['elections']
+        i = TABLES['elections'].index('total_votes_cast')
+        row = rows[self._last_election]
+        assert row[0] == election_id
+        rows[self._last_election] = row[:i] + (total,) + row[i + 1:]
+
+    def general(self, seat, year, gen_id, nominees, incumbent, is_open,
+                running_mates=None, cy_ids=None, linked=None, outcome=None):
+        rng = self.rng
+        g_date = general_day(year)
+        if outcome is None and nominees and rng.random() < 0.1:
+            nominees = nominees + [(self.person(seat.state), rng.choice(('L', 'G', 'I')))]
+        cy_ids = cy_ids or {}
+        running_mates = running_mates or {}
+
+        if year == UPCOMING_YEAR:
+            rating = rating_for(seat.lean) if seat.office_type == 'Governor' or abs(seat.lean) < 12 else None
+            self.add_election(seat, year, 'General', g_date, eid=gen_id, is_open_seat=is_open,
+                              forecast_rating=rating, linked_election_id=linked,
+                              forecast_source=FORECAST_SOURCES[0] if rating else None)
+            for cand, party in nominees:
+                self.add('candidacies', id=cy_ids.get(party) or self.new_id('candidacies'),
+                         election_id=gen_id, candidate_id=cand, party=party,
+                         caucus=self.caucus(seat, party), candidate_status='Filed',
+                         is_incumbent=cand == incumbent, is_major=party in PARTY_NAMES,
+                         is_write_in=False, running_mate_candidacy_id=running_mates.get(party))
+            if rating:
+                prev = None
+                for src in FORECAST_SOURCES:
+                    for when in (date(year, 3, 1), date(year, 9, 1)):
+                        r = rating_for(seat.lean + rng.gauss(0, 3))
+                        self.add('forecasts', election_id=gen_id, source=src, rating=r,
+                                 date_of_forecast=when, previous_rating=prev)
+                        prev = r
+            return None
+
+        self.add_election(seat, year, 'General', g_date, eid=gen_id, is_open_seat=is_open,
+                          linked_election_id=linked)
+        if not nominees:
+            return None
+        total = self.turnout(seat) * (1.3 if year % 4 == 0 else 1.0)
+        if outcome is None:
+            d_share = 0.5 + seat.lean / 200 + rng.gauss(0, 0.05)
+            shares = []
+            for cand, party in nominees:
+                share = {'D': d_share, 'R': 1 - d_share}.get(party, rng.uniform(0.01, 0.06))
+                if cand == incumbent:
+                    share += 0.04
+                shares.append(max(0.02, share) * rng.uniform(0.97, 1.03))
+            outcome = {party: s for (_, party), s in zip(nominees, shares)}
+        else:
+            shares = [outcome.get(party, 0.02) for _, party in nominees]
+        votes = [round(total * s / sum(shares)) for s in shares]
+        counted = sum(votes)
+        order = sorted(range(len(nominees)), key=lambda i: -votes[i])
+        uncontested = len(nominees) == 1
+        for rank, i in enumerate(order):
+            cand, party = nominees[i]
+            self.add('candidacies', id=cy_ids.get(party) or self.new_id('candidacies'),
+                     election_id=gen_id, candidate_id=cand, party=party,
+                     caucus=self.caucus(seat, party), is_incumbent=cand == incumbent,
+                     is_major=party in PARTY_NAMES, is_write_in=False,
+                     votes_received=None if uncontested else votes[i],
+                     vote_percentage=None if uncontested else round(votes[i] * 100 / counted, 2),
+                     result='Won' if rank == 0 else 'Lost',
+                     running_mate_candidacy_id=running_mates.get(party))
+        self.set_total(gen_id, None if uncontested else counted)
+
+        winner, w_party = nominees[order[0]]
+        if winner != seat.holder or seat.term_start is None:
+            self.end_term(seat, date(year + 1, 1, 9),
+                          'lost_election' if seat.holder == incumbent else 'term_expired')
+            self.start_term(seat, winner, w_party, date(year + 1, 1, 10), 'elected', gen_id)
+        return outcome
+
+    def statewide_contests(self, st, year):
+        offices = self.statewide[st]
+        gov = offices['Governor']
+        for office, seat in offices.items():
+            if seat.selection == 'Appointed':
+                if year <= LAST_RESULTS_YEAR and self.rng.random() < 0.15:
+                    self.end_term(seat, date(year + 1, 1, 9), 'resigned')
+                    self.start_term(seat, self.person(st), gov.party, date(year + 1, 1, 10), 'appointed')
+                continue
+            if office == 'Lt. Governor' and seat.selection == 'Joint_Ticket' or not seat.up(year):
+                continue
+            if office != 'Governor' or 'Lt. Governor' not in offices or \
+                    offices['Lt. Governor'].selection != 'Joint_Ticket':
+                self.contest(seat, year)
+                continue
+            # Joint ticket: separate primaries, one linked general pair
+            lt = offices['Lt. Governor']
+            gov_gen, lt_gen = self.new_id('elections'), self.new_id('elections')
+            p_date = self.primary_date(st, year)
+            gov_inc = gov.holder if self.rng.random() < 0.8 else None
+            lt_inc = lt.holder if gov_inc else None
+            gov_noms = self.primaries(gov, year, p_date, gov_gen, gov_inc)
+            lt_noms = self.primaries(lt, year, p_date, lt_gen, lt_inc)
+            parties = [p for _, p in gov_noms if p in {q for _, q in lt_noms}]
+            gov_noms = [n for n in gov_noms if n[1] in parties]
+            lt_noms = [n for n in lt_noms if n[1] in parties]
+            gov_cy = {p: self.new_id('candidacies') for p in parties}
+            lt_cy = {p: self.new_id('candidacies') for p in parties}
+            outcome = self.general(gov, year, gov_gen, gov_noms, gov_inc, gov_inc is None,
+                                   running_mates=lt_cy, cy_ids=gov_cy, linked=lt_gen)
+            self.general(lt, year, lt_gen, lt_noms, lt_inc, lt_inc is None,
+                         running_mates=gov_cy, cy_ids=lt_cy, linked=gov_gen, outcome=outcome)
+
+    def between_cycles(self, st, year, seats):
+        """Resignations (odd-year specials), party switches, chamber control, trifectas."""
+        rng = self.rng
+        for seat in seats:
+            if seat.holder is None:
+                continue
+            r = rng.random()
+            if r < 0.015:
+                self.end_term(seat, date(year + 1, 2, 1), 'resigned')
+                s_date = first_tuesday(year + 1, rng.randrange(3, 13))
+                eid = self.add_election(seat, year + 1, 'Special', s_date)
+                field = [(self.person(st), 'D'), (self.person(st), 'R')]
+                ranked = self.tally(eid, field, None, 0.6, seat)
+                self.start_term(seat, ranked[0][0], ranked[0][1], s_date + timedelta(days=14),
+                                'elected', eid)
+            elif r < 0.017:
+                old, new = seat.party, 'R' if seat.party == 'D' else 'D'
+                holder = seat.holder
+                when = date(year + 1, rng.randrange(1, 13), 15)
+                self.add('party_switches', candidate_id=holder, seat_id=seat.id,
+                         state_id=seat.state_id, chamber=seat.chamber, old_party=old,
+                         new_party=new, old_caucus=old, new_caucus=new, switch_date=when,
+                         switch_year=when.year, is_current=seat.cycle == MAPS[-1][0])
+                self.end_term(seat, when, 'party_switch')
+                self.start_term(seat, holder, new, when, 'party_switch')
+
+        state_id = seats[0].state_id
+        effective = date(year + 1, 1, 10)
+        control = {}
+        for chamber in dict.fromkeys(s.chamber for s in seats):
+            members = [s for s in seats if s.chamber == chamber]
+            d = sum(s.party == 'D' for s in members)
+            r = sum(s.party == 'R' for s in members)
+            vacant = sum(s.holder is None for s in members)
+            status = 'D' if d > r else 'R' if r > d else 'Tied'
+            control[chamber] = status
+            self.add('chamber_control', state_id=state_id, chamber=chamber,
+                     effective_date=effective, control_status=status, d_seats=d, r_seats=r,
+                     other_seats=len(members) - d - r - vacant, vacant_seats=vacant,
+                     total_seats=len(members), majority_threshold=len(members) // 2 + 1)
+        statuses = set(control.values())
+        legislature = PARTY_NAMES[statuses.pop()] if len(statuses) == 1 and 'Tied' not in statuses else 'Split'
+        governor = PARTY_NAMES.get(self.statewide[st]['Governor'].party, 'Independent')
+        trifecta = governor if governor == legislature else 'Split'
+        for y in (year + 1, year + 2):
+            self.add('trifectas', state_id=state_id, year=y, governor_party=governor,
+                     legislature_status=legislature, trifecta_status=trifecta)
+
+    def measures(self, year):
+        rng = self.rng
+        upcoming = year == UPCOMING_YEAR
+        for st_idx, (st, *_rest) in enumerate(STATES):
+            for n in range(rng.choice((0, 0, 1, 2, 3))):
+                yes = rng.randint(200000, 3000000)
+                no = rng.randint(200000, 3000000)
+                passed = yes > no
+                self.add('ballot_measures', state_id=st_idx + 1, election_date=general_day(year),
+                         election_year=year, measure_type=rng.choice(MEASURE_TYPES),
+                         measure_number=f'Question {n + 1}',
+                         short_title=f'{rng.choice(MEASURE_SUBJECTS)} Measure {n + 1}',
+                         subject_category=rng.choice(MEASURE_SUBJECTS),
+                         sponsor_type=rng.choice(('Citizen', 'Legislature')),
+                         status='On Ballot' if upcoming else ('Passed' if passed else 'Failed'),
+                         votes_yes=None if upcoming else yes, votes_no=None if upcoming else no,
+                         yes_percentage=None if upcoming else round(yes * 100 / (yes + no), 2),
+                         result='Pending' if upcoming else ('Passed' if passed else 'Failed'),
+                         passage_threshold='Simple majority')
+
+    def write_seats(self):
+        current = MAPS[-1][0]
+        for seat in self.seats:
+            live = seat.cycle in (current, 'permanent')
+            if not live:
+                self.end_term(seat, date(MAPS[-1][1] + 1, 1, 9), 'redistricted')
+            elif seat.term_start is not None:
+                self.add('seat_terms', seat_id=seat.id, candidate_id=seat.holder,
+                         party=seat.party, start_date=seat.term_start,
+                         start_reason=seat.term_reason, caucus=self.caucus(seat, seat.party),
+                         election_id=seat.term_election)
+            next_year = next((y for y in range(UPCOMING_YEAR, UPCOMING_YEAR + 5, 2) if seat.up(y)), None)
+            self.add('seats', id=seat.id, district_id=seat.district_id,
+                     office_level=seat.office_level, office_type=seat.office_type,
+                     seat_label=seat.label, seat_designator=seat.designator,
+                     term_length_years=seat.term,
+                     election_class=str(seat.cls + 1) if seat.term == 4 else None,
+                     next_regular_election_year=next_year if live and seat.selection != 'Appointed' else None,
+                     current_holder=self.names.get(seat.holder) if live else None,
+                     current_holder_party=seat.party if live else None,
+                     current_holder_caucus=self.caucus(seat, seat.party) if live else None,
+                     selection_method=seat.selection)
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Local database
+# ═══════════════════════════════════════════════════════════════════════
+
+def connect(dsn):
+    try:
+        import psycopg2
+    except ImportError:
+        sys.exit('bench_exports.py needs psycopg2: pip install psycopg2-binary')
+    conn = psycopg2.connect(dsn)
+    conn.autocommit = True
+    return conn
+
+
+def load_fixture(conn, fixture):
+    """Recreate the public schema from schema.sql and COPY the fixture in."""
+    cur = conn.cursor()
+    cur.execute('DROP SCHEMA IF EXISTS public CASCADE')
+    cur.execute('CREATE SCHEMA public')
+    with open(SCHEMA_PATH) as f:
+        cur.execute(f.read())
+    # seat_terms are generated with the seat rows already in their final state
+    cur.execute('ALTER TABLE seat_terms DISABLE TRIGGER trg_sync_seat_on_term_change')
+    order = ('states', 'districts', 'seats', 'candidates', 'elections', 'candidacies',
+             'seat_terms', 'party_switches', 'ballot_measures', 'forecasts',
+             'chamber_control', 'supermajority_thresholds', 'trifectas', 'state_redistricting')
+    for table in order:
+        buf = io.StringIO()
+        csv.writer(buf).writerows(fixture.rows[table])
+        buf.seek(0)
+        cur.copy_expert(f'COPY {table} ({", ".join(TABLES[table])}) FROM STDIN WITH (FORMAT csv)', buf)
+        cur.execute(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                    f"GREATEST((SELECT MAX(id) FROM {table}), 1))")
+    cur.execute('ALTER TABLE seat_terms ENABLE TRIGGER trg_sync_seat_on_term_change')
+    cur.execute('ANALYZE')
+    meta = {'scale': fixture.scale, 'years': fixture.years, 'seed': fixture.seed,
+            'rows': {t: len(r) for t, r in fixture.rows.items()},
+            'generated_at': datetime.now(timezone.utc).isoformat(timespec='seconds')}
+    cur.execute('COMMENT ON SCHEMA public IS %s', (json.dumps(meta),))
+
+
+def fixture_meta(conn):
+    cur = conn.cursor()
+    cur.execute("SELECT obj_description('public'::regnamespace)")
+    row = cur.fetchone()
+    try:
+        return json.loads(row[0])
+    except (TypeError, ValueError):
+        return None
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f'not JSON serializable: {type(value).__name__}')
+
+
+class LocalManagementAPI:
+    """Stands in for httpx.post to the Management API: runs json['query'] locally."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __call__(self, url, **kwargs):
+        import httpx
+        from psycopg2.extras import RealDictCursor
+        try:
+            with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(kwargs['json']['query'])
+                rows = cur.fetchall() if cur.description else []
+        except Exception as e:
+            return httpx.Response(400, json={'message': str(e)})
+        body = json.dumps(rows, default=_json_default).encode()
+        return httpx.Response(201, content=body, headers={'content-type': 'application/json'})
+
+
+def run_worker(args):
+    """Child process: run one exporter's main() against the local database."""
+    os.environ.setdefault('SUPABASE_MANAGEMENT_TOKEN', 'local-bench')
+    sys.path.insert(0, SCRIPTS_DIR)
+    import httpx
+    httpx.post = LocalManagementAPI(connect(args.dsn))
+    mod = importlib.import_module(args.worker)
+    mod.SITE_DATA_DIR = args.out
+    sys.argv = [f'{args.worker}.py', '--profile', args.report] + (['--cprofile'] if args.cprofile else [])
+    mod.main()
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Benchmark runs
+# ═══════════════════════════════════════════════════════════════════════
+
+def git_revision():
+    def git(*cmd):
+        return subprocess.run(['git', '-C', REPO_DIR, *cmd], capture_output=True,
+                              text=True).stdout.strip()
+    return git('rev-parse', '--short', 'HEAD') or 'unknown', bool(git('status', '--porcelain', '--untracked-files=no'))
+
+
+def run_exporter(name, args, stamp, attempt):
+    reports = os.path.join(BENCH_DIR, 'reports')
+    logs = os.path.join(BENCH_DIR, 'logs')
+    os.makedirs(reports, exist_ok=True)
+    os.makedirs(logs, exist_ok=True)
+    report = os.path.join(reports, f'{stamp}_{name}_{attempt}.json')
+    out_dir = tempfile.mkdtemp(prefix=f'bench_{name}_')
+    cmd = [sys.executable, os.path.abspath(__file__), '--worker', name, '--dsn', args.dsn,
+           '--out', out_dir, '--report', report] + (['--cprofile'] if args.cprofile else [])
+    log_path = os.path.join(logs, f'{name}.log')
+    t0 = time.perf_counter()
+    with open(log_path, 'w') as log:
+        proc = subprocess.run(cmd, stdout=log, stderr=subprocess.STDOUT)
+    process_s = time.perf_counter() - t0
+    shutil.rmtree(out_dir, ignore_errors=True)
+    if proc.returncode != 0 or not os.path.exists(report):
+        with open(log_path) as f:
+            tail = f.read()[-1500:]
+        print(f'  {name} FAILED (exit {proc.returncode}), log: {log_path}\n{tail}')
+        return {'error': f'exit {proc.returncode}', 'log': log_path}
+    with open(report) as f:
+        data = json.load(f)
+    counters = data['counters']
+    return {
+        'wall_s': data['wall_s'],
+        'process_s': round(process_s, 3),
+        'queries': counters.get('http_requests', 0),
+        'rows': counters.get('rows', 0),
+        'bytes_in': counters.get('bytes_in', 0),
+        'bytes_out': counters.get('bytes_out', 0),
+        'files_written': counters.get('files_written', 0),
+        'peak_rss_mb': data['peak_rss_mb'],
+        'totals': data['totals'],
+        'report': report,
+    }
+
+
+def best_of(runs):
+    ok = [r for r in runs if 'error' not in r]
+    if not ok:
+        return runs[-1]
+    best = dict(min(ok, key=lambda r: r['wall_s']))
+    best['runs'] = [r['wall_s'] for r in ok]
+    return best
+
+
+def load_results(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def same_fixture(a, b):
+    return all(a['fixture'].get(k) == b['fixture'].get(k) for k in ('scale', 'years', 'seed'))
+
+
+def print_run(run, previous=None):
+    fx = run['fixture']
+    print(f'\nBenchmark {run["commit"]}{"+dirty" if run["dirty"] else ""}  '
+          f'scale={fx["scale"]} years={fx["years"]} seed={fx["seed"]}'
+          + (f'  (vs {previous["commit"]} at {previous["timestamp"]})' if previous else ''))
+    print(f'  {"exporter":<24} {"wall s":>8} {"queries":>8} {"rows":>10} {"MB out":>8} {"peak MB":>8}'
+          + (f' {"prev s":>8} {"delta":>7}' if previous else ''))
+    for name, r in run['exporters'].items():
+        if 'error' in r:
+            print(f'  {name:<24} {r["error"]}')
+            continue
+        line = (f'  {name:<24} {r["wall_s"]:>8.2f} {r["queries"]:>8,} {r["rows"]:>10,} '
+                f'{r["bytes_out"] / 1e6:>8.1f} {r["peak_rss_mb"]:>8.0f}')
+        old = (previous or {}).get('exporters', {}).get(name)
+        if old and 'error' not in old:
+            delta = (r['wall_s'] - old['wall_s']) / old['wall_s'] * 100 if old['wall_s'] else 0
+            line += f' {old["wall_s"]:>8.2f} {delta:>+6.0f}%'
+        print(line)
+
+
+def print_history(results):
+    print(f'{"timestamp":<26} {"commit":<14} {"fixture":<22}' + ''.join(f' {n[7:]:>17}' for n in EXPORTERS))
+    for run in results:
+        fx = run['fixture']
+        cells = []
+        for name in EXPORTERS:
+            r = run['exporters'].get(name)
+            cells.append(f' {"-" if r is None else "error" if "error" in r else format(r["wall_s"], ".2f"):>17}')
+        print(f'{run["timestamp"]:<26} {run["commit"] + ("+" if run["dirty"] else ""):<14} '
+              f'{"s=%s y=%s seed=%s" % (fx["scale"], fx["years"], fx["seed"]):<22}' + ''.join(cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the site exporters against a local fixture database')
+    parser.add_argument('--dsn', default=DEFAULT_DSN, help=f'Local Postgres (default {DEFAULT_DSN}, or $BENCH_DSN)')
+    parser.add_argument('--generate', action='store_true', help='Drop and rebuild the fixture before running')
+    parser.add_argument('--scale', type=float, default=1.0, help='Chamber size multiplier (default 1.0)')
+    parser.add_argument('--years', type=int, default=20, help='Years of election history (default 20)')
+    parser.add_argument('--seed', type=int, default=2026, help='Random seed (default 2026)')
+    parser.add_argument('--only', action='append', choices=EXPORTERS, help='Run only these exporters (repeatable)')
+    parser.add_argument('--repeat', type=int, default=1, help='Runs per exporter; the fastest is recorded')
+    parser.add_argument('--cprofile', action='store_true', help='Pass --cprofile to the exporters')
+    parser.add_argument('--results', default=RESULTS_PATH, help=f'Results file (default {RESULTS_PATH})')
+    parser.add_argument('--history', action='store_true', help='Print recorded runs and exit')
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    parser.add_argument('--out', help=argparse.SUPPRESS)
+    parser.add_argument('--report', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args)
+        return
+    if args.history:
+        print_history(load_results(args.results))
+        return
+
+    conn = connect(args.dsn)
+    if args.generate:
+        if 'supabase' in args.dsn:
+            sys.exit('Refusing to drop the schema of a Supabase database')
+        t0 = time.perf_counter()
+        fixture = Fixture(args.scale, args.years, args.seed).build()
+        t1 = time.perf_counter()
+        load_fixture(conn, fixture)
+        print(f'Fixture: generated in {t1 - t0:.1f}s, loaded in {time.perf_counter() - t1:.1f}s')
+    meta = fixture_meta(conn)
+    conn.close()
+    if meta is None:
+        sys.exit('No benchmark fixture in this database — run with --generate first')
+    print('  ' + ', '.join(f'{t}={n:,}' for t, n in meta['rows'].items() if n))
+
+    commit, dirty = git_revision()
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    run = {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': commit,
+        'dirty': dirty,
+        'fixture': meta,
+        'exporters': {},
+    }
+    for name in args.only or EXPORTERS:
+        print(f'Running {name}...')
+        run['exporters'][name] = best_of([run_exporter(name, args, stamp, i)
+                                          for i in range(max(1, args.repeat))])
+
+    results = load_results(args.results)
+    previous = next((r for r in reversed(results) if same_fixture(r, run)), None)
+    os.makedirs(os.path.dirname(os.path.abspath(args.results)), exist_ok=True)
+    with open(args.results, 'a') as f:
+        f.write(json.dumps(run) + '\n')
+    print_run(run, previous)
+    print(f'\n  Results appended to {args.results}')
+
+
+if __name__ == '__main__':
+    main()
@@ -19,11 +19,65 @@ Usage:
         seat_id=1234,        # optional — improves matching
         party='R',            # optional — stored on candidacy, not candidate
     )
+
+    # Several states in one round trip
+    lookup.load_states(['AL', 'AK', 'AZ'])
+
+    # Report (never merge) existing candidates with a similar last name
+    lookup = CandidateLookup(run_sql, fuzzy=True)
+    for name, state, similar, cid in lookup.fuzzy_matches: ...
+
+find_match only ever matches the exact normalized last name (with a matching
+first name). With fuzzy=True, a name that finds no match is also checked
+against last names that share a phonetic code ("Smyth"/"Smith",
+"McDonald"/"MacDonald") or are within one typo (two for names of 8+ letters),
+via a per-state LastNameIndex. Those hits are only recorded in fuzzy_matches
+as suggestions for review: common surnames collide too often (Hill/Hall,
+Johnston/Johnson, Rose/Ross) for a similar name to be merged automatically.
+Once the new candidate is inserted, callers pass the pairs to
+save_suggestions(); dedup_candidates.py lists them for review (Tier 4) and
+merges the confirmed ones with --merge-suggested.
+
+Each state's normalized by-last-name index is kept in
+/tmp/candidate_lookup/{ST}.json with the highest candidacy and seat_term ids
+it has seen and a DB change watermark, so every script shares it. A load only
+pulls candidates linked to the state by candidacies/seat_terms added since
+(re-reading the last ID_OVERLAP ids, for rows that committed late);
+the watermark (candidate updates and deletes from the linking tables, via
+data_versions) forces a full reload when existing links may have changed. Pass
+use_cache=False to always load from scratch.
 """
 
+import io
+import os
 import re
+import csv
+import json
 import unicodedata
 
+from state_context import watermark_sql, require_data_versions, esc
+
+CACHE_DIR = '/tmp/candidate_lookup'
+# Similar-name pairs from fuzzy lookups, read by dedup_candidates.py
+SUGGESTIONS_FILE = os.path.join(CACHE_DIR, 'suggestions.csv')
+SUGGESTION_FIELDS = ('state', 'id1', 'name1', 'id2', 'name2')
+# Bump when normalize_name/split_name change, so cached indexes are rebuilt
+CACHE_VERSION = 1
+STATES_PER_QUERY = 10
+# Ids are handed out before commit, so a row can land below a max id that was
+# already read. Incremental loads re-read this many ids under the cached max;
+# rows seen before are dropped by id when merging.
+ID_OVERLAP = 1000
+
+# Full-reload watermark: changes when an existing candidate is edited or a
+# candidate, candidacy, seat term or the seat structure above them is
+# deleted — anything append-only deltas can't see. Inserts don't count: new
+# candidacies/seat_terms are picked up by id. Scoped per state (see _fetch).
+WATERMARK_VERSIONS = (
+    [(t, op) for t in ('candidates', 'candidacies', 'seat_terms', 'elections', 'seats', 'districts')
+     for op in ('DELETE', 'TRUNCATE')]
+    + [('candidates', 'UPDATE')])
+
 
 # ── Nickname mappings ──
 
@@ -163,6 +217,317 @@ def first_names_match(first1, first2):
     return False
 
 
+# ── Phonetic codes ──
+
+_VOWELS = frozenset('AEIOUY')
+
+
+def phonetic_codes(name):
+    """
+    (primary, alternate) phonetic codes for a surname.
+
+    A compact subset of Double Metaphone covering the rules that matter for
+    US candidate surnames: silent initial letters, MC/MAC, PH, TH, SCH, soft
+    C/G, silent GH, doubled letters, Germanic/Slavic alternates (CH → X/K,
+    SZ → S/X, J → J/H). Only an initial vowel is coded. "Smith"/"Smyth" and
+    "McDonald"/"MacDonald" share a code.
+    """
+    w = re.sub(r'[^A-Z]', '', strip_accents(name or '').upper())
+    if not w:
+        return ('', '')
+    n = len(w)
+    primary, alternate = [], []
+
+    def add(p, a=None):
+        primary.append(p)
+        alternate.append(p if a is None else a)
+
+    def at(k, *subs):
+        return k >= 0 and any(w.startswith(s, k) for s in subs)
+
+    def vowel(k):
+        return 0 <= k < n and w[k] in _VOWELS
+
+    i = 0
+    if at(0, 'GN', 'KN', 'PN', 'WR', 'PS'):
+        i = 1
+    elif w[0] == 'X':
+        add('S')
+        i = 1
+    elif at(0, 'WH'):
+        add('A')
+        i = 2
+
+    while i < n:
+        c = w[i]
+        nxt = w[i + 1] if i + 1 < n else ''
+        if c in _VOWELS:
+            if i == 0:
+                add('A')
+            i += 1
+        elif c == 'B':
+            add('P')
+            i += 2 if nxt == 'B' else 1
+        elif c == 'C':
+            if at(i, 'CIA'):
+                add('X')
+                i += 3
+            elif at(i, 'CH'):
+                if i == 0 and at(i, 'CHR', 'CHL'):
+                    add('K')
+                else:
+                    add('X', 'K')
+                i += 2
+            elif at(i, 'CZ'):
+                add('S', 'X')
+                i += 2
+            elif at(i, 'CC') and at(i + 2, 'I', 'E', 'Y'):
+                add('KS')
+                i += 3
+            elif nxt in ('I', 'E', 'Y'):
+                add('S')
+                i += 2
+            else:
+                add('K')
+                i += 2 if nxt in ('C', 'K', 'Q', 'G') else 1
+        elif c == 'D':
+            if at(i, 'DG') and at(i + 2, 'I', 'E', 'Y'):
+                add('J')
+                i += 3
+            else:
+                add('T')
+                i += 2 if nxt in ('T', 'D') else 1
+        elif c == 'F':
+            add('F')
+            i += 2 if nxt == 'F' else 1
+        elif c == 'G':
+            if nxt == 'H':
+                if i == 0 or not vowel(i - 1):
+                    add('K')
+                else:
+                    add('', 'F')          # Wright / Laughlin
+                i += 2
+            elif nxt == 'N':
+                add('N', 'KN')
+                i += 2
+            elif nxt in ('I', 'E', 'Y'):
+                add('K', 'J')
+                i += 1
+            else:
+                add('K')
+                i += 2 if nxt == 'G' else 1
+        elif c == 'H':
+            if (i == 0 or vowel(i - 1)) and vowel(i + 1):
+                add('H')
+            i += 1
+        elif c == 'J':
+            add('J', 'H')
+            i += 2 if nxt == 'J' else 1
+        elif c in 'KLMNR':
+            add(c)
+            i += 2 if nxt == c else 1
+            if c == 'M' and nxt == 'B' and i + 1 == n:
+                i += 1                    # Lamb
+        elif c == 'P':
+            if nxt == 'H':
+                add('F')
+                i += 2
+            else:
+                add('P')
+                i += 2 if nxt in ('P', 'B') else 1
+        elif c == 'Q':
+            add('K')
+            i += 2 if nxt == 'Q' else 1
+        elif c == 'S':
+            if at(i, 'SCH'):
+                add('SK', 'X')
+                i += 3
+            elif nxt == 'H':
+                add('X')
+                i += 2
+            elif at(i, 'SIO', 'SIA'):
+                add('S', 'X')
+                i += 3
+            elif at(i, 'SC') and at(i + 2, 'I', 'E', 'Y'):
+                add('S')
+                i += 3
+            elif nxt == 'Z':
+                add('S', 'X')
+                i += 2
+            else:
+                add('S')
+                i += 2 if nxt == 'S' else 1
+        elif c == 'T':
+            if at(i, 'TION', 'TIA', 'TCH'):
+                add('X')
+                i += 3
+            elif nxt == 'H':
+                add('0', 'T')
+                i += 2
+            else:
+                add('T')
+                i += 2 if nxt in ('T', 'D') else 1
+        elif c == 'V':
+            add('F')
+            i += 2 if nxt == 'V' else 1
+        elif c == 'W':
+            if i == 0 and vowel(1):
+                add('A', 'F')             # Walker / Volker
+            i += 1                        # otherwise silent
+        elif c == 'X':
+            add('KS')
+            i += 2 if nxt in ('X', 'C') else 1
+        elif c == 'Z':
+            add('J' if nxt == 'H' else 'S')
+            i += 2 if nxt in ('Z', 'H') else 1
+        else:
+            i += 1
+    return (''.join(primary), ''.join(alternate))
+
+
+# ── Edit distance ──
+
+def edit_distance(a, b, limit=None):
+    """Optimal-string-alignment distance (Levenshtein plus adjacent transpositions).
+
+    With limit, returns limit + 1 as soon as the distance must exceed it.
+    """
+    if a == b:
+        return 0
+    if limit is not None and abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev2 = None
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i] + [0] * len(b)
+        for j, cb in enumerate(b, 1):
+            cost = 0 if ca == cb else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if prev2 is not None and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        if limit is not None and min(cur) > limit:
+            return limit + 1
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+def max_edits(last):
+    """Typos tolerated in a last name: none under 4 letters, 1 up to 7, 2 beyond."""
+    if len(last) < 4:
+        return 0
+    return 1 if len(last) <= 7 else 2
+
+
+def _deletes(word, depth):
+    """word plus every string reachable by deleting up to depth characters."""
+    out = {word}
+    frontier = {word}
+    for _ in range(depth):
+        frontier = {w[:k] + w[k + 1:] for w in frontier for k in range(len(w))}
+        out |= frontier
+    return out
+
+
+class LastNameIndex:
+    """
+    Approximate lookup over one state's normalized last names.
+
+    Phonetic buckets (both phonetic_codes) plus a SymSpell-style deletion
+    index: every name is stored under each string reachable by deleting up
+    to max_edits(name) letters, so a query only generates its own deletes
+    and verifies the few names they hit — no scan of the state's names.
+    """
+
+    PHONETIC_MAX_DISTANCE = 3   # phonetic hits further apart than this are ignored
+
+    def __init__(self, last_names=()):
+        self.by_code = {}
+        self.by_delete = {}
+        self.names = set()
+        for last in last_names:
+            self.add(last)
+
+    def add(self, last):
+        if not last or last in self.names:
+            return
+        self.names.add(last)
+        for code in set(phonetic_codes(last)):
+            if code:
+                self.by_code.setdefault(code, set()).add(last)
+        for d in _deletes(last, max_edits(last)):
+            self.by_delete.setdefault(d, set()).add(last)
+
+    def similar(self, last):
+        """{other_last_name: distance} for names within max_edits(last) edits or sharing a code."""
+        out = {}
+        if len(last) < 4:
+            return out
+        limit = max_edits(last)
+        seen = set()
+        for d in _deletes(last, limit):
+            seen |= self.by_delete.get(d, set())
+        for other in seen:
+            dist = edit_distance(last, other, limit)
+            if 0 < dist <= limit:
+                out[other] = dist
+        for code in set(phonetic_codes(last)):
+            for other in self.by_code.get(code, ()):
+                if other != last and other not in out and len(other) >= 4:
+                    dist = edit_distance(last, other, self.PHONETIC_MAX_DISTANCE)
+                    if dist <= self.PHONETIC_MAX_DISTANCE:
+                        out[other] = dist
+        return out
+
+
+def _cache_path(state):
+    return os.path.join(CACHE_DIR, f'{state}.json')
+
+
+def _read_cache(state):
+    try:
+        with open(_cache_path(state)) as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return entry if entry.get('version') == CACHE_VERSION else None
+
+
+def _write_cache(state, fetched, by_last):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    entry = {
+        'version': CACHE_VERSION,
+        'watermark': fetched['watermark'],
+        'max_candidacy_id': fetched['max_candidacy_id'],
+        'max_term_id': fetched['max_term_id'],
+        'by_last': {last: [[e['id'], e['full_name'], e['first']] for e in entries]
+                    for last, entries in by_last.items()},
+    }
+    path = _cache_path(state)
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(entry, f, separators=(',', ':'))
+    os.replace(tmp, path)
+
+
+def save_suggestions(rows, path=SUGGESTIONS_FILE):
+    """
+    Append similar-name pairs for dedup_candidates.py. Each row is a dict
+    with SUGGESTION_FIELDS: id1/name1 the existing candidate, id2/name2 the
+    one just created. Rows go out in a single write so concurrent populate
+    runs don't interleave them.
+    """
+    if not rows:
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=SUGGESTION_FIELDS)
+    if not os.path.exists(path):
+        writer.writeheader()
+    writer.writerows(rows)
+    with open(path, 'a', newline='') as f:
+        f.write(buf.getvalue())
+
+
 class CandidateLookup:
     """
     Maintains a per-state cache of existing candidates for fuzzy matching.
@@ -173,42 +538,119 @@ class CandidateLookup:
         cid = lookup.find_or_create('Josh Hernandez', state='NM')
     """
 
-    def __init__(self, run_sql):
+    def __init__(self, run_sql, use_cache=True, fuzzy=False):
         """
         Args:
             run_sql: callable that takes a SQL string and returns list of dicts.
+            use_cache: share per-state indexes through CACHE_DIR (see module doc).
+            fuzzy: when find_match finds nothing, record existing candidates
+                whose last name sounds alike or is a typo or two away in
+                fuzzy_matches (suggestions only; find_match still returns None).
         """
         self.run_sql = run_sql
+        self.use_cache = use_cache
+        self.fuzzy = fuzzy
         # state_abbr → { normalized_last_name → [ {id, full_name, first, last} ] }
         self._cache = {}
         self._loaded_states = set()
+        # state_abbr → LastNameIndex, built on the first fuzzy lookup
+        self._name_index = {}
+        # (query full_name, state, similar full_name, candidate_id) for review
+        self.fuzzy_matches = []
 
     def load_state(self, state_abbr):
         """Load all candidates associated with a state into the cache."""
-        if state_abbr in self._loaded_states:
-            return
-        rows = self.run_sql(f"""
-            SELECT DISTINCT c.id, c.full_name, c.first_name, c.last_name
-            FROM candidates c
-            LEFT JOIN candidacies ca ON ca.candidate_id = c.id
-            LEFT JOIN elections e ON ca.election_id = e.id
-            LEFT JOIN seats s ON e.seat_id = s.id
-            LEFT JOIN districts d ON s.district_id = d.id
-            LEFT JOIN states st ON d.state_id = st.id
-            LEFT JOIN seat_terms stm ON stm.candidate_id = c.id
-            LEFT JOIN seats s2 ON stm.seat_id = s2.id
-            LEFT JOIN districts d2 ON s2.district_id = d2.id
-            LEFT JOIN states st2 ON d2.state_id = st2.id
-            WHERE st.abbreviation = '{state_abbr}' OR st2.abbreviation = '{state_abbr}'
+        self.load_states([state_abbr])
+
+    def load_states(self, states):
+        """Load several states, STATES_PER_QUERY per round trip."""
+        todo = [st for st in dict.fromkeys(states) if st not in self._loaded_states]
+        for i in range(0, len(todo), STATES_PER_QUERY):
+            group = todo[i:i + STATES_PER_QUERY]
+            disk = {st: _read_cache(st) for st in group} if self.use_cache else {}
+            for r in self._fetch(group, disk):
+                st = r['state']
+                rows = r['rows']
+                if isinstance(rows, str):
+                    rows = json.loads(rows)
+                entry = disk.get(st)
+                if r['incremental'] and entry:
+                    by_last = {last: [{'id': cid, 'full_name': name, 'first': first, 'last': last}
+                                      for cid, name, first in items]
+                               for last, items in entry['by_last'].items()}
+                    known = {e['id'] for entries in by_last.values() for e in entries}
+                else:
+                    by_last, known = {}, set()
+                added = 0
+                for cid, full_name in rows:
+                    if cid in known:
+                        continue
+                    known.add(cid)
+                    added += 1
+                    first, last = split_name(full_name)
+                    by_last.setdefault(last, []).append(
+                        {'id': cid, 'full_name': full_name, 'first': first, 'last': last})
+                self._cache[st] = by_last
+                self._name_index.pop(st, None)
+                self._loaded_states.add(st)
+                if self.use_cache and (added or not r['incremental'] or not entry
+                                       or entry['max_candidacy_id'] != r['max_candidacy_id']
+                                       or entry['max_term_id'] != r['max_term_id']):
+                    _write_cache(st, r, by_last)
+
+    def _fetch(self, states, disk):
+        """
+        One statement for a group of states: one row per state with the
+        candidates (id, full_name) linked to it by candidacies or seat terms
+        newer than the cached ids (less ID_OVERLAP), or all of them when the
+        watermark moved (or nothing is cached). incremental says which.
+        """
+        values = []
+        for st in states:
+            entry = disk.get(st)
+            if entry:
+                values.append(f"('{st}', '{esc(entry['watermark'])}', "
+                              f"{int(entry['max_candidacy_id'])}, {int(entry['max_term_id'])})")
+            else:
+                values.append(f"('{st}', '', 0, 0)")
+        require_data_versions(self.run_sql, {t for t, _ in WATERMARK_VERSIONS})
+        return self.run_sql(f"""
+            WITH mx AS (
+                SELECT (SELECT COALESCE(MAX(id), 0) FROM candidacies) AS ca,
+                       (SELECT COALESCE(MAX(id), 0) FROM seat_terms) AS t
+            ),
+            req (abbreviation, cached, ca, t) AS (VALUES {', '.join(values)}),
+            since AS (
+                SELECT req.abbreviation, wm.v AS watermark, req.cached = wm.v AS incremental,
+                       CASE WHEN req.cached = wm.v THEN req.ca - {ID_OVERLAP} ELSE 0 END AS ca,
+                       CASE WHEN req.cached = wm.v THEN req.t - {ID_OVERLAP} ELSE 0 END AS t
+                FROM req
+                LEFT JOIN states st ON st.abbreviation = req.abbreviation
+                CROSS JOIN LATERAL ({watermark_sql(WATERMARK_VERSIONS, 'st.id').strip()}) wm
+            )
+            SELECT since.abbreviation AS state, since.incremental, since.watermark,
+                   mx.ca AS max_candidacy_id, mx.t AS max_term_id,
+                   (SELECT COALESCE(json_agg(json_build_array(x.id, x.full_name)), '[]')
+                    FROM (
+                        SELECT c.id, c.full_name
+                        FROM candidacies ca
+                        JOIN candidates c ON ca.candidate_id = c.id
+                        JOIN elections e ON ca.election_id = e.id
+                        JOIN seats s ON e.seat_id = s.id
+                        JOIN districts d ON s.district_id = d.id
+                        JOIN states st ON d.state_id = st.id
+                        WHERE st.abbreviation = since.abbreviation AND ca.id > since.ca
+                        UNION
+                        SELECT c.id, c.full_name
+                        FROM seat_terms stm
+                        JOIN candidates c ON stm.candidate_id = c.id
+                        JOIN seats s2 ON stm.seat_id = s2.id
+                        JOIN districts d2 ON s2.district_id = d2.id
+                        JOIN states st2 ON d2.state_id = st2.id
+                        WHERE st2.abbreviation = since.abbreviation AND stm.id > since.t
+                    ) x) AS rows
+            FROM since CROSS JOIN mx
         """)
-        by_last = {}
-        for r in rows:
-            first, last = split_name(r['full_name'])
-            entry = {'id': r['id'], 'full_name': r['full_name'],
-                     'first': first, 'last': last}
-            by_last.setdefault(last, []).append(entry)
-        self._cache[state_abbr] = by_last
-        self._loaded_states.add(state_abbr)
 
     def find_match(self, full_name, state):
         """
@@ -223,8 +665,6 @@ class CandidateLookup:
 
         by_last = self._cache.get(state, {})
         candidates = by_last.get(last, [])
-        if not candidates:
-            return None
 
         # Score all candidates with the same last name
         best_id = None
@@ -242,8 +682,35 @@ class CandidateLookup:
                     best_score = score
                     best_id = c['id']
 
+        if best_id is None and self.fuzzy:
+            self._suggest_similar(full_name, first, last, state)
         return best_id
 
+    def _suggest_similar(self, full_name, first, last, state):
+        """
+        Record the existing candidate with a similar last name (phonetic or
+        within max_edits) and a matching first name in fuzzy_matches.
+        Closest last name wins, exact first name breaking ties; still-tied
+        different candidates are ambiguous and not reported. Placeholder
+        ids (candidates staged but not yet inserted) are never suggested.
+        """
+        by_last = self._cache.get(state, {})
+        index = self._name_index.get(state)
+        if index is None:
+            index = self._name_index[state] = LastNameIndex(by_last)
+        hits = []
+        for other, dist in index.similar(last).items():
+            for c in by_last.get(other, ()):
+                if c['id'] > 0 and first_names_match(first, c['first']):
+                    hits.append((dist, c['first'] != first, c['id'], c['full_name']))
+        if not hits:
+            return
+        hits.sort()
+        best = hits[0]
+        if any(h[:2] == best[:2] and h[2] != best[2] for h in hits[1:]):
+            return
+        self.fuzzy_matches.append((full_name, state, best[3], best[2]))
+
     def find_or_create(self, full_name, state, first_name=None, last_name=None,
                        gender=None):
         """
@@ -269,12 +736,27 @@ class CandidateLookup:
             RETURNING id
         """)
         new_id = result[0]['id']
+        self.add(new_id, full_name, state)
+        return new_id
 
-        # Add to cache
+    def add(self, candidate_id, full_name, state):
+        """Add a candidate to the state cache (e.g. after a bulk INSERT)."""
         first, last = split_name(full_name)
-        entry = {'id': new_id, 'full_name': full_name,
+        entry = {'id': candidate_id, 'full_name': full_name,
                  'first': first, 'last': last}
         by_last = self._cache.setdefault(state, {})
         by_last.setdefault(last, []).append(entry)
+        if state in self._name_index:
+            self._name_index[state].add(last)
 
-        return new_id
+    def reassign(self, id_map, state):
+        """
+        Replace cached ids in one pass: id_map is {old_id: new_id}.
+
+        Used to swap placeholder ids (staged before a bulk INSERT) for the
+        real ids the INSERT returned.
+        """
+        for entries in self._cache.get(state, {}).values():
+            for entry in entries:
+                if entry['id'] in id_map:
+                    entry['id'] = id_map[entry['id']]
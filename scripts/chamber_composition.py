@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Point-in-time chamber composition engine over seat_terms.
+
+No DB access — feed it seat_terms rows (seat_id, candidate_id, party, caucus,
+start_date, end_date) and party_switches rows, and it answers:
+
+  - composition of a chamber on a date          ChamberTimeline.on(date)
+  - every composition change between two dates  ChamberTimeline.changes_between(d1, d2)
+  - majority-control changes                    ChamberTimeline.control_changes()
+  - who held a seat on a date                   SeatIndex.holder_on(seat_id, date)
+
+Each chamber is swept once at build time: term starts/ends become +1/-1
+events per party bucket, and a snapshot is stored at every date the counts
+change. Queries are then a bisect over the sorted change dates, O(log n)
+(plus k for the changes returned).
+
+Date conventions (ISO 'YYYY-MM-DD' strings, compared lexically):
+  - a term counts from start_date (inclusive) up to end_date (exclusive), so
+    a successor starting the day the predecessor's term ends is not counted
+    twice; end_date NULL = still serving,
+  - a party switch inside a term splits it at switch_date (or July 1 of
+    switch_year when only the year is known) — unless the DB already records
+    the switch as a separate term.
+
+Usage (synthetic benchmark):
+    python3 scripts/chamber_composition.py --benchmark
+"""
+
+import time
+import argparse
+from bisect import bisect_right
+from collections import namedtuple
+
+Composition = namedtuple('Composition', 'date d r other vacant total')
+
+
+def term_party(party, caucus):
+    """Effective alignment: caucus, except AK-style coalition 'C' falls back to party."""
+    if caucus and caucus != 'C':
+        return caucus
+    return party
+
+
+def bucket(party):
+    return party if party in ('D', 'R') else 'other'
+
+
+def control_of(comp):
+    """'D' / 'R' (outright majority), 'Tied', 'No_Majority', or None (unknown).
+
+    Vacant and uncovered seats count as undecided: the result is None
+    whenever they could still give either party a majority, or turn a tie
+    into a plurality (or the reverse). 'Tied' / 'No_Majority' are only
+    returned when no assignment of those seats changes the outcome.
+    """
+    if comp is None or comp.total == 0:
+        return None
+    majority = comp.total // 2 + 1
+    if comp.d >= majority:
+        return 'D'
+    if comp.r >= majority:
+        return 'R'
+    undecided = comp.total - comp.d - comp.r - comp.other
+    if comp.d + undecided >= majority or comp.r + undecided >= majority:
+        return None
+    if abs(comp.d - comp.r) <= undecided and undecided > 0:
+        return None
+    if comp.d == comp.r:
+        return 'Tied'
+    return 'No_Majority'
+
+
+def switch_date_of(sw):
+    if sw.get('switch_date'):
+        return str(sw['switch_date'])[:10]
+    if sw.get('switch_year'):
+        return f"{sw['switch_year']}-07-01"
+    return None
+
+
+def build_intervals(terms, switches=()):
+    """Turn seat_terms rows into (seat_id, candidate_id, start, end, party) intervals.
+
+    Terms with no start_date are dropped. Party switches recorded only in
+    party_switches (not as a separate term) split the containing term.
+    """
+    switches_by_cand = {}
+    for sw in switches:
+        d = switch_date_of(sw)
+        if d:
+            switches_by_cand.setdefault(sw['candidate_id'], []).append(
+                (d, sw.get('old_caucus') or sw['old_party'],
+                 sw.get('new_caucus') or sw['new_party']))
+    for lst in switches_by_cand.values():
+        lst.sort()
+
+    intervals = []
+    for t in terms:
+        start = str(t['start_date'])[:10] if t.get('start_date') else None
+        if not start:
+            continue
+        end = str(t['end_date'])[:10] if t.get('end_date') else None
+        party = term_party(t.get('party'), t.get('caucus'))
+        for d, old, new in switches_by_cand.get(t['candidate_id'], ()):
+            if start < d and (end is None or d < end) and party == old:
+                intervals.append((t['seat_id'], t['candidate_id'], start, d, party))
+                start, party = d, new
+        intervals.append((t['seat_id'], t['candidate_id'], start, end, party))
+    return intervals
+
+
+class ChamberTimeline:
+    """Composition of one chamber over time, built by one sweep over its intervals."""
+
+    def __init__(self, key, total_seats, intervals):
+        self.key = key
+        self.total = total_seats
+        deltas = {}
+        for _seat, _cand, start, end, party in intervals:
+            b = bucket(party)
+            deltas.setdefault(start, {}).setdefault(b, 0)
+            deltas[start][b] += 1
+            if end:
+                deltas.setdefault(end, {}).setdefault(b, 0)
+                deltas[end][b] -= 1
+
+        self.dates = []
+        self.snapshots = []
+        counts = {'D': 0, 'R': 0, 'other': 0}
+        for date in sorted(deltas):
+            for b, n in deltas[date].items():
+                counts[b] += n
+            snap = self._make(date, counts)
+            if self.snapshots and self.snapshots[-1][1:4] == snap[1:4]:
+                continue
+            self.dates.append(date)
+            self.snapshots.append(snap)
+
+    def _make(self, date, counts):
+        filled = counts['D'] + counts['R'] + counts['other']
+        total = max(self.total, filled)
+        return Composition(date, counts['D'], counts['R'], counts['other'],
+                           total - filled, total)
+
+    def on(self, date):
+        """Composition in effect on date (None before the first known term)."""
+        i = bisect_right(self.dates, date) - 1
+        return self.snapshots[i] if i >= 0 else None
+
+    def changes_between(self, d1, d2):
+        """Every composition change with d1 < date <= d2, in order."""
+        lo = bisect_right(self.dates, d1)
+        hi = bisect_right(self.dates, d2)
+        return self.snapshots[lo:hi]
+
+    def control_changes(self):
+        """[(date, from_control, to_control, composition)] whenever majority control changes.
+
+        Changes into/out of unknown (vacant or uncovered seats that could still
+        decide control) are skipped, so gaps in historical coverage don't read
+        as flips.
+        """
+        out = []
+        prev = None
+        for snap in self.snapshots:
+            ctl = control_of(snap)
+            if ctl is None:
+                continue
+            if prev is not None and ctl != prev:
+                out.append((snap.date, prev, ctl, snap))
+            prev = ctl
+        return out
+
+
+class SeatIndex:
+    """Per-seat holder lookup: sorted intervals, bisect on start date."""
+
+    def __init__(self, intervals):
+        by_seat = {}
+        for seat_id, cand, start, end, party in intervals:
+            by_seat.setdefault(seat_id, []).append((start, end, party, cand))
+        self._starts = {}
+        self._terms = {}
+        for seat_id, lst in by_seat.items():
+            lst.sort(key=lambda t: t[0])
+            self._terms[seat_id] = lst
+            self._starts[seat_id] = [t[0] for t in lst]
+
+    def holder_on(self, seat_id, date):
+        """(party, candidate_id) serving on date, or None (vacant / unknown)."""
+        starts = self._starts.get(seat_id)
+        if not starts:
+            return None
+        i = bisect_right(starts, date) - 1
+        # Overlapping terms happen in messy data: also look at the few terms
+        # before the latest start, in case that one already ended.
+        terms = self._terms[seat_id]
+        for j in range(i, max(i - 3, -1), -1):
+            _start, end, party, cand = terms[j]
+            if end is None or date < end:
+                return party, cand
+        return None
+
+    def last_before(self, seat_id, date):
+        """(party, candidate_id) of the most recent term that started before date."""
+        starts = self._starts.get(seat_id)
+        if not starts:
+            return None
+        i = bisect_right(starts, date) - 1
+        while i >= 0 and starts[i] == date:
+            i -= 1
+        if i < 0:
+            return None
+        _start, _end, party, cand = self._terms[seat_id][i]
+        return party, cand
+
+
+def build_timelines(seats, terms, switches=()):
+    """Sweep every chamber once.
+
+    seats: rows with seat_id, state, chamber, and is_current (counts toward
+    the chamber's seat total). Returns ({(state, chamber): ChamberTimeline},
+    SeatIndex).
+    """
+    chamber_of = {}
+    totals = {}
+    for s in seats:
+        key = (s['state'], s['chamber'])
+        chamber_of[s['seat_id']] = key
+        if s.get('is_current', True):
+            totals[key] = totals.get(key, 0) + 1
+    intervals = build_intervals(terms, switches)
+    by_chamber = {}
+    for iv in intervals:
+        key = chamber_of.get(iv[0])
+        if key:
+            by_chamber.setdefault(key, []).append(iv)
+    timelines = {key: ChamberTimeline(key, totals.get(key, 0), ivs)
+                 for key, ivs in by_chamber.items()}
+    return timelines, SeatIndex(intervals)
+
+
+# ══════════════════════════════════════════════════════════════════════
+# BENCHMARK
+# ══════════════════════════════════════════════════════════════════════
+
+def main():
+    parser = argparse.ArgumentParser(description='Chamber composition engine')
+    parser.add_argument('--benchmark', action='store_true',
+                        help='Build 99 synthetic chambers and time queries')
+    args = parser.parse_args()
+    if not args.benchmark:
+        parser.print_help()
+        return
+
+    import random
+    rng = random.Random(0)
+    seats, terms = [], []
+    seat_id = 0
+    for c in range(99):
+        for _ in range(rng.choice((40, 60, 100, 150))):
+            seat_id += 1
+            seats.append({'seat_id': seat_id, 'state': f'S{c // 2:02d}', 'chamber': f'C{c}'})
+            year = 1990
+            while year < 2026:
+                length = rng.choice((2, 2, 4))
+                end = year + length
+                terms.append({'seat_id': seat_id, 'candidate_id': len(terms),
+                              'party': rng.choice('DDRRRI'), 'caucus': None,
+                              'start_date': f'{year}-01-0{rng.randint(1, 9)}',
+                              'end_date': f'{end}-01-0{rng.randint(1, 9)}' if end < 2026 else None})
+                year = end
+    t0 = time.time()
+    timelines, index = build_timelines(seats, terms)
+    t1 = time.time()
+    n = 0
+    for tl in timelines.values():
+        for y in range(1992, 2026):
+            tl.on(f'{y}-07-01')
+            n += 1
+    t2 = time.time()
+    flips = sum(len(tl.control_changes()) for tl in timelines.values())
+    print(f'{len(terms):,} terms, {len(seats):,} seats, {len(timelines)} chambers')
+    print(f'  sweep/build: {t1 - t0:.2f}s  '
+          f'{sum(len(tl.dates) for tl in timelines.values()):,} snapshots')
+    print(f'  {n:,} point queries: {(t2 - t1) * 1e6 / n:.1f} µs each')
+    print(f'  {flips} control changes')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,304 @@
+"""
+Correlated Monte Carlo simulator for state legislative chamber control.
+
+Takes per-seat forecast probabilities (StateNavigate win_pct / proj_margin,
+or a categorical rating as fallback) and simulates every chamber at once:
+
+    margin_i = mean_i + national_swing + state_swing[state_i] + noise_i
+
+where all margins are two-party D-minus-R margins (fractions, +0.05 = D+5).
+The district noise is sized per seat so that national + state + district
+variance equals the seat's own forecast variance, i.e. each seat's marginal
+win probability stays equal to the forecast, while the shared swings make
+seats move together the way they do on election night.
+
+Seats not up in 2026 are held fixed at their current caucus.
+
+Usage:
+    from chamber_simulator import seat_from_forecast, simulate_chambers
+
+    seats = [seat_from_forecast('WV', 'House of Delegates', 'R', 0.9999, 0.3741), ...]
+    results = simulate_chambers(seats, thresholds, n_sims=20000)
+
+    # Benchmark on a synthetic 99-chamber / ~7,000-seat dataset (no DB needed)
+    python3 scripts/chamber_simulator.py --benchmark
+    python3 scripts/chamber_simulator.py --benchmark --sims 50000 --seats 7400
+"""
+
+import argparse
+import math
+import time
+from statistics import NormalDist
+
+import numpy as np
+
+# Shared-swing standard deviations (margin units). A 1-sigma national swing
+# of 3 points and state swing of 2.5 points roughly matches the spread of
+# state legislative environments relative to forecasts in recent cycles.
+NATIONAL_SD = 0.03
+STATE_SD = 0.025
+
+# Forecast sd used when a seat has no proj_margin (rating/pres-margin fallback)
+DEFAULT_SIGMA = 0.08
+
+# Floor on each seat's idiosyncratic noise so near-certain seats still vary
+MIN_DISTRICT_SD = 0.01
+
+# Midpoint win probability for each band of win_pct_to_rating()
+RATING_WIN_PCT = {
+    'Solid': 0.995,
+    'Very Likely': 0.95,
+    'Likely': 0.825,
+    'Lean': 0.675,
+    'Tilt': 0.55,
+}
+
+SIMS_PER_CHUNK = 2000
+
+_NORMAL = NormalDist()
+
+# ══════════════════════════════════════════════════════════════════════
+# Seat construction
+# ══════════════════════════════════════════════════════════════════════
+
+def seat_from_forecast(state, chamber, leading_party, win_pct, proj_margin=None):
+    """
+    Build a contested seat from a win probability for the leading party.
+
+    The forecast's implied sd is proj_margin / z(win_pct); when no usable
+    margin is available the seat gets DEFAULT_SIGMA and a mean placed so
+    that P(leading party wins) == win_pct exactly.
+    """
+    p = min(max(float(win_pct), 0.5), 0.99999)
+    z = _NORMAL.inv_cdf(p)
+    margin = abs(float(proj_margin)) if proj_margin not in (None, '') else None
+    if margin and z > 0.01:
+        mean, sigma = margin, margin / z
+    else:
+        mean, sigma = z * DEFAULT_SIGMA, DEFAULT_SIGMA
+    if leading_party == 'R':
+        mean = -mean
+    elif leading_party != 'D':
+        mean = 0.0
+    return {'state': state, 'chamber': chamber, 'mean': mean, 'sigma': sigma}
+
+
+def seat_from_rating(state, chamber, rating):
+    """Build a contested seat from a categorical rating like 'Lean R'."""
+    if not rating or rating.lower().startswith('toss'):
+        return seat_from_forecast(state, chamber, None, 0.5)
+    label, _, party = rating.rpartition(' ')
+    win_pct = RATING_WIN_PCT.get(label)
+    if win_pct is None:
+        return None
+    return seat_from_forecast(state, chamber, party, win_pct)
+
+
+def seat_from_pres_margin(state, chamber, pres_margin):
+    """Build a contested seat from a district's presidential margin ('+12.3' = D+12.3)."""
+    try:
+        mean = float(pres_margin) / 100
+    except (TypeError, ValueError):
+        return None
+    return {'state': state, 'chamber': chamber, 'mean': mean, 'sigma': DEFAULT_SIGMA}
+
+
+def fixed_seat(state, chamber, party):
+    """A seat not on the ballot: counts for its current party in every draw."""
+    return {'state': state, 'chamber': chamber, 'fixed': party}
+
+# ══════════════════════════════════════════════════════════════════════
+# Simulation
+# ══════════════════════════════════════════════════════════════════════
+
+def _pack(seats, national_sd, state_sd):
+    """Convert seat dicts into column arrays grouped by chamber/state index."""
+    chamber_keys = sorted({(s['state'], s['chamber']) for s in seats})
+    chamber_idx = {k: i for i, k in enumerate(chamber_keys)}
+    state_keys = sorted({s['state'] for s in seats})
+    state_idx = {k: i for i, k in enumerate(state_keys)}
+
+    n_ch = len(chamber_keys)
+    fixed_d = np.zeros(n_ch, dtype=np.int32)
+    fixed_r = np.zeros(n_ch, dtype=np.int32)
+    fixed_other = np.zeros(n_ch, dtype=np.int32)
+    totals = np.zeros(n_ch, dtype=np.int32)
+
+    means, dist_sd, seat_state, seat_chamber = [], [], [], []
+    shared_var = national_sd ** 2 + state_sd ** 2
+    for s in seats:
+        ci = chamber_idx[(s['state'], s['chamber'])]
+        totals[ci] += 1
+        if 'fixed' in s:
+            party = s['fixed']
+            if party == 'D':
+                fixed_d[ci] += 1
+            elif party == 'R':
+                fixed_r[ci] += 1
+            else:
+                fixed_other[ci] += 1
+            continue
+        means.append(s['mean'])
+        dist_sd.append(max(math.sqrt(max(s['sigma'] ** 2 - shared_var, 0.0)), MIN_DISTRICT_SD))
+        seat_state.append(state_idx[s['state']])
+        seat_chamber.append(ci)
+
+    n_up = len(means)
+    # Dense seat → chamber indicator so per-chamber sums are one matmul per chunk
+    indicator = np.zeros((n_up, n_ch), dtype=np.float32)
+    indicator[np.arange(n_up), seat_chamber] = 1.0
+
+    return {
+        'chamber_keys': chamber_keys,
+        'n_states': len(state_keys),
+        'means': np.asarray(means, dtype=np.float32),
+        'dist_sd': np.asarray(dist_sd, dtype=np.float32),
+        'seat_state': np.asarray(seat_state, dtype=np.int32),
+        'indicator': indicator,
+        'up_counts': indicator.sum(axis=0).astype(np.int32),
+        'fixed_d': fixed_d,
+        'fixed_r': fixed_r,
+        'fixed_other': fixed_other,
+        'totals': totals,
+    }
+
+
+def simulate_d_seats(seats, n_sims=20000, national_sd=NATIONAL_SD, state_sd=STATE_SD,
+                     seed=None, chunk=SIMS_PER_CHUNK):
+    """
+    Run the correlated simulation.
+
+    Returns (packed, d_seats) where d_seats is an int16 array of shape
+    (n_sims, n_chambers) holding the D seat count of every chamber in every
+    draw, and packed carries the chamber keys and fixed-seat counts.
+    """
+    packed = _pack(seats, national_sd, state_sd)
+    rng = np.random.default_rng(seed)
+    n_ch = len(packed['chamber_keys'])
+    n_up = len(packed['means'])
+    means, dist_sd = packed['means'], packed['dist_sd']
+    seat_state, indicator = packed['seat_state'], packed['indicator']
+
+    won = np.empty((n_sims, n_ch), dtype=np.int16)
+    for start in range(0, n_sims, chunk):
+        n = min(chunk, n_sims - start)
+        national = rng.standard_normal((n, 1), dtype=np.float32) * national_sd
+        state = rng.standard_normal((n, packed['n_states']), dtype=np.float32) * state_sd
+        margin = rng.standard_normal((n, n_up), dtype=np.float32)
+        margin *= dist_sd
+        margin += means
+        margin += national
+        margin += state[:, seat_state]
+        d_wins = (margin > 0).astype(np.float32)
+        won[start:start + n] = (d_wins @ indicator).astype(np.int16)
+
+    return packed, won + packed['fixed_d'].astype(np.int16)
+
+
+def summarize(packed, d_seats, thresholds):
+    """
+    Reduce simulated seat counts to per-chamber probabilities.
+
+    thresholds: {(state, chamber): {'majority': int, 'supermajority': int or None}}
+    Returns {(state, chamber): summary dict}.
+    """
+    n_sims = d_seats.shape[0]
+    out = {}
+    for ci, key in enumerate(packed['chamber_keys']):
+        total = int(packed['totals'][ci])
+        contested = int(packed['up_counts'][ci])
+        d = d_seats[:, ci].astype(np.int32)
+        # Contested seats are two-party; anything not won by D goes to R
+        r = total - int(packed['fixed_other'][ci]) - d
+        th = thresholds.get(key, {})
+        majority = th.get('majority') or total // 2 + 1
+        supermajority = th.get('supermajority')
+
+        hist = np.bincount(d, minlength=total + 1)
+        lo, mid, hi = np.percentile(d, [5, 50, 95])
+        summary = {
+            'total_seats': total,
+            'seats_up': contested,
+            'majority_threshold': majority,
+            'supermajority_threshold': supermajority,
+            'p_control': {
+                'D': round(float((d >= majority).mean()), 4),
+                'R': round(float((r >= majority).mean()), 4),
+            },
+            'p_tied': round(float(((d < majority) & (r < majority)).mean()), 4),
+            'd_seats': {
+                'mean': round(float(d.mean()), 2),
+                'p5': int(lo), 'median': int(mid), 'p95': int(hi),
+            },
+            # Index = number of D seats, value = share of draws
+            'd_seat_distribution': [round(int(c) / n_sims, 5) for c in hist],
+        }
+        if supermajority:
+            summary['p_supermajority'] = {
+                'D': round(float((d >= supermajority).mean()), 4),
+                'R': round(float((r >= supermajority).mean()), 4),
+            }
+        out[key] = summary
+    return out
+
+
+def simulate_chambers(seats, thresholds, n_sims=20000, national_sd=NATIONAL_SD,
+                      state_sd=STATE_SD, seed=None):
+    """Simulate and summarize in one call. See simulate_d_seats / summarize."""
+    packed, d_seats = simulate_d_seats(seats, n_sims=n_sims, national_sd=national_sd,
+                                       state_sd=state_sd, seed=seed)
+    return summarize(packed, d_seats, thresholds)
+
+# ══════════════════════════════════════════════════════════════════════
+# Benchmark
+# ══════════════════════════════════════════════════════════════════════
+
+def synthetic_seats(n_seats=7386, n_chambers=99, up_share=0.85, seed=0):
+    """Synthetic national map: 50 states, n_chambers chambers, ~n_seats seats."""
+    rng = np.random.default_rng(seed)
+    states = [f'S{i:02d}' for i in range(50)]
+    chambers = [(states[i % 50], 'Senate' if i < 50 else 'House') for i in range(n_chambers)]
+    sizes = rng.dirichlet(np.ones(n_chambers) * 3) * n_seats
+    seats = []
+    for (st, ch), size in zip(chambers, sizes):
+        lean = rng.normal(0, 0.08)
+        for _ in range(max(int(size), 3)):
+            if rng.random() > up_share:
+                seats.append(fixed_seat(st, ch, 'D' if rng.random() < 0.5 + lean else 'R'))
+                continue
+            margin = rng.normal(lean, 0.25)
+            win_pct = _NORMAL.cdf(abs(margin) / 0.1)
+            seats.append(seat_from_forecast(st, ch, 'D' if margin > 0 else 'R',
+                                            win_pct, abs(margin)))
+    return seats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the chamber-control simulator')
+    parser.add_argument('--benchmark', action='store_true', help='Run on synthetic data')
+    parser.add_argument('--sims', type=int, default=20000, help='Number of draws')
+    parser.add_argument('--seats', type=int, default=7386, help='Synthetic seat count')
+    args = parser.parse_args()
+
+    if not args.benchmark:
+        parser.error('Nothing to do — pass --benchmark (use simulate_chamber_control.py for real data)')
+
+    t0 = time.time()
+    seats = synthetic_seats(n_seats=args.seats)
+    t1 = time.time()
+    packed, d_seats = simulate_d_seats(seats, n_sims=args.sims, seed=1)
+    t2 = time.time()
+    results = summarize(packed, d_seats, {})
+    t3 = time.time()
+
+    n_up = len(packed['means'])
+    print(f'Seats: {len(seats):,} ({n_up:,} contested) in {len(results)} chambers')
+    print(f'Draws: {args.sims:,} ({args.sims * n_up / 1e6:,.0f}M seat-draws)')
+    print(f'  build seats:  {t1 - t0:6.2f}s')
+    print(f'  simulate:     {t2 - t1:6.2f}s')
+    print(f'  summarize:    {t3 - t2:6.2f}s')
+    print(f'  total:        {t3 - t0:6.2f}s')
+
+
+if __name__ == '__main__':
+    main()
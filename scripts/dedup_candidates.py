@@ -5,6 +5,8 @@ Deduplicate candidate records in the elections database.
 Tier 1 (auto-merge): Exact same full_name + shared seat → merge automatically
 Tier 2 (review): Exact same full_name + same state, different seats → output for review
 Tier 3 (review): Name variations (prefix match) + same state → output for review
+Tier 4 (review): Similar last names the populate scripts created side by side
+                 (candidate_lookup.SUGGESTIONS_FILE) → output for review
 
 For each merge, the "canonical" record is chosen by:
   1. Prefer the record referenced by seat_terms (officeholder history)
@@ -15,6 +17,7 @@ Usage:
   python3 scripts/dedup_candidates.py --dry-run        # Preview changes
   python3 scripts/dedup_candidates.py                   # Execute merges
   python3 scripts/dedup_candidates.py --review-file /tmp/dedup_review.csv
+  python3 scripts/dedup_candidates.py --merge-suggested   # Tier 4 rows left in the review CSV
 """
 
 import argparse
@@ -27,6 +30,7 @@ import httpx
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 from db_config import TOKEN, API_URL
+from candidate_lookup import SUGGESTIONS_FILE
 
 MAX_RETRIES = 5
 
@@ -159,6 +163,28 @@ def find_tier3_duplicates():
     return run_sql(sql)
 
 
+def find_tier4_duplicates(path):
+    """Similar-name pairs saved by populate runs whose records both still exist."""
+    try:
+        with open(path, newline='') as f:
+            rows = list(csv.DictReader(f))
+    except OSError:
+        return []
+    pairs = {}
+    for row in rows:
+        id1, id2 = int(row['id1']), int(row['id2'])
+        if id1 != id2:
+            pairs.setdefault((min(id1, id2), max(id1, id2)), row)
+    if not pairs:
+        return []
+    ids = ','.join(str(i) for pair in pairs for i in pair)
+    existing = {r['id'] for r in run_sql(f"SELECT id FROM candidates WHERE id IN ({ids})")}
+    return [{'state': row['state'], 'id1': id1, 'name1': row['name1'] if int(row['id1']) == id1 else row['name2'],
+             'id2': id2, 'name2': row['name2'] if int(row['id2']) == id2 else row['name1']}
+            for (id1, id2), row in sorted(pairs.items())
+            if id1 in existing and id2 in existing]
+
+
 def pick_canonical(row):
     """Choose which record to keep. Returns (keep_id, merge_id)."""
     id1, id2 = row['id1'], row['id2']
@@ -213,6 +239,70 @@ def execute_batch(pairs):
     run_sql(sql)
 
 
+def merge_review_pairs(review_file, tier, dry_run):
+    """Merge the pairs of one tier left in the review CSV after review."""
+    print(f'Reading Tier {tier} pairs from {review_file}...')
+    with open(review_file) as f:
+        reader = csv.DictReader(f)
+        pairs = [(int(row['id1']), int(row['id2']), row['name1'], row['name2'])
+                 for row in reader if row['tier'] == str(tier)]
+    print(f'  Found {len(pairs)} Tier {tier} pairs')
+    if not pairs:
+        return
+
+    # Get seat_term and candidacy counts for canonical selection
+    all_ids = set()
+    for id1, id2, _, _ in pairs:
+        all_ids.add(id1)
+        all_ids.add(id2)
+    id_list = ','.join(str(i) for i in all_ids)
+    counts = run_sql(f"""
+        SELECT c.id,
+          (SELECT COUNT(*) FROM seat_terms WHERE candidate_id = c.id) as st_count,
+          (SELECT COUNT(*) FROM candidacies WHERE candidate_id = c.id) as ca_count
+        FROM candidates c WHERE c.id IN ({id_list})
+    """)
+    count_map = {r['id']: (r['st_count'], r['ca_count']) for r in counts}
+
+    merged = 0
+    already_merged = set()
+    batch = []
+    BATCH_SIZE = 20
+
+    for id1, id2, name1, name2 in pairs:
+        if id1 in already_merged or id2 in already_merged:
+            continue
+        st1, ca1 = count_map.get(id1, (0, 0))
+        st2, ca2 = count_map.get(id2, (0, 0))
+        row = {'id1': id1, 'id2': id2, 'st_count1': st1, 'st_count2': st2,
+               'ca_count1': ca1, 'ca_count2': ca2}
+        keep_id, merge_id = pick_canonical(row)
+
+        if dry_run:
+            print(f'  MERGE: #{keep_id} "{name1 if keep_id == id1 else name2}" '
+                  f'← #{merge_id} "{name2 if merge_id == id2 else name1}" '
+                  f'(st:{st1}/{st2}, ca:{ca1}/{ca2})')
+        else:
+            batch.append((keep_id, merge_id))
+            if len(batch) >= BATCH_SIZE:
+                execute_batch(batch)
+                print(f'  Merged batch of {len(batch)} (total: {merged + len(batch)})')
+                merged += len(batch)
+                batch = []
+                time.sleep(2)
+
+        already_merged.add(merge_id)
+        if dry_run:
+            merged += 1
+
+    if batch:
+        execute_batch(batch)
+        print(f'  Merged final batch of {len(batch)} (total: {merged + len(batch)})')
+        merged += len(batch)
+
+    print(f'  {"Would merge" if dry_run else "Merged"}: {merged} Tier {tier} pairs\n')
+
+
 def main():
     parser = argparse.ArgumentParser(description='Deduplicate candidate records')
     parser.add_argument('--dry-run', action='store_true', help='Preview without making changes')
@@ -220,71 +310,21 @@ def main():
                         help='Output path for Tier 2/3 review CSV')
     parser.add_argument('--merge-tier2', action='store_true',
                         help='Merge Tier 2 pairs from the review CSV')
+    parser.add_argument('--merge-suggested', action='store_true',
+                        help='Merge Tier 4 (similar-name) pairs from the review CSV')
+    parser.add_argument('--suggestions-file', default=SUGGESTIONS_FILE,
+                        help='Similar-name pairs saved by the populate scripts (Tier 4 input)')
     args = parser.parse_args()
 
     if args.dry_run:
         print('DRY RUN — no database changes will be made.\n')
 
-    # ── Merge Tier 2 from review CSV ──
-    if args.merge_tier2:
-        print(f'Reading Tier 2 pairs from {args.review_file}...')
-        with open(args.review_file) as f:
-            reader = csv.DictReader(f)
-            tier2_pairs = [(int(row['id1']), int(row['id2']), row['name1'], row['name2'])
-                           for row in reader if row['tier'] == '2']
-        print(f'  Found {len(tier2_pairs)} Tier 2 pairs')
-
-        # Get seat_term and candidacy counts for canonical selection
-        all_ids = set()
-        for id1, id2, _, _ in tier2_pairs:
-            all_ids.add(id1)
-            all_ids.add(id2)
-        id_list = ','.join(str(i) for i in all_ids)
-        counts = run_sql(f"""
-            SELECT c.id,
-              (SELECT COUNT(*) FROM seat_terms WHERE candidate_id = c.id) as st_count,
-              (SELECT COUNT(*) FROM candidacies WHERE candidate_id = c.id) as ca_count
-            FROM candidates c WHERE c.id IN ({id_list})
-        """)
-        count_map = {r['id']: (r['st_count'], r['ca_count']) for r in counts}
-
-        merged = 0
-        already_merged = set()
-        batch = []
-        BATCH_SIZE = 20
-
-        for id1, id2, name1, name2 in tier2_pairs:
-            if id1 in already_merged or id2 in already_merged:
-                continue
-            st1, ca1 = count_map.get(id1, (0, 0))
-            st2, ca2 = count_map.get(id2, (0, 0))
-            row = {'id1': id1, 'id2': id2, 'st_count1': st1, 'st_count2': st2,
-                   'ca_count1': ca1, 'ca_count2': ca2}
-            keep_id, merge_id = pick_canonical(row)
-
-            if args.dry_run:
-                print(f'  MERGE: #{keep_id} "{name1 if keep_id == id1 else name2}" '
-                      f'← #{merge_id} "{name2 if merge_id == id2 else name1}" '
-                      f'(st:{st1}/{st2}, ca:{ca1}/{ca2})')
-            else:
-                batch.append((keep_id, merge_id))
-                if len(batch) >= BATCH_SIZE:
-                    execute_batch(batch)
-                    print(f'  Merged batch of {len(batch)} (total: {merged + len(batch)})')
-                    merged += len(batch)
-                    batch = []
-                    time.sleep(2)
-
-            already_merged.add(merge_id)
-            if args.dry_run:
-                merged += 1
-
-        if batch:
-            execute_batch(batch)
-            print(f'  Merged final batch of {len(batch)} (total: {merged + len(batch)})')
-            merged += len(batch)
-
-        print(f'  {"Would merge" if args.dry_run else "Merged"}: {merged} Tier 2 pairs\n')
+    # ── Merge reviewed Tier 2 / Tier 4 pairs from the review CSV ──
+    if args.merge_tier2 or args.merge_suggested:
+        if args.merge_tier2:
+            merge_review_pairs(args.review_file, 2, args.dry_run)
+        if args.merge_suggested:
+            merge_review_pairs(args.review_file, 4, args.dry_run)
         print('Done.')
         return
 
@@ -336,6 +376,10 @@ def main():
     tier3 = find_tier3_duplicates()
     print(f'  Found {len(tier3)} pairs')
 
+    print(f'Reading Tier 4 suggestions (similar last names) from {args.suggestions_file}...')
+    tier4 = find_tier4_duplicates(args.suggestions_file)
+    print(f'  Found {len(tier4)} pairs')
+
     review_rows = []
     for row in tier2:
         review_rows.append({
@@ -355,6 +399,15 @@ def main():
             'id2': row['id2'],
             'name2': row['name2'],
         })
+    for row in tier4:
+        review_rows.append({
+            'tier': 4,
+            'state': row['state'],
+            'id1': row['id1'],
+            'name1': row['name1'],
+            'id2': row['id2'],
+            'name2': row['name2'],
+        })
 
     if review_rows:
         with open(args.review_file, 'w', newline='') as f:
@@ -3,7 +3,8 @@
 Download Alaska Secretary of State election results (1994-2018).
 
 Fetches official certified results from the AK Division of Elections website,
-parses the simple HTML tables, and saves structured JSON to /tmp.
+parses the simple HTML tables, and writes the races to the results lake
+(results_lake.py, source 'ak_sos') for populate_ak_sos_results.py.
 
 Captures both state legislative races AND statewide races (Governor, Lt Governor).
 
@@ -24,7 +25,6 @@ Usage:
 
 import sys
 import os
-import json
 import re
 import argparse
 import time
@@ -32,7 +32,7 @@ from html.parser import HTMLParser
 
 import httpx
 
-OUTPUT_PATH = '/tmp/ak_sos_results.json'
+from results_lake import write_source
 
 # All available election pages (verified via HTTP probes)
 # Most use BASE_URL pattern; 2008 primary and 2010 general are in /Core/Archive/
@@ -459,6 +459,20 @@ def determine_election_type(is_primary, primary_code):
     return 'Primary'
 
 
+def lake_races(all_results):
+    """Results-lake rows for downloaded AK races (statewide races keyed by office)."""
+    return [{
+        'state': 'AK',
+        'year': r['year'],
+        'election_type': r['election_type'],
+        'chamber': r['chamber'] or 'Statewide',
+        'district': r['district'] if r['chamber'] else r.get('office_type'),
+        'office': r.get('office_type'),
+        'candidates': [(c['name'], c['party'], c['votes']) for c in r['candidates']],
+        'payload': r,
+    } for r in all_results]
+
+
 def main():
     parser = argparse.ArgumentParser(description='Download AK SoS election results')
     parser.add_argument('--year', type=int, help='Single year to download')
@@ -540,9 +554,8 @@ def main():
         print(f'  {yr} {et:15s} {cnt} races')
 
     # Save
-    with open(OUTPUT_PATH, 'w') as f:
-        json.dump(all_results, f, indent=2)
-    print(f'\nSaved to {OUTPUT_PATH}')
+    print()
+    write_source('ak_sos', lake_races(all_results))
 
 
 if __name__ == '__main__':
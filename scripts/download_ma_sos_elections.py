@@ -13,7 +13,8 @@ Covers all state-level offices from 1970 to present:
   - Treasurer (office_id=53)
   - Auditor (office_id=90)
 
-Output: /tmp/ma_sos_elections.json
+Output: results lake (results_lake.py, source "ma_sos"), read by
+populate_ma_sos_elections.py
 
 Usage:
   python3 scripts/download_ma_sos_elections.py
@@ -28,6 +29,8 @@ import time
 import urllib.request
 import urllib.error
 
+from results_lake import write_source
+
 BASE_URL = "https://electionstats.state.ma.us/elections/search"
 
 OFFICES = {
@@ -53,7 +56,8 @@ OFFICE_YEAR_RANGES = {
     90: (1970, 2022),
 }
 
-OUTPUT_FILE = "/tmp/ma_sos_elections.json"
+# office_id → results-lake chamber (everything else is Statewide)
+LAKE_CHAMBERS = {9: "Senate", 8: "House"}
 
 
 def fetch_elections(office_id, year_from, year_to, retries=3):
@@ -77,12 +81,42 @@ def fetch_elections(office_id, year_from, year_to, retries=3):
     return []
 
 
+def lake_election_type(election):
+    """Coarse election type for the lake columns; populate does the exact mapping."""
+    party = election.get("party_primary")
+    etype = f"Primary_{party[0]}" if party else "General"
+    return f"Special_{etype}" if election.get("is_special") == "1" else etype
+
+
+def lake_races(all_elections):
+    """Results-lake rows for downloaded MA SoS election records."""
+    races = []
+    for e in all_elections:
+        chamber = LAKE_CHAMBERS.get(e["_office_id"], "Statewide")
+        candidates = []
+        for cand in e.get("Candidate", []):
+            cte = cand.get("CandidateToElection", {})
+            candidates.append((cand.get("display_name", "").strip(),
+                               cte.get("party") or cand.get("party") or None,
+                               int(cte["n_votes"]) if cte.get("n_votes") else None))
+        races.append({
+            "state": "MA",
+            "year": int(e["Election"]["year"]),
+            "election_type": lake_election_type(e["Election"]),
+            "chamber": chamber,
+            "district": (e.get("District") or {}).get("name") if chamber != "Statewide" else e["_office_name"],
+            "office": e["_office_name"] if chamber == "Statewide" else None,
+            "candidates": candidates,
+            "payload": e,
+        })
+    return races
+
+
 def main():
     parser = argparse.ArgumentParser(description="Download MA SoS election data")
     parser.add_argument("--office", type=int, help="Single office_id to download")
     parser.add_argument("--year-from", type=int, default=1970, help="Start year (default 1970)")
     parser.add_argument("--year-to", type=int, default=2026, help="End year (default 2026)")
-    parser.add_argument("--output", default=OUTPUT_FILE, help="Output file path")
     parser.add_argument("--chunk-size", type=int, default=10,
                         help="Years per API request (default 10)")
     args = parser.parse_args()
@@ -126,8 +160,7 @@ def main():
         print(f"  Subtotal: {office_count} elections")
 
     # Write output
-    with open(args.output, "w") as f:
-        json.dump(all_elections, f, indent=2)
+    write_source("ma_sos", lake_races(all_elections))
 
     print(f"\n{'='*60}")
     print(f"DOWNLOAD COMPLETE")
@@ -135,7 +168,6 @@ def main():
     print(f"Total elections: {len(all_elections)}")
     for name, count in stats.items():
         print(f"  {name}: {count}")
-    print(f"Written to: {args.output}")
 
 
 if __name__ == "__main__":
@@ -6,24 +6,24 @@ disaggregated to every state legislative district in all 50 states:
 https://docs.google.com/spreadsheets/d/1GiIiDrVwddCH4Pc0Jsc9u9hxbm3mVRZVgivUeeT2ssQ
 
 This script downloads each state's tab as CSV, parses the district identifiers and
-presidential vote columns, computes R+X.X / D+X.X margins, and outputs a JSON file
-that can be loaded by populate_pres_margins.py.
+presidential vote columns, computes R+X.X / D+X.X margins, and writes them to the
+results lake (results_lake.py, source 'pres_margins') for populate_pres_margins.py.
 
 Usage:
     python3 scripts/download_pres_margins.py
     python3 scripts/download_pres_margins.py --state VA
-    python3 scripts/download_pres_margins.py --output /tmp/pres_margins.json
 """
 import sys
 import csv
 import io
 import re
-import json
 import time
 import argparse
 
 import httpx
 
+from results_lake import write_source
+
 SPREADSHEET_ID = '1GiIiDrVwddCH4Pc0Jsc9u9hxbm3mVRZVgivUeeT2ssQ'
 BASE_URL = f'https://docs.google.com/spreadsheets/d/{SPREADSHEET_ID}/export?format=csv&gid='
 
@@ -677,10 +677,23 @@ def find_ma_match(name, name_map):
     return None
 
 
+def lake_races(records):
+    """Results-lake rows for per-district margin records (Harris/Trump as candidates)."""
+    return [{
+        'state': r['state'],
+        'year': 2024,
+        'election_type': 'General',
+        'chamber': r['chamber'],
+        'district': r['district_number'],
+        'office': 'President',
+        'candidates': [('Harris', 'D', r['harris']), ('Trump', 'R', r['trump'])],
+        'payload': r,
+    } for r in records]
+
+
 def main():
     parser = argparse.ArgumentParser(description='Download 2024 presidential margins by legislative district')
     parser.add_argument('--state', type=str, help='Download a single state (abbreviation)')
-    parser.add_argument('--output', type=str, default='/tmp/pres_margins.json', help='Output JSON path')
     args = parser.parse_args()
 
     states = [args.state.upper()] if args.state else sorted(STATE_GIDS.keys())
@@ -716,9 +729,8 @@ def main():
         print(f"  {chamber}: {count}")
 
     # Write output
-    with open(args.output, 'w') as f:
-        json.dump(all_records, f, indent=2)
-    print(f"\nWritten to {args.output}")
+    print()
+    write_source('pres_margins', lake_races(all_records))
 
 
 if __name__ == '__main__':
@@ -17,6 +17,13 @@ Usage:
     python3 scripts/election_briefing.py --dry-run         # Print queries, don't execute
     python3 scripts/election_briefing.py --mark-done seat_gap_audit   # Update check timestamp
     python3 scripts/election_briefing.py --json            # Output as JSON
+    python3 scripts/election_briefing.py --refresh         # Ignore the cached snapshot
+
+All six briefing queries run as one JSON-aggregating statement. The result is
+cached in /tmp/election_briefing.json with a DB change watermark: within
+--max-age seconds the cache is used without touching the database, and after
+that the server skips the aggregation (one tiny round trip) when nothing has
+changed since the snapshot.
 """
 import sys
 import os
@@ -29,6 +36,7 @@ import httpx
 import sys as _sys, os as _os
 _sys.path.insert(0, _os.path.join(_os.path.dirname(_os.path.abspath(__file__)), '..'))
 from db_config import TOKEN, PROJECT_REF, API_URL
+from state_context import watermark_sql, require_data_versions, OPERATIONS
 
 # Import local data
 _sys.path.insert(0, _os.path.join(_os.path.dirname(_os.path.abspath(__file__)), '..', 'data'))
@@ -36,6 +44,7 @@ from primary_dates_2026 import PRIMARY_DATES, RUNOFF_DATES, GENERAL_ELECTION_DAT
 
 # Import STATE_DEADLINES from populate_filing_deadlines (same scripts/ directory)
 from populate_filing_deadlines import STATE_DEADLINES
+from source_monitor import pending_count as pending_source_changes
 
 MONITORING_STATE_PATH = os.path.join(
     os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'monitoring_state.json'
@@ -44,6 +53,9 @@ VAULT_NOTE_PATH = os.path.expanduser(
     '~/second-brain/02-Projects/Work/Elections/Elections Database.md'
 )
 
+SNAPSHOT_CACHE_PATH = '/tmp/election_briefing.json'
+SNAPSHOT_MAX_AGE = 300  # seconds a snapshot is reused without checking the watermark
+
 TODAY = date.today()
 
 
@@ -228,6 +240,87 @@ Q_UNCONTESTED_SUMMARY = """
 """
 
 
+# Name → query, in the order they are reported
+BRIEFING_QUERIES = (
+    ('upcoming', 'Upcoming elections', Q_UPCOMING_ELECTIONS),
+    ('health', 'Database health', Q_HEALTH),
+    ('seat_changes', 'Seat changes', Q_SEAT_CHANGES),
+    ('specials', 'Special elections', Q_SPECIALS),
+    ('candidacy_counts', 'Candidacy counts', Q_CANDIDACY_COUNTS),
+    ('uncontested', 'Uncontested summary', Q_UNCONTESTED_SUMMARY),
+)
+
+WATERMARK_TABLES = ('states', 'districts', 'seats', 'elections', 'seat_terms',
+                    'candidates', 'candidacies', 'ballot_measures', 'forecasts')
+
+# Change watermark: data_versions counters for the tables above (same scheme
+# as state_context.py) and today's date (the queries are relative to
+# CURRENT_DATE).
+WATERMARK_SQL = f"""
+    SELECT md5(CURRENT_DATE::text || w.v) AS v
+    FROM ({watermark_sql((t, op) for t in WATERMARK_TABLES for op in OPERATIONS).strip()}) w
+"""
+
+
+def snapshot_sql(cached_watermark=None):
+    """One statement returning every briefing query as a JSON array of rows.
+
+    The CASE short-circuits when the cached watermark still matches, so an
+    unchanged database costs only the watermark lookup.
+    """
+    parts = ',\n'.join(
+        f"                '{name}', (SELECT COALESCE(json_agg(q), '[]') FROM ({query.strip()}) q)"
+        for name, _, query in BRIEFING_QUERIES
+    )
+    return f"""
+        WITH wm AS ({WATERMARK_SQL.strip()})
+        SELECT wm.v AS watermark,
+               CASE WHEN wm.v = '{(cached_watermark or '').replace("'", "''")}' THEN NULL
+                    ELSE json_build_object(
+{parts})
+               END AS payload
+        FROM wm
+    """
+
+
+def _read_snapshot_cache():
+    try:
+        with open(SNAPSHOT_CACHE_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_snapshot_cache(entry):
+    tmp = f'{SNAPSHOT_CACHE_PATH}.{os.getpid()}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(entry, f, separators=(',', ':'))
+    os.replace(tmp, SNAPSHOT_CACHE_PATH)
+
+
+def fetch_snapshot(max_age=SNAPSHOT_MAX_AGE, refresh=False):
+    """Rows for every briefing query: {name: [rows]}, from cache when still valid."""
+    cache = None if refresh else _read_snapshot_cache()
+    if cache:
+        age = time.time() - cache['fetched_at']
+        if age < max_age:
+            print(f'Using cached snapshot ({age:.0f}s old)')
+            return cache['payload']
+
+    require_data_versions(run_sql, WATERMARK_TABLES)
+    rows = run_sql(snapshot_sql(cache['watermark'] if cache else None))
+    watermark, payload = rows[0]['watermark'], rows[0]['payload']
+    if payload is None:
+        print('Database unchanged since cached snapshot')
+        payload = cache['payload']
+    else:
+        if isinstance(payload, str):
+            payload = json.loads(payload)
+        print(f'Ran {len(BRIEFING_QUERIES)} briefing queries in one statement')
+    _write_snapshot_cache({'watermark': watermark, 'fetched_at': time.time(), 'payload': payload})
+    return payload
+
+
 # ---------------------------------------------------------------------------
 # Build briefing data
 # ---------------------------------------------------------------------------
@@ -270,38 +363,25 @@ def get_filing_deadlines_local():
     return upcoming, recently_closed
 
 
-def build_briefing(dry_run=False):
+def build_briefing(dry_run=False, max_age=SNAPSHOT_MAX_AGE, refresh=False):
     """Run queries and build the full briefing data structure."""
 
     if dry_run:
-        print('DRY RUN — queries that would be executed:\n')
-        for name, q in [
-            ('Upcoming elections', Q_UPCOMING_ELECTIONS),
-            ('Database health', Q_HEALTH),
-            ('Seat changes', Q_SEAT_CHANGES),
-            ('Special elections', Q_SPECIALS),
-            ('Candidacy counts', Q_CANDIDACY_COUNTS),
-            ('Uncontested summary', Q_UNCONTESTED_SUMMARY),
-        ]:
-            print(f'--- {name} ---')
+        print('DRY RUN — queries that would be executed (as one statement):\n')
+        for _, label, q in BRIEFING_QUERIES:
+            print(f'--- {label} ---')
             print(q.strip())
             print()
         print('(Plus local filing deadline computation from STATE_DEADLINES)')
         return None
 
-    print('Running 6 database queries...')
-    upcoming_raw = run_sql(Q_UPCOMING_ELECTIONS)
-    print('  1/6 upcoming elections')
-    health_raw = run_sql(Q_HEALTH)
-    print('  2/6 health snapshot')
-    changes_raw = run_sql(Q_SEAT_CHANGES)
-    print('  3/6 seat changes')
-    specials_raw = run_sql(Q_SPECIALS)
-    print('  4/6 special elections')
-    candidacy_counts_raw = run_sql(Q_CANDIDACY_COUNTS)
-    print('  5/6 candidacy counts')
-    uncontested_raw = run_sql(Q_UNCONTESTED_SUMMARY)
-    print('  6/6 uncontested summary')
+    snapshot = fetch_snapshot(max_age=max_age, refresh=refresh)
+    upcoming_raw = snapshot['upcoming']
+    health_raw = snapshot['health']
+    changes_raw = snapshot['seat_changes']
+    specials_raw = snapshot['specials']
+    candidacy_counts_raw = snapshot['candidacy_counts']
+    uncontested_raw = snapshot['uncontested']
 
     health = health_raw[0] if health_raw else {}
     candidacy_by_state = {r['state']: r['candidacy_count'] for r in (candidacy_counts_raw or [])}
@@ -404,11 +484,14 @@ def build_briefing(dry_run=False):
                     'candidacies': candidacy_by_state.get(abbr, 0),
                 })
 
+    # --- Source monitor review queue ---
+    source_changes = pending_source_changes()
+
     # --- Build action items ---
     actions = build_action_items(
         elections_7d, elections_14d, elections_30d,
         upcoming_deadlines, scrape_needed,
-        primary_calendar, specials_raw or [],
+        primary_calendar, specials_raw or [], source_changes,
     )
 
     return {
@@ -424,13 +507,14 @@ def build_briefing(dry_run=False):
         'seat_changes': changes_raw or [],
         'specials': specials_raw or [],
         'monitoring': mon_state,
+        'source_changes': source_changes,
         'candidacy_by_state': candidacy_by_state,
         'uncontested_by_state': uncontested_by_state,
         'actions': actions,
     }
 
 
-def build_action_items(e7d, e14d, e30d, upcoming_dl, scrape_needed, primaries, specials):
+def build_action_items(e7d, e14d, e30d, upcoming_dl, scrape_needed, primaries, specials, source_changes=0):
     """Generate prioritized action items."""
     actions = []
 
@@ -474,6 +558,13 @@ def build_action_items(e7d, e14d, e30d, upcoming_dl, scrape_needed, primaries, s
                 'text': f"{item['state']} primary {format_date_short(item['date'])} — research SoS results pages",
             })
 
+    # SOON: source changes flagged by source_monitor.py
+    if source_changes:
+        actions.append({
+            'priority': 'SOON',
+            'text': f"Review {source_changes} source change(s) — python3 scripts/source_monitor.py --queue",
+        })
+
     # PLAN: scraping needed
     for item in scrape_needed:
         actions.append({
@@ -655,6 +746,11 @@ def print_briefing(data):
             print(f'  {marker} {name:30s} ({days_ago} days ago{interval_str})')
         else:
             print(f'  ? {name:30s} (never run)')
+    sources = mon.get('sources', {})
+    if sources:
+        last = max((e.get('last_checked') or '' for e in sources.values()), default='')
+        print(f'  Sources: {len(sources)} watched, last check {last[:16].replace("T", " ") or "never"}, '
+              f'{data["source_changes"]} change(s) pending review')
 
     # Uncontested primaries
     unc = data.get('uncontested_by_state', {})
@@ -824,6 +920,9 @@ def build_vault_markdown(data):
             status = '?'
             interval_str = f'{interval}d' if interval else 'manual'
         lines.append(f'| {name} | {last_run} | {interval_str} | {status} |')
+    if data.get('source_changes'):
+        lines.append('')
+        lines.append(f'*{data["source_changes"]} source change(s) pending review (`source_monitor.py --queue`)*')
     lines.append('')
 
     # Uncontested Primaries
@@ -963,6 +1062,11 @@ def main():
                         help='Mark a monitoring check as done today')
     parser.add_argument('--json', action='store_true',
                         help='Output briefing data as JSON')
+    parser.add_argument('--refresh', action='store_true',
+                        help='Ignore the cached snapshot and re-run the queries')
+    parser.add_argument('--max-age', type=int, default=SNAPSHOT_MAX_AGE,
+                        help=f'Reuse a cached snapshot this many seconds old without '
+                             f'checking the database (default: {SNAPSHOT_MAX_AGE})')
     args = parser.parse_args()
 
     # Handle --mark-done
@@ -979,7 +1083,7 @@ def main():
         return
 
     # Build briefing
-    data = build_briefing(dry_run=args.dry_run)
+    data = build_briefing(dry_run=args.dry_run, max_age=args.max_age, refresh=args.refresh)
     if data is None:
         return  # dry-run already printed
 
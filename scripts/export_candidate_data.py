@@ -9,6 +9,7 @@ Usage:
     python3 scripts/export_candidate_data.py                  # Export all 50 states
     python3 scripts/export_candidate_data.py --state PA       # Single state
     python3 scripts/export_candidate_data.py --dry-run        # Show queries only
+    python3 scripts/export_candidate_data.py --profile        # Also write a timing report (see profiling.py)
 """
 
 import sys
@@ -22,6 +23,8 @@ from collections import defaultdict
 import httpx
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
 from db_config import TOKEN, PROJECT_REF, API_URL
+import profiling
+from site_model import Candidacy, record_type, peak_rss_mb
 
 SITE_DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'site', 'data')
 
@@ -30,24 +33,49 @@ MIN_EXPORT_YEAR = {
     'NE': 2014,
 }
 
-
-def run_sql(query, retries=5):
-    for attempt in range(retries):
-        resp = httpx.post(
-            f'https://api.supabase.com/v1/projects/{PROJECT_REF}/database/query',
-            headers={'Authorization': f'Bearer {TOKEN}', 'Content-Type': 'application/json'},
-            json={'query': query},
-            timeout=120
-        )
-        if resp.status_code == 201:
-            return resp.json()
-        if resp.status_code == 429 and attempt < retries - 1:
-            wait = 10 * (attempt + 1)
-            print(f'  Rate limited, waiting {wait}s...')
-            time.sleep(wait)
-            continue
-        print(f'SQL ERROR: {resp.status_code} - {resp.text[:500]}')
-        sys.exit(1)
+# Row shapes for the candidate-centric queries (opponents use site_model.Candidacy)
+CandidacyRow = record_type('CandidacyRow', (
+    'state', 'candidacy_id', 'candidate_id', 'election_id', 'full_name',
+    'first_name', 'last_name', 'gender', 'hometown', 'party', 'caucus',
+    'votes', 'pct', 'result', 'is_incumbent', 'is_write_in',
+    'candidate_status', 'running_mate_candidacy_id', 'election_date',
+    'election_year', 'election_type', 'total_votes_cast', 'result_status',
+    'forecast_rating', 'linked_election_id', 'chamber', 'district_number',
+    'district_name', 'office_type',
+))
+CandidateTerm = record_type('CandidateTerm', (
+    'state', 'candidate_id', 'party', 'caucus', 'start_date', 'end_date',
+    'start_reason', 'end_reason', 'chamber', 'district_number',
+    'district_name', 'office_type',
+))
+CandidateSwitch = record_type('CandidateSwitch', (
+    'state', 'candidate_id', 'old_party', 'new_party', 'old_caucus',
+    'new_caucus', 'switch_date', 'switch_year',
+))
+
+
+def run_sql(query, retries=5, record=None):
+    """Run a query. With record=<site_model type>, rows decode straight into records."""
+    with profiling.span('query', profiling.query_label(query)):
+        for attempt in range(retries):
+            resp = httpx.post(
+                f'https://api.supabase.com/v1/projects/{PROJECT_REF}/database/query',
+                headers={'Authorization': f'Bearer {TOKEN}', 'Content-Type': 'application/json'},
+                json={'query': query},
+                timeout=120
+            )
+            profiling.record_response(resp)
+            if resp.status_code == 201:
+                rows = record.from_json(resp.content) if record else resp.json()
+                profiling.count('rows', len(rows))
+                return rows
+            if resp.status_code == 429 and attempt < retries - 1:
+                wait = 10 * (attempt + 1)
+                print(f'  Rate limited, waiting {wait}s...')
+                time.sleep(wait)
+                continue
+            print(f'SQL ERROR: {resp.status_code} - {resp.text[:500]}')
+            sys.exit(1)
 
 
 def export_candidates(dry_run=False, single_state=None):
@@ -182,13 +210,13 @@ def export_candidates(dry_run=False, single_state=None):
         return
 
     print('  Running 4 bulk queries...')
-    candidacies_data = run_sql(q_candidacies)
+    candidacies_data = run_sql(q_candidacies, record=CandidacyRow)
     print(f'    1/4 candidacies: {len(candidacies_data)} rows')
-    terms_data = run_sql(q_terms)
+    terms_data = run_sql(q_terms, record=CandidateTerm)
     print(f'    2/4 seat_terms: {len(terms_data)} rows')
-    switches_data = run_sql(q_switches)
+    switches_data = run_sql(q_switches, record=CandidateSwitch)
     print(f'    3/4 party_switches: {len(switches_data)} rows')
-    opponents_data = run_sql(q_opponents)
+    opponents_data = run_sql(q_opponents, record=Candidacy)
     print(f'    4/4 opponents: {len(opponents_data)} rows')
 
     # --- Index data ---
@@ -503,8 +531,7 @@ def export_candidates(dry_run=False, single_state=None):
         }
 
         out_path = os.path.join(out_dir, f'{state}.json')
-        with open(out_path, 'w') as f:
-            json.dump(result, f, separators=(',', ':'))
+        profiling.write_json(out_path, result, separators=(',', ':'))
         size_kb = os.path.getsize(out_path) / 1024
         print(f'    {state}: {len(cand_list)} candidates, {size_kb:.0f} KB')
 
@@ -562,22 +589,26 @@ def export_candidates(dry_run=False, single_state=None):
     else:
         search_index = new_entries
 
-    with open(search_path, 'w') as f:
-        json.dump({'generated_at': generated_at, 'candidates': search_index}, f, separators=(',', ':'))
+    profiling.write_json(search_path, {'generated_at': generated_at, 'candidates': search_index},
+                         separators=(',', ':'))
     size_kb = os.path.getsize(search_path) / 1024
     print(f'\n  Search index: {len(search_index)} entries, {size_kb:.0f} KB')
+    print(f'  Peak RSS: {peak_rss_mb():.0f} MB')
 
 
 def main():
     parser = argparse.ArgumentParser(description='Export candidate data for site pages')
     parser.add_argument('--dry-run', action='store_true')
     parser.add_argument('--state', type=str, help='Single state (2-letter abbreviation)')
+    profiling.add_arguments(parser)
     args = parser.parse_args()
+    profiling.configure(args, 'export_candidate_data')
 
-    if args.state:
-        export_candidates(dry_run=args.dry_run, single_state=args.state.upper())
-    else:
-        export_candidates(dry_run=args.dry_run)
+    with profiling.stage(args.state.upper() if args.state else 'all_states'):
+        if args.state:
+            export_candidates(dry_run=args.dry_run, single_state=args.state.upper())
+        else:
+            export_candidates(dry_run=args.dry_run)
 
     print('\nDone.')
 
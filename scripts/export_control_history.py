@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+Export control history and flip summaries for all 99 chambers in one pass.
+
+Loads every legislative / governor seat_terms interval plus party_switches,
+builds a point-in-time composition timeline per chamber
+(chamber_composition.py), then derives:
+
+  - per-state, per-year chamber composition and legislature control
+    (as of July 1 each year), governor party, and trifecta status,
+  - seat flips (incumbent defeats by the other party and open-seat pickups,
+    the latter checked against the seat's previous holder), primary
+    incumbent defeats, party switches, close races,
+  - chamber majority flips, dated to the term change that caused them.
+
+Trifecta status comes from the trifectas table where a row exists (it
+carries hand-checked history from before seat_terms coverage); years without
+one are derived from the governor + legislature values computed here.
+
+Generates:
+  - site/data/control_history.json
+  - site/data/flips_summary.json
+
+Usage:
+    python3 scripts/export_control_history.py
+    python3 scripts/export_control_history.py --dry-run
+    python3 scripts/export_control_history.py --first-year 2000
+"""
+
+import sys
+import os
+import json
+import time
+import argparse
+from datetime import date, datetime
+
+import httpx
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from db_config import TOKEN, PROJECT_REF, API_URL
+from chamber_composition import build_timelines, control_of, switch_date_of
+from site_model import record_type, group_by, peak_rss_mb
+from recount import CLOSE_RACE_PCT
+
+SITE_DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'site', 'data')
+CONTROL_FILE = os.path.join(SITE_DATA_DIR, 'control_history.json')
+FLIPS_FILE = os.path.join(SITE_DATA_DIR, 'flips_summary.json')
+
+FIRST_YEAR = 1992
+AS_OF = '07-01'  # composition snapshot date within each year
+
+FLIP_ELIGIBLE_TYPES = {
+    'General', 'General_Runoff', 'Special', 'Special_Runoff', 'Recall',
+}
+TRIFECTA_ABBR = {'Democrat': 'D', 'Republican': 'R', 'Split': 'Split'}
+
+RaceRow = record_type('RaceRow', (
+    'election_id', 'seat_id', 'state', 'chamber', 'district', 'year',
+    'election_date', 'election_type', 'total_votes_cast', 'name', 'party',
+    'caucus', 'votes', 'result', 'is_incumbent',
+))
+
+
+def run_sql(query, retries=5, record=None):
+    for attempt in range(retries):
+        resp = httpx.post(
+            API_URL,
+            headers={'Authorization': f'Bearer {TOKEN}', 'Content-Type': 'application/json'},
+            json={'query': query},
+            timeout=300
+        )
+        if resp.status_code == 201:
+            return record.from_json(resp.content) if record else resp.json()
+        if resp.status_code == 429 and attempt < retries - 1:
+            wait = 10 * (attempt + 1)
+            print(f'  Rate limited, waiting {wait}s...')
+            time.sleep(wait)
+            continue
+        print(f'SQL ERROR: {resp.status_code} - {resp.text[:500]}')
+        sys.exit(1)
+
+
+# Legislative seats keep their district's chamber; governor seats are keyed
+# under the pseudo-chamber 'Governor' so one SeatIndex covers both.
+SEAT_FILTER = """
+    (s.office_level = 'Legislative' OR s.office_type = 'Governor')
+"""
+
+
+def load_data():
+    seats = run_sql(f"""
+        SELECT s.id AS seat_id, st.abbreviation AS state,
+               CASE WHEN s.office_type = 'Governor' THEN 'Governor' ELSE d.chamber END AS chamber,
+               COALESCE(d.redistricting_cycle, '2022') = '2022' AS is_current
+        FROM seats s
+        JOIN districts d ON s.district_id = d.id
+        JOIN states st ON d.state_id = st.id
+        WHERE {SEAT_FILTER}
+    """)
+    terms = run_sql(f"""
+        SELECT stm.seat_id, stm.candidate_id, stm.party, stm.caucus,
+               stm.start_date, stm.end_date
+        FROM seat_terms stm
+        JOIN seats s ON stm.seat_id = s.id
+        WHERE {SEAT_FILTER}
+    """)
+    switches = run_sql("""
+        SELECT st.abbreviation AS state, ps.candidate_id, c.full_name AS name,
+               ps.seat_id, COALESCE(d.chamber, ps.chamber) AS chamber,
+               d.district_number AS district,
+               ps.old_party, ps.new_party, ps.old_caucus, ps.new_caucus,
+               ps.switch_date, ps.switch_year
+        FROM party_switches ps
+        JOIN states st ON ps.state_id = st.id
+        JOIN candidates c ON ps.candidate_id = c.id
+        LEFT JOIN seats s ON ps.seat_id = s.id
+        LEFT JOIN districts d ON s.district_id = d.id
+        ORDER BY ps.switch_year DESC, st.abbreviation
+    """)
+    races = run_sql("""
+        SELECT e.id AS election_id, e.seat_id, st.abbreviation AS state,
+               d.chamber, d.district_number AS district, e.election_year AS year,
+               e.election_date, e.election_type, e.total_votes_cast,
+               c.full_name AS name, cy.party, cy.caucus,
+               cy.votes_received AS votes, cy.result, cy.is_incumbent
+        FROM elections e
+        JOIN seats s ON e.seat_id = s.id
+        JOIN districts d ON s.district_id = d.id
+        JOIN states st ON d.state_id = st.id
+        JOIN candidacies cy ON cy.election_id = e.id
+        JOIN candidates c ON cy.candidate_id = c.id
+        WHERE s.office_level = 'Legislative'
+          AND cy.result IS NOT NULL
+          AND e.result_status IS DISTINCT FROM 'Counting'
+        ORDER BY e.id, cy.votes_received DESC NULLS LAST
+    """, record=RaceRow)
+    trifectas = run_sql("""
+        SELECT st.abbreviation AS state, t.year, t.legislature_status, t.trifecta_status
+        FROM trifectas t
+        JOIN states st ON t.state_id = st.id
+    """)
+    return seats, terms, switches, races, trifectas
+
+
+# ══════════════════════════════════════════════════════════════════════
+# CONTROL HISTORY
+# ══════════════════════════════════════════════════════════════════════
+
+def build_control_history(seats, timelines, index, trifecta_rows, years):
+    today = date.today().isoformat()
+    as_of = {y: min(f'{y}-{AS_OF}', today) for y in years}
+
+    gov_seat = {}
+    chambers_by_state = {}
+    for s in seats:
+        if s['chamber'] == 'Governor':
+            gov_seat.setdefault(s['state'], s['seat_id'])
+        elif (s['state'], s['chamber']) in timelines:
+            chambers_by_state.setdefault(s['state'], set()).add(s['chamber'])
+
+    table = {(r['state'], r['year']): r for r in trifecta_rows}
+    states = sorted(set(gov_seat) | set(chambers_by_state) | {r['state'] for r in trifecta_rows})
+
+    governors, legislatures, trifectas, chambers = {}, {}, {}, {}
+    for st in states:
+        for y in years:
+            day = as_of[y]
+            held = index.holder_on(gov_seat[st], day) if st in gov_seat else None
+            if held and held[0]:
+                governors.setdefault(st, {})[str(y)] = held[0]
+
+            controls = []
+            for ch in sorted(chambers_by_state.get(st, ())):
+                comp = timelines[(st, ch)].on(day)
+                if comp:
+                    chambers.setdefault(st, {}).setdefault(ch, {})[str(y)] = [
+                        comp.d, comp.r, comp.other, comp.vacant]
+                controls.append(control_of(comp))
+            row = table.get((st, y))
+            if controls and None not in controls:
+                leg = controls[0] if len(set(controls)) == 1 and controls[0] in ('D', 'R') else 'Split'
+            elif row and row['legislature_status']:
+                leg = TRIFECTA_ABBR[row['legislature_status']]
+            else:
+                leg = None
+            if leg:
+                legislatures.setdefault(st, {})[str(y)] = leg
+
+            if row:
+                tri = TRIFECTA_ABBR[row['trifecta_status']]
+            elif held and leg:
+                tri = leg if held[0] == leg and leg in ('D', 'R') else 'Split'
+            else:
+                tri = None
+            if tri:
+                trifectas.setdefault(st, {})[str(y)] = tri
+
+    national = {}
+    for y in years:
+        ys = str(y)
+        counts = {
+            'trifecta': {'d': 0, 'r': 0, 'split': 0},
+            'governor': {'d': 0, 'r': 0, 'other': 0},
+            'legislature': {'d': 0, 'r': 0, 'split': 0},
+        }
+        for st in states:
+            for key, source, rest in (('trifecta', trifectas, 'split'),
+                                      ('governor', governors, 'other'),
+                                      ('legislature', legislatures, 'split')):
+                v = source.get(st, {}).get(ys)
+                if v:
+                    counts[key][v.lower() if v in ('D', 'R') else rest] += 1
+        national[ys] = counts
+
+    return {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'year_range': [years[0], years[-1]],
+        'states': states,
+        'trifectas': trifectas,
+        'governors': governors,
+        'legislatures': legislatures,
+        'chambers': chambers,
+        'national': national,
+    }
+
+
+# ══════════════════════════════════════════════════════════════════════
+# FLIPS
+# ══════════════════════════════════════════════════════════════════════
+
+def _party(r):
+    return r.caucus if r.caucus and r.caucus != 'C' else r.party
+
+
+def _margin_pct(a, b, total):
+    if a.votes is None or b.votes is None or not total:
+        return None
+    return round((a.votes - b.votes) / total * 100, 2)
+
+
+def build_flips(races, switches, timelines, index, first_year):
+    flips, defeats, close_races = [], [], []
+    for rows in group_by(races, 'election_id').values():
+        e = rows[0]
+        if e.year < first_year:
+            continue
+        winners = [r for r in rows if r.result == 'Won']
+        total = e.total_votes_cast or sum(r.votes or 0 for r in rows)
+        base = {'state': e.state, 'chamber': e.chamber, 'district': e.district,
+                'year': e.year, 'type': e.election_type}
+
+        if len(winners) == 1 and e.election_type in FLIP_ELIGIBLE_TYPES:
+            w = winners[0]
+            to_party = _party(w)
+            runner_up = next((r for r in rows if r is not w), None)
+            inc = next((r for r in rows if r.is_incumbent), None)
+            if inc is not None:
+                if inc.result == 'Lost' and _party(inc) and to_party and _party(inc) != to_party:
+                    flips.append({**base, 'from_party': _party(inc), 'to_party': to_party,
+                                  'winner': w.name, 'loser': inc.name, 'is_open': False,
+                                  'margin_pct': _margin_pct(w, inc, total)})
+            else:
+                day = str(e.election_date)[:10] if e.election_date else f'{e.year}-11-01'
+                prev = index.holder_on(e.seat_id, day) or index.last_before(e.seat_id, day)
+                if prev and prev[0] and to_party and prev[0] != to_party:
+                    flips.append({**base, 'from_party': prev[0], 'to_party': to_party,
+                                  'winner': w.name,
+                                  'loser': runner_up.name if runner_up else None,
+                                  'is_open': True,
+                                  'margin_pct': _margin_pct(w, runner_up, total) if runner_up else None})
+
+        if 'Primary' in e.election_type:
+            for inc in rows:
+                if inc.is_incumbent and inc.result == 'Lost':
+                    challenger = next((r for r in rows if r.result in ('Won', 'Advanced')), None)
+                    defeats.append({**base, 'incumbent': inc.name, 'inc_party': inc.party,
+                                    'challenger': challenger.name if challenger else None})
+
+        # Top-two margin is meaningless for multi-member races
+        if len(winners) <= 1 and len(rows) >= 2 and rows[0].result in ('Won', 'Advanced', 'Runoff'):
+            a, b = rows[0], rows[1]
+            pct = _margin_pct(a, b, total)
+            if pct is not None and pct <= CLOSE_RACE_PCT:
+                close_races.append({**base, 'margin': a.votes - b.votes, 'margin_pct': pct,
+                                    'winner': a.name, 'winner_party': a.party,
+                                    'runner_up': b.name, 'runner_up_party': b.party,
+                                    'total_votes': total})
+
+    party_switches = []
+    for sw in switches:
+        if sw['switch_year'] < first_year:
+            continue
+        party_switches.append({
+            'state': sw['state'], 'chamber': sw['chamber'], 'district': sw['district'],
+            'name': sw['name'], 'year': sw['switch_year'],
+            'from_party': sw['old_party'], 'to_party': sw['new_party'],
+        })
+
+    chamber_flips = []
+    for (st, ch), tl in timelines.items():
+        if ch == 'Governor':
+            continue
+        for day, old, new, comp in tl.control_changes():
+            if int(day[:4]) < first_year:
+                continue
+            chamber_flips.append({'state': st, 'chamber': ch, 'date': day,
+                                  'year': int(day[:4]), 'from_control': old,
+                                  'to_control': new, 'd': comp.d, 'r': comp.r,
+                                  'other': comp.other, 'vacant': comp.vacant})
+
+    order = lambda x: (-x['year'], x['state'], x['chamber'] or '')
+    for lst in (flips, defeats, party_switches, close_races, chamber_flips):
+        lst.sort(key=order)
+
+    flips_by_year, directions = {}, {}
+    for f in flips:
+        flips_by_year[str(f['year'])] = flips_by_year.get(str(f['year']), 0) + 1
+        key = f"{f['from_party']}→{f['to_party']}"
+        directions[key] = directions.get(key, 0) + 1
+
+    return {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'summary': {
+            'total_flips': len(flips),
+            'total_incumbent_defeats': len(defeats),
+            'total_party_switches': len(party_switches),
+            'total_close_races': len(close_races),
+            'total_chamber_flips': len(chamber_flips),
+            'flips_by_year': dict(sorted(flips_by_year.items(), reverse=True)),
+            'flip_directions': dict(sorted(directions.items(), key=lambda kv: -kv[1])),
+        },
+        'flips': flips,
+        'incumbent_defeats': defeats,
+        'party_switches': party_switches,
+        'close_races': close_races,
+        'chamber_flips': chamber_flips,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export control history and flip summaries')
+    parser.add_argument('--first-year', type=int, default=FIRST_YEAR,
+                        help=f'First year exported (default {FIRST_YEAR})')
+    parser.add_argument('--dry-run', action='store_true', help='Print summary, do not write JSON')
+    args = parser.parse_args()
+
+    t0 = time.time()
+    seats, terms, switches, races, trifecta_rows = load_data()
+    print(f'Loaded {len(seats):,} seats, {len(terms):,} terms, {len(switches):,} switches, '
+          f'{len(races):,} candidacies in {time.time() - t0:.1f}s')
+
+    t1 = time.time()
+    # Switches with a known seat only; the rest can't be placed in a chamber.
+    timelines, index = build_timelines(
+        seats, terms, [sw for sw in switches if sw['seat_id'] and switch_date_of(sw)])
+    years = list(range(args.first_year, date.today().year + 1))
+    control = build_control_history(seats, timelines, index, trifecta_rows, years)
+    flips = build_flips(races, switches, timelines, index, args.first_year)
+    print(f'Built {len(timelines)} timelines and summaries in {time.time() - t1:.2f}s')
+
+    s = flips['summary']
+    print(f"  {len(control['states'])} states, years {years[0]}–{years[-1]}")
+    print(f"  flips: {s['total_flips']}  incumbent defeats: {s['total_incumbent_defeats']}  "
+          f"switches: {s['total_party_switches']}  close: {s['total_close_races']}  "
+          f"chamber flips: {s['total_chamber_flips']}")
+    print(f'  Peak RSS {peak_rss_mb():.0f} MB')
+
+    if args.dry_run:
+        print('\n[DRY RUN] No files written.')
+        return
+
+    os.makedirs(SITE_DATA_DIR, exist_ok=True)
+    for path, data in ((CONTROL_FILE, control), (FLIPS_FILE, flips)):
+        with open(path, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+        print(f'Wrote {path} ({os.path.getsize(path) / 1024:.0f} KB)')
+
+
+if __name__ == '__main__':
+    main()
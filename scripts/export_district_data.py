@@ -9,11 +9,11 @@ Usage:
     python3 scripts/export_district_data.py                  # Export all 50 states
     python3 scripts/export_district_data.py --state PA       # Single state
     python3 scripts/export_district_data.py --dry-run        # Show queries only
+    python3 scripts/export_district_data.py --profile        # Also write a timing report (see profiling.py)
 """
 
 import sys
 import os
-import json
 import time
 import argparse
 import math
@@ -22,6 +22,9 @@ from datetime import datetime
 import httpx
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
 from db_config import TOKEN, PROJECT_REF, API_URL
+import profiling
+from site_model import Election, Candidacy, SeatTerm, PartySwitch, group_by, peak_rss_mb
+from recount import RecountBatch
 
 SITE_DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'site', 'data')
 
@@ -32,153 +35,29 @@ MIN_EXPORT_YEAR = {
     'NE': 2014,  # 2010/2012 loser caucus data unverified (no Wikipedia source)
 }
 
-# ── Recount threshold rules by state ──────────────────────────────────
-# States with official margin-based recount thresholds (automatic or
-# mandatory-to-grant when requested). Researched from NCSL, Ballotpedia,
-# and state statutes. Format: { state: { 'statewide': pct, 'legislative': pct } }
-#
-# States NOT listed here use the CLOSE_RACE_PCT fallback (1%).
-# These include: states with no recount provision (IL, MS, TN), states
-# where recounts are purely candidate-requested with no margin limit
-# (AR, CA, IN, LA, NV, NH, NJ, OK, WV), and states with tie-only
-# automatic recounts (AK, ME, MT, SD, TX, UT, VT).
-RECOUNT_THRESHOLDS = {
-    # Automatic recount states
-    'AL': {'statewide': 0.5, 'legislative': 0.5},
-    'AZ': {'statewide': 0.5, 'legislative': 0.5},   # Changed from 0.1% to 0.5% in 2022
-    'CO': {'statewide': 0.5, 'legislative': 0.5},
-    'CT': {'statewide': 0.5, 'legislative': 0.5},
-    'DE': {'statewide': 0.5, 'legislative': 0.5},
-    'FL': {'statewide': 0.5, 'legislative': 0.5},    # 0.5% machine, 0.25% manual
-    'HI': {'statewide': 0.25, 'legislative': 0.25},
-    'KY': {'statewide': 0.5, 'legislative': 0.5},
-    'MI': {'statewide': 0.1, 'legislative': 0.1},    # Fixed: 0.1% statewide; legislative uses fixed vote counts but ~0.1% equivalent
-    'NE': {'statewide': 1.0, 'legislative': 1.0},    # 1% for >500 votes; 2% for <=500
-    'NM': {'statewide': 0.25, 'legislative': 1.0},
-    'NY': {'statewide': 0.5, 'legislative': 0.5},
-    'ND': {'statewide': 0.5, 'legislative': 0.5},
-    'OH': {'statewide': 0.25, 'legislative': 0.5},
-    'OR': {'statewide': 0.2, 'legislative': 0.2},
-    'SC': {'statewide': 1.0, 'legislative': 1.0},
-    'WA': {'statewide': 0.5, 'legislative': 0.5},
-    'WY': {'statewide': 1.0, 'legislative': 1.0},
-    # Candidate-requested but mandatory to grant at threshold
-    'GA': {'statewide': 0.5, 'legislative': 0.5},    # Fixed: 0.5% all races (requested, not automatic)
-    'ID': {'statewide': 0.5, 'legislative': 0.5},
-    'IA': {'statewide': 1.0, 'legislative': 1.0},
-    'KS': {'statewide': 0.5, 'legislative': 0.5},    # State pays if <=0.5%
-    'MA': {'statewide': 0.5, 'legislative': 0.5},
-    'MD': {'statewide': 0.1, 'legislative': 0.1},    # Any candidate can request; state pays if <=0.1%
-    'MN': {'statewide': 0.25, 'legislative': 0.5},
-    'MO': {'statewide': 0.5, 'legislative': 1.0},
-    'NC': {'statewide': 0.5, 'legislative': 1.0},
-    'PA': {'statewide': 0.5, 'legislative': 0.5},
-    'VA': {'statewide': 1.0, 'legislative': 1.0},
-    'WI': {'statewide': 0.25, 'legislative': 0.25},  # Fixed: state pays if <=0.25%
-}
-
-# Close-race threshold for states without a specific margin-based rule
-# (e.g. AR where any candidate can request a recount regardless of margin).
-# Flags races under 1% as "close" — not a legal threshold, just notable.
-CLOSE_RACE_PCT = 1.0
-
-
-def _check_recount_eligible(state_abbr, candidates, total_votes, election_type, result_status):
-    """
-    Check if an election result is within recount threshold or triggered a runoff.
-
-    Three badge types:
-    - 'runoff_triggered': top candidates both advancing to runoff (margin irrelevant)
-    - 'recount': margin within official state threshold (advancing vs eliminated)
-    - 'close_race': margin within 1% fallback for states without thresholds
-
-    Only flags races with 'Called' or 'Unofficial' result_status (not Certified).
-    Returns a dict with badge info if eligible, None otherwise.
-    """
-    if not total_votes or total_votes == 0:
-        return None
-    if result_status not in ('Called', 'Unofficial'):
-        return None
-
-    # Sort by votes descending
-    sorted_cands = sorted(
-        [c for c in candidates if c.get('votes') and c['votes'] > 0],
-        key=lambda c: c['votes'], reverse=True)
-    if len(sorted_cands) < 2:
-        return None
-
-    # Check for runoff scenario: if top candidates both have result='Runoff',
-    # the margin between them doesn't affect who advances.
-    runoff_cands = [c for c in sorted_cands if c.get('result') == 'Runoff']
-    if len(runoff_cands) >= 2:
-        # Runoff triggered — show badge with margin between the runoff candidates
-        r_margin = runoff_cands[0]['votes'] - runoff_cands[-1]['votes']
-        r_margin_pct = (r_margin / total_votes) * 100
-        # Also check if there's a close margin between last advancing and first
-        # eliminated candidate (that's where a recount would actually matter)
-        eliminated = [c for c in sorted_cands if c.get('result') not in ('Runoff', 'Won', 'Advanced')]
-        if eliminated:
-            cutoff_margin = runoff_cands[-1]['votes'] - eliminated[0]['votes']
-            cutoff_pct = (cutoff_margin / total_votes) * 100
-        else:
-            cutoff_margin = None
-            cutoff_pct = None
-        return {
-            'type': 'runoff_triggered',
-            'margin': r_margin,
-            'margin_pct': round(r_margin_pct, 2),
-            'cutoff_margin': cutoff_margin,
-            'cutoff_margin_pct': round(cutoff_pct, 2) if cutoff_pct is not None else None,
-        }
 
-    # Standard recount/close-race check using top-2 margin
-    margin = sorted_cands[0]['votes'] - sorted_cands[1]['votes']
-    margin_pct = (margin / total_votes) * 100
-
-    thresholds = RECOUNT_THRESHOLDS.get(state_abbr)
-
-    if thresholds:
-        # Official threshold state
-        is_statewide = election_type in ('General',) and 'Statewide' in str(candidates)
-        key = 'statewide' if is_statewide else 'legislative'
-        threshold = thresholds.get(key)
-        if threshold is not None and margin_pct <= threshold:
-            return {
-                'type': 'recount',
-                'margin': margin,
-                'margin_pct': round(margin_pct, 2),
-                'threshold_pct': threshold,
-            }
-    else:
-        # No official threshold — use close-race fallback
-        if margin_pct <= CLOSE_RACE_PCT:
-            return {
-                'type': 'close_race',
-                'margin': margin,
-                'margin_pct': round(margin_pct, 2),
-                'threshold_pct': CLOSE_RACE_PCT,
-            }
-
-    return None
-
-
-def run_sql(query, retries=5):
-    for attempt in range(retries):
-        resp = httpx.post(
-            f'https://api.supabase.com/v1/projects/{PROJECT_REF}/database/query',
-            headers={'Authorization': f'Bearer {TOKEN}', 'Content-Type': 'application/json'},
-            json={'query': query},
-            timeout=120
-        )
-        if resp.status_code == 201:
-            return resp.json()
-        if resp.status_code == 429 and attempt < retries - 1:
-            wait = 10 * (attempt + 1)
-            print(f'  Rate limited, waiting {wait}s...')
-            time.sleep(wait)
-            continue
-        print(f'SQL ERROR: {resp.status_code} - {resp.text[:500]}')
-        sys.exit(1)
+def run_sql(query, retries=5, record=None):
+    """Run a query. With record=<site_model type>, rows decode straight into records."""
+    with profiling.span('query', profiling.query_label(query)):
+        for attempt in range(retries):
+            resp = httpx.post(
+                f'https://api.supabase.com/v1/projects/{PROJECT_REF}/database/query',
+                headers={'Authorization': f'Bearer {TOKEN}', 'Content-Type': 'application/json'},
+                json={'query': query},
+                timeout=120
+            )
+            profiling.record_response(resp)
+            if resp.status_code == 201:
+                rows = record.from_json(resp.content) if record else resp.json()
+                profiling.count('rows', len(rows))
+                return rows
+            if resp.status_code == 429 and attempt < retries - 1:
+                wait = 10 * (attempt + 1)
+                print(f'  Rate limited, waiting {wait}s...')
+                time.sleep(wait)
+                continue
+            print(f'SQL ERROR: {resp.status_code} - {resp.text[:500]}')
+            sys.exit(1)
 
 def export_all_districts(dry_run=False, single_state=None):
     """Export district data for all states using bulk queries."""
@@ -523,27 +402,27 @@ def export_all_districts(dry_run=False, single_state=None):
     print('  Running 13 bulk queries...')
     districts_data = run_sql(q_districts)
     print(f'    1/13 districts+seats: {len(districts_data)} rows')
-    elections_data = run_sql(q_elections)
+    elections_data = run_sql(q_elections, record=Election)
     print(f'    2/13 elections: {len(elections_data)} rows')
-    candidacies_data = run_sql(q_candidacies)
+    candidacies_data = run_sql(q_candidacies, record=Candidacy)
     print(f'    3/13 candidacies: {len(candidacies_data)} rows')
-    terms_data = run_sql(q_terms)
+    terms_data = run_sql(q_terms, record=SeatTerm)
     print(f'    4/13 seat_terms: {len(terms_data)} rows')
     states_data = run_sql(q_states)
     print(f'    5/13 states: {len(states_data)} rows')
     forecasts_data = run_sql(q_forecasts)
     print(f'    6/13 forecasts: {len(forecasts_data)} rows')
-    switches_data = run_sql(q_switches)
+    switches_data = run_sql(q_switches, record=PartySwitch)
     print(f'    7/13 party_switches: {len(switches_data)} rows')
     old_districts_data = run_sql(q_old_districts)
     print(f'    8/13 old-era districts: {len(old_districts_data)} rows')
-    old_elections_data = run_sql(q_old_elections)
+    old_elections_data = run_sql(q_old_elections, record=Election)
     print(f'    9/13 old-era elections: {len(old_elections_data)} rows')
-    old_candidacies_data = run_sql(q_old_candidacies)
+    old_candidacies_data = run_sql(q_old_candidacies, record=Candidacy)
     print(f'    10/13 old-era candidacies: {len(old_candidacies_data)} rows')
-    old_terms_data = run_sql(q_old_terms)
+    old_terms_data = run_sql(q_old_terms, record=SeatTerm)
     print(f'    11/13 old-era seat_terms: {len(old_terms_data)} rows')
-    old_switches_data = run_sql(q_old_switches)
+    old_switches_data = run_sql(q_old_switches, record=PartySwitch)
     print(f'    12/13 old-era party_switches: {len(old_switches_data)} rows')
     redistricting_data = run_sql(q_redistricting)
     print(f'    13/13 redistricting cycles: {len(redistricting_data)} rows')
@@ -564,22 +443,17 @@ def export_all_districts(dry_run=False, single_state=None):
     states_info = {r['abbreviation']: r for r in states_data}
 
     # Elections indexed by seat_id
-    elections_by_seat = {}
-    for r in elections_data:
-        elections_by_seat.setdefault(r['seat_id'], []).append(r)
+    elections_by_seat = group_by(elections_data, 'seat_id')
 
     # Candidacies indexed by election_id
-    candidacies_by_election = {}
-    for r in candidacies_data:
-        candidacies_by_election.setdefault(r['election_id'], []).append(r)
+    candidacies_by_election = group_by(candidacies_data, 'election_id')
 
     # All terms indexed by seat_id (list), plus current holder (end_date IS NULL)
-    all_terms_by_seat = {}
+    all_terms_by_seat = group_by(terms_data, 'seat_id')
     current_term_by_seat = {}
     for r in terms_data:
-        all_terms_by_seat.setdefault(r['seat_id'], []).append(r)
-        if r['end_date'] is None:
-            current_term_by_seat[r['seat_id']] = r
+        if r.end_date is None:
+            current_term_by_seat[r.seat_id] = r
 
     # Forecasts indexed by seat_id
     forecasts_by_seat = {}
@@ -590,31 +464,21 @@ def export_all_districts(dry_run=False, single_state=None):
         })
 
     # Party switches indexed by seat_id
-    switches_by_seat = {}
-    for r in switches_data:
-        switches_by_seat.setdefault(r['seat_id'], []).append(r)
+    switches_by_seat = group_by(switches_data, 'seat_id')
 
     # --- Index old-era data ---
 
     # Old-era elections indexed by seat_id
-    old_elections_by_seat = {}
-    for r in old_elections_data:
-        old_elections_by_seat.setdefault(r['seat_id'], []).append(r)
+    old_elections_by_seat = group_by(old_elections_data, 'seat_id')
 
     # Old-era candidacies indexed by election_id
-    old_candidacies_by_election = {}
-    for r in old_candidacies_data:
-        old_candidacies_by_election.setdefault(r['election_id'], []).append(r)
+    old_candidacies_by_election = group_by(old_candidacies_data, 'election_id')
 
     # Old-era terms indexed by seat_id
-    old_terms_by_seat = {}
-    for r in old_terms_data:
-        old_terms_by_seat.setdefault(r['seat_id'], []).append(r)
+    old_terms_by_seat = group_by(old_terms_data, 'seat_id')
 
     # Old-era party switches indexed by seat_id
-    old_switches_by_seat = {}
-    for r in old_switches_data:
-        old_switches_by_seat.setdefault(r['seat_id'], []).append(r)
+    old_switches_by_seat = group_by(old_switches_data, 'seat_id')
 
     # Build old-era district info: (state, chamber, district_number) -> {num_seats, cycle, seat_ids}
     old_district_info = {}  # (state, chamber, district_number) -> dict
@@ -637,6 +501,7 @@ def export_all_districts(dry_run=False, single_state=None):
     # --- Group districts by state, then by district_id ---
     # Multiple seats can share the same district (multi-member)
     districts_by_state = {}
+    recounts = RecountBatch('legislative')
     for r in districts_data:
         state = r['state']
         did = r['district_id']
@@ -730,12 +595,9 @@ def export_all_districts(dry_run=False, single_state=None):
                 elec_obj['precincts_reporting'] = e['precincts_reporting']
                 elec_obj['precincts_total'] = e['precincts_total']
 
-            # Check for potential recount eligibility
-            recount_flag = _check_recount_eligible(
-                state, candidate_list, e['total_votes_cast'],
-                e['election_type'], e.get('result_status'))
-            if recount_flag:
-                elec_obj['recount_eligible'] = recount_flag
+            # Recount eligibility — evaluated for the whole export below
+            recounts.add(elec_obj, state, candidate_list,
+                         e['total_votes_cast'], e.get('result_status'))
 
             # Check for incumbent defeated in primary
             if 'Primary' in e['election_type']:
@@ -823,6 +685,7 @@ def export_all_districts(dry_run=False, single_state=None):
         if r.get('raw_caucus') == 'C':
             seat_obj['raw_caucus'] = 'C'
         districts_by_state[state][did]['seats'].append(seat_obj)
+    recounts.apply()
 
     # --- Helper: build election/term/switch objects from old-era seat data ---
     def build_old_era_elections(seat_ids, state):
@@ -1217,24 +1080,27 @@ def export_all_districts(dry_run=False, single_state=None):
         }
 
         out_path = os.path.join(out_dir, f'{state}.json')
-        with open(out_path, 'w') as f:
-            json.dump(result, f, separators=(',', ':'))  # compact — these files can be large
+        profiling.write_json(out_path, result, separators=(',', ':'))  # compact — these files can be large
         size_kb = os.path.getsize(out_path) / 1024
         print(f'    {state}: {len(district_list)} districts, {size_kb:.0f} KB')
 
     print(f'\n  Total: {total_districts} districts, {total_elections} election records')
     print(f'  Written to {out_dir}/')
+    print(f'  Peak RSS: {peak_rss_mb():.0f} MB')
 
 def main():
     parser = argparse.ArgumentParser(description='Export district data for site pages')
     parser.add_argument('--dry-run', action='store_true')
     parser.add_argument('--state', type=str, help='Single state (2-letter abbreviation)')
+    profiling.add_arguments(parser)
     args = parser.parse_args()
+    profiling.configure(args, 'export_district_data')
 
-    if args.state:
-        export_all_districts(dry_run=args.dry_run, single_state=args.state.upper())
-    else:
-        export_all_districts(dry_run=args.dry_run)
+    with profiling.stage(args.state.upper() if args.state else 'all_states'):
+        if args.state:
+            export_all_districts(dry_run=args.dry_run, single_state=args.state.upper())
+        else:
+            export_all_districts(dry_run=args.dry_run)
 
     print('\nDone.')
 
@@ -22,69 +22,10 @@ from datetime import datetime
 import httpx
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
 from db_config import TOKEN, PROJECT_REF, API_URL
+from recount import RecountBatch
 
 SITE_DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'site', 'data')
 
-# Import recount thresholds and close-race constant from district export
-from export_district_data import RECOUNT_THRESHOLDS, CLOSE_RACE_PCT
-
-
-def _check_recount_eligible(state_abbr, candidates, total_votes, election_type, result_status):
-    """Check if a governor election is within recount threshold or triggered a runoff."""
-    if not total_votes or total_votes == 0:
-        return None
-    if result_status not in ('Called', 'Unofficial'):
-        return None
-
-    sorted_cands = sorted(
-        [c for c in candidates if c.get('votes') and c['votes'] > 0],
-        key=lambda c: c['votes'], reverse=True)
-    if len(sorted_cands) < 2:
-        return None
-
-    # Runoff scenario
-    runoff_cands = [c for c in sorted_cands if c.get('result') == 'Runoff']
-    if len(runoff_cands) >= 2:
-        r_margin = runoff_cands[0]['votes'] - runoff_cands[-1]['votes']
-        r_margin_pct = (r_margin / total_votes) * 100
-        eliminated = [c for c in sorted_cands if c.get('result') not in ('Runoff', 'Won', 'Advanced')]
-        cutoff_margin = cutoff_pct = None
-        if eliminated:
-            cutoff_margin = runoff_cands[-1]['votes'] - eliminated[0]['votes']
-            cutoff_pct = (cutoff_margin / total_votes) * 100
-        return {
-            'type': 'runoff_triggered',
-            'margin': r_margin,
-            'margin_pct': round(r_margin_pct, 2),
-            'cutoff_margin': cutoff_margin,
-            'cutoff_margin_pct': round(cutoff_pct, 2) if cutoff_pct is not None else None,
-        }
-
-    # Standard recount/close-race check
-    margin = sorted_cands[0]['votes'] - sorted_cands[1]['votes']
-    margin_pct = (margin / total_votes) * 100
-
-    thresholds = RECOUNT_THRESHOLDS.get(state_abbr)
-    if thresholds:
-        threshold = thresholds.get('statewide')  # Governor is statewide
-        if threshold is not None and margin_pct <= threshold:
-            return {
-                'type': 'recount',
-                'margin': margin,
-                'margin_pct': round(margin_pct, 2),
-                'threshold_pct': threshold,
-            }
-    else:
-        if margin_pct <= CLOSE_RACE_PCT:
-            return {
-                'type': 'close_race',
-                'margin': margin,
-                'margin_pct': round(margin_pct, 2),
-                'threshold_pct': CLOSE_RACE_PCT,
-            }
-
-    return None
-
 
 def run_sql(query, retries=5):
     for attempt in range(retries):
@@ -354,6 +295,7 @@ def export_governor_pages(dry_run=False, single_state=None):
 
     total_terms = 0
     total_elections = 0
+    recounts = RecountBatch('statewide')
 
     for state, seat in sorted(seats_by_state.items()):
         terms = terms_by_state.get(state, [])
@@ -462,11 +404,8 @@ def export_governor_pages(dry_run=False, single_state=None):
             # --- Badge computations ---
 
             # Recount / close-race / runoff-triggered
-            recount_flag = _check_recount_eligible(
-                state, candidate_list, e['total_votes_cast'],
-                e['election_type'], e.get('result_status'))
-            if recount_flag:
-                elec_obj['recount_eligible'] = recount_flag
+            recounts.add(elec_obj, state, candidate_list,
+                         e['total_votes_cast'], e.get('result_status'))
 
             # Incumbent defeated in primary
             if 'Primary' in e['election_type']:
@@ -511,6 +450,7 @@ def export_governor_pages(dry_run=False, single_state=None):
                             }
 
             elections_list.append(elec_obj)
+        recounts.apply()
 
         # Current governor (first term with no end_date)
         current_gov = None
@@ -13,10 +13,10 @@ Usage:
     python3 scripts/export_site_data.py --margins-only    # Just pres_margins.json
     python3 scripts/export_site_data.py --states-only     # Just all 50 state detail JSONs
     python3 scripts/export_site_data.py --dry-run         # Print queries, don't write
+    python3 scripts/export_site_data.py --profile         # Also write a timing report (see profiling.py)
 """
 import sys
 import os
-import json
 import time
 import argparse
 import math
@@ -26,6 +26,7 @@ import httpx
 import sys as _sys, os as _os
 _sys.path.insert(0, _os.path.join(_os.path.dirname(_os.path.abspath(__file__)), '..'))
 from db_config import TOKEN, PROJECT_REF, API_URL
+import profiling
 
 SITE_DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'site', 'data')
 
@@ -37,24 +38,28 @@ EP = ("CASE WHEN s.current_holder_caucus = 'C' THEN s.current_holder_party "
       "ELSE COALESCE(s.current_holder_caucus, s.current_holder_party) END")
 
 def run_sql(query, exit_on_error=True, retries=5):
-    for attempt in range(retries):
-        resp = httpx.post(
-            f'https://api.supabase.com/v1/projects/{PROJECT_REF}/database/query',
-            headers={'Authorization': f'Bearer {TOKEN}', 'Content-Type': 'application/json'},
-            json={'query': query},
-            timeout=120
-        )
-        if resp.status_code == 201:
-            return resp.json()
-        if resp.status_code == 429 and attempt < retries - 1:
-            wait = 10 * (attempt + 1)
-            print(f'  Rate limited, waiting {wait}s...')
-            time.sleep(wait)
-            continue
-        print(f'SQL ERROR: {resp.status_code} - {resp.text[:500]}')
-        if exit_on_error:
-            sys.exit(1)
-        return None
+    with profiling.span('query', profiling.query_label(query)):
+        for attempt in range(retries):
+            resp = httpx.post(
+                f'https://api.supabase.com/v1/projects/{PROJECT_REF}/database/query',
+                headers={'Authorization': f'Bearer {TOKEN}', 'Content-Type': 'application/json'},
+                json={'query': query},
+                timeout=120
+            )
+            profiling.record_response(resp)
+            if resp.status_code == 201:
+                rows = resp.json()
+                profiling.count('rows', len(rows))
+                return rows
+            if resp.status_code == 429 and attempt < retries - 1:
+                wait = 10 * (attempt + 1)
+                print(f'  Rate limited, waiting {wait}s...')
+                time.sleep(wait)
+                continue
+            print(f'SQL ERROR: {resp.status_code} - {resp.text[:500]}')
+            if exit_on_error:
+                sys.exit(1)
+            return None
 
 LOWER_CHAMBER_NAMES = {
     'CA': 'Assembly', 'NV': 'Assembly', 'NY': 'Assembly', 'WI': 'Assembly', 'NJ': 'Assembly',
@@ -481,8 +486,7 @@ def export_states_summary(dry_run=False):
 
     out_path = os.path.join(SITE_DATA_DIR, 'states_summary.json')
     os.makedirs(os.path.dirname(out_path), exist_ok=True)
-    with open(out_path, 'w') as f:
-        json.dump(result, f, indent=2)
+    profiling.write_json(out_path, result, indent=2)
     print(f'  Written {out_path} ({len(states)} states)')
 
 def export_pres_margins(dry_run=False):
@@ -534,8 +538,7 @@ def export_pres_margins(dry_run=False):
     }
 
     out_path = os.path.join(SITE_DATA_DIR, 'pres_margins.json')
-    with open(out_path, 'w') as f:
-        json.dump(result, f)  # No indent — this file is ~500KB
+    profiling.write_json(out_path, result)  # No indent — this file is ~500KB
     print(f'  Written {out_path} ({len(districts)} seats)')
 
 def export_state_detail(state_abbr, dry_run=False):
@@ -956,8 +959,7 @@ def export_state_detail(state_abbr, dry_run=False):
 
     out_path = os.path.join(SITE_DATA_DIR, 'states', f'{state_abbr}.json')
     os.makedirs(os.path.dirname(out_path), exist_ok=True)
-    with open(out_path, 'w') as f:
-        json.dump(result, f, indent=2)
+    profiling.write_json(out_path, result, indent=2)
     print(f'  Written {out_path}')
 
 def export_all_state_details(dry_run=False):
@@ -1392,8 +1394,7 @@ def export_all_state_details(dry_run=False):
         }
 
         out_path = os.path.join(out_dir, f'{abbr}.json')
-        with open(out_path, 'w') as f:
-            json.dump(result, f, indent=2)
+        profiling.write_json(out_path, result, indent=2)
 
     print(f'  Written 50 state files to {out_dir}/')
 
@@ -1470,8 +1471,7 @@ def export_ballot_measures(dry_run=False):
     }
 
     out_path = os.path.join(SITE_DATA_DIR, 'ballot_measures.json')
-    with open(out_path, 'w') as f:
-        json.dump(result, f, indent=2)
+    profiling.write_json(out_path, result, indent=2)
     print(f'  Written {out_path} ({len(measures)} measures)')
 
 def main():
@@ -1482,7 +1482,9 @@ def main():
     parser.add_argument('--margins-only', action='store_true', help='Only export pres_margins.json')
     parser.add_argument('--states-only', action='store_true', help='Only export all 50 state detail JSONs')
     parser.add_argument('--measures-only', action='store_true', help='Only export ballot_measures.json')
+    profiling.add_arguments(parser)
     args = parser.parse_args()
+    profiling.configure(args, 'export_site_data')
 
     os.makedirs(SITE_DATA_DIR, exist_ok=True)
     os.makedirs(os.path.join(SITE_DATA_DIR, 'states'), exist_ok=True)
@@ -1491,20 +1493,29 @@ def main():
         print('DRY RUN MODE')
 
     if args.state:
-        export_state_detail(args.state.upper(), dry_run=args.dry_run)
+        with profiling.stage(f'state_detail_{args.state.upper()}'):
+            export_state_detail(args.state.upper(), dry_run=args.dry_run)
     elif args.summary_only:
-        export_states_summary(dry_run=args.dry_run)
+        with profiling.stage('states_summary'):
+            export_states_summary(dry_run=args.dry_run)
     elif args.margins_only:
-        export_pres_margins(dry_run=args.dry_run)
+        with profiling.stage('pres_margins'):
+            export_pres_margins(dry_run=args.dry_run)
     elif args.states_only:
-        export_all_state_details(dry_run=args.dry_run)
+        with profiling.stage('state_details'):
+            export_all_state_details(dry_run=args.dry_run)
     elif args.measures_only:
-        export_ballot_measures(dry_run=args.dry_run)
+        with profiling.stage('ballot_measures'):
+            export_ballot_measures(dry_run=args.dry_run)
     else:
-        export_states_summary(dry_run=args.dry_run)
-        export_pres_margins(dry_run=args.dry_run)
-        export_all_state_details(dry_run=args.dry_run)
-        export_ballot_measures(dry_run=args.dry_run)
+        with profiling.stage('states_summary'):
+            export_states_summary(dry_run=args.dry_run)
+        with profiling.stage('pres_margins'):
+            export_pres_margins(dry_run=args.dry_run)
+        with profiling.stage('state_details'):
+            export_all_state_details(dry_run=args.dry_run)
+        with profiling.stage('ballot_measures'):
+            export_ballot_measures(dry_run=args.dry_run)
 
     print('\nDone.')
 
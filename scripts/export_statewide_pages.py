@@ -15,11 +15,11 @@ Usage:
     python3 scripts/export_statewide_pages.py --office ag              # AG only
     python3 scripts/export_statewide_pages.py --office ltgov --state PA  # Single office + state
     python3 scripts/export_statewide_pages.py --dry-run                # Show queries only
+    python3 scripts/export_statewide_pages.py --profile                # Also write a timing report
 """
 
 import sys
 import os
-import json
 import time
 import argparse
 from datetime import datetime
@@ -27,51 +27,11 @@ from datetime import datetime
 import httpx
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
 from db_config import TOKEN, PROJECT_REF, API_URL
+import profiling
+from recount import RecountBatch
 
 SITE_DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'site', 'data')
 
-# Import recount thresholds and close-race constant from district export
-from export_district_data import RECOUNT_THRESHOLDS, CLOSE_RACE_PCT
-
-
-def _check_recount_eligible(state_abbr, candidates, total_votes, election_type, result_status):
-    """Check if an election is within recount threshold or triggered a runoff."""
-    if not total_votes or total_votes == 0:
-        return None
-    if result_status not in ('Called', 'Unofficial'):
-        return None
-    sorted_cands = sorted(
-        [c for c in candidates if c.get('votes') and c['votes'] > 0],
-        key=lambda c: c['votes'], reverse=True)
-    if len(sorted_cands) < 2:
-        return None
-    runoff_cands = [c for c in sorted_cands if c.get('result') == 'Runoff']
-    if len(runoff_cands) >= 2:
-        r_margin = runoff_cands[0]['votes'] - runoff_cands[-1]['votes']
-        r_margin_pct = (r_margin / total_votes) * 100
-        eliminated = [c for c in sorted_cands if c.get('result') not in ('Runoff', 'Won', 'Advanced')]
-        cutoff_margin = cutoff_pct = None
-        if eliminated:
-            cutoff_margin = runoff_cands[-1]['votes'] - eliminated[0]['votes']
-            cutoff_pct = (cutoff_margin / total_votes) * 100
-        return {
-            'type': 'runoff_triggered', 'margin': r_margin,
-            'margin_pct': round(r_margin_pct, 2), 'cutoff_margin': cutoff_margin,
-            'cutoff_margin_pct': round(cutoff_pct, 2) if cutoff_pct is not None else None,
-        }
-    margin = sorted_cands[0]['votes'] - sorted_cands[1]['votes']
-    margin_pct = (margin / total_votes) * 100
-    thresholds = RECOUNT_THRESHOLDS.get(state_abbr)
-    if thresholds:
-        threshold = thresholds.get('statewide')
-        if threshold is not None and margin_pct <= threshold:
-            return {'type': 'recount', 'margin': margin, 'margin_pct': round(margin_pct, 2), 'threshold_pct': threshold}
-    else:
-        if margin_pct <= CLOSE_RACE_PCT:
-            return {'type': 'close_race', 'margin': margin, 'margin_pct': round(margin_pct, 2), 'threshold_pct': CLOSE_RACE_PCT}
-    return None
-
-
 # Office type mapping: CLI key -> (DB office_type, output directory, display name)
 OFFICE_TYPES = {
     'ag': ('Attorney General', 'ag', 'Attorney General'),
@@ -81,22 +41,26 @@ OFFICE_TYPES = {
 
 
 def run_sql(query, retries=5):
-    for attempt in range(retries):
-        resp = httpx.post(
-            f'https://api.supabase.com/v1/projects/{PROJECT_REF}/database/query',
-            headers={'Authorization': f'Bearer {TOKEN}', 'Content-Type': 'application/json'},
-            json={'query': query},
-            timeout=120
-        )
-        if resp.status_code == 201:
-            return resp.json()
-        if resp.status_code == 429 and attempt < retries - 1:
-            wait = 10 * (attempt + 1)
-            print(f'  Rate limited, waiting {wait}s...')
-            time.sleep(wait)
-            continue
-        print(f'SQL ERROR: {resp.status_code} - {resp.text[:500]}')
-        sys.exit(1)
+    with profiling.span('query', profiling.query_label(query)):
+        for attempt in range(retries):
+            resp = httpx.post(
+                f'https://api.supabase.com/v1/projects/{PROJECT_REF}/database/query',
+                headers={'Authorization': f'Bearer {TOKEN}', 'Content-Type': 'application/json'},
+                json={'query': query},
+                timeout=120
+            )
+            profiling.record_response(resp)
+            if resp.status_code == 201:
+                rows = resp.json()
+                profiling.count('rows', len(rows))
+                return rows
+            if resp.status_code == 429 and attempt < retries - 1:
+                wait = 10 * (attempt + 1)
+                print(f'  Rate limited, waiting {wait}s...')
+                time.sleep(wait)
+                continue
+            print(f'SQL ERROR: {resp.status_code} - {resp.text[:500]}')
+            sys.exit(1)
 
 
 def export_statewide_pages(office_key, dry_run=False, single_state=None):
@@ -344,6 +308,7 @@ def export_statewide_pages(office_key, dry_run=False, single_state=None):
 
     total_terms = 0
     total_elections = 0
+    recounts = RecountBatch('statewide')
 
     for state, seat in sorted(seats_by_state.items()):
         terms = terms_by_state.get(state, [])
@@ -446,11 +411,8 @@ def export_statewide_pages(office_key, dry_run=False, single_state=None):
                 elec_obj['notes'] = e['notes']
 
             # --- Badge computations ---
-            recount_flag = _check_recount_eligible(
-                state, candidate_list, e['total_votes_cast'],
-                e['election_type'], e.get('result_status'))
-            if recount_flag:
-                elec_obj['recount_eligible'] = recount_flag
+            recounts.add(elec_obj, state, candidate_list,
+                         e['total_votes_cast'], e.get('result_status'))
 
             if 'Primary' in e['election_type']:
                 inc_lost = [c for c in candidate_list
@@ -480,6 +442,7 @@ def export_statewide_pages(office_key, dry_run=False, single_state=None):
                             elec_obj['flipped_seat'] = {'from': prev_party, 'to': winner_party}
 
             elections_list.append(elec_obj)
+        recounts.apply()
 
         # Current holder (first term with no end_date)
         current_holder = None
@@ -577,8 +540,7 @@ def export_statewide_pages(office_key, dry_run=False, single_state=None):
         }
 
         out_path = os.path.join(out_dir, f'{state}.json')
-        with open(out_path, 'w') as f:
-            json.dump(result, f, separators=(',', ':'))
+        profiling.write_json(out_path, result, separators=(',', ':'))
         size_kb = os.path.getsize(out_path) / 1024
         print(f'    {state}: {len(timeline)} terms, {len(elections_list)} elections, {size_kb:.1f} KB')
 
@@ -815,8 +777,7 @@ def export_statewide_dashboard(office_key, dry_run=False):
 
     os.makedirs(SITE_DATA_DIR, exist_ok=True)
     outpath = os.path.join(SITE_DATA_DIR, f'{out_subdir}_2026.json')
-    with open(outpath, 'w') as f:
-        json.dump(data, f, indent=2)
+    profiling.write_json(outpath, data, indent=2)
     print(f'  Written: {outpath} ({len(races)} races, {len(no_race)} no-race states)')
 
 
@@ -827,17 +788,21 @@ def main():
                         help='Which office to export (default: all)')
     parser.add_argument('--dry-run', action='store_true')
     parser.add_argument('--state', type=str, help='Single state (2-letter abbreviation)')
+    profiling.add_arguments(parser)
     args = parser.parse_args()
+    profiling.configure(args, 'export_statewide_pages')
 
     offices = list(OFFICE_TYPES.keys()) if args.office == 'all' else [args.office]
     single_state = args.state.upper() if args.state else None
 
     for office_key in offices:
         # Export per-state page data
-        export_statewide_pages(office_key, dry_run=args.dry_run, single_state=single_state)
+        with profiling.stage(f'{office_key}_pages'):
+            export_statewide_pages(office_key, dry_run=args.dry_run, single_state=single_state)
         # Export dashboard summary (only if not filtering to a single state)
         if not single_state:
-            export_statewide_dashboard(office_key, dry_run=args.dry_run)
+            with profiling.stage(f'{office_key}_dashboard'):
+                export_statewide_dashboard(office_key, dry_run=args.dry_run)
 
     print('\nDone.')
 
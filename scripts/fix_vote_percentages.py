@@ -24,6 +24,7 @@ import httpx
 
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
 from db_config import TOKEN, PROJECT_REF
+from batch_executor import BatchExecutor
 
 API_URL = f'https://api.supabase.com/v1/projects/{PROJECT_REF}/database/query'
 
@@ -73,16 +74,13 @@ def normalize_name(name):
     return n
 
 
-def delete_candidacies(ids, dry_run, batch_size=50):
-    """Delete candidacies by ID list, batched to avoid oversized queries."""
+def delete_candidacies(ids, dry_run):
+    """Delete candidacies by ID list (coalesced into adaptively sized DELETE … IN batches)."""
     if not ids or dry_run:
         return
-    id_list = list(ids)
-    for i in range(0, len(id_list), batch_size):
-        batch = id_list[i:i + batch_size]
-        run_sql(f'DELETE FROM candidacies WHERE id IN ({",".join(str(x) for x in batch)});')
-        if i + batch_size < len(id_list):
-            time.sleep(0.5)
+    with BatchExecutor('delete candidacies') as ex:
+        for cid in ids:
+            ex.delete('candidacies', cid)
 
 
 def get_problem_elections(threshold=110):
@@ -445,19 +443,18 @@ def phase_3(dry_run):
 
     delete_candidacies(delete_ids, dry_run)
     print(f'  Deleted {len(delete_ids)} duplicate candidacies')
-    time.sleep(1)
 
     # Clean up orphan candidates (no remaining candidacies or seat_terms)
     cleaned = 0
-    for cand_id in orphan_cand_ids:
-        refs = run_sql(f"""
-            SELECT (SELECT COUNT(*) FROM candidacies WHERE candidate_id = {cand_id}) as c,
-                   (SELECT COUNT(*) FROM seat_terms WHERE candidate_id = {cand_id}) as t
+    if orphan_cand_ids:
+        rows = run_sql(f"""
+            DELETE FROM candidates ca
+            WHERE ca.id IN ({','.join(str(x) for x in orphan_cand_ids)})
+              AND NOT EXISTS (SELECT 1 FROM candidacies WHERE candidate_id = ca.id)
+              AND NOT EXISTS (SELECT 1 FROM seat_terms WHERE candidate_id = ca.id)
+            RETURNING ca.id
         """)
-        if refs and refs[0]['c'] == 0 and refs[0]['t'] == 0:
-            run_sql(f'DELETE FROM candidates WHERE id = {cand_id};')
-            cleaned += 1
-        time.sleep(0.3)
+        cleaned = len(rows or [])
     if cleaned:
         print(f'  Deleted {cleaned} orphan candidate records')
 
@@ -555,7 +552,6 @@ def phase_4(dry_run):
 
             if not dry_run:
                 delete_candidacies(delete_ids, dry_run)
-                time.sleep(0.3)
             total_deleted += len(delete_ids)
         else:
             for c in cands:
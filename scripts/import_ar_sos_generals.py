@@ -23,6 +23,7 @@ import httpx
 
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
 from db_config import TOKEN, PROJECT_REF
+from batch_executor import BatchExecutor
 
 YEARS = [2014, 2016, 2018, 2020, 2022, 2024]
 TMP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tmp')
@@ -53,22 +54,6 @@ def run_sql(query, max_retries=5):
     sys.exit(1)
 
 
-def run_sql_batch(statements, dry_run=False):
-    """Execute a list of SQL statements in batches."""
-    if not statements:
-        return
-    if dry_run:
-        return
-    # Combine into single transaction
-    batch_size = 30
-    for i in range(0, len(statements), batch_size):
-        batch = statements[i:i + batch_size]
-        combined = 'BEGIN;\n' + '\n'.join(batch) + '\nCOMMIT;'
-        run_sql(combined)
-        if i + batch_size < len(statements):
-            time.sleep(1)
-
-
 # ══════════════════════════════════════════════════════════════════════
 # NAME MATCHING
 # ══════════════════════════════════════════════════════════════════════
@@ -454,7 +439,7 @@ def process_year(year, sos_contests, seat_map, election_map, candidacy_map, dry_
         'unmatched_candidates': [],
     }
 
-    update_stmts = []
+    updates = []        # (table, id, {column: value}) — coalesced by BatchExecutor
     insert_stmts = []
 
     for contest in sos_contests:
@@ -483,14 +468,13 @@ def process_year(year, sos_contests, seat_map, election_map, candidacy_map, dry_
 
         # --- Update election total_votes_cast and result_status ---
         sos_total = contest['total_votes']
-        changes = []
+        changes = {}
         if election['total_votes_cast'] != sos_total:
-            changes.append(f'total_votes_cast = {sos_total}')
+            changes['total_votes_cast'] = sos_total
         if election['result_status'] != 'Certified':
-            changes.append("result_status = 'Certified'")
+            changes['result_status'] = 'Certified'
         if changes:
-            stmt = f"UPDATE elections SET {', '.join(changes)} WHERE id = {election_id};"
-            update_stmts.append(stmt)
+            updates.append(('elections', election_id, changes))
             stats['elections_updated'] += 1
             if dry_run:
                 old_votes = election['total_votes_cast']
@@ -513,9 +497,9 @@ def process_year(year, sos_contests, seat_map, election_map, candidacy_map, dry_
 
             if matched:
                 # Update votes and percentage
-                cand_changes = []
+                cand_changes = {}
                 if matched['votes_received'] != sos_votes:
-                    cand_changes.append(f'votes_received = {sos_votes}')
+                    cand_changes['votes_received'] = sos_votes
                 # Recompute percentage from official total
                 if sos_total > 0:
                     pct = round(sos_votes / sos_total * 100, 1)
@@ -524,18 +508,17 @@ def process_year(year, sos_contests, seat_map, election_map, candidacy_map, dry_
                 # DB returns vote_percentage as string (DECIMAL); convert for comparison
                 db_pct = float(matched['vote_percentage']) if matched['vote_percentage'] is not None else None
                 if db_pct != pct:
-                    cand_changes.append(f'vote_percentage = {pct}')
+                    cand_changes['vote_percentage'] = pct
                 # Fill party if DB is NULL and SoS has value
                 if sos_party and not matched['party']:
-                    cand_changes.append(f"party = {sql_escape(sos_party)}")
+                    cand_changes['party'] = sos_party
 
                 if cand_changes:
-                    stmt = f"UPDATE candidacies SET {', '.join(cand_changes)} WHERE id = {matched['id']};"
-                    update_stmts.append(stmt)
+                    updates.append(('candidacies', matched['id'], cand_changes))
                     stats['candidacies_updated'] += 1
                     if dry_run:
                         db_name = matched['full_name'] or f"{matched['first_name']} {matched['last_name']}"
-                        print(f'    {db_name}: {", ".join(cand_changes)}')
+                        print(f'    {db_name}: {", ".join(f"{k} = {v}" for k, v in cand_changes.items())}')
             else:
                 # New candidate not in DB — create candidate + candidacy
                 stats['new_candidacies'] += 1
@@ -570,17 +553,14 @@ def process_year(year, sos_contests, seat_map, election_map, candidacy_map, dry_
                 if dry_run:
                     print(f'    NEW: {sos_name} ({sos_party or "?"}) {sos_votes} votes')
 
-    # Execute batched updates
-    if not dry_run:
-        if update_stmts:
-            print(f'  Executing {len(update_stmts)} updates...')
-            run_sql_batch(update_stmts)
-        if insert_stmts:
-            print(f'  Executing {len(insert_stmts)} inserts...')
-            # Inserts with CTEs need individual execution
+    # Execute updates (coalesced per column set) and candidate inserts
+    if not dry_run and (updates or insert_stmts):
+        print(f'  Executing {len(updates)} updates, {len(insert_stmts)} inserts...')
+        with BatchExecutor(f'AR {year} General') as ex:
+            for table, row_id, changes in updates:
+                ex.update(table, {'id': row_id}, changes)
             for stmt in insert_stmts:
-                run_sql(stmt)
-                time.sleep(0.3)
+                ex.add(stmt)
 
     return stats
 
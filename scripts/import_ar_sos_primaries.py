@@ -26,6 +26,7 @@ import httpx
 
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
 from db_config import TOKEN, PROJECT_REF
+from batch_executor import BatchExecutor
 
 # Map year keys to filenames — '2020_runoff' is a special key
 FILES = {
@@ -66,21 +67,6 @@ def run_sql(query, max_retries=5):
     sys.exit(1)
 
 
-def run_sql_batch(statements, dry_run=False):
-    """Execute a list of SQL statements in batches."""
-    if not statements:
-        return
-    if dry_run:
-        return
-    batch_size = 30
-    for i in range(0, len(statements), batch_size):
-        batch = statements[i:i + batch_size]
-        combined = 'BEGIN;\n' + '\n'.join(batch) + '\nCOMMIT;'
-        run_sql(combined)
-        if i + batch_size < len(statements):
-            time.sleep(1)
-
-
 # ══════════════════════════════════════════════════════════════════════
 # NAME MATCHING
 # ══════════════════════════════════════════════════════════════════════
@@ -512,7 +498,7 @@ def process_year(year_key, sos_contests, seat_map, election_map, candidacy_map,
         'unmatched_candidates': [],
     }
 
-    update_stmts = []
+    updates = []        # (table, id, {column: value}) — coalesced by BatchExecutor
     insert_stmts = []
 
     for contest in sos_contests:
@@ -538,14 +524,13 @@ def process_year(year_key, sos_contests, seat_map, election_map, candidacy_map,
             election_id = election['id']
             db_candidacies = candidacy_map.get(election_id, [])
 
-            changes = []
+            changes = {}
             if election['total_votes_cast'] != sos_total:
-                changes.append(f'total_votes_cast = {sos_total}')
+                changes['total_votes_cast'] = sos_total
             if election['result_status'] != 'Certified':
-                changes.append("result_status = 'Certified'")
+                changes['result_status'] = 'Certified'
             if changes:
-                stmt = f"UPDATE elections SET {', '.join(changes)} WHERE id = {election_id};"
-                update_stmts.append(stmt)
+                updates.append(('elections', election_id, changes))
                 stats['elections_updated'] += 1
                 if dry_run:
                     old_votes = election['total_votes_cast']
@@ -565,26 +550,25 @@ def process_year(year_key, sos_contests, seat_map, election_map, candidacy_map,
                         break
 
                 if matched:
-                    cand_changes = []
+                    cand_changes = {}
                     if matched['votes_received'] != sos_votes:
-                        cand_changes.append(f'votes_received = {sos_votes}')
+                        cand_changes['votes_received'] = sos_votes
                     if sos_total > 0:
                         pct = round(sos_votes / sos_total * 100, 1)
                     else:
                         pct = 0.0
                     db_pct = float(matched['vote_percentage']) if matched['vote_percentage'] is not None else None
                     if db_pct != pct:
-                        cand_changes.append(f'vote_percentage = {pct}')
+                        cand_changes['vote_percentage'] = pct
                     if sos_party and not matched['party']:
-                        cand_changes.append(f"party = {sql_escape(sos_party)}")
+                        cand_changes['party'] = sos_party
 
                     if cand_changes:
-                        stmt = f"UPDATE candidacies SET {', '.join(cand_changes)} WHERE id = {matched['id']};"
-                        update_stmts.append(stmt)
+                        updates.append(('candidacies', matched['id'], cand_changes))
                         stats['candidacies_updated'] += 1
                         if dry_run:
                             db_name = matched['full_name'] or f"{matched['first_name']} {matched['last_name']}"
-                            print(f'    {db_name}: {", ".join(cand_changes)}')
+                            print(f'    {db_name}: {", ".join(f"{k} = {v}" for k, v in cand_changes.items())}')
                 else:
                     # New candidate for existing election
                     stats['new_candidacies'] += 1
@@ -654,9 +638,8 @@ def process_year(year_key, sos_contests, seat_map, election_map, candidacy_map,
                 """
                 result_rows = run_sql(elec_sql)
                 new_elec_id = result_rows[0]['id']
-                time.sleep(0.3)
 
-                # Insert each candidate + candidacy
+                # Queue each candidate + candidacy (sent with the batched writes below)
                 for first_name, last_name, full_name, party_val, votes, pct, result in cand_values:
                     cand_sql = f"""
                         WITH new_cand AS (
@@ -668,9 +651,8 @@ def process_year(year_key, sos_contests, seat_map, election_map, candidacy_map,
                         SELECT {new_elec_id}, new_cand.id, {party_val}, {votes}, {pct}, {sql_escape(result)}
                         FROM new_cand;
                     """
-                    run_sql(cand_sql)
+                    insert_stmts.append(cand_sql)
                     stats['new_candidacies'] += 1
-                    time.sleep(0.3)
 
                 # Add to maps so subsequent lookups work
                 election_map[(seat_id, election_year, election_type)] = {
@@ -685,16 +667,14 @@ def process_year(year_key, sos_contests, seat_map, election_map, candidacy_map,
             if dry_run:
                 stats['new_candidacies'] += len(contest['candidates'])
 
-    # Execute batched updates for existing elections
-    if not dry_run:
-        if update_stmts:
-            print(f'  Executing {len(update_stmts)} updates...')
-            run_sql_batch(update_stmts)
-        if insert_stmts:
-            print(f'  Executing {len(insert_stmts)} inserts (new candidacies for existing elections)...')
+    # Execute updates (coalesced per column set) and candidate inserts
+    if not dry_run and (updates or insert_stmts):
+        print(f'  Executing {len(updates)} updates, {len(insert_stmts)} inserts...')
+        with BatchExecutor(f'AR {year_key} Primary') as ex:
+            for table, row_id, changes in updates:
+                ex.update(table, {'id': row_id}, changes)
             for stmt in insert_stmts:
-                run_sql(stmt)
-                time.sleep(0.3)
+                ex.add(stmt)
 
     return stats
 
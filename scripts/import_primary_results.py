@@ -27,6 +27,13 @@ AR (Arkansas):
   Status: TODO — Clarity Elections blocks server requests (403)
   Notes: May need browser export or Clarity API key
 
+CO, KY, SC, WV (Clarity ENR / Scytl):
+  Source: results.enr.clarityelections.com/{ST}/{electionId}/
+  API: current_ver.txt, then {version}/reports/detailxml.zip
+  Format: Zipped XML, streamed with iterparse; only re-fetched and re-parsed
+          when current_ver.txt changes
+  Notes: Election IDs go in CLARITY_ELECTION_IDS (or --election-id)
+
 === USAGE ===
 
   # Download + preview what would change (no DB writes)
@@ -41,12 +48,26 @@ AR (Arkansas):
   # Import only senate or house
   python3 scripts/import_primary_results.py --state NC --chamber senate
 
+  # Time each step (JSON report in /tmp/profile, see profiling.py)
+  python3 scripts/import_primary_results.py --state NC --dry-run --profile
+
+  # Clarity ENR state, election ID from the results page URL
+  python3 scripts/import_primary_results.py --state KY --date 2026-05-19 --election-id 123456 --dry-run
+
+  # Check the Clarity parser against data/fixtures/clarity (no network/DB)
+  python3 scripts/import_primary_results.py --check
+
+  # Run against a recorded night served by results_replay.py --serve
+  python3 scripts/import_primary_results.py --state NC --dry-run --replay http://127.0.0.1:8765
+
 === ELECTION NIGHT CHECKLIST ===
 
 1. Verify the SoS results URL is live and returning data
 2. Run with --dry-run first to check candidate matching
 3. Review any UNMATCHED candidates — may need manual name fixes
 4. Run without --dry-run to update the database
+   (each non-dry run also rewrites site/data/live/XX.json — see
+   publish_live_snapshot.py; commit/push it to update live pages)
 5. Re-export affected states:
      python3 scripts/export_site_data.py --state XX
      python3 scripts/export_district_data.py --state XX
@@ -58,16 +79,26 @@ import os
 import re
 import json
 import time
+import io
 import base64
+import zipfile
 import argparse
 import unicodedata
+import xml.etree.ElementTree as ET
 
 import httpx
 
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
 from db_config import TOKEN, PROJECT_REF
+from publish_live_snapshot import publish_states
+import profiling
+from results_replay import replay_url
+from snapshot_store import SnapshotStore, SNAPSHOT_DIR
 
-TMP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tmp')
+# Set by --replay / results_replay.py (see http_get)
+REPLAY_URL = None
+CAPTURE = None
+SNAPSHOT_ROOT = SNAPSHOT_DIR
 
 
 # ══════════════════════════════════════════════════════════════════════
@@ -76,27 +107,55 @@ TMP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tmp')
 
 def run_sql(query, max_retries=5):
     """Execute SQL via Supabase Management API with retry logic."""
-    for attempt in range(max_retries):
-        resp = httpx.post(
-            f'https://api.supabase.com/v1/projects/{PROJECT_REF}/database/query',
-            headers={
-                'Authorization': f'Bearer {TOKEN}',
-                'Content-Type': 'application/json',
-            },
-            json={'query': query},
-            timeout=30.0,
-        )
-        if resp.status_code in (200, 201):
-            return resp.json()
-        if resp.status_code == 429:
-            wait = 5 * (attempt + 1)
-            print(f'    Rate limited, waiting {wait}s...', flush=True)
-            time.sleep(wait)
-            continue
-        print(f'    SQL error ({resp.status_code}): {resp.text[:200]}', flush=True)
-        if attempt < max_retries - 1:
-            time.sleep(2)
-    return None
+    with profiling.span('query', profiling.query_label(query)):
+        for attempt in range(max_retries):
+            resp = httpx.post(
+                f'https://api.supabase.com/v1/projects/{PROJECT_REF}/database/query',
+                headers={
+                    'Authorization': f'Bearer {TOKEN}',
+                    'Content-Type': 'application/json',
+                },
+                json={'query': query},
+                timeout=30.0,
+            )
+            profiling.record_response(resp)
+            if resp.status_code in (200, 201):
+                rows = resp.json()
+                profiling.count('rows', len(rows))
+                return rows
+            if resp.status_code == 429:
+                wait = 5 * (attempt + 1)
+                print(f'    Rate limited, waiting {wait}s...', flush=True)
+                time.sleep(wait)
+                continue
+            print(f'    SQL error ({resp.status_code}): {resp.text[:200]}', flush=True)
+            if attempt < max_retries - 1:
+                time.sleep(2)
+        return None
+
+
+def http_get(url, **kwargs):
+    """httpx.get for SoS result downloads, timed as a 'download' span.
+
+    With REPLAY_URL set the request goes to a results_replay.py server
+    instead of the SoS site; with CAPTURE set the response is recorded.
+    """
+    fetch_url = replay_url(REPLAY_URL, url) if REPLAY_URL else url
+    with profiling.span('download', url.split('?')[0]):
+        resp = httpx.get(fetch_url, **kwargs)
+    profiling.record_response(resp)
+    if CAPTURE is not None:
+        CAPTURE.add(resp)
+    return resp
+
+
+def save_snapshot(source, data):
+    """Archive a download in the append-only snapshot store (snapshot_store.py)."""
+    entry = SnapshotStore(source, SNAPSHOT_ROOT).save(data)
+    print(f'  Snapshot {entry["sha256"][:12]} {"stored" if entry["new"] else "unchanged"} '
+          f'({entry["bytes"] / 1e6:.1f} MB raw, {entry["stored_bytes"] / 1e6:.2f} MB written) '
+          f'in {source}', flush=True)
+    return entry
 
 
 def normalize_name(name):
@@ -254,17 +313,14 @@ def nc_download(election_date):
     url = f'{NC_API_BASE}/{date_str}/data/results_0.txt'
     print(f'  Fetching {url}...', flush=True)
 
-    resp = httpx.get(url, timeout=30.0)
+    resp = http_get(url, timeout=30.0)
     if resp.status_code != 200:
         print(f'  ERROR: HTTP {resp.status_code}', flush=True)
         return None
 
     data = resp.json()
-    outpath = os.path.join(TMP_DIR, f'NC_{date_str}_primary_results.json')
-    os.makedirs(TMP_DIR, exist_ok=True)
-    with open(outpath, 'w') as f:
-        json.dump(data, f, indent=2)
-    print(f'  Saved {len(data)} entries to {outpath}', flush=True)
+    print(f'  Downloaded {len(data)} entries', flush=True)
+    save_snapshot(f'NC_{date_str}', data)
     return data
 
 
@@ -353,7 +409,7 @@ def ar_download(election_date):
     if not election_id:
         # Try to find election ID from the list
         print(f'  No cached election ID for {election_date}, fetching list...', flush=True)
-        resp = httpx.get(
+        resp = http_get(
             f'{AR_API_BASE}/Election/GetElectionList?cId={AR_CLIENT_ID}',
             timeout=30.0,
         )
@@ -370,11 +426,9 @@ def ar_download(election_date):
             print(f'  ERROR: No election found for date {election_date}', flush=True)
             return None
 
-    os.makedirs(TMP_DIR, exist_ok=True)
-
     # Get contest search list (has candidate names)
     print(f'  Fetching contest search list...', flush=True)
-    resp = httpx.get(
+    resp = http_get(
         f'{AR_API_BASE}/Contest/GetContestSearchList?cId={AR_CLIENT_ID}&electionID={election_id}',
         timeout=30.0,
     )
@@ -387,7 +441,7 @@ def ar_download(election_date):
     all_results = {}
     for contest_type in ['State Senate', 'State Representative']:
         print(f'  Fetching {contest_type} results...', flush=True)
-        resp = httpx.get(
+        resp = http_get(
             f'{AR_API_BASE}/Contest/GetContestResults?cId={AR_CLIENT_ID}'
             f'&electionID={election_id}&contestType={contest_type}',
             timeout=30.0,
@@ -395,13 +449,9 @@ def ar_download(election_date):
         if resp.status_code == 200:
             all_results[contest_type] = resp.json()
 
-    # Save raw data
-    outpath = os.path.join(TMP_DIR, f'AR_{election_date.replace("-","")}_primary_results.json')
-    with open(outpath, 'w') as f:
-        json.dump({'search': search_data, 'results': all_results}, f, indent=2)
-    print(f'  Saved to {outpath}', flush=True)
-
-    return {'search': search_data, 'results': all_results}
+    data = {'search': search_data, 'results': all_results}
+    save_snapshot(f'AR_{election_date.replace("-", "")}', data)
+    return data
 
 
 def ar_parse_results(data, chamber_filter=None):
@@ -489,7 +539,6 @@ TX_ELECTION_IDS = {
 
 def tx_download(election_date):
     """Download TX Civix GoElect data. Returns dict with R and D results."""
-    os.makedirs(TMP_DIR, exist_ok=True)
     all_data = {}
 
     for party_label, party_code in [('R', 'R'), ('D', 'D')]:
@@ -500,7 +549,7 @@ def tx_download(election_date):
             continue
 
         print(f'  Fetching TX {party_code} Primary (election {election_id})...', flush=True)
-        resp = httpx.get(
+        resp = http_get(
             f'{TX_API_BASE}/enr/election/{election_id}',
             headers={
                 'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 '
@@ -525,12 +574,7 @@ def tx_download(election_date):
 
         all_data[party_code] = decoded
 
-    # Save raw data
-    outpath = os.path.join(TMP_DIR, f'TX_{election_date.replace("-","")}_primary_results.json')
-    with open(outpath, 'w') as f:
-        json.dump(all_data, f, indent=2)
-    print(f'  Saved to {outpath}', flush=True)
-
+    save_snapshot(f'TX_{election_date.replace("-", "")}', all_data)
     return all_data
 
 
@@ -625,12 +669,280 @@ def tx_parse_results(data, chamber_filter=None):
     return contests
 
 
+# ══════════════════════════════════════════════════════════════════════
+# CLARITY ENR (Scytl) — results.enr.clarityelections.com
+# ══════════════════════════════════════════════════════════════════════
+
+CLARITY_API_BASE = 'https://results.enr.clarityelections.com'
+
+# Clarity election IDs are the number in the results page URL
+# (results.enr.clarityelections.com/KY/{id}/web.../#/summary). Add each one
+# when the state's results site goes up, or pass --election-id.
+CLARITY_ELECTION_IDS = {
+    # ('KY', '2026-05-19'): '123456',
+}
+
+# Clarity returns 403 to requests without a browser user agent
+CLARITY_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 '
+                  '(KHTML, like Gecko) Chrome/130.0.0.0 Safari/537.36',
+}
+
+CLARITY_STATEWIDE_OFFICE_MAP = {
+    'GOVERNOR': 'Governor',
+    'LIEUTENANT GOVERNOR': 'Lt. Governor',
+    'ATTORNEY GENERAL': 'Attorney General',
+    'SECRETARY OF STATE': 'Secretary of State',
+}
+
+CLARITY_PARTIES = {'DEM': 'D', 'DEMOCRAT': 'D', 'DEMOCRATIC': 'D', 'REP': 'R', 'REPUBLICAN': 'R'}
+
+
+def clarity_extract(zip_file):
+    """
+    Stream a Clarity detailxml.zip into compact contest records.
+
+    detail.xml is tens of MB for a statewide roll-up, most of it per-county
+    <VoteType>/<County> breakdowns. It is read incrementally straight out of
+    the zip and each <Contest> is cleared once its statewide choice totals
+    are taken, so memory stays flat however large the file is.
+
+    Returns {'timestamp': ..., 'contests': [{'text', 'choices': [[name, party, votes], ...]}]}.
+    """
+    contests = []
+    timestamp = None
+    with zipfile.ZipFile(zip_file) as zf:
+        name = next((n for n in zf.namelist() if n.lower().endswith('.xml')), None)
+        if name is None:
+            raise ValueError('detailxml.zip has no XML file')
+        with zf.open(name) as xml:
+            root = None
+            choices = []
+            for event, elem in ET.iterparse(xml, events=('start', 'end')):
+                if event == 'start':
+                    if root is None:
+                        root = elem
+                    continue
+                if elem.tag == 'Choice':
+                    choices.append([elem.get('text', '').strip(), elem.get('party', ''),
+                                    int(elem.get('totalVotes') or 0)])
+                elif elem.tag == 'Contest':
+                    contests.append({'text': elem.get('text', '').strip(), 'choices': choices})
+                    choices = []
+                    root.clear()
+                elif elem.tag == 'Timestamp' and elem.text:
+                    timestamp = elem.text.strip()
+    return {'timestamp': timestamp, 'contests': contests}
+
+
+def clarity_download(state, election_date):
+    """Download a Clarity ENR state roll-up. Returns compact contest records.
+
+    current_ver.txt is checked first; when the version matches the last
+    archived snapshot the zip is not fetched or parsed again.
+    """
+    date_str = election_date.replace('-', '')
+    election_id = CLARITY_ELECTION_IDS.get((state, election_date))
+    if not election_id:
+        print(f'  ERROR: No Clarity election ID for {state} {election_date} '
+              f'(add it to CLARITY_ELECTION_IDS or pass --election-id)', flush=True)
+        return None
+
+    base = f'{CLARITY_API_BASE}/{state}/{election_id}'
+    resp = http_get(f'{base}/current_ver.txt', headers=CLARITY_HEADERS, timeout=30.0)
+    if resp.status_code != 200:
+        print(f'  ERROR: current_ver.txt HTTP {resp.status_code}', flush=True)
+        return None
+    version = resp.text.strip()
+
+    source = f'{state}_{date_str}'
+    previous = SnapshotStore(source, SNAPSHOT_ROOT).latest()
+    if previous and previous.get('election_id') == election_id and previous.get('version') == version:
+        print(f'  Version {version} unchanged, reusing the archived snapshot', flush=True)
+        return previous
+
+    url = f'{base}/{version}/reports/detailxml.zip'
+    print(f'  Fetching {url}...', flush=True)
+    resp = http_get(url, headers=CLARITY_HEADERS, timeout=120.0)
+    if resp.status_code != 200:
+        print(f'  ERROR: HTTP {resp.status_code}', flush=True)
+        return None
+
+    with profiling.span('parse_xml', source):
+        data = clarity_extract(io.BytesIO(resp.content))
+    data = {'state': state, 'election_id': election_id, 'version': version, **data}
+    print(f'  Downloaded version {version}: {len(data["contests"])} contests '
+          f'({len(resp.content) / 1e6:.1f} MB zipped)', flush=True)
+    save_snapshot(source, data)
+    return data
+
+
+def clarity_contest_party(text, choices):
+    """Primary party from the contest name ("... - REP", "(Democratic)", "DEM ..."),
+    falling back to the party shared by every choice."""
+    for token in re.findall(r'[A-Za-z]+', text):
+        if token.upper() in CLARITY_PARTIES:
+            return CLARITY_PARTIES[token.upper()]
+    parties = {CLARITY_PARTIES.get(p.upper()) for _, p, _ in choices}
+    if len(parties) == 1:
+        return parties.pop()
+    return None
+
+
+def clarity_parse_results(data, chamber_filter=None):
+    """Parse Clarity ENR contest records into standardized contest dicts."""
+    contests = []
+    state = data['state']
+
+    for record in data['contests']:
+        text = record['text']
+        upper = text.upper()
+        if re.search(r'\bU\.?\s?S\.?\b|UNITED STATES|CONGRESS', upper):
+            continue
+        party = clarity_contest_party(text, record['choices'])
+        if party is None:
+            continue
+
+        office = re.sub(r'\s*[-(]?\s*\b(DEM|DEMOCRAT|DEMOCRATIC|REP|REPUBLICAN)\b\)?\s*', ' ', upper).strip()
+        office_type = CLARITY_STATEWIDE_OFFICE_MAP.get(office)
+        if office_type:
+            chamber = 'Statewide'
+            district = office_type
+        else:
+            if re.search(r'SENATE|SENATOR', upper):
+                chamber = 'State Senate'
+            elif re.search(r'HOUSE|REPRESENTATIVE|DELEGATE|ASSEMBLY', upper):
+                chamber = 'State House'
+            else:
+                continue
+            # "District 7", "Dist. 07", "7th Representative District"
+            m = (re.search(r'\bDIST(?:RICT|\.)?\s*(?:NO\.?\s*)?(\d+)', upper)
+                 or re.search(r'\b(\d+)(?:ST|ND|RD|TH)?\s+(?:[A-Z]+\s+){0,2}DISTRICT', upper))
+            if not m:
+                continue
+            district = int(m.group(1))
+
+        if chamber_filter:
+            if chamber_filter.lower() == 'statewide':
+                if chamber != 'Statewide':
+                    continue
+            elif chamber_filter.lower() not in chamber.lower():
+                continue
+
+        total = sum(votes for _, _, votes in record['choices'])
+        candidates = [{
+            'name': re.sub(r'\s*\(I\)\s*$', '', name),
+            'party': party,
+            'votes': votes,
+            'pct': votes / total if total else 0.0,
+        } for name, _, votes in record['choices'] if name.upper() not in ('WRITE-IN', 'WRITE-INS')]
+        candidates.sort(key=lambda c: c['votes'], reverse=True)
+
+        if len(candidates) > 1:
+            contest = {
+                'state': state,
+                'chamber': chamber,
+                'district': district,
+                'party': party,
+                'candidates': candidates,
+            }
+            if chamber == 'Statewide':
+                contest['office_type'] = office_type
+            contests.append(contest)
+
+    return contests
+
+
+def clarity_handler(state, default_date):
+    """STATE_HANDLERS entry for a state whose results run on Clarity ENR."""
+    return {
+        'download': lambda election_date: clarity_download(state, election_date),
+        'parse': clarity_parse_results,
+        'default_date': default_date,
+    }
+
+
+CLARITY_FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'fixtures', 'clarity')
+
+# (fixture, chamber filter) -> expected (chamber, district, party, ((name, votes), ...)).
+# The fixtures carry per-county <VoteType> breakdowns like the real files,
+# plus contests that must be skipped: U.S. Senate, a judicial race with no
+# party, a county office, and a single-candidate primary.
+CLARITY_PINNED_CASES = [
+    (('KY_detailxml.zip', None), [
+        ('Statewide', 'Governor', 'D', (('Andrea Cole', 10200), ('Marcus Hill', 8050))),
+        ('Statewide', 'Governor', 'R', (('Dale Fenwick', 12800), ('Rita Osborne', 12590))),
+        ('State Senate', 14, 'R', (('Gary Lyle', 3310), ('Jane Ott', 1620))),
+        ('State House', 7, 'D', (('Sam Dunn', 851), ('Paula Reyes', 840))),
+        ('State House', 88, 'R', (('Ken Moss', 2290), ('Ann Bly', 1970))),
+    ]),
+    (('KY_detailxml.zip', 'senate'), [
+        ('State Senate', 14, 'R', (('Gary Lyle', 3310), ('Jane Ott', 1620))),
+    ]),
+    (('KY_detailxml.zip', 'statewide'), [
+        ('Statewide', 'Governor', 'D', (('Andrea Cole', 10200), ('Marcus Hill', 8050))),
+        ('Statewide', 'Governor', 'R', (('Dale Fenwick', 12800), ('Rita Osborne', 12590))),
+    ]),
+    (('WV_detailxml.zip', None), [
+        ('State House', 3, 'R', (('Hal Boyd', 1460), ('Nina Pratt', 1451), ('Omar Lutz', 309))),
+        ('State Senate', 7, 'D', (('Carla Wynn', 2650), ('Dean Frost', 2629))),
+        ('Statewide', 'Secretary of State', 'R', (('Iris Vogel', 43000), ('Pete Rowe', 40500))),
+    ]),
+    (('WV_detailxml.zip', 'house'), [
+        ('State House', 3, 'R', (('Hal Boyd', 1460), ('Nina Pratt', 1451), ('Omar Lutz', 309))),
+    ]),
+]
+
+
+def run_check():
+    """Run clarity_extract and clarity_parse_results over the fixture archives.
+    Returns the number of failures."""
+    failures = 0
+    extracted = {}
+    for (fixture, chamber_filter), expected in CLARITY_PINNED_CASES:
+        if fixture not in extracted:
+            extracted[fixture] = clarity_extract(os.path.join(CLARITY_FIXTURE_DIR, fixture))
+            if not extracted[fixture]['timestamp']:
+                failures += 1
+                print(f'  FAIL {fixture}: no <Timestamp>')
+        data = {'state': fixture[:2], **extracted[fixture]}
+        contests = clarity_parse_results(data, chamber_filter=chamber_filter)
+        got = [(c['chamber'], c.get('office_type', c['district']), c['party'],
+                tuple((x['name'], x['votes']) for x in c['candidates'])) for c in contests]
+        # pct is of all votes cast, write-ins included, so it may sum to less than 1
+        bad = [c for c in contests
+               if c['state'] != data['state'] or not 0 < sum(x['pct'] for x in c['candidates']) <= 1 + 1e-9]
+        if got != expected or bad:
+            failures += 1
+            print(f'  FAIL {fixture} chamber={chamber_filter}\n    expected {expected}\n    got      {got}')
+            for c in bad:
+                print(f'    bad state/pct: {c}')
+    print(f'Clarity fixtures: {len(CLARITY_PINNED_CASES) - failures}/{len(CLARITY_PINNED_CASES)} OK')
+
+    empty = io.BytesIO()
+    with zipfile.ZipFile(empty, 'w') as zf:
+        zf.writestr('readme.txt', 'no results')
+    try:
+        clarity_extract(empty)
+        failures += 1
+        print('  FAIL zip without XML was accepted')
+    except ValueError:
+        pass
+    return failures
+
+
 # ══════════════════════════════════════════════════════════════════════
 # MATCHING + DB UPDATE (state-agnostic)
 # ══════════════════════════════════════════════════════════════════════
 
 def load_db_elections(state, year, include_statewide=False):
-    """Load all primary elections + candidacies for a state/year from DB."""
+    """
+    Load all primary elections + candidacies for a state/year from DB.
+
+    A targeted query rather than the shared state context: on election night
+    every candidacy write invalidates the context, so each poll would refetch
+    the whole state.
+    """
     level_filter = "d.office_level IN ('Legislative', 'Statewide')" if include_statewide else "d.office_level = 'Legislative'"
     query = f"""
     SELECT
@@ -1013,16 +1325,20 @@ STATE_HANDLERS = {
         'parse': ar_parse_results,
         'default_date': '2026-03-03',
     },
+    'CO': clarity_handler('CO', '2026-06-23'),
+    'KY': clarity_handler('KY', '2026-05-19'),
     'NC': {
         'download': nc_download,
         'parse': nc_parse_results,
         'default_date': '2026-03-03',
     },
+    'SC': clarity_handler('SC', '2026-06-09'),
     'TX': {
         'download': tx_download,
         'parse': tx_parse_results,
         'default_date': '2026-03-03',
     },
+    'WV': clarity_handler('WV', '2026-05-12'),
 }
 
 
@@ -1032,7 +1348,7 @@ def main():
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog=__doc__,
     )
-    parser.add_argument('--state', required=True, choices=sorted(STATE_HANDLERS.keys()),
+    parser.add_argument('--state', choices=sorted(STATE_HANDLERS.keys()),
                         help='State to import')
     parser.add_argument('--date', type=str, help='Election date (YYYY-MM-DD)')
     parser.add_argument('--chamber', type=str, help='Filter by chamber (house/senate/statewide)')
@@ -1041,12 +1357,30 @@ def main():
     parser.add_argument('--year', type=int, default=2026, help='Election year (default: 2026)')
     parser.add_argument('--dry-run', action='store_true',
                         help='Preview changes without writing to DB')
+    parser.add_argument('--no-publish', action='store_true',
+                        help='Skip writing the site/data/live/{ST}.json snapshot')
+    parser.add_argument('--replay', metavar='URL',
+                        help='Download from a results_replay.py --serve server instead of the SoS site')
+    parser.add_argument('--election-id', type=str,
+                        help='Clarity ENR election ID (CO/KY/SC/WV) if not in CLARITY_ELECTION_IDS')
+    parser.add_argument('--check', action='store_true',
+                        help='Parse the Clarity fixture archives and compare with pinned results (no network/DB)')
+    profiling.add_arguments(parser)
     args = parser.parse_args()
+    if args.check:
+        sys.exit(1 if run_check() else 0)
+    if not args.state:
+        parser.error('--state is required')
+    profiling.configure(args, f'import_primary_results_{args.state}')
+    global REPLAY_URL
+    REPLAY_URL = args.replay
 
     state = args.state
     handler = STATE_HANDLERS[state]
     election_date = args.date or handler['default_date']
     year = args.year
+    if args.election_id:
+        CLARITY_ELECTION_IDS[(state, election_date)] = args.election_id
 
     print(f'\n{"=" * 60}')
     print(f'Importing {state} Primary Results')
@@ -1056,7 +1390,8 @@ def main():
 
     # Step 1: Download results from SoS
     print('Step 1: Downloading official results...', flush=True)
-    raw_data = handler['download'](election_date)
+    with profiling.stage('download'):
+        raw_data = handler['download'](election_date)
     if not raw_data:
         print('ERROR: No data downloaded. Exiting.', flush=True)
         sys.exit(1)
@@ -1064,8 +1399,12 @@ def main():
     # Step 2: Parse into standardized format
     print('\nStep 2: Parsing results...', flush=True)
     chamber_filter = args.chamber or ('statewide' if args.statewide else None)
-    contests = handler['parse'](raw_data, chamber_filter=chamber_filter)
-    print(f'  Found {len(contests)} contested primaries', flush=True)
+    with profiling.stage('parse'):
+        contests = handler['parse'](raw_data, chamber_filter=chamber_filter)
+        changed = SnapshotStore(f'{state}_{election_date.replace("-", "")}',
+                                SNAPSHOT_ROOT).append_series(contests)
+    print(f'  Found {len(contests)} contested primaries ({changed} changed since the last snapshot)',
+          flush=True)
 
     # Step 3: Load DB elections for matching
     print('\nStep 3: Loading DB elections...', flush=True)
@@ -1073,7 +1412,8 @@ def main():
     # If no filter specified, include statewide too
     if not args.chamber and not args.statewide:
         include_statewide = True
-    db_elections = load_db_elections(state, year, include_statewide=include_statewide)
+    with profiling.stage('load_db'):
+        db_elections = load_db_elections(state, year, include_statewide=include_statewide)
     if db_elections is None:
         print('ERROR: Failed to load DB elections. Exiting.', flush=True)
         sys.exit(1)
@@ -1081,15 +1421,24 @@ def main():
 
     # Step 4: Match and update
     print(f'\nStep 4: {"Previewing" if args.dry_run else "Applying"} updates...', flush=True)
-    stats = match_and_update(contests, db_elections, state=state, dry_run=args.dry_run)
+    with profiling.stage('match_update'):
+        stats = match_and_update(contests, db_elections, state=state, dry_run=args.dry_run)
 
     # Step 5: Create runoff elections where needed
-    runoffs_created = create_runoff_elections(state, year, dry_run=args.dry_run)
+    with profiling.stage('runoffs'):
+        runoffs_created = create_runoff_elections(state, year, dry_run=args.dry_run)
 
     # Step 6: Promote primary winners to general elections
-    promoted = promote_winners_to_general(state, year, dry_run=args.dry_run)
+    with profiling.stage('promote'):
+        promoted = promote_winners_to_general(state, year, dry_run=args.dry_run)
+
+    # Step 7: Publish the election-night snapshot the site polls
+    if not args.dry_run and not args.no_publish:
+        print('\nStep 7: Publishing live snapshot...', flush=True)
+        with profiling.stage('publish'):
+            publish_states([state], year)
 
-    # Step 7: Summary
+    # Step 8: Summary
     print(f'\n{"=" * 60}')
     print(f'SUMMARY')
     print(f'{"=" * 60}')
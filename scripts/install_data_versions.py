@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Install the data_versions table and the triggers that maintain it.
+
+The on-disk caches (state_context, candidate_lookup, election_briefing) are
+keyed by a DB change watermark. They used to read it from the
+pg_stat_user_tables n_tup_* counters, which are updated outside transactions
+and flushed lazily, so a read right after a write could still see the old
+watermark and be served a stale cache.
+
+data_versions holds counters per (table, operation, state, shard) that
+statement-level triggers bump in the same transaction as the write. A
+watermark read in the same statement as the data therefore always agrees
+with it: either both include a committed write or neither does.
+
+    SELECT * FROM data_versions;
+    → table_name  | operation | state_id | shard | version
+      candidacies | INSERT    |       33 |     5 |      12
+      candidates  | UPDATE    |        0 |     2 |       3
+
+- state_id scopes a write to the states its rows belong to (found through
+  the statement's transition table), so a per-state cache only moves when
+  its own state changes. 0 is "every state": candidates (not tied to one
+  state) and TRUNCATE. Rows whose parent is already gone (cascaded deletes)
+  are skipped; the parent's own delete bumped their state.
+- shard is the writing backend's pid modulo SHARDS, so concurrent writers
+  (separate populate/import runs) bump different rows instead of queueing
+  on one counter until each other commits.
+
+state_context.watermark_sql() builds the watermark from these rows, and
+state_context.require_data_versions() refuses to run against a database
+without them. The same DDL is in schema.sql for fresh databases; this script
+adds it to an existing one (replacing the older unscoped table) and is safe
+to re-run (e.g. after adding a table to VERSIONED_TABLES).
+
+Usage:
+    python3 scripts/install_data_versions.py
+    python3 scripts/install_data_versions.py --dry-run   # print SQL only
+    python3 scripts/install_data_versions.py --schema    # the schema.sql block
+"""
+
+import sys
+import os
+import time
+import argparse
+
+import httpx
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from db_config import TOKEN, API_URL
+from state_context import VERSIONED_TABLES
+
+SHARDS = 16
+
+# Per table: the states a set of changed rows ({rows}) belong to, or None
+# for tables not tied to a state (always scope 0)
+_VIA_SEAT = 'JOIN seats s ON s.id = r.seat_id JOIN districts d ON d.id = s.district_id'
+STATE_SCOPE = {
+    'states': 'SELECT r.id AS state_id FROM {rows} r',
+    'districts': 'SELECT r.state_id FROM {rows} r',
+    'ballot_measures': 'SELECT r.state_id FROM {rows} r',
+    'seats': 'SELECT d.state_id FROM {rows} r JOIN districts d ON d.id = r.district_id',
+    'elections': f'SELECT d.state_id FROM {{rows}} r {_VIA_SEAT}',
+    'seat_terms': f'SELECT d.state_id FROM {{rows}} r {_VIA_SEAT}',
+    'candidacies': ('SELECT d.state_id FROM {rows} r JOIN elections e ON e.id = r.election_id '
+                    + _VIA_SEAT.replace('r.seat_id', 'e.seat_id')),
+    'forecasts': ('SELECT d.state_id FROM {rows} r JOIN elections e ON e.id = r.election_id '
+                  + _VIA_SEAT.replace('r.seat_id', 'e.seat_id')
+                  + ' UNION ALL SELECT m.state_id FROM {rows} r JOIN ballot_measures m ON m.id = r.measure_id'),
+    'candidates': None,
+}
+
+
+def run_sql(query, retries=5):
+    for attempt in range(retries):
+        resp = httpx.post(
+            API_URL,
+            headers={'Authorization': f'Bearer {TOKEN}', 'Content-Type': 'application/json'},
+            json={'query': query},
+            timeout=120
+        )
+        if resp.status_code == 201:
+            return resp.json()
+        if resp.status_code == 429 and attempt < retries - 1:
+            wait = 10 * (attempt + 1)
+            print(f'  Rate limited, waiting {wait}s...')
+            time.sleep(wait)
+            continue
+        print(f'SQL ERROR: {resp.status_code} - {resp.text[:500]}')
+        sys.exit(1)
+
+
+def _quote(sql):
+    return "'" + sql.replace("'", "''") + "'"
+
+
+def _triggers(table):
+    """CREATE TRIGGER statements for one table: one per operation, so each
+    can name its transition table."""
+    scope = STATE_SCOPE[table]
+    rowsets = {'INSERT': ('REFERENCING NEW TABLE AS changed', ['changed']),
+               'UPDATE': ('REFERENCING OLD TABLE AS changed_old NEW TABLE AS changed',
+                          ['changed', 'changed_old']),
+               'DELETE': ('REFERENCING OLD TABLE AS changed', ['changed'])}
+    out = []
+    for op in ('INSERT', 'UPDATE', 'DELETE', 'TRUNCATE'):
+        name = f'trg_data_version_{op.lower()}'
+        if scope is None or op == 'TRUNCATE':
+            out.append(f"CREATE TRIGGER {name} AFTER {op} ON {table}\n"
+                       f"  FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();")
+            continue
+        referencing, names = rowsets[op]
+        query = ' UNION '.join(scope.format(rows=n) for n in names)
+        out.append(f"CREATE TRIGGER {name} AFTER {op} ON {table}\n"
+                   f"  {referencing}\n"
+                   f"  FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version({_quote(query)});")
+    return out
+
+
+def build_sql(fresh=False):
+    """
+    DDL for data_versions. fresh=True is the schema.sql form; otherwise the
+    older unscoped table and its triggers are replaced first.
+    """
+    parts = []
+    if not fresh:
+        parts.append("""DO $$
+BEGIN
+  IF to_regclass('public.data_versions') IS NOT NULL AND NOT EXISTS (
+      SELECT 1 FROM information_schema.columns
+      WHERE table_schema = 'public' AND table_name = 'data_versions' AND column_name = 'shard') THEN
+    DROP TABLE data_versions;
+  END IF;
+END $$;""")
+        for t in VERSIONED_TABLES:
+            parts.append(f"DROP TRIGGER IF EXISTS trg_data_version ON {t};")
+            parts += [f"DROP TRIGGER IF EXISTS trg_data_version_{op} ON {t};"
+                      for op in ('insert', 'update', 'delete', 'truncate')]
+    parts.append(f"""CREATE TABLE{'' if fresh else ' IF NOT EXISTS'} data_versions (
+    table_name      TEXT NOT NULL,
+    operation       TEXT NOT NULL,
+    state_id        INTEGER NOT NULL DEFAULT 0,   -- 0 = all states
+    shard           SMALLINT NOT NULL DEFAULT 0,
+    version         BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (table_name, operation, state_id, shard)
+);
+ALTER TABLE data_versions ENABLE ROW LEVEL SECURITY;
+
+-- TG_ARGV[0], when given, selects the state_id of each changed row from
+-- the statement's transition table(s); without it the write is scoped to
+-- every state (0).
+CREATE OR REPLACE FUNCTION bump_data_version()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_NARGS = 0 THEN
+    INSERT INTO data_versions (table_name, operation, state_id, shard, version)
+    VALUES (TG_TABLE_NAME, TG_OP, 0, pg_backend_pid() % {SHARDS}, 1)
+    ON CONFLICT (table_name, operation, state_id, shard)
+    DO UPDATE SET version = data_versions.version + 1;
+  ELSE
+    EXECUTE format(
+      'INSERT INTO data_versions (table_name, operation, state_id, shard, version)
+       SELECT DISTINCT %L, %L, scope.state_id, pg_backend_pid() %% {SHARDS}, 1
+       FROM (%s) scope WHERE scope.state_id IS NOT NULL
+       ON CONFLICT (table_name, operation, state_id, shard)
+       DO UPDATE SET version = data_versions.version + 1',
+      TG_TABLE_NAME, TG_OP, TG_ARGV[0]);
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;""")
+    for t in VERSIONED_TABLES:
+        parts += _triggers(t)
+    return '\n'.join(parts) + '\n'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Install data_versions change tracking')
+    parser.add_argument('--dry-run', action='store_true', help='Print SQL, do not execute')
+    parser.add_argument('--schema', action='store_true',
+                        help='Print the fresh-install form kept in schema.sql')
+    args = parser.parse_args()
+
+    if args.schema:
+        print(build_sql(fresh=True))
+        return
+    sql = build_sql()
+    if args.dry_run:
+        print(sql)
+        return
+    run_sql(sql)
+    print(f'Installed data_versions triggers on {len(VERSIONED_TABLES)} tables')
+
+
+if __name__ == '__main__':
+    main()
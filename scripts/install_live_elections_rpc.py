@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Install the live_elections() RPC used by district pages on election night.
+
+site/js/supabase.js used to fetch live 2026 results with a PostgREST
+embedded select (elections → candidacies → candidates) and reshape,
+sort and recount-check them in the browser. live_elections() does all of
+that in the database and returns the finished array:
+
+    POST /rest/v1/rpc/live_elections
+    {"p_seat_ids": [101, 102], "p_year": 2026}
+
+    → [{seat_id, year, type, date, total_votes, is_open_seat, result_status,
+        filing_deadline, forecast_rating, [precincts_reporting, precincts_total],
+        candidates: [{id, name, party, [caucus], votes, pct, result,
+                      is_incumbent, is_write_in}, …],      -- Won, Advanced, then votes desc
+        [recount_eligible: {…}], [incumbent_defeated: true]}, …]
+
+Element shape = transformElection() in supabase.js, plus seat_id.
+recount_eligible follows recount.check_recount_eligible with the
+legislative thresholds; the threshold table is generated from
+RECOUNT_THRESHOLDS, so re-run this script after changing them.
+
+Usage:
+    python3 scripts/install_live_elections_rpc.py
+    python3 scripts/install_live_elections_rpc.py --dry-run   # print SQL only
+"""
+
+import sys
+import os
+import time
+import argparse
+
+import httpx
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from db_config import TOKEN, PROJECT_REF, API_URL
+from recount import RECOUNT_THRESHOLDS, CLOSE_RACE_PCT
+
+
+def run_sql(query, retries=5):
+    for attempt in range(retries):
+        resp = httpx.post(
+            API_URL,
+            headers={'Authorization': f'Bearer {TOKEN}', 'Content-Type': 'application/json'},
+            json={'query': query},
+            timeout=120
+        )
+        if resp.status_code == 201:
+            return resp.json()
+        if resp.status_code == 429 and attempt < retries - 1:
+            wait = 10 * (attempt + 1)
+            print(f'  Rate limited, waiting {wait}s...')
+            time.sleep(wait)
+            continue
+        print(f'SQL ERROR: {resp.status_code} - {resp.text[:500]}')
+        sys.exit(1)
+
+
+def build_sql():
+    thresholds = ',\n        '.join(
+        f"('{st}', {t['legislative']})" for st, t in sorted(RECOUNT_THRESHOLDS.items()))
+    return f"""
+CREATE INDEX IF NOT EXISTS idx_elections_seat_year ON elections(seat_id, election_year);
+
+CREATE OR REPLACE FUNCTION live_elections(p_seat_ids integer[], p_year integer DEFAULT 2026)
+RETURNS jsonb
+LANGUAGE sql STABLE
+SET search_path = public
+AS $fn$
+WITH thresholds(state, pct) AS (
+    VALUES
+        {thresholds}
+),
+el AS (
+    SELECT e.id, e.seat_id, e.election_year, e.election_type, e.election_date,
+           e.total_votes_cast, e.is_open_seat, e.result_status, e.filing_deadline,
+           e.forecast_rating, e.precincts_reporting, e.precincts_total,
+           st.abbreviation AS state
+    FROM elections e
+    JOIN seats s ON s.id = e.seat_id
+    JOIN districts d ON d.id = s.district_id
+    JOIN states st ON st.id = d.state_id
+    WHERE e.seat_id = ANY(p_seat_ids)
+      AND e.election_year = p_year
+),
+cy AS (
+    SELECT cy.election_id, cy.candidate_id, c.full_name, cy.party, cy.caucus,
+           cy.votes_received AS votes, cy.vote_percentage, cy.result,
+           cy.is_incumbent, cy.is_write_in
+    FROM candidacies cy
+    JOIN el ON el.id = cy.election_id
+    LEFT JOIN candidates c ON c.id = cy.candidate_id
+),
+cands AS (
+    SELECT election_id,
+           jsonb_agg(
+               jsonb_build_object(
+                   'id', candidate_id, 'name', COALESCE(full_name, 'Unknown'),
+                   'party', party, 'votes', votes, 'pct', vote_percentage,
+                   'result', result, 'is_incumbent', is_incumbent,
+                   'is_write_in', is_write_in)
+               || CASE WHEN caucus <> '' THEN jsonb_build_object('caucus', caucus)
+                       ELSE '{{}}'::jsonb END
+               ORDER BY CASE result WHEN 'Won' THEN 0 WHEN 'Advanced' THEN 1 ELSE 2 END,
+                        COALESCE(votes, 0) DESC
+           ) AS candidates,
+           count(*) FILTER (WHERE votes > 0) AS n_voted,
+           (array_agg(votes ORDER BY votes DESC) FILTER (WHERE votes > 0))[1:2] AS top2,
+           count(*) FILTER (WHERE votes > 0 AND result = 'Runoff') AS n_runoff,
+           max(votes) FILTER (WHERE votes > 0 AND result = 'Runoff') AS runoff_hi,
+           min(votes) FILTER (WHERE votes > 0 AND result = 'Runoff') AS runoff_lo,
+           max(votes) FILTER (WHERE votes > 0
+                              AND COALESCE(result, '') NOT IN ('Runoff', 'Won', 'Advanced')) AS elim_hi,
+           bool_or(is_incumbent AND result = 'Lost') AS incumbent_lost
+    FROM cy
+    GROUP BY election_id
+)
+SELECT COALESCE(jsonb_agg(
+    jsonb_build_object(
+        'seat_id', el.seat_id, 'year', el.election_year, 'type', el.election_type,
+        'date', el.election_date, 'total_votes', el.total_votes_cast,
+        'is_open_seat', el.is_open_seat, 'result_status', el.result_status,
+        'filing_deadline', el.filing_deadline, 'forecast_rating', el.forecast_rating,
+        'candidates', COALESCE(c.candidates, '[]'::jsonb))
+    || CASE WHEN el.precincts_reporting IS NOT NULL
+            THEN jsonb_build_object('precincts_reporting', el.precincts_reporting,
+                                    'precincts_total', el.precincts_total)
+            ELSE '{{}}'::jsonb END
+    || CASE WHEN r.recount IS NOT NULL
+            THEN jsonb_build_object('recount_eligible', r.recount)
+            ELSE '{{}}'::jsonb END
+    || CASE WHEN el.election_type LIKE '%Primary%' AND c.incumbent_lost
+            THEN '{{"incumbent_defeated": true}}'::jsonb
+            ELSE '{{}}'::jsonb END
+    ORDER BY el.seat_id, el.election_date, el.id
+), '[]'::jsonb)
+FROM el
+LEFT JOIN cands c ON c.election_id = el.id
+LEFT JOIN thresholds t ON t.state = el.state
+CROSS JOIN LATERAL (
+    SELECT CASE
+        WHEN COALESCE(el.total_votes_cast, 0) <= 0
+          OR COALESCE(el.result_status, '') NOT IN ('Called', 'Unofficial')
+          OR COALESCE(c.n_voted, 0) < 2
+            THEN NULL
+        WHEN c.n_runoff >= 2 THEN jsonb_build_object(
+            'type', 'runoff_triggered',
+            'margin', c.runoff_hi - c.runoff_lo,
+            'margin_pct', round((c.runoff_hi - c.runoff_lo) * 100.0 / el.total_votes_cast, 2),
+            'cutoff_margin', c.runoff_lo - c.elim_hi,
+            'cutoff_margin_pct', round((c.runoff_lo - c.elim_hi) * 100.0 / el.total_votes_cast, 2))
+        WHEN t.pct IS NOT NULL THEN
+            CASE WHEN (c.top2[1] - c.top2[2]) * 100.0 / el.total_votes_cast <= t.pct
+                 THEN jsonb_build_object(
+                     'type', 'recount', 'margin', c.top2[1] - c.top2[2],
+                     'margin_pct', round((c.top2[1] - c.top2[2]) * 100.0 / el.total_votes_cast, 2),
+                     'threshold_pct', t.pct)
+            END
+        WHEN (c.top2[1] - c.top2[2]) * 100.0 / el.total_votes_cast <= {CLOSE_RACE_PCT} THEN jsonb_build_object(
+            'type', 'close_race', 'margin', c.top2[1] - c.top2[2],
+            'margin_pct', round((c.top2[1] - c.top2[2]) * 100.0 / el.total_votes_cast, 2),
+            'threshold_pct', {CLOSE_RACE_PCT})
+    END AS recount
+) r
+$fn$;
+
+GRANT EXECUTE ON FUNCTION live_elections(integer[], integer) TO anon, authenticated;
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Install the live_elections() RPC')
+    parser.add_argument('--dry-run', action='store_true', help='Print SQL, do not execute')
+    args = parser.parse_args()
+
+    sql = build_sql()
+    if args.dry_run:
+        print(sql)
+        return
+    run_sql(sql)
+    # PostgREST caches the schema; reload so /rpc/live_elections is visible now
+    run_sql("NOTIFY pgrst, 'reload schema'")
+    print(f'Installed live_elections() with {len(RECOUNT_THRESHOLDS)} state thresholds')
+
+
+if __name__ == '__main__':
+    main()
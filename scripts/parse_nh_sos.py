@@ -24,6 +24,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'
 from db_config import TOKEN, PROJECT_REF, API_URL
 
 import httpx
+from state_context import load_state_context
 
 try:
     import xlrd
@@ -338,55 +339,28 @@ def load_nh_db_context(year):
     cycle = '2022' if year >= 2022 else '2012'
     print(f'  Using redistricting_cycle={cycle} for year {year}')
 
-    # Districts + seats (filtered by redistricting cycle)
-    seats_data = run_sql(f"""
-        SELECT se.id as seat_id, se.seat_designator, se.seat_label,
-               d.id as district_id, d.district_number, d.num_seats, d.is_floterial
-        FROM seats se
-        JOIN districts d ON se.district_id = d.id
-        JOIN states st ON d.state_id = st.id
-        WHERE st.abbreviation = 'NH'
-          AND se.office_type = 'State House'
-          AND d.chamber = 'House'
-          AND d.redistricting_cycle = '{cycle}'
-        ORDER BY d.district_number, se.seat_designator
-    """)
+    # Districts + seats (filtered by redistricting cycle), elections and
+    # current holders come from the shared (cached) state context
+    ctx = load_state_context('NH', run_sql)
+    seats_data = ctx.seats_for(office_type='State House', chamber='House',
+                               redistricting_cycle=cycle) if ctx else []
     if not seats_data:
         print('  ERROR: No NH House seats found')
         return None
 
     # Existing elections for this year
-    elections_data = run_sql(f"""
-        SELECT e.id as election_id, e.seat_id
-        FROM elections e
-        JOIN seats se ON e.seat_id = se.id
-        JOIN districts d ON se.district_id = d.id
-        JOIN states st ON d.state_id = st.id
-        WHERE st.abbreviation = 'NH' AND d.chamber = 'House'
-          AND e.election_year = {year} AND e.election_type = 'General'
-    """)
-
-    existing_election_seats = set()
-    if elections_data:
-        for e in elections_data:
-            existing_election_seats.add(e['seat_id'])
+    house_seats = ctx.seats_for(chamber='House')
+    existing_election_seats = set(
+        e['seat_id'] for e in ctx.elections_for(seats=house_seats, year=year,
+                                                election_types={'General'})
+    )
 
     # Current holders (for district matching)
-    holders_data = run_sql("""
-        SELECT d.district_number, c.full_name, c.last_name
-        FROM seat_terms st2
-        JOIN seats s ON st2.seat_id = s.id
-        JOIN districts d ON s.district_id = d.id
-        JOIN states st ON d.state_id = st.id
-        JOIN candidates c ON st2.candidate_id = c.id
-        WHERE st.abbreviation = 'NH' AND d.chamber = 'House'
-          AND st2.end_date IS NULL
-    """)
-
     holders_by_district = defaultdict(list)
-    if holders_data:
-        for h in holders_data:
-            holders_by_district[h['district_number']].append(h['full_name'])
+    for s in house_seats:
+        t = ctx.current_terms.get(s['seat_id'])
+        if t:
+            holders_by_district[s['district_number']].append(t['full_name'])
 
     # All candidates for name matching
     cands_data = run_sql("SELECT id, full_name, last_name FROM candidates")
@@ -32,6 +32,7 @@ except ImportError:
     sys.exit(1)
 
 import httpx
+from state_context import load_state_context
 
 # ═══════════════════════════════════════════════════════════════
 # CONSTANTS
@@ -1053,18 +1054,9 @@ def load_db_context(state_abbr, chamber_db, year):
         print(f'  ERROR: No office_type mapping for {state_abbr} {chamber_db}')
         return {}, {}, {}
 
-    # Load seats
-    seats_data = run_sql(f"""
-        SELECT se.id as seat_id, se.seat_designator, se.seat_label,
-               d.district_number, d.num_seats
-        FROM seats se
-        JOIN districts d ON se.district_id = d.id
-        JOIN states s ON d.state_id = s.id
-        WHERE s.abbreviation = '{esc(state_abbr)}'
-          AND se.office_type = '{esc(office_type_key)}'
-          AND d.chamber = '{esc(chamber_db)}'
-        ORDER BY d.district_number, se.seat_designator
-    """)
+    # Seats + elections come from the shared (cached) state context
+    ctx = load_state_context(state_abbr, run_sql)
+    seats_data = ctx.seats_for(office_type=office_type_key, chamber=chamber_db) if ctx else []
 
     if not seats_data:
         print(f'  WARNING: No seats found for {state_abbr} {chamber_db}')
@@ -1076,23 +1068,13 @@ def load_db_context(state_abbr, chamber_db, year):
         seats[key] = s['seat_id']
     debug(f'Loaded {len(seats)} seats')
 
-    # Load existing elections for the year
-    elections_data = run_sql(f"""
-        SELECT e.id as election_id, e.seat_id, e.election_type
-        FROM elections e
-        JOIN seats se ON e.seat_id = se.id
-        JOIN districts d ON se.district_id = d.id
-        JOIN states s ON d.state_id = s.id
-        WHERE s.abbreviation = '{esc(state_abbr)}'
-          AND e.election_year = {year}
-          AND se.office_type = '{esc(office_type_key)}'
-    """)
+    # Existing elections for the year (all seats of this office type)
+    elections_data = ctx.elections_for(seats=ctx.seats_for(office_type=office_type_key), year=year)
 
     existing_elections = defaultdict(dict)
-    if elections_data:
-        for e in elections_data:
-            existing_elections[e['seat_id']][e['election_type']] = e['election_id']
-    debug(f'Loaded {len(elections_data or [])} existing elections')
+    for e in elections_data:
+        existing_elections[e['seat_id']][e['election_type']] = e['election_id']
+    debug(f'Loaded {len(elections_data)} existing elections')
 
     # Load all candidates (for name matching)
     cands_data = run_sql("""
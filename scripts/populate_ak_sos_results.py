@@ -2,7 +2,7 @@
 """
 Populate AK election results from Secretary of State data.
 
-Reads /tmp/ak_sos_results.json (from download_ak_sos_results.py),
+Reads AK SoS races from the results lake (written by download_ak_sos_results.py),
 matches races to existing DB districts/seats, and inserts elections,
 candidates, and candidacies.
 
@@ -20,7 +20,6 @@ Usage:
 
 import sys
 import os
-import json
 import time
 import argparse
 import re
@@ -29,6 +28,7 @@ from difflib import SequenceMatcher
 import httpx
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
 from db_config import TOKEN, PROJECT_REF, API_URL
+from results_lake import read_source
 
 
 def run_sql(query, retries=5, exit_on_error=True):
@@ -122,19 +122,8 @@ def main():
     parser.add_argument('--year', type=int, help='Single year')
     args = parser.parse_args()
 
-    # Load downloaded data
-    input_path = '/tmp/ak_sos_results.json'
-    if not os.path.exists(input_path):
-        print(f'ERROR: {input_path} not found. Run download_ak_sos_results.py first.')
-        sys.exit(1)
-
-    with open(input_path) as f:
-        all_races = json.load(f)
-
-    if args.year:
-        all_races = [r for r in all_races if r['year'] == args.year]
-
-    print(f'Loaded {len(all_races)} races from {input_path}')
+    # Load downloaded data (only the requested year is read from the lake)
+    all_races = read_source('ak_sos', 'races', year=args.year)
 
     # --- Load DB mappings ---
     print('\nLoading DB mappings...')
@@ -2,8 +2,8 @@
 """
 Populate AK statewide election results (Governor, Lt Governor) from SoS data.
 
-Reads /tmp/ak_sos_results.json (run download_ak_sos_results.py --statewide first),
-creates elections, candidates, and candidacies for:
+Reads AK statewide races from the results lake (run download_ak_sos_results.py
+--statewide first), creates elections, candidates, and candidacies for:
   - Governor primaries (1998-2018)
   - Lt Governor primaries (1998-2018)
   - Lt Governor generals (fills in missing elections and candidacies)
@@ -20,7 +20,6 @@ Usage:
 
 import sys
 import os
-import json
 import time
 import argparse
 import re
@@ -30,6 +29,7 @@ from difflib import SequenceMatcher
 import httpx
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
 from db_config import TOKEN, PROJECT_REF, API_URL
+from results_lake import read_source
 
 # AK statewide seat IDs
 GOV_SEAT_ID = 7387
@@ -183,20 +183,7 @@ def main():
                         help='Only process primaries (skip general Lt Gov matching)')
     args = parser.parse_args()
 
-    input_path = '/tmp/ak_sos_results.json'
-    if not os.path.exists(input_path):
-        print(f'ERROR: {input_path} not found. Run download_ak_sos_results.py --statewide first.')
-        sys.exit(1)
-
-    with open(input_path) as f:
-        all_races = json.load(f)
-
-    all_races = [r for r in all_races if r.get('office_type')]
-
-    if args.year:
-        all_races = [r for r in all_races if r['year'] == args.year]
-
-    print(f'Loaded {len(all_races)} statewide races')
+    all_races = read_source('ak_sos', 'statewide races', chamber='Statewide', year=args.year)
 
     # --- Load DB data ---
     print('\nLoading DB state...')
@@ -11,20 +11,25 @@ Usage:
     python3 scripts/populate_candidacies.py --state TX
     python3 scripts/populate_candidacies.py --state TX --dry-run
     python3 scripts/populate_candidacies.py --all-closed
+    python3 scripts/populate_candidacies.py --all-closed --parallel   # overlap downloads/parsing with DB writes
     python3 scripts/populate_candidacies.py --state NC --force   # re-run on partially-populated state
 """
 import sys
 import re
 import time
+import queue
 import argparse
+import threading
 import html as htmlmod
 from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 
 import httpx
 import sys as _sys, os as _os
 _sys.path.insert(0, _os.path.join(_os.path.dirname(_os.path.abspath(__file__)), '..'))
 from db_config import TOKEN, PROJECT_REF, API_URL
-from candidate_lookup import CandidateLookup
+from candidate_lookup import CandidateLookup, split_name, save_suggestions, SUGGESTIONS_FILE
+from state_context import load_state_context
 
 BATCH_SIZE = 400
 
@@ -493,24 +498,15 @@ def build_lookup_maps(state_abbrev):
         election_map: {seat_id → {'Primary_D': election_id, 'Primary_R': election_id, 'General': election_id}}
         incumbent_map: {seat_id → (candidate_id, full_name)}
     """
-    # Load all seats for this state with 2026 elections
-    seats = run_sql(f"""
-        SELECT se.id as seat_id, se.office_type, se.seat_designator,
-               d.district_number, d.num_seats
-        FROM seats se
-        JOIN districts d ON se.district_id = d.id
-        JOIN states s ON d.state_id = s.id
-        WHERE s.abbreviation = '{state_abbrev}'
-          AND se.next_regular_election_year = 2026
-          AND se.selection_method = 'Elected'
-          AND d.office_level = 'Legislative'
-        ORDER BY se.office_type, d.district_number, se.seat_designator
-    """)
+    ctx = load_state_context(state_abbrev, run_sql)
+    seats = ctx.seats_for(office_level='Legislative', selection_method='Elected',
+                          next_election_year=2026) if ctx else []
 
     seat_map = {}       # (office_type, district_num) → seat_id (for single-seat districts)
     multi_seat_map = {} # (office_type, district_num) → [seat_ids]
 
-    for s in seats:
+    for s in sorted(seats, key=lambda s: (s['office_type'], s['district_number'] or '',
+                                          s['seat_designator'] or '')):
         key = (s['office_type'], s['district_number'])
         if s['num_seats'] == 1:
             seat_map[key] = s['seat_id']
@@ -519,38 +515,18 @@ def build_lookup_maps(state_abbrev):
                 multi_seat_map[key] = []
             multi_seat_map[key].append(s['seat_id'])
 
-    # Load all elections for this state (2026)
-    elections = run_sql(f"""
-        SELECT e.id as election_id, e.seat_id, e.election_type
-        FROM elections e
-        JOIN seats se ON e.seat_id = se.id
-        JOIN districts d ON se.district_id = d.id
-        JOIN states s ON d.state_id = s.id
-        WHERE s.abbreviation = '{state_abbrev}'
-          AND e.election_year = 2026
-          AND d.office_level = 'Legislative'
-    """)
-
+    # 2026 elections for all legislative seats in the state
     election_map = defaultdict(dict)
-    for e in elections:
-        election_map[e['seat_id']][e['election_type']] = e['election_id']
-
-    # Load current seat_terms (incumbents)
-    incumbents = run_sql(f"""
-        SELECT st.seat_id, st.candidate_id, c.full_name
-        FROM seat_terms st
-        JOIN seats se ON st.seat_id = se.id
-        JOIN districts d ON se.district_id = d.id
-        JOIN states s ON d.state_id = s.id
-        JOIN candidates c ON st.candidate_id = c.id
-        WHERE s.abbreviation = '{state_abbrev}'
-          AND st.end_date IS NULL
-          AND d.office_level = 'Legislative'
-    """)
+    if ctx:
+        legislative = ctx.seats_for(office_level='Legislative')
+        election_map.update(ctx.election_map(2026, seats=legislative))
 
+    # Current seat_terms (incumbents)
     incumbent_map = {}
-    for inc in incumbents:
-        incumbent_map[inc['seat_id']] = (inc['candidate_id'], inc['full_name'])
+    if ctx:
+        for seat_id, t in ctx.current_terms.items():
+            if ctx.seats_by_id[seat_id]['office_level'] == 'Legislative':
+                incumbent_map[seat_id] = (t['candidate_id'], t['full_name'])
 
     return seat_map, multi_seat_map, election_map, incumbent_map
 
@@ -871,6 +847,169 @@ def match_candidates(parsed_candidates, office_type, seat_map, multi_seat_map,
 # STEP 5-6: Insert Candidates and Candidacies
 # ══════════════════════════════════════════════════════════════════════
 
+def bulk_insert_candidacies(reuse, new, state, lookup):
+    """
+    Set-based insert: resolve every challenger against the in-memory lookup,
+    then insert the truly new candidates and all candidacies in one statement
+    per batch. Each statement is atomic (a failed batch leaves none of its
+    candidates behind), but batches commit separately, so a run that dies
+    part-way keeps the batches before it; re-run with --force to fill in.
+
+    Names that normalize to nothing (blank, "Jr.", a lone initial) are
+    skipped: they never match the lookup, so each would get its own
+    placeholder, and identical ones would cross-join on full_name.
+
+    Unresolved names get a negative placeholder id that is added to the lookup
+    cache, so a later mention of the same person in this run (e.g. 'Bob Smith'
+    after 'Robert Smith') resolves to the same pending candidate.
+
+    Returns (new_candidates_count, candidacies_count)
+    """
+    blank = [m for m in new if not split_name(m['candidate_name'])[1]]
+    if blank:
+        new = [m for m in new if split_name(m['candidate_name'])[1]]
+        print(f"    WARNING: Skipping {len(blank)} candidacies with no usable name: "
+              f"{sorted(set(repr(m['candidate_name']) for m in blank))}")
+
+    staged = {}  # placeholder id → full_name
+    reused_existing = 0
+    fuzzy_before = len(lookup.fuzzy_matches)
+    for m in new:
+        cid = lookup.find_match(m['candidate_name'], state)
+        if cid is None:
+            cid = -(len(staged) + 1)
+            staged[cid] = m['candidate_name']
+            lookup.add(cid, m['candidate_name'], state)
+        elif cid > 0:
+            reused_existing += 1
+        m['candidate_id'] = cid
+    if reused_existing:
+        print(f"    Reused {reused_existing} existing candidates (dedup match)")
+    suggested = lookup.fuzzy_matches[fuzzy_before:]
+    for name, _, similar, similar_id in suggested:
+        print(f"      possible duplicate (created as new, review): {name} ~ {similar} (id {similar_id})")
+
+    real_ids = {}  # placeholder id → inserted candidates.id
+    all_candidacies = reuse + new
+    total_inserted = 0
+    statements = 0
+    for batch_start in range(0, len(all_candidacies), BATCH_SIZE):
+        batch = all_candidacies[batch_start:batch_start + BATCH_SIZE]
+
+        # Placeholders first seen in this batch are created by this statement
+        to_create = []
+        for m in batch:
+            cid = m['candidate_id']
+            if cid < 0 and cid not in real_ids and cid not in to_create:
+                to_create.append(cid)
+
+        rows = []
+        landed_keys = []  # (election, candidate id or staged name) to look for after a failure
+        for m in batch:
+            cid = real_ids.get(m['candidate_id'], m['candidate_id'])
+            ref = 'NULL' if cid < 0 else str(cid)
+            placeholder = str(cid) if cid < 0 else 'NULL'
+            rows.append(f"({m['election_id']}, {ref}, {placeholder}, "
+                        f"'{esc(m['party'])}', {m['is_incumbent']})")
+            name = f"'{esc(staged[cid])}'" if cid < 0 else 'NULL'
+            landed_keys.append(f"({m['election_id']}, {ref}, {name})")
+
+        if to_create:
+            cand_values = []
+            for cid in to_create:
+                name = staged[cid]
+                parts = name.split()
+                first = parts[0] if parts else ''
+                last = parts[-1] if len(parts) > 1 else first
+                cand_values.append(f"({cid}, '{esc(name)}', '{esc(first)}', '{esc(last)}')")
+            # Staged names are distinct (an exact repeat resolves to its placeholder),
+            # so the RETURNING rows map back to placeholders by full_name
+            new_cte = (
+                "staged (placeholder, full_name, first_name, last_name) AS (VALUES\n"
+                + ",\n".join(cand_values) + "\n),\n"
+                "new_cands AS (\n"
+                "    INSERT INTO candidates (full_name, first_name, last_name, gender)\n"
+                "    SELECT full_name, first_name, last_name, NULL FROM staged\n"
+                "    RETURNING id, full_name\n"
+                "),\n"
+                "new_ids AS (\n"
+                "    SELECT s.placeholder, n.id, n.full_name\n"
+                "    FROM staged s JOIN new_cands n ON n.full_name = s.full_name\n"
+                "),\n"
+            )
+        else:
+            new_cte = ("new_ids (placeholder, id, full_name) AS (\n"
+                       "    SELECT NULL::int, NULL::int, NULL::text WHERE FALSE\n"
+                       "),\n")
+
+        sql = (
+            "WITH " + new_cte
+            + "rows (election_id, candidate_id, placeholder, party, is_incumbent) AS (VALUES\n"
+            + ",\n".join(rows) + "\n),\n"
+            "ins AS (\n"
+            "    INSERT INTO candidacies (election_id, candidate_id, party, "
+            "candidate_status, is_incumbent, is_write_in, filing_date, "
+            "withdrawal_date, votes_received, vote_percentage, result, "
+            "endorsements, notes)\n"
+            "    SELECT r.election_id, COALESCE(r.candidate_id::int, ni.id), r.party, "
+            "'Filed', r.is_incumbent, false, NULL, NULL, NULL, NULL, 'Pending', NULL, NULL\n"
+            "    FROM rows r LEFT JOIN new_ids ni ON ni.placeholder = r.placeholder::int\n"
+            "    RETURNING id\n"
+            ")\n"
+            "SELECT 'candidate' AS kind, placeholder, id, full_name FROM new_ids\n"
+            "UNION ALL\n"
+            "SELECT 'candidacy', NULL, id, NULL FROM ins;"
+        )
+        result = run_sql(sql, exit_on_error=False)
+        if result is None:
+            # A failed request (e.g. a gateway timeout) may still have committed,
+            # and the INSERT is not idempotent: resend only if none of it landed
+            time.sleep(2)
+            landed = run_sql(
+                "SELECT EXISTS (\n"
+                "    SELECT 1 FROM (VALUES\n" + ",\n".join(landed_keys) + "\n"
+                "    ) AS v (election_id, candidate_id, full_name)\n"
+                "    JOIN candidacies cy ON cy.election_id = v.election_id\n"
+                "    JOIN candidates c ON c.id = cy.candidate_id\n"
+                "    WHERE cy.candidate_id = v.candidate_id::int\n"
+                "       OR (v.candidate_id IS NULL AND c.full_name = v.full_name::text)\n"
+                ") AS landed;", exit_on_error=False)
+            if landed is None or landed[0]['landed']:
+                print("    ERROR: Batch failed but may have committed; not resending. "
+                      "Check the state and re-run with --force to fill in.")
+                sys.exit(1)
+            print("      Batch failed (nothing committed), retrying...")
+            result = run_sql(sql)
+        statements += 1
+
+        for r in result:
+            if r['kind'] == 'candidate':
+                real_ids[r['placeholder']] = r['id']
+            else:
+                total_inserted += 1
+
+    lookup.reassign(real_ids, state)
+    for m in new:
+        m['candidate_id'] = real_ids.get(m['candidate_id'], m['candidate_id'])
+
+    print(f"    Created {len(real_ids)} new candidates")
+    print(f"    Inserted {total_inserted} candidacies ({statements} statement(s))")
+    if suggested:
+        placeholder_of = {name: cid for cid, name in staged.items()}
+        save_suggestions([
+            {'state': state, 'id1': similar_id, 'name1': similar,
+             'id2': real_ids[placeholder_of[name]], 'name2': name}
+            for name, _, similar, similar_id in suggested
+            if real_ids.get(placeholder_of.get(name))])
+        print(f"    {len(suggested)} possible duplicates saved for review "
+              f"(dedup_candidates.py, {SUGGESTIONS_FILE})")
+    if len(real_ids) != len(staged) or total_inserted != len(all_candidacies):
+        print(f"    ERROR: Expected {len(staged)} candidates / {len(all_candidacies)} candidacies, "
+              f"got {len(real_ids)} / {total_inserted}")
+        sys.exit(1)
+
+    return len(real_ids), total_inserted
+
 def insert_candidacies(matched, dry_run=False, force=False, state=None, lookup=None):
     """
     Insert new candidates (challengers) and candidacy records.
@@ -923,58 +1062,42 @@ def insert_candidacies(matched, dry_run=False, force=False, state=None, lookup=N
     if dry_run:
         return len(new), len(matched)
 
-    # Insert new candidates (with dedup lookup if available)
+    # Set-based path: resolve names in memory, then one statement per batch
+    # inserts the truly new candidates and all candidacies together
+    if lookup and state:
+        return bulk_insert_candidacies(reuse, new, state, lookup)
+
+    # Insert new candidates (no dedup lookup available)
     new_candidate_ids = []
-    reused_existing = 0
     if new:
-        if lookup and state:
-            # Use fuzzy matching to find existing candidates before inserting
-            for m in new:
-                existing_id = lookup.find_match(m['candidate_name'], state)
-                if existing_id:
-                    new_candidate_ids.append(existing_id)
-                    reused_existing += 1
-                else:
-                    parts = m['candidate_name'].split()
-                    first = parts[0] if parts else ''
-                    last = parts[-1] if len(parts) > 1 else parts[0] if parts else ''
-                    new_id = lookup.find_or_create(
-                        m['candidate_name'], state,
-                        first_name=first, last_name=last)
-                    new_candidate_ids.append(new_id)
-            if reused_existing:
-                print(f"    Reused {reused_existing} existing candidates (dedup match)")
-            print(f"    Created {len(new) - reused_existing} new candidates")
-        else:
-            # Fallback: batch INSERT without dedup check
-            values = []
-            for m in new:
-                parts = m['candidate_name'].split()
-                first = esc(parts[0]) if parts else ''
-                last = esc(parts[-1]) if len(parts) > 1 else esc(parts[0]) if parts else ''
-                full = esc(m['candidate_name'])
-                values.append(f"('{full}', '{first}', '{last}', NULL)")
-
-            total_inserted = 0
-            for batch_start in range(0, len(values), BATCH_SIZE):
-                batch = values[batch_start:batch_start + BATCH_SIZE]
-                sql = (
-                    "INSERT INTO candidates (full_name, first_name, last_name, gender) VALUES\n"
-                    + ",\n".join(batch)
-                    + "\nRETURNING id;"
-                )
-                result = run_sql(sql, exit_on_error=False)
-                if result is None:
-                    print(f"      Batch failed, retrying in 2s...")
-                    time.sleep(2)
-                    result = run_sql(sql)
-                new_candidate_ids.extend(r['id'] for r in result)
-                total_inserted += len(result)
-
-            print(f"    Inserted {total_inserted} new candidates")
-            if total_inserted != len(new):
-                print(f"    ERROR: Expected {len(new)}, got {total_inserted}")
-                sys.exit(1)
+        values = []
+        for m in new:
+            parts = m['candidate_name'].split()
+            first = esc(parts[0]) if parts else ''
+            last = esc(parts[-1]) if len(parts) > 1 else esc(parts[0]) if parts else ''
+            full = esc(m['candidate_name'])
+            values.append(f"('{full}', '{first}', '{last}', NULL)")
+
+        total_inserted = 0
+        for batch_start in range(0, len(values), BATCH_SIZE):
+            batch = values[batch_start:batch_start + BATCH_SIZE]
+            sql = (
+                "INSERT INTO candidates (full_name, first_name, last_name, gender) VALUES\n"
+                + ",\n".join(batch)
+                + "\nRETURNING id;"
+            )
+            result = run_sql(sql, exit_on_error=False)
+            if result is None:
+                print("      Batch failed, retrying in 2s...")
+                time.sleep(2)
+                result = run_sql(sql)
+            new_candidate_ids.extend(r['id'] for r in result)
+            total_inserted += len(result)
+
+        print(f"    Inserted {total_inserted} new candidates")
+        if total_inserted != len(new):
+            print(f"    ERROR: Expected {len(new)}, got {total_inserted}")
+            sys.exit(1)
 
     # Assign new candidate_ids
     for i, m in enumerate(new):
@@ -1018,8 +1141,35 @@ def insert_candidacies(matched, dry_run=False, force=False, state=None, lookup=N
 # MAIN: Process a single state
 # ══════════════════════════════════════════════════════════════════════
 
-def process_state(state_abbrev, dry_run=False, force=False):
-    """Process all chambers for a single state."""
+def download_chamber_page(state_abbrev, state_name, chamber_type, office_type):
+    """Download one chamber page and save it to /tmp for debugging. Returns HTML or None."""
+    html_text = download_bp_page(state_name, chamber_type)
+    if html_text:
+        fname = f"/tmp/bp_{state_abbrev.lower()}_{office_type.replace(' ', '_').lower()}.html"
+        with open(fname, 'w', encoding='utf-8') as f:
+            f.write(html_text)
+    return html_text
+
+def download_state_pages(state_abbrev):
+    """
+    I/O stage: download every chamber page for a state.
+
+    Returns {office_type: html_text or None}.
+    """
+    return {office_type: download_chamber_page(state_abbrev, state_name, chamber_type, office_type)
+            for state_name, chamber_type, office_type in STATE_CHAMBERS.get(state_abbrev, [])}
+
+def parse_chamber_page(html_text):
+    """CPU stage: parse one chamber page → (primary_candidates, general_candidates)."""
+    return parse_primary_candidates(html_text), parse_general_election_candidates(html_text)
+
+def process_state(state_abbrev, dry_run=False, force=False, prepared=None):
+    """
+    Process all chambers for a single state.
+
+    prepared: optional {office_type: (primary, general) or None} from the
+    pipelined --parallel mode; when given, pages are not downloaded/parsed here.
+    """
     print(f"\n{'=' * 60}")
     print(f"PROCESSING: {state_abbrev}" + (" (FORCE)" if force else ""))
     print(f"{'=' * 60}")
@@ -1051,7 +1201,7 @@ def process_state(state_abbrev, dry_run=False, force=False):
     seat_map, multi_seat_map, election_map, incumbent_map = build_lookup_maps(state_abbrev)
 
     # Initialize candidate lookup for dedup prevention
-    lookup = CandidateLookup(run_sql)
+    lookup = CandidateLookup(run_sql, fuzzy=True)
     lookup.load_state(state_abbrev)
     total_seats = len(seat_map) + sum(len(v) for v in multi_seat_map.values())
     print(f"  Seats with 2026 elections: {total_seats} "
@@ -1068,24 +1218,22 @@ def process_state(state_abbrev, dry_run=False, force=False):
         chamber_label = f"{state_abbrev} {chamber_type.replace('_', ' ')}"
         print(f"\n  --- {chamber_label} ---")
 
-        # Download
-        print(f"  Downloading Ballotpedia page...")
-        html_text = download_bp_page(state_name, chamber_type)
-        if not html_text:
-            print(f"  SKIPPED: Could not download {chamber_label}")
-            continue
-
-        # Save for debugging
-        fname = f"/tmp/bp_{state_abbrev.lower()}_{office_type.replace(' ', '_').lower()}.html"
-        with open(fname, 'w', encoding='utf-8') as f:
-            f.write(html_text)
-
-        # Parse primary candidates
-        print(f"  Parsing primary candidates...")
-        parsed = parse_primary_candidates(html_text)
+        if prepared is not None:
+            if not prepared.get(office_type):
+                print(f"  SKIPPED: Could not download {chamber_label}")
+                continue
+            parsed, general_parsed = prepared[office_type]
+            print(f"  Using prefetched page ({len(parsed)} primary, {len(general_parsed)} general)")
+        else:
+            print("  Downloading Ballotpedia page...")
+            html_text = download_chamber_page(state_abbrev, state_name, chamber_type, office_type)
+            if not html_text:
+                print(f"  SKIPPED: Could not download {chamber_label}")
+                continue
 
-        # Parse general election candidates (second table)
-        general_parsed = parse_general_election_candidates(html_text)
+            # Parse primary candidates, then general election candidates (second table)
+            print("  Parsing primary candidates...")
+            parsed, general_parsed = parse_chamber_page(html_text)
 
         # Merge uncontested candidates from general table into primary list.
         # Candidates in the general table who are NOT already in the primary list
@@ -1400,7 +1548,7 @@ def process_state_statewide(state_abbrev, dry_run=False, force=False):
             return False
 
     # Initialize candidate lookup for dedup prevention
-    lookup = CandidateLookup(run_sql)
+    lookup = CandidateLookup(run_sql, fuzzy=True)
     lookup.load_state(state_abbrev)
 
     # Build statewide lookup maps
@@ -1728,6 +1876,69 @@ def verify_state_statewide(state_abbrev):
         inc = " (i)" if r['is_incumbent'] else ""
         print(f"      {r['office_type']}: {r['full_name']}{inc} [{r['party']}] → {r['election_type']}")
 
+# ══════════════════════════════════════════════════════════════════════
+# PIPELINED ALL-STATES MODE (--parallel)
+# ══════════════════════════════════════════════════════════════════════
+
+def _fetch_and_parse(state_abbrev, parse_pool):
+    """Download a state's pages (I/O thread), then parse them in the process pool."""
+    t0 = time.time()
+    pages = download_state_pages(state_abbrev)
+    t1 = time.time()
+    futures = {office_type: parse_pool.submit(parse_chamber_page, html_text)
+               for office_type, html_text in pages.items() if html_text}
+    prepared = {office_type: None for office_type in pages}
+    for office_type, fut in futures.items():
+        prepared[office_type] = fut.result()
+    return prepared, {'download': t1 - t0, 'parse': time.time() - t1}
+
+def process_states_pipelined(states, dry_run=False, force=False, io_workers=4, parse_workers=None,
+                             lookahead=None):
+    """
+    Process many states with downloads/parsing overlapped with DB work.
+
+    Downloads for upcoming states run in a bounded thread pool and parsing in
+    a process pool, while this thread acts as the single DB writer: it takes
+    states in order, waits for their parsed pages, then loads maps, matches
+    and inserts exactly as process_state does serially. A feeder thread keeps
+    at most lookahead + 1 states (default lookahead: io_workers) fetched
+    ahead of the writer, so a slow DB doesn't pile up every state's parsed
+    pages in memory.
+    """
+    timings = {}
+    start = time.time()
+    ready = queue.Queue(maxsize=lookahead or io_workers)
+    with ThreadPoolExecutor(max_workers=io_workers) as io_pool, \
+            ProcessPoolExecutor(max_workers=parse_workers) as parse_pool:
+        def feed():
+            for st in states:
+                # Blocks while the writer is lookahead states behind
+                ready.put((st, io_pool.submit(_fetch_and_parse, st, parse_pool)))
+        threading.Thread(target=feed, daemon=True).start()
+        for _ in states:
+            st, future = ready.get()
+            t0 = time.time()
+            prepared, t = future.result()
+            t['wait'] = time.time() - t0
+            t1 = time.time()
+            success = process_state(st, dry_run=dry_run, force=force, prepared=prepared)
+            if success and not dry_run:
+                verify_state(st)
+            t['db'] = time.time() - t1
+            t['ok'] = success
+            timings[st] = t
+
+    print(f"\n{'=' * 60}")
+    print("PER-STATE TIMING (download/parse overlap DB work of earlier states)")
+    print(f"{'=' * 60}")
+    print(f"  {'State':<6} {'Download':>9} {'Parse':>7} {'Wait':>7} {'DB':>7}  Status")
+    for st in states:
+        t = timings[st]
+        print(f"  {st:<6} {t['download']:>8.1f}s {t['parse']:>6.1f}s {t['wait']:>6.1f}s "
+              f"{t['db']:>6.1f}s  {'ok' if t['ok'] else 'skipped'}")
+    serial = sum(t['download'] + t['parse'] + t['db'] for t in timings.values())
+    print(f"  Wall time: {time.time() - start:.1f}s (serial stage total {serial:.1f}s)")
+
 # ══════════════════════════════════════════════════════════════════════
 # CLI ENTRY POINT
 # ══════════════════════════════════════════════════════════════════════
@@ -1743,10 +1954,18 @@ def main():
                         help='Parse and match only, no database inserts')
     parser.add_argument('--force', action='store_true',
                         help='Re-run on states with existing candidacies (skips already-populated elections)')
+    parser.add_argument('--parallel', action='store_true',
+                        help='With --all-closed: overlap downloads/parsing with DB writes')
+    parser.add_argument('--io-workers', type=int, default=4,
+                        help='Concurrent Ballotpedia downloads in --parallel mode (default 4)')
+    parser.add_argument('--parse-workers', type=int, default=None,
+                        help='Parser processes in --parallel mode (default: CPU count)')
     args = parser.parse_args()
 
     if not args.state and not args.all_closed:
         parser.error('Specify --state XX or --all-closed')
+    if args.parallel and args.statewide:
+        parser.error('--parallel only supports legislative races')
 
     if args.dry_run:
         print("DRY RUN MODE — no database changes will be made.\n")
@@ -1771,6 +1990,9 @@ def main():
                 verify_state_statewide(st)
             if len(states) > 1:
                 time.sleep(1)
+    elif args.parallel:
+        process_states_pipelined(states, dry_run=args.dry_run, force=args.force,
+                                 io_workers=args.io_workers, parse_workers=args.parse_workers)
     else:
         # Process legislative races
         for st in states:
@@ -5,16 +5,25 @@ Reads /tmp/district_history/{state}.json (from download_district_history.py),
 matches districts to DB seats, creates/matches candidates, and inserts
 historical elections + candidacies.
 
+Each parsed district is fingerprinted (sha256 of its parsed JSON) and the
+fingerprint is stored in district_history_sources together with the election
+ids it was reconciled as. Re-runs skip districts whose fingerprint is
+unchanged and whose elections still exist, so only districts whose Ballotpedia
+content changed are matched and inserted. When nothing changed the seats,
+elections and candidate preloads are skipped entirely.
+
 Usage:
     python3 scripts/populate_district_history.py --state AK --dry-run
     python3 scripts/populate_district_history.py --state AK
     python3 scripts/populate_district_history.py --state AK --skip-candidates
+    python3 scripts/populate_district_history.py --state AK --force   # reconcile every district
 """
 import sys
 import os
 import re
 import json
 import time
+import hashlib
 import argparse
 import unicodedata
 
@@ -22,6 +31,7 @@ import httpx
 import sys as _sys, os as _os
 _sys.path.insert(0, _os.path.join(_os.path.dirname(_os.path.abspath(__file__)), '..'))
 from db_config import TOKEN, PROJECT_REF, API_URL
+from state_context import load_state_context
 
 INPUT_DIR = '/tmp/district_history'
 BATCH_SIZE = 50
@@ -244,46 +254,92 @@ def split_name(full_name):
 
 
 # ══════════════════════════════════════════════════════════════════════
-# DISTRICT MATCHING
+# SOURCE FINGERPRINTS
 # ══════════════════════════════════════════════════════════════════════
 
-def load_db_seats(state):
-    """Load all legislative seats for a state from DB."""
-    sql = f"""
-    SELECT
-        s.id AS seat_id,
-        s.seat_label,
-        s.current_holder,
-        s.current_holder_party,
-        s.seat_designator,
-        d.id AS district_id,
-        d.chamber,
-        d.district_number,
-        d.district_name,
-        d.num_seats
-    FROM seats s
-    JOIN districts d ON s.district_id = d.id
-    JOIN states st ON d.state_id = st.id
-    WHERE st.abbreviation = '{state}'
-      AND d.office_level = 'Legislative'
-      AND s.selection_method = 'Elected'
-    ORDER BY d.chamber, d.district_number, s.seat_designator
+def district_key(dist):
+    return (dist['chamber'], dist['district_identifier'])
+
+
+def district_fingerprint(dist):
+    """Stable hash of one parsed district (URL, name, elections and candidates)."""
+    canonical = json.dumps(dist, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def load_fingerprints(state, required=True):
+    """Stored fingerprints for a state: {(chamber, district_identifier) → fingerprint}.
+
+    The district_history_sources table comes from schema.sql; when it is
+    missing a real run exits (required=True) and a dry run reconciles every
+    district. Districts whose reconciled elections have since been deleted
+    are left out, so they get reconciled again.
     """
-    return run_sql(sql)
-
-
-def load_existing_elections(state):
-    """Load existing elections for a state to avoid duplicates."""
-    sql = f"""
-    SELECT e.id, e.seat_id, e.election_date, e.election_year, e.election_type
-    FROM elections e
-    JOIN seats s ON e.seat_id = s.id
-    JOIN districts d ON s.district_id = d.id
-    JOIN states st ON d.state_id = st.id
-    WHERE st.abbreviation = '{state}'
-      AND e.election_year < 2026
+    present = run_sql("SELECT to_regclass('district_history_sources') IS NOT NULL AS present")
+    if not present or not present[0]['present']:
+        if required:
+            print("ERROR: table district_history_sources is missing; create it (with its "
+                  "RLS policy) from the district_history_sources blocks of schema.sql")
+            sys.exit(1)
+        return {}
+    rows = run_sql(f"""
+        SELECT f.chamber, f.district_identifier, f.fingerprint
+        FROM district_history_sources f
+        JOIN states st ON st.id = f.state_id
+        WHERE st.abbreviation = '{esc(state)}'
+          AND cardinality(f.election_ids) = (
+              SELECT COUNT(*) FROM elections e WHERE e.id = ANY(f.election_ids))
+    """)
+    return {(r['chamber'], r['district_identifier']): r['fingerprint'] for r in rows or []}
+
+
+def save_fingerprints(state, reconciled):
+    """Upsert fingerprints for districts reconciled cleanly this run.
+
+    reconciled is a list of (district, election_ids), where the district is a
+    matched dict carrying its fingerprint and seat_id.
     """
-    return run_sql(sql)
+    # One row per district (a repeated identifier keeps its last result)
+    reconciled = list({district_key(dist): (dist, ids) for dist, ids in reconciled}.values())
+    for batch_start in range(0, len(reconciled), BATCH_SIZE):
+        batch = reconciled[batch_start:batch_start + BATCH_SIZE]
+        values = []
+        for dist, election_ids in batch:
+            ids = ','.join(str(eid) for eid in sorted(set(election_ids)))
+            values.append(
+                f"('{esc(dist['chamber'])}', '{esc(dist['district_identifier'])}', "
+                f"{dist['seat_id']}, '{dist['fingerprint']}', '{{{ids}}}'::integer[])"
+            )
+        rows_sql = ',\n'.join(values)
+        run_sql(f"""
+            INSERT INTO district_history_sources
+                (state_id, chamber, district_identifier, seat_id, fingerprint, election_ids)
+            SELECT st.id, v.chamber, v.district_identifier, v.seat_id, v.fingerprint, v.election_ids
+            FROM (VALUES
+{rows_sql}
+            ) AS v (chamber, district_identifier, seat_id, fingerprint, election_ids)
+            CROSS JOIN states st
+            WHERE st.abbreviation = '{esc(state)}'
+            ON CONFLICT (state_id, chamber, district_identifier) DO UPDATE SET
+                seat_id = EXCLUDED.seat_id,
+                fingerprint = EXCLUDED.fingerprint,
+                election_ids = EXCLUDED.election_ids,
+                reconciled_at = now()
+        """, exit_on_error=False)
+
+
+# ══════════════════════════════════════════════════════════════════════
+# DISTRICT MATCHING
+# ══════════════════════════════════════════════════════════════════════
+
+def load_db_seats(ctx):
+    """All elected legislative seats for a state, from the shared state context."""
+    return ctx.seats_for(office_level='Legislative', selection_method='Elected')
+
+
+def load_existing_elections(ctx):
+    """Existing pre-2026 elections for a state (to avoid duplicates)."""
+    return [e for e in ctx.elections if e['election_year'] < 2026]
 
 
 def match_districts(state, parsed_districts, db_seats):
@@ -483,13 +539,18 @@ def insert_elections(matched_districts, existing_elections, dry_run=False, skip_
     2. Batch-insert all elections for the district (1 API call with RETURNING)
     3. Batch-insert all candidacies (1 API call)
     ~3 API calls per district instead of ~10+.
+
+    stats['reconciled'] lists (district, election_ids) for every district
+    whose writes all succeeded and whose candidacies were all inserted: the
+    ids of the existing elections it matched plus the ones it inserted.
+    These are what save_fingerprints() stores.
     """
-    # Build set of existing elections for dedup
-    existing_keys = set()
-    existing_year_type_keys = set()
+    # Index existing elections for dedup: key → election_id
+    existing_keys = {}
+    existing_year_type_keys = {}
     for e in existing_elections:
-        existing_keys.add((e['seat_id'], e['election_date'], e['election_type']))
-        existing_year_type_keys.add((e['seat_id'], e['election_year'], e['election_type']))
+        existing_keys[(e['seat_id'], e['election_date'], e['election_type'])] = e['election_id']
+        existing_year_type_keys[(e['seat_id'], e['election_year'], e['election_type'])] = e['election_id']
 
     stats = {
         'elections_inserted': 0,
@@ -497,10 +558,13 @@ def insert_elections(matched_districts, existing_elections, dry_run=False, skip_
         'candidacies_inserted': 0,
         'candidates_created': 0,
         'candidates_matched': 0,
+        'reconciled': [],
     }
 
     for dist in matched_districts:
         seat_id = dist['seat_id']
+        election_ids = []
+        clean = True
 
         # Phase 1: Filter to new elections only
         new_elections = []
@@ -509,11 +573,11 @@ def insert_elections(matched_districts, existing_elections, dry_run=False, skip_
             etype = election['election_type']
             edate = election.get('election_date')
 
-            if (seat_id, edate, etype) in existing_keys:
-                stats['elections_skipped'] += 1
-                continue
-            if (seat_id, year, etype) in existing_year_type_keys:
+            existing_id = (existing_keys.get((seat_id, edate, etype))
+                           or existing_year_type_keys.get((seat_id, year, etype)))
+            if existing_id:
                 stats['elections_skipped'] += 1
+                election_ids.append(existing_id)
                 continue
 
             candidates = election.get('candidates', [])
@@ -523,6 +587,7 @@ def insert_elections(matched_districts, existing_elections, dry_run=False, skip_
             new_elections.append(election)
 
         if not new_elections:
+            stats['reconciled'].append((dist, election_ids))
             continue
 
         # Phase 2: Find/create all candidates needed for this district's new elections
@@ -570,7 +635,9 @@ def insert_elections(matched_districts, existing_elections, dry_run=False, skip_
                     + "\nRETURNING id, full_name"
                 )
                 result = run_sql(create_sql, exit_on_error=False)
-                if result:
+                if not result:
+                    clean = False
+                else:
                     for r in result:
                         cid = r['id']
                         fname = r['full_name']
@@ -588,6 +655,13 @@ def insert_elections(matched_districts, existing_elections, dry_run=False, skip_
                 _candidate_cache[cache_key] = -1
                 stats['candidates_created'] += 1
 
+        if not clean:
+            # Inserting the elections now would leave them without these
+            # candidacies for good (later runs dedup on the election)
+            print(f'    WARNING: Failed to create candidates for {dist["seat_label"]}; '
+                  f'skipping district until the next run')
+            continue
+
         if dry_run:
             stats['elections_inserted'] += len(new_elections)
             for election in new_elections:
@@ -627,11 +701,13 @@ def insert_elections(matched_districts, existing_elections, dry_run=False, skip_
             if result:
                 for i, row in enumerate(result):
                     eid = row['id']
+                    election_ids.append(eid)
                     if i < len(meta_batch):
                         edate, etype, election_obj = meta_batch[i]
                         election_id_map[(edate, etype)] = eid
                         stats['elections_inserted'] += 1
             else:
+                clean = False
                 print(f'    WARNING: Failed to insert election batch for {dist["seat_label"]}')
 
         # Phase 4: Batch-insert all candidacies for this district
@@ -650,6 +726,7 @@ def insert_elections(matched_districts, existing_elections, dry_run=False, skip_
                 cache_key = normalize_name(cname)
                 cid = _candidate_cache.get(cache_key)
                 if not cid:
+                    clean = False  # candidacy dropped; reconcile again next run
                     continue
 
                 party = c.get('party')
@@ -678,6 +755,11 @@ def insert_elections(matched_districts, existing_elections, dry_run=False, skip_
                 cand_result = run_sql(cand_sql, exit_on_error=False)
                 if cand_result is not None:
                     stats['candidacies_inserted'] += len(batch)
+                else:
+                    clean = False
+
+        if clean:
+            stats['reconciled'].append((dist, election_ids))
 
     return stats
 
@@ -692,6 +774,8 @@ def main():
     parser.add_argument('--dry-run', action='store_true', help='Show what would be inserted')
     parser.add_argument('--skip-candidates', action='store_true',
                         help='Only match existing candidates, don\'t create new ones')
+    parser.add_argument('--force', action='store_true',
+                        help='Reconcile every district, ignoring stored fingerprints')
     args = parser.parse_args()
 
     state = args.state.upper()
@@ -712,32 +796,57 @@ def main():
     total_elections = sum(len(d.get('elections', [])) for d in parsed_districts)
     print(f'Total elections in JSON: {total_elections}')
 
+    # Skip districts whose parsed content matches what was last reconciled
+    for dist in parsed_districts:
+        dist['fingerprint'] = district_fingerprint(dist)
+    stored = load_fingerprints(state, required=not args.dry_run)
+    if args.force:
+        stored = {}
+    changed = [d for d in parsed_districts if stored.get(district_key(d)) != d['fingerprint']]
+    print(f'Districts unchanged: {len(parsed_districts) - len(changed)}')
+    print(f'Districts to reconcile: {len(changed)}')
+
+    if not changed:
+        print(f'\n{"═"*60}')
+        print(f'RESULTS — {state}')
+        print(f'{"═"*60}')
+        print('  Nothing changed since the last run (use --force to reconcile anyway)')
+        print('  Elections inserted: 0')
+        print('  Candidacies inserted: 0')
+        print('  Candidates created: 0')
+        print('\nDone!')
+        return
+
     # Load DB data
-    print(f'\nLoading DB seats for {state}...')
-    db_seats = load_db_seats(state)
+    print(f'\nLoading DB seats and elections for {state}...')
+    ctx = load_state_context(state, run_sql)
+    if not ctx:
+        print(f'ERROR: State {state} not found in DB')
+        sys.exit(1)
+    db_seats = load_db_seats(ctx)
     print(f'  {len(db_seats)} seats in DB')
 
-    print(f'Loading existing elections...')
-    existing = load_existing_elections(state)
+    existing = load_existing_elections(ctx)
     print(f'  {len(existing)} existing pre-2026 elections')
 
-    # Preload candidate cache
-    print(f'Preloading candidate cache...')
-    preload_candidate_cache(state)
-
     # Match districts
-    print(f'\nMatching BP districts to DB seats...')
-    matched, unmatched = match_districts(state, parsed_districts, db_seats)
+    print('\nMatching BP districts to DB seats...')
+    matched, unmatched = match_districts(state, changed, db_seats)
     print(f'  Matched: {len(matched)}')
     print(f'  Unmatched: {len(unmatched)}')
 
     if unmatched:
-        print(f'\n  Unmatched districts:')
+        print('\n  Unmatched districts:')
         for u in unmatched[:20]:
             print(f'    {u["chamber"]} {u["district_identifier"]}: {u["bp_district_name"]}')
         if len(unmatched) > 20:
             print(f'    ... and {len(unmatched) - 20} more')
 
+    # Preload candidate cache (only needed when a changed district matched a seat)
+    if matched:
+        print('\nPreloading candidate cache...')
+        preload_candidate_cache(state)
+
     # Insert elections + candidacies
     print(f'\n{"═"*60}')
     print(f'INSERTING HISTORICAL DATA — {state}')
@@ -759,10 +868,15 @@ def main():
     print(f'  Candidates matched: {stats["candidates_matched"]}')
     print(f'  Candidates created: {stats["candidates_created"]}')
 
+    # --skip-candidates leaves candidacies out on purpose; a later full run must redo them
+    if not args.dry_run and not args.skip_candidates:
+        save_fingerprints(state, stats['reconciled'])
+        print(f'  Fingerprints stored: {len(stats["reconciled"])} districts')
+
     # Verify (if not dry run)
     if not args.dry_run:
         print(f'\n{"═"*60}')
-        print(f'VERIFICATION')
+        print('VERIFICATION')
         print(f'{"═"*60}')
 
         verify = run_sql(f"""
@@ -779,12 +893,12 @@ def main():
         """, exit_on_error=False)
 
         if verify:
-            print(f'  Historical elections by year/type:')
+            print('  Historical elections by year/type:')
             for r in verify:
                 print(f'    {r["election_year"]} {r["election_type"]}: {r["cnt"]} elections, '
                       f'{r["total_votes"]:,} total votes')
 
-    print(f'\nDone!')
+    print('\nDone!')
 
 
 if __name__ == '__main__':
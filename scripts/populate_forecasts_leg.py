@@ -5,7 +5,8 @@ Reads CSV files with columns: district, id, incumbent_name, inc_party, pres_24,
 leading_party, proj_margin, caucus_margin, win_pct
 
 Converts win_pct probability to our categorical rating scale, matches districts
-to 2026 General elections, and inserts forecast rows.
+to 2026 General elections, and inserts forecast rows. The raw win_pct and
+proj_margin are kept in forecasts.notes for simulate_chamber_control.py.
 
 Usage:
     python3 scripts/populate_forecasts_leg.py "map examples/forecast_26_lower.csv" "map examples/forecast_26_upper.csv"
@@ -19,6 +20,9 @@ import sys
 import time
 
 import httpx
+import sys as _sys, os as _os
+_sys.path.insert(0, _os.path.join(_os.path.dirname(_os.path.abspath(__file__)), '..'))
+from db_config import TOKEN, PROJECT_REF, API_URL
 
 SUPABASE_URL = f'https://api.supabase.com/v1/projects/{PROJECT_REF}/database/query'
 
@@ -309,9 +313,6 @@ def main():
 
     # Rating distribution
     from collections import Counter
-import sys as _sys, os as _os
-_sys.path.insert(0, _os.path.join(_os.path.dirname(_os.path.abspath(__file__)), '..'))
-from db_config import TOKEN, PROJECT_REF, API_URL
     ratings = Counter()
     for row in all_forecast_rows:
         key = (row['_chamber'], row['_district_num'], row['_seat_designator'])
@@ -321,7 +322,7 @@ from db_config import TOKEN, PROJECT_REF, API_URL
         if eid:
             ratings[win_pct_to_rating(row['win_pct'], row['leading_party'])] += 1
 
-    print(f"\nRating distribution:")
+    print("\nRating distribution:")
     for rating in sorted(ratings.keys()):
         print(f"  {rating}: {ratings[rating]}")
 
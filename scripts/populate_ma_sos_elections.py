@@ -2,9 +2,9 @@
 """
 Populate MA election results from Secretary of State data.
 
-Reads /tmp/ma_sos_elections.json (from download_ma_sos_elections.py),
-reconciles against the existing Supabase database, and inserts/updates
-elections and candidacies.
+Reads MA SoS election records from the results lake (written by
+download_ma_sos_elections.py), reconciles against the existing Supabase
+database, and inserts/updates elections and candidacies.
 
 Handles:
   - State Senate and State House legislative races
@@ -24,7 +24,6 @@ Usage:
 
 import sys
 import os
-import json
 import time
 import argparse
 import re
@@ -36,6 +35,7 @@ import httpx
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
 from db_config import TOKEN, PROJECT_REF, API_URL
 from candidate_lookup import CandidateLookup
+from results_lake import read_source
 
 
 # ══════════════════════════════════════════════════════════════════════
@@ -286,22 +286,9 @@ def main():
                         help='Just count what\'s missing vs what we have')
     args = parser.parse_args()
 
-    # ── Load JSON ──
-    input_path = '/tmp/ma_sos_elections.json'
-    if not os.path.exists(input_path):
-        print(f'ERROR: {input_path} not found. Run download_ma_sos_elections.py first.')
-        sys.exit(1)
-
-    with open(input_path) as f:
-        all_records = json.load(f)
-
-    print(f'Loaded {len(all_records)} election records from {input_path}')
-
-    # ── Filter by year ──
-    if args.year_from:
-        all_records = [r for r in all_records if int(r['Election']['year']) >= args.year_from]
-    if args.year_to:
-        all_records = [r for r in all_records if int(r['Election']['year']) <= args.year_to]
+    # ── Load the requested years from the results lake ──
+    all_records = read_source('ma_sos', 'election records',
+                              year_from=args.year_from, year_to=args.year_to)
 
     # ── Filter by office ──
     if args.office:
@@ -1,17 +1,16 @@
 """
 Populate elections.pres_margin_this_cycle with 2024 presidential margins.
 
-Reads the parsed JSON from download_pres_margins.py and sets the presidential
-margin on every election in matching districts. Also populates districts.pres_2024_margin
-and districts.pres_2024_winner for reference.
+Reads the margins download_pres_margins.py wrote to the results lake and sets
+the presidential margin on every election in matching districts. Also populates
+districts.pres_2024_margin and districts.pres_2024_winner for reference.
 
 Usage:
     python3 scripts/populate_pres_margins.py
     python3 scripts/populate_pres_margins.py --dry-run
-    python3 scripts/populate_pres_margins.py --input /tmp/pres_margins.json
+    python3 scripts/populate_pres_margins.py --state VA     # one state's slice only
 """
 import sys
-import json
 import time
 import argparse
 from collections import Counter, defaultdict
@@ -20,8 +19,10 @@ import httpx
 import sys as _sys, os as _os
 _sys.path.insert(0, _os.path.join(_os.path.dirname(_os.path.abspath(__file__)), '..'))
 from db_config import TOKEN, PROJECT_REF, API_URL
+from batch_executor import BatchExecutor
+from results_lake import read_source
 
-BATCH_SIZE = 400
+BATCH_SIZE = 400  # districts per election-id lookup; writes go through BatchExecutor
 
 def run_sql(query, exit_on_error=True, retries=5):
     for attempt in range(retries):
@@ -43,30 +44,26 @@ def run_sql(query, exit_on_error=True, retries=5):
             sys.exit(1)
         return None
 
-def esc(s):
-    if s is None:
-        return ''
-    return str(s).replace("'", "''")
-
 def main():
     parser = argparse.ArgumentParser(description='Populate presidential margins on elections')
     parser.add_argument('--dry-run', action='store_true', help='Print what would be done without writing')
-    parser.add_argument('--input', type=str, default='/tmp/pres_margins.json', help='Input JSON path')
+    parser.add_argument('--state', type=str, help='Only this state (abbreviation)')
     args = parser.parse_args()
+    state_filter = args.state.upper() if args.state else None
 
     # Load parsed margins
-    with open(args.input) as f:
-        records = json.load(f)
-    print(f"Loaded {len(records)} margin records from {args.input}")
+    records = read_source('pres_margins', 'margin records', state=state_filter)
 
     # ═══════════════════════════════════════════════════════════════
     # Step 1: Build lookup of all districts in our DB
     # ═══════════════════════════════════════════════════════════════
     print("\nLoading districts from DB...")
-    rows = run_sql("""
+    state_where = f"WHERE s.abbreviation = '{state_filter}'" if state_filter else ''
+    rows = run_sql(f"""
         SELECT d.id, d.district_number, d.chamber, d.office_level, s.abbreviation as state
         FROM districts d
         JOIN states s ON d.state_id = s.id
+        {state_where}
         ORDER BY s.abbreviation, d.chamber, d.district_number
     """)
 
@@ -163,60 +160,33 @@ def main():
     # Step 3: Update districts table (pres_2024_margin + pres_2024_winner)
     # ═══════════════════════════════════════════════════════════════
     print("\nUpdating districts table...")
-    district_updates = 0
 
-    for i in range(0, len(matched), BATCH_SIZE):
-        batch = matched[i:i+BATCH_SIZE]
-        cases_margin = []
-        cases_winner = []
-        ids = []
-
-        for m in batch:
-            did = m['district_id']
-            margin = m['margin']
-            ids.append(str(did))
-
-            # pres_2024_margin: store as signed number like "+12.3" or "-15.7"
-            if margin == 'EVEN':
-                cases_margin.append(f"WHEN {did} THEN '0.0'")
-                cases_winner.append(f"WHEN {did} THEN NULL")
-            elif margin.startswith('D+'):
-                val = margin[2:]
-                cases_margin.append(f"WHEN {did} THEN '+{val}'")
-                cases_winner.append(f"WHEN {did} THEN 'D'")
-            elif margin.startswith('R+'):
-                val = margin[2:]
-                cases_margin.append(f"WHEN {did} THEN '-{val}'")
-                cases_winner.append(f"WHEN {did} THEN 'R'")
-
-        sql = f"""
-            UPDATE districts SET
-                pres_2024_margin = CASE id {' '.join(cases_margin)} END,
-                pres_2024_winner = CASE id {' '.join(cases_winner)} END
-            WHERE id IN ({','.join(ids)})
-        """
-        run_sql(sql)
-        district_updates += len(batch)
-        print(f"  Districts updated: {district_updates}/{len(matched)}", end='\r')
-        time.sleep(0.8)  # Rate limit
-
-    # Also update statewide districts
-    for state, margin in statewide_margins.items():
-        key = (state, 'Statewide', 'Statewide')
-        did = district_lookup.get(key)
-        if did:
-            if margin == 'EVEN':
-                m_val, w_val = "'0.0'", "NULL"
-            elif margin.startswith('D+'):
-                m_val, w_val = f"'+{margin[2:]}'", "'D'"
-            elif margin.startswith('R+'):
-                m_val, w_val = f"'-{margin[2:]}'", "'R'"
-            else:
-                continue
-            run_sql(f"UPDATE districts SET pres_2024_margin = {m_val}, pres_2024_winner = {w_val} WHERE id = {did}")
-            district_updates += 1
+    def district_values(margin):
+        """pres_2024_margin as signed text ("+12.3" / "-15.7") plus winner; None if unparseable."""
+        if margin == 'EVEN':
+            return {'pres_2024_margin': '0.0', 'pres_2024_winner': None}
+        if margin.startswith('D+'):
+            return {'pres_2024_margin': f'+{margin[2:]}', 'pres_2024_winner': 'D'}
+        if margin.startswith('R+'):
+            return {'pres_2024_margin': f'-{margin[2:]}', 'pres_2024_winner': 'R'}
+        return None
 
-    print(f"\n  Total districts updated: {district_updates}")
+    district_updates = 0
+    with BatchExecutor('districts') as ex:
+        for m in matched:
+            values = district_values(m['margin'])
+            if values:
+                ex.update('districts', {'id': m['district_id']}, values)
+                district_updates += 1
+        # Also update statewide districts
+        for state, margin in statewide_margins.items():
+            did = district_lookup.get((state, 'Statewide', 'Statewide'))
+            values = district_values(margin) if did else None
+            if values:
+                ex.update('districts', {'id': did}, values)
+                district_updates += 1
+
+    print(f"  Total districts updated: {district_updates}")
 
     # ═══════════════════════════════════════════════════════════════
     # Step 4: Update elections table (pres_margin_this_cycle)
@@ -236,50 +206,27 @@ def main():
     all_district_ids = list(margin_by_district.keys())
     election_updates = 0
 
-    for i in range(0, len(all_district_ids), BATCH_SIZE):
-        batch_ids = all_district_ids[i:i+BATCH_SIZE]
-        id_list = ','.join(str(x) for x in batch_ids)
+    with BatchExecutor('elections') as ex:
+        for i in range(0, len(all_district_ids), BATCH_SIZE):
+            batch_ids = all_district_ids[i:i+BATCH_SIZE]
+            id_list = ','.join(str(x) for x in batch_ids)
 
-        # Get election IDs for these districts
-        rows = run_sql(f"""
-            SELECT e.id as election_id, s.district_id
-            FROM elections e
-            JOIN seats s ON e.seat_id = s.id
-            WHERE s.district_id IN ({id_list})
-        """)
-
-        if not rows:
-            continue
+            # Get election IDs for these districts
+            rows = run_sql(f"""
+                SELECT e.id as election_id, s.district_id
+                FROM elections e
+                JOIN seats s ON e.seat_id = s.id
+                WHERE s.district_id IN ({id_list})
+            """)
 
-        # Build update cases
-        cases = []
-        eids = []
-        for r in rows:
-            eid = r['election_id']
-            did = r['district_id']
-            margin = margin_by_district.get(did)
-            if margin:
-                cases.append(f"WHEN {eid} THEN '{esc(margin)}'")
-                eids.append(str(eid))
-
-        if not cases:
-            continue
+            for r in rows or []:
+                margin = margin_by_district.get(r['district_id'])
+                if margin:
+                    ex.update('elections', {'id': r['election_id']},
+                              {'pres_margin_this_cycle': margin})
+                    election_updates += 1
 
-        # Update in sub-batches to avoid huge queries
-        for j in range(0, len(cases), BATCH_SIZE):
-            sub_cases = cases[j:j+BATCH_SIZE]
-            sub_eids = eids[j:j+BATCH_SIZE]
-            sql = f"""
-                UPDATE elections SET
-                    pres_margin_this_cycle = CASE id {' '.join(sub_cases)} END
-                WHERE id IN ({','.join(sub_eids)})
-            """
-            run_sql(sql)
-            election_updates += len(sub_cases)
-            print(f"  Elections updated: {election_updates}", end='\r')
-            time.sleep(0.8)  # Rate limit
-
-    print(f"\n  Total elections updated: {election_updates}")
+    print(f"  Total elections updated: {election_updates}")
 
     # ═══════════════════════════════════════════════════════════════
     # Step 5: Verification
@@ -22,10 +22,11 @@ import httpx
 import sys as _sys, os as _os
 _sys.path.insert(0, _os.path.join(_os.path.dirname(_os.path.abspath(__file__)), '..'))
 from db_config import TOKEN, PROJECT_REF, API_URL
+from batch_executor import BatchExecutor
 
 OPENSTATES_URL = 'https://data.openstates.org/people/current/{state}.csv'
 
-BATCH_SIZE = 500
+BATCH_SIZE = 500  # candidates per INSERT … RETURNING (ids are needed in order)
 
 def run_sql(query, exit_on_error=True):
     resp = httpx.post(
@@ -560,35 +561,19 @@ def main():
     print("STEP 6: Insert seat_terms")
     print("=" * 60)
 
-    total_st_inserted = 0
-
-    for batch_start in range(0, len(matched), BATCH_SIZE):
-        batch = matched[batch_start:batch_start + BATCH_SIZE]
-        values = []
-        for i, (leg, seat_id) in enumerate(batch):
-            cand_id = all_cand_ids[batch_start + i]
-            party = leg['party']
-            caucus = leg['caucus']
-            values.append(
-                f"({seat_id}, {cand_id}, '{esc(party)}', '2025-01-01', NULL, "
-                f"'elected', '{esc(caucus)}', NULL)"
-            )
-
-        sql = (
-            "INSERT INTO seat_terms (seat_id, candidate_id, party, start_date, end_date, "
-            "start_reason, caucus, election_id) VALUES\n"
-            + ",\n".join(values)
-            + "\nRETURNING id;"
-        )
-
-        result = run_sql(sql, exit_on_error=False)
-        if result is None:
-            print(f"  Batch {batch_start}-{batch_start+len(batch)} failed, retrying in 2s...")
-            time.sleep(2)
-            result = run_sql(sql)
-
-        total_st_inserted += len(result)
-        print(f"  Batch {batch_start}-{batch_start+len(batch)}: {len(result)} seat_terms inserted")
+    with BatchExecutor('seat_terms') as ex:
+        for i, (leg, seat_id) in enumerate(matched):
+            ex.insert('seat_terms', {
+                'seat_id': seat_id,
+                'candidate_id': all_cand_ids[i],
+                'party': leg['party'] or '',
+                'start_date': '2025-01-01',
+                'end_date': None,
+                'start_reason': 'elected',
+                'caucus': leg['caucus'] or '',
+                'election_id': None,
+            })
+    total_st_inserted = ex.stats['rows']  # on_error='exit': every queued row committed
 
     print(f"  Total seat_terms inserted: {total_st_inserted}")
 
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Timing instrumentation for the export and ingest scripts.
+
+Scripts call add_arguments(parser) and configure(args, name); with
+--profile the run writes a JSON timing report on exit, without it every
+hook below is a near no-op.
+
+  - span(kind, name)   context manager timing one piece of work; kinds used
+                       by the scripts are 'query', 'download', 'serialize'
+                       and 'write'
+  - stage(name)        a top-level step (one export, one import step); its
+                       time not covered by spans is reported as 'transform'
+  - count(name, n)     counters — rows, bytes_in, bytes_out, http_requests,
+                       http_retries, files_written (record_response() counts
+                       the HTTP ones for a response)
+  - write_json(path, obj, **dump_kwargs)
+                       json.dump replacement that times serialize and write
+                       separately and counts bytes
+
+With --cprofile each stage also runs under cProfile; the .prof file is
+written next to the report and the top functions are listed in it.
+
+Reports go to /tmp/profile/{script}_{YYYYmmdd_HHMMSS}.json by default, so
+consecutive runs can be compared:
+
+Usage:
+    python3 scripts/export_district_data.py --profile
+    python3 scripts/export_site_data.py --profile /tmp/site.json --cprofile
+    python3 scripts/profiling.py export_district_data     # last two runs
+    python3 scripts/profiling.py old.json new.json        # two reports
+"""
+
+import os
+import re
+import sys
+import glob
+import json
+import time
+import atexit
+import argparse
+import cProfile
+import pstats
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from site_model import peak_rss_mb
+
+PROFILE_DIR = '/tmp/profile'
+KINDS = ('query', 'download', 'transform', 'serialize', 'write')
+
+_profiler = None  # active Profiler, or None when --profile is off
+
+
+class _Frame:
+    __slots__ = ('kind', 'name', 'start', 'inner')
+
+    def __init__(self, kind, name, start):
+        self.kind = kind
+        self.name = name
+        self.start = start
+        self.inner = Counter()  # seconds of child spans by kind
+
+
+class Profiler:
+    def __init__(self, script, report_path=None, cprofile=False):
+        self.script = script
+        self.started_at = datetime.now(timezone.utc)
+        if not report_path:
+            stamp = self.started_at.astimezone().strftime('%Y%m%d_%H%M%S')
+            report_path = os.path.join(PROFILE_DIR, f'{script}_{stamp}.json')
+        self.report_path = report_path
+        self.cprofile = cprofile
+        self.t0 = time.perf_counter()
+        self.root = _Frame('run', script, self.t0)
+        self.stack = [self.root]
+        self.spans = []
+        self.stages = []
+        self.counters = Counter()
+        self._active_profile = None
+
+    def close_frame(self, frame, seconds):
+        parent = self.stack[-1]
+        if frame.kind == 'stage':
+            # A stage's uncovered time is transform work
+            breakdown = dict(frame.inner)
+            breakdown['transform'] = max(0.0, seconds - sum(
+                s for k, s in breakdown.items() if k != 'transform'))
+            parent.inner.update(breakdown)
+            return breakdown
+        parent.inner[frame.kind] += seconds
+        return None
+
+    def report(self):
+        wall = time.perf_counter() - self.t0
+        totals = {k: round(self.root.inner.get(k, 0.0), 4) for k in KINDS}
+        for k, s in self.root.inner.items():
+            totals.setdefault(k, round(s, 4))
+        totals['untracked'] = round(max(0.0, wall - sum(self.root.inner.values())), 4)
+        return {
+            'script': self.script,
+            'argv': sys.argv[1:],
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'wall_s': round(wall, 4),
+            'peak_rss_mb': round(peak_rss_mb(), 1),
+            'totals': totals,
+            'counters': dict(self.counters),
+            'stages': self.stages,
+            'spans': self.spans,
+        }
+
+    def write_report(self):
+        data = self.report()
+        os.makedirs(os.path.dirname(os.path.abspath(self.report_path)), exist_ok=True)
+        with open(self.report_path, 'w') as f:
+            json.dump(data, f, indent=1)
+        print_summary(data)
+        print(f'  Profile report: {self.report_path}')
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Hooks used by the scripts
+# ═══════════════════════════════════════════════════════════════════════
+
+def add_arguments(parser):
+    parser.add_argument('--profile', nargs='?', const='', default=None, metavar='PATH',
+                        help=f'Write a JSON timing report (default {PROFILE_DIR}/<script>_<time>.json)')
+    parser.add_argument('--cprofile', action='store_true',
+                        help='With --profile, also run each stage under cProfile')
+
+
+def configure(args, script):
+    """Enable profiling if --profile was given. The report is written at exit."""
+    global _profiler
+    if getattr(args, 'profile', None) is None:
+        return None
+    _profiler = Profiler(script, args.profile or None, cprofile=args.cprofile)
+    atexit.register(_finish)
+    return _profiler
+
+
+def enabled():
+    return _profiler is not None
+
+
+def _finish():
+    global _profiler
+    p, _profiler = _profiler, None
+    if p is not None:
+        p.write_report()
+
+
+@contextmanager
+def span(kind, name=''):
+    p = _profiler
+    if p is None:
+        yield
+        return
+    frame = _Frame(kind, name, time.perf_counter())
+    p.stack.append(frame)
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - frame.start
+        p.stack.pop()
+        p.close_frame(frame, seconds)
+        p.spans.append({'kind': kind, 'name': name,
+                        'start_s': round(frame.start - p.t0, 4), 'seconds': round(seconds, 4)})
+
+
+@contextmanager
+def stage(name):
+    p = _profiler
+    if p is None:
+        yield
+        return
+    prof = None
+    if p.cprofile and p._active_profile is None:
+        prof = p._active_profile = cProfile.Profile()
+        prof.enable()
+    frame = _Frame('stage', name, time.perf_counter())
+    p.stack.append(frame)
+    counters_before = Counter(p.counters)
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - frame.start
+        p.stack.pop()
+        breakdown = p.close_frame(frame, seconds)
+        entry = {
+            'name': name,
+            'start_s': round(frame.start - p.t0, 4),
+            'seconds': round(seconds, 4),
+            'breakdown': {k: round(s, 4) for k, s in breakdown.items()},
+            'counters': dict(p.counters - counters_before),
+        }
+        if prof is not None:
+            prof.disable()
+            p._active_profile = None
+            entry.update(_cprofile_output(p, name, prof))
+        p.stages.append(entry)
+
+
+def count(name, n=1):
+    if _profiler is not None:
+        _profiler.counters[name] += n
+
+
+def record_response(resp):
+    """Count one Management API / download response (bytes, retries)."""
+    if _profiler is not None:
+        _profiler.counters['http_requests'] += 1
+        _profiler.counters['bytes_in'] += len(resp.content)
+        if resp.status_code == 429:
+            _profiler.counters['http_retries'] += 1
+
+
+def write_json(path, obj, **dump_kwargs):
+    """json.dump(obj, open(path, 'w'), **dump_kwargs), timed as serialize + write."""
+    name = os.path.basename(path)
+    with span('serialize', name):
+        text = json.dumps(obj, **dump_kwargs)
+    with span('write', name):
+        with open(path, 'w') as f:
+            f.write(text)
+    count('bytes_out', len(text))
+    count('files_written')
+
+
+def query_label(query):
+    """Short label for a SQL span: the first table after FROM/INTO/UPDATE."""
+    m = re.search(r'\b(?:FROM|INTO|UPDATE)\s+([\w.]+)', query, re.IGNORECASE)
+    return m.group(1) if m else ' '.join(query.split())[:40]
+
+
+def _cprofile_output(p, name, prof, top=15):
+    base = os.path.splitext(p.report_path)[0]
+    path = f'{base}.{re.sub(r"[^A-Za-z0-9_.-]+", "_", name)}.prof'
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    prof.dump_stats(path)
+    stats = pstats.Stats(prof).sort_stats('cumulative')
+    functions = []
+    for func in stats.fcn_list[:top]:
+        cc, nc, tt, ct, _callers = stats.stats[func]
+        filename, line, fn = func
+        functions.append({'function': f'{os.path.basename(filename)}:{line}({fn})',
+                          'calls': nc, 'tottime': round(tt, 4), 'cumtime': round(ct, 4)})
+    return {'cprofile': path, 'top_functions': functions}
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Reports
+# ═══════════════════════════════════════════════════════════════════════
+
+def print_summary(data):
+    kinds = [k for k in KINDS if any(s['breakdown'].get(k) for s in data['stages'])
+             or data['totals'].get(k)]
+    print(f'\nProfile: {data["script"]}  {data["wall_s"]:.2f}s wall, '
+          f'{data["peak_rss_mb"]:.0f} MB peak RSS')
+    print(f'  {"stage":<28} {"total":>8}' + ''.join(f' {k:>10}' for k in kinds))
+    for s in data['stages']:
+        print(f'  {s["name"]:<28} {s["seconds"]:>8.2f}'
+              + ''.join(f' {s["breakdown"].get(k, 0):>10.2f}' for k in kinds))
+    print(f'  {"(all)":<28} {data["wall_s"]:>8.2f}'
+          + ''.join(f' {data["totals"].get(k, 0):>10.2f}' for k in kinds))
+    if data['counters']:
+        print('  ' + ', '.join(f'{k}={v:,}' for k, v in sorted(data['counters'].items())))
+
+
+def compare(old, new):
+    """Print per-stage and per-kind timing deltas between two reports."""
+    def pct(a, b):
+        return f'{(b - a) / a * 100:+.0f}%' if a else ''
+
+    print(f'{old["script"]}: {old["started_at"]} -> {new["started_at"]}')
+    print(f'  {"":<28} {"old":>9} {"new":>9} {"delta":>9}')
+    print(f'  {"wall":<28} {old["wall_s"]:>9.2f} {new["wall_s"]:>9.2f} {pct(old["wall_s"], new["wall_s"]):>9}')
+    for k in KINDS + ('untracked',):
+        a, b = old['totals'].get(k, 0), new['totals'].get(k, 0)
+        if a or b:
+            print(f'  {k:<28} {a:>9.2f} {b:>9.2f} {pct(a, b):>9}')
+    old_stages = {s['name']: s['seconds'] for s in old['stages']}
+    for s in new['stages']:
+        a = old_stages.get(s['name'])
+        if a is not None:
+            print(f'  stage {s["name"]:<22} {a:>9.2f} {s["seconds"]:>9.2f} {pct(a, s["seconds"]):>9}')
+    for k in sorted(set(old['counters']) | set(new['counters'])):
+        a, b = old['counters'].get(k, 0), new['counters'].get(k, 0)
+        if a != b:
+            print(f'  {k:<28} {a:>9,} {b:>9,}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare profiling reports')
+    parser.add_argument('reports', nargs='+',
+                        help='Two report files, or a script name to compare its last two runs')
+    args = parser.parse_args()
+
+    if len(args.reports) == 1:
+        paths = sorted(glob.glob(os.path.join(PROFILE_DIR, f'{args.reports[0]}_*.json')))
+        if len(paths) < 2:
+            parser.error(f'need two reports for {args.reports[0]} in {PROFILE_DIR}')
+        paths = paths[-2:]
+    elif len(args.reports) == 2:
+        paths = args.reports
+    else:
+        parser.error('give one script name or two report files')
+    with open(paths[0]) as f:
+        old = json.load(f)
+    with open(paths[1]) as f:
+        new = json.load(f)
+    compare(old, new)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Publish per-state static snapshots of counting/called elections for election night.
+
+Writes site/data/live/{ST}.json containing every election (for --year) on
+seats with a race being counted or called (result_status 'Counting' or
+'Called'), in the exact shape district
+pages render — built by the live_elections() RPC
+(scripts/install_live_elections_rpc.py), so the snapshot and the direct
+database path can't drift apart.
+
+district.html polls this one static file per state and only falls back to
+querying Supabase when it is missing or stale, so database load stays
+constant no matter how many visitors there are.
+
+Each snapshot carries a version (hash of its elections). A file is only
+rewritten when the version changes or its generated_at is older than
+REFRESH_SECONDS, so unchanged states keep their ETag between refreshes and
+browsers get a 304. district.html ignores snapshots older than
+LIVE_SNAPSHOT_MAX_AGE_MS (site/js/supabase.js, 3× REFRESH_SECONDS): once
+publishing stops, or another script writes results without publishing,
+pages go back to the live_elections() RPC instead of showing stale data.
+
+import_primary_results.py calls publish_states() after every non-dry-run
+ingest cycle.
+
+Usage:
+    python3 scripts/publish_live_snapshot.py --state NC
+    python3 scripts/publish_live_snapshot.py --state NC --state TX
+    python3 scripts/publish_live_snapshot.py --all
+"""
+
+import sys
+import os
+import json
+import time
+import hashlib
+import argparse
+from datetime import datetime, timezone
+
+import httpx
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from db_config import TOKEN, PROJECT_REF, API_URL
+
+LIVE_DIR = os.path.join(os.path.dirname(__file__), '..', 'site', 'data', 'live')
+LIVE_YEAR = 2026
+LIVE_STATUSES = ('Counting', 'Called')
+# Rewrite an unchanged snapshot after this long so readers can tell it is current
+REFRESH_SECONDS = 300
+
+
+def run_sql(query, retries=5):
+    for attempt in range(retries):
+        resp = httpx.post(
+            API_URL,
+            headers={'Authorization': f'Bearer {TOKEN}', 'Content-Type': 'application/json'},
+            json={'query': query},
+            timeout=120
+        )
+        if resp.status_code == 201:
+            return resp.json()
+        if resp.status_code == 429 and attempt < retries - 1:
+            wait = 10 * (attempt + 1)
+            print(f'  Rate limited, waiting {wait}s...')
+            time.sleep(wait)
+            continue
+        print(f'SQL ERROR: {resp.status_code} - {resp.text[:500]}')
+        sys.exit(1)
+
+
+def load_live_elections(states, year):
+    """{state: [page-shaped elections]} for seats with a counting/called election. One query."""
+    state_list = ', '.join(f"'{s}'" for s in states)
+    status_list = ', '.join(f"'{s}'" for s in LIVE_STATUSES)
+    rows = run_sql(f"""
+        WITH live_seats AS (
+            SELECT st.abbreviation AS state, array_agg(DISTINCT e.seat_id) AS seat_ids
+            FROM elections e
+            JOIN seats s ON e.seat_id = s.id
+            JOIN districts d ON s.district_id = d.id
+            JOIN states st ON d.state_id = st.id
+            WHERE e.election_year = {year}
+              AND e.result_status IN ({status_list})
+              AND st.abbreviation IN ({state_list})
+            GROUP BY st.abbreviation
+        )
+        SELECT state, live_elections(seat_ids, {year}) AS elections
+        FROM live_seats
+    """)
+    return {r['state']: r['elections'] for r in rows}
+
+
+def snapshot_version(elections):
+    payload = json.dumps(elections, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def write_snapshot(state, year, elections):
+    """Write live/{ST}.json if its content changed or is due a refresh.
+
+    Returns (version, written).
+    """
+    version = snapshot_version(elections)
+    path = os.path.join(LIVE_DIR, f'{state}.json')
+    now = datetime.now(timezone.utc)
+    try:
+        with open(path) as f:
+            current = json.load(f)
+        age = (now - datetime.fromisoformat(current['generated_at'])).total_seconds()
+        if current.get('version') == version and age < REFRESH_SECONDS:
+            return version, False
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    snapshot = {
+        'state': state,
+        'year': year,
+        'version': version,
+        'generated_at': now.isoformat(timespec='seconds'),
+        'elections': elections,
+    }
+    os.makedirs(LIVE_DIR, exist_ok=True)
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(snapshot, f, separators=(',', ':'))
+    os.replace(tmp, path)  # readers never see a half-written file
+    return version, True
+
+
+def publish_states(states, year=LIVE_YEAR):
+    """Publish snapshots for states. States with nothing counting or called get an empty list."""
+    t0 = time.time()
+    live = load_live_elections(states, year)
+    written = 0
+    for st in states:
+        elections = live.get(st) or []
+        version, changed = write_snapshot(st, year, elections)
+        written += changed
+        print(f'  live/{st}.json  {len(elections):>4} elections  v{version}'
+              f'{"" if changed else "  (unchanged)"}')
+    print(f'  Published {written} of {len(states)} snapshots in {time.time() - t0:.1f}s')
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Publish election-night live snapshots')
+    parser.add_argument('--state', action='append', help='State abbreviation (repeatable)')
+    parser.add_argument('--all', action='store_true', help='All states')
+    parser.add_argument('--year', type=int, default=LIVE_YEAR, help=f'Election year (default {LIVE_YEAR})')
+    args = parser.parse_args()
+
+    if args.all:
+        states = [r['abbreviation'] for r in run_sql(
+            'SELECT abbreviation FROM states ORDER BY abbreviation')]
+    elif args.state:
+        states = [s.upper() for s in args.state]
+    else:
+        parser.error('--state or --all required')
+    publish_states(states, args.year)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,498 @@
+#!/usr/bin/env python3
+"""
+Ranked-choice tabulation from cast-vote records (AK 2022+, ME).
+
+Ballots are held as one int16 matrix (ballots × ranks of candidate indices)
+plus a weight per distinct ballot, so every round is a handful of array
+operations over all ballots at once:
+
+  1. identical ballots are collapsed (np.unique) and carried as weights,
+  2. each ballot is cleaned once up front: duplicate rankings dropped, the
+     ballot cut off at an overvote or after too many consecutive skipped
+     rankings (both AK and ME exhaust a ballot there),
+  3. each round moves only the ballots whose current choice was eliminated
+     or elected to their next continuing choice, then tallies with
+     np.bincount.
+
+Single-winner races are instant runoff: a candidate wins with a majority of
+continuing ballots (or by being one of the last two). seats > 1 runs STV
+with a Droop quota and fractional (Gregory) surplus transfers; surpluses of
+candidates elected in the same round are transferred together.
+
+Ties for last place go to the candidate who was lower in the most recent
+round where the tied candidates differed, then to a seeded random draw
+(the statutory tie-break is by lot), and are flagged in the round.
+
+CVR formats:
+  CSV   one row per ballot; rank columns are any header containing
+        "choice N" / "rank N" (e.g. "Choice 1", "rank_2", "Governor [Choice 3]");
+        an optional count/weight column gives identical-ballot counts.
+        Cells: candidate name, blank/"undervote"/"skipped", "overvote".
+  JSON  a list of ballots, or {"ballots": [...]}; a ballot is a list of
+        ranks or {"ranks": [...], "count": n}. A rank is a name, null,
+        "overvote", or a list of names (several marks = overvote).
+
+Results map onto candidacies as votes_received / vote_percentage (first
+round), rcv_final_votes / rcv_final_percentage (the last round a candidate
+was counted in) and rcv_round_eliminated (NULL for winners).
+
+Usage:
+    python3 scripts/rcv_tabulate.py --cvr ak_hd18.csv                       # print the rounds
+    python3 scripts/rcv_tabulate.py --cvr ak_hd18.csv --election-id 41234 --dry-run
+    python3 scripts/rcv_tabulate.py --cvr ak_hd18.csv --election-id 41234   # write candidacies
+    python3 scripts/rcv_tabulate.py --cvr council.json --seats 3            # multi-winner STV
+    python3 scripts/rcv_tabulate.py --benchmark --ballots 400000 --candidates 6
+    python3 scripts/rcv_tabulate.py --benchmark --save-cvr /tmp/rcv_fixture.csv
+"""
+
+import os
+import re
+import sys
+import csv
+import json
+import time
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+SKIP = -1        # raw rank: no mark at this rank
+OVERVOTE = -2    # raw rank: more than one candidate marked at this rank
+EXHAUSTED = -1   # cleaned choice: nothing left on the ballot
+
+SKIP_MARKS = {'', 'undervote', 'skipped', 'blank', 'none', 'null'}
+OVERVOTE_MARKS = {'overvote', 'over vote', 'overvoted'}
+RANK_COLUMN = re.compile(r'(?:choice|rank)\s*_?\s*(\d+)', re.IGNORECASE)
+COUNT_COLUMNS = {'count', 'weight', 'ballots', 'ballot count'}
+
+# Consecutive skipped rankings a ballot survives (AK and ME: two exhaust it)
+MAX_SKIPPED = 1
+
+# ══════════════════════════════════════════════════════════════════════
+# Loading cast-vote records
+# ══════════════════════════════════════════════════════════════════════
+
+def _mark_code(mark, index):
+    """Raw rank code for one CVR cell, registering new candidate names in index."""
+    if isinstance(mark, list):
+        marks = [m for m in mark if m not in (None, '')]
+        if len(marks) > 1:
+            return OVERVOTE
+        mark = marks[0] if marks else None
+    if mark is None:
+        return SKIP
+    text = str(mark).strip()
+    if text.lower() in SKIP_MARKS:
+        return SKIP
+    if text.lower() in OVERVOTE_MARKS:
+        return OVERVOTE
+    return index.setdefault(text, len(index))
+
+
+def _pack_ballots(rank_lists, counts, index):
+    """(names, ranks int16 [n × R], weights) with identical ballots collapsed."""
+    width = max((len(r) for r in rank_lists), default=1) or 1
+    ranks = np.full((len(rank_lists), width), SKIP, dtype=np.int16)
+    for i, r in enumerate(rank_lists):
+        ranks[i, :len(r)] = r
+    weights = np.asarray(counts, dtype=np.float64)
+    names = [None] * len(index)
+    for name, i in index.items():
+        names[i] = name
+    return (names,) + collapse(ranks, weights)
+
+
+def load_cvr(path):
+    """Read a CSV or JSON cast-vote record. Returns (names, ranks, weights)."""
+    index = {}
+    rank_lists, counts = [], []
+    if path.lower().endswith('.json'):
+        with open(path) as f:
+            data = json.load(f)
+        ballots = data['ballots'] if isinstance(data, dict) else data
+        for b in ballots:
+            ranks, count = (b['ranks'], b.get('count', 1)) if isinstance(b, dict) else (b, 1)
+            rank_lists.append([_mark_code(m, index) for m in ranks])
+            counts.append(count)
+        if isinstance(data, dict):
+            for name in data.get('candidates', []):
+                index.setdefault(name, len(index))
+    else:
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            reader = csv.DictReader(f)
+            rank_cols = sorted(((int(m.group(1)), col) for col in reader.fieldnames
+                                for m in [RANK_COLUMN.search(col)] if m))
+            if not rank_cols:
+                raise ValueError(f'{path}: no rank columns (expected headers like "Choice 1")')
+            count_col = next((c for c in reader.fieldnames if c.strip().lower() in COUNT_COLUMNS), None)
+            for row in reader:
+                rank_lists.append([_mark_code(row[col], index) for _, col in rank_cols])
+                counts.append(float(row[count_col]) if count_col else 1)
+    return _pack_ballots(rank_lists, counts, index)
+
+
+def collapse(ranks, weights=None):
+    """Merge identical ballots into one row each with summed weights."""
+    if weights is None:
+        weights = np.ones(len(ranks), dtype=np.float64)
+    if len(ranks) == 0:
+        return ranks, weights
+    # One scalar key per ballot: a packed integer when the ranks fit in 63
+    # bits, else the raw row bytes. Sorting scalars is far faster than
+    # np.unique(axis=0) on a 2-D array.
+    base = int(ranks.max()) - OVERVOTE + 1
+    width = ranks.shape[1]
+    if width * np.log2(max(base, 2)) < 63:
+        keys = (ranks.astype(np.int64) - OVERVOTE) @ (base ** np.arange(width, dtype=np.int64))
+    else:
+        keys = np.ascontiguousarray(ranks).view(np.dtype((np.void, ranks.itemsize * width))).ravel()
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    return ranks[first], np.bincount(inverse.ravel(), weights=weights, minlength=len(first))
+
+
+def clean_ballots(ranks, n_candidates, overvote='exhaust', max_skipped=MAX_SKIPPED):
+    """
+    Reduce raw ranks to the ordered list of choices each ballot can count for.
+
+    Duplicate rankings of a candidate are ignored after the first. A ballot
+    stops at an overvote (overvote='exhaust', AK/ME) or treats it as a
+    skipped ranking (overvote='skip'), and stops after more than max_skipped
+    consecutive skipped rankings (None = never). Returns int16 [n × R+1]
+    padded with EXHAUSTED, so every row ends in at least one EXHAUSTED.
+    """
+    n, width = ranks.shape
+    choices = np.full((n, width + 1), EXHAUSTED, dtype=np.int16)
+    fill = np.zeros(n, dtype=np.int64)
+    alive = np.ones(n, dtype=bool)
+    skipped = np.zeros(n, dtype=np.int64)
+    seen = np.zeros((n, max(n_candidates, 1)), dtype=bool)
+    for r in range(width):
+        mark = ranks[:, r]
+        if overvote == 'exhaust':
+            alive &= mark != OVERVOTE
+        skipped = np.where(mark < 0, skipped + 1, 0)
+        if max_skipped is not None:
+            alive &= skipped <= max_skipped
+        rows = np.flatnonzero(alive & (mark >= 0))
+        cand = mark[rows]
+        fresh = ~seen[rows, cand]
+        rows, cand = rows[fresh], cand[fresh]
+        seen[rows, cand] = True
+        choices[rows, fill[rows]] = cand
+        fill[rows] += 1
+    return choices
+
+# ══════════════════════════════════════════════════════════════════════
+# Tabulation
+# ══════════════════════════════════════════════════════════════════════
+
+def _pick_loser(tally, candidates, history, rng):
+    """Lowest continuing candidate; ties broken by prior rounds, then by lot."""
+    low = tally[candidates].min()
+    tied = [c for c in candidates if tally[c] == low]
+    for prior in reversed(history):
+        if len(tied) == 1:
+            break
+        low = min(prior[c] for c in tied)
+        tied = [c for c in tied if prior[c] == low]
+    if len(tied) == 1:
+        return tied[0], False
+    return int(rng.choice(tied)), True
+
+
+def tabulate(choices, weights, names, seats=1, seed=0):
+    """
+    Tabulate cleaned ballots. Returns
+      {'winners': [...], 'quota': q or None, 'rounds': [{round, tallies,
+       continuing_votes, exhausted, elected, eliminated, tie}],
+       'summary': {name: {first_round_votes, first_round_pct, final_votes,
+                          final_pct, round_eliminated, elected}}}
+    Tallies are floats for STV (fractional transfers) and ints otherwise.
+    """
+    n_cand = len(names)
+    n = len(choices)
+    rng = np.random.default_rng(seed)
+    w = np.asarray(weights, dtype=np.float64).copy()
+    continuing = np.ones(n_cand + 1, dtype=bool)
+    continuing[-1] = False                      # slot for EXHAUSTED (index -1)
+    pos = np.zeros(n, dtype=np.int64)
+    rows = np.arange(n)
+    cur = choices[rows, pos].astype(np.int64)
+    moving = rows[:0]
+
+    quota = None
+    if seats > 1:
+        first = np.bincount(cur[cur >= 0], weights=w[cur >= 0], minlength=n_cand)
+        quota = np.floor(first.sum() / (seats + 1)) + 1
+
+    rounds, history, winners = [], [], []
+    last_round = {}
+    to_int = (lambda v: int(round(v))) if seats == 1 else (lambda v: round(float(v), 4))
+
+    while True:
+        # Move ballots sitting on a no-longer-continuing candidate down their ranking
+        while len(moving):
+            pos[moving] += 1
+            cur[moving] = choices[moving, pos[moving]]
+            moving = moving[(cur[moving] >= 0) & ~continuing[cur[moving]]]
+
+        live = cur >= 0
+        tally = np.bincount(cur[live], weights=w[live], minlength=n_cand)
+        active = [c for c in range(n_cand) if continuing[c]]
+        total = tally[active].sum()
+        rnd = {
+            'round': len(rounds) + 1,
+            'tallies': {names[c]: to_int(tally[c]) for c in sorted(active, key=lambda c: -tally[c])},
+            'continuing_votes': to_int(total),
+            'exhausted': to_int(w[~live].sum()),
+            'elected': [],
+            'eliminated': [],
+            'tie': False,
+        }
+        rounds.append(rnd)
+        for c in active:
+            last_round[c] = (tally[c], total, rnd['round'])
+
+        seats_left = seats - len(winners)
+        if seats == 1:
+            top = max(active, key=lambda c: tally[c])
+            if tally[top] * 2 > total or len(active) <= 2:
+                if len(active) == 2 and tally[active[0]] == tally[active[1]]:
+                    loser, _ = _pick_loser(tally, active, history, rng)
+                    top = active[1] if loser == active[0] else active[0]
+                    rnd['tie'] = True
+                winners.append(top)
+                rnd['elected'].append(names[top])
+                break
+        else:
+            if len(active) <= seats_left:
+                winners.extend(sorted(active, key=lambda c: -tally[c]))
+                rnd['elected'].extend(names[c] for c in sorted(active, key=lambda c: -tally[c]))
+                break
+            reached = sorted((c for c in active if tally[c] >= quota), key=lambda c: -tally[c])
+            if reached:
+                reached = reached[:seats_left]
+                for c in reached:
+                    winners.append(c)
+                    rnd['elected'].append(names[c])
+                    continuing[c] = False
+                    holders = cur == c
+                    w[holders] *= (tally[c] - quota) / tally[c]
+                if len(winners) == seats:
+                    break
+                moving = np.flatnonzero(np.isin(cur, reached))
+                history.append(tally)
+                continue
+
+        loser, tie = _pick_loser(tally, active, history, rng)
+        continuing[loser] = False
+        rnd['eliminated'].append(names[loser])
+        rnd['tie'] = tie
+        moving = np.flatnonzero(cur == loser)
+        history.append(tally)
+
+    first = rounds[0]
+    summary = {}
+    for c, name in enumerate(names):
+        votes, total, rnd_no = last_round.get(c, (0.0, 0.0, 1))
+        first_votes = first['tallies'].get(name, 0)
+        summary[name] = {
+            'first_round_votes': first_votes,
+            'first_round_pct': round(float(100 * first_votes / first['continuing_votes']), 2)
+                               if first['continuing_votes'] else None,
+            'final_votes': to_int(votes),
+            'final_pct': round(float(100 * votes / total), 2) if total else None,
+            'round_eliminated': None if c in winners else rnd_no,
+            'elected': c in winners,
+        }
+    return {
+        'winners': [names[c] for c in winners],
+        'quota': None if quota is None else to_int(quota),
+        'rounds': rounds,
+        'summary': summary,
+    }
+
+
+def tabulate_cvr(path, seats=1, overvote='exhaust', max_skipped=MAX_SKIPPED, seed=0):
+    """Load, clean and tabulate one CVR file."""
+    names, ranks, weights = load_cvr(path)
+    choices = clean_ballots(ranks, len(names), overvote=overvote, max_skipped=max_skipped)
+    return tabulate(choices, weights, names, seats=seats, seed=seed)
+
+# ══════════════════════════════════════════════════════════════════════
+# DB write
+# ══════════════════════════════════════════════════════════════════════
+
+def run_sql(query, exit_on_error=True, retries=5):
+    # Imported here so tabulating and --benchmark need no DB credentials
+    import httpx
+    from db_config import TOKEN, PROJECT_REF
+    for attempt in range(retries):
+        resp = httpx.post(
+            f'https://api.supabase.com/v1/projects/{PROJECT_REF}/database/query',
+            headers={'Authorization': f'Bearer {TOKEN}', 'Content-Type': 'application/json'},
+            json={'query': query},
+            timeout=120
+        )
+        if resp.status_code == 201:
+            return resp.json()
+        if resp.status_code == 429 and attempt < retries - 1:
+            wait = 10 * (attempt + 1)
+            print(f'\n  Rate limited, waiting {wait}s...')
+            time.sleep(wait)
+            continue
+        print(f'SQL ERROR: {resp.status_code} - {resp.text[:500]}')
+        if exit_on_error:
+            sys.exit(1)
+        return None
+
+
+def _cvr_name_key(name):
+    """(first, last) from a CVR name, which may be "Last, First M." and carry an id suffix."""
+    from candidate_lookup import split_name
+    name = re.sub(r'\s*\(\d+\)\s*$', '', name)
+    if ',' in name:
+        last, _, first = name.partition(',')
+        name = f'{first.strip()} {last.strip()}'
+    return split_name(name)
+
+
+def write_candidacies(election_id, result, dry_run=False):
+    """Write first-round and final-round RCV figures to the election's candidacies."""
+    from candidate_lookup import split_name, first_names_match
+    from batch_executor import BatchExecutor
+
+    rows = run_sql(f"""
+        SELECT cy.id AS candidacy_id, c.full_name
+        FROM candidacies cy
+        JOIN candidates c ON c.id = cy.candidate_id
+        WHERE cy.election_id = {int(election_id)}
+    """)
+    db = [(r['candidacy_id'], r['full_name'], split_name(r['full_name'])) for r in rows or []]
+    print(f'\nElection {election_id}: {len(db)} candidacies in DB')
+
+    matched, unmatched = 0, []
+    with BatchExecutor(f'RCV election {election_id}', dry_run=dry_run) as ex:
+        for name, s in result['summary'].items():
+            first, last = _cvr_name_key(name)
+            hits = [(cid, full) for cid, full, (f, l) in db if l == last and first_names_match(f, first)]
+            if len(hits) != 1:
+                unmatched.append(name)
+                continue
+            cid, full = hits[0]
+            matched += 1
+            print(f'  {name:<32} → {full:<28} first {s["first_round_votes"]:>9,}  '
+                  f'final {s["final_votes"]:>9,} ({s["final_pct"]}%)  '
+                  f'{"WON" if s["elected"] else "out in round " + str(s["round_eliminated"])}')
+            ex.update('candidacies', {'id': cid}, {
+                'votes_received': int(round(s['first_round_votes'])),
+                'vote_percentage': s['first_round_pct'],
+                'rcv_round_eliminated': s['round_eliminated'],
+                'rcv_final_votes': int(round(s['final_votes'])),
+                'rcv_final_percentage': s['final_pct'],
+            }, types={'rcv_round_eliminated': 'integer', 'rcv_final_percentage': 'numeric',
+                      'vote_percentage': 'numeric'})
+    print(f'  Matched {matched}/{len(result["summary"])} CVR candidates')
+    if unmatched:
+        print(f'  UNMATCHED (not written): {", ".join(unmatched)}')
+    return matched
+
+# ══════════════════════════════════════════════════════════════════════
+# Benchmark
+# ══════════════════════════════════════════════════════════════════════
+
+def synthetic_ranks(n_ballots, n_candidates, max_ranks=None, seed=1):
+    """Plackett-Luce style ballots with truncation, skips and the odd overvote."""
+    rng = np.random.default_rng(seed)
+    max_ranks = max_ranks or n_candidates
+    strength = np.log(rng.dirichlet(np.ones(n_candidates) * 2))
+    order = np.argsort(-(strength + rng.gumbel(size=(n_ballots, n_candidates))), axis=1)
+    ranks = order[:, :max_ranks].astype(np.int16)
+    depth = rng.integers(1, max_ranks + 1, size=n_ballots)
+    ranks[np.arange(max_ranks) >= depth[:, None]] = SKIP
+    ranks[rng.random((n_ballots, max_ranks)) < 0.01] = SKIP
+    ranks[rng.random((n_ballots, max_ranks)) < 0.002] = OVERVOTE
+    return ranks
+
+
+def save_cvr(path, ranks, names):
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Ballot'] + [f'Choice {r + 1}' for r in range(ranks.shape[1])])
+        for i, row in enumerate(ranks):
+            writer.writerow([i + 1] + ['overvote' if c == OVERVOTE else '' if c == SKIP else names[c]
+                                       for c in row])
+
+
+def print_result(result):
+    for rnd in result['rounds']:
+        print(f'Round {rnd["round"]}: {rnd["continuing_votes"]:,} continuing, '
+              f'{rnd["exhausted"]:,} exhausted{"  (tie broken)" if rnd["tie"] else ""}')
+        for name, votes in rnd['tallies'].items():
+            pct = 100 * votes / rnd['continuing_votes'] if rnd['continuing_votes'] else 0
+            mark = ' ✓' if name in rnd['elected'] else ' ✗' if name in rnd['eliminated'] else ''
+            print(f'    {name:<32} {votes:>12,} {pct:6.2f}%{mark}')
+    print(f'Winner{"s" if len(result["winners"]) > 1 else ""}: {", ".join(result["winners"])}'
+          + (f' (quota {result["quota"]:,})' if result['quota'] else ''))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tabulate ranked-choice races from cast-vote records')
+    parser.add_argument('--cvr', help='Cast-vote record file (.csv or .json)')
+    parser.add_argument('--seats', type=int, default=1, help='Winners (>1 runs STV)')
+    parser.add_argument('--overvote', choices=['exhaust', 'skip'], default='exhaust',
+                        help='Overvote handling (AK/ME: exhaust)')
+    parser.add_argument('--max-skipped', type=int, default=MAX_SKIPPED,
+                        help='Consecutive skipped rankings a ballot survives (default 1)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for ties broken by lot')
+    parser.add_argument('--election-id', type=int, help='Write the result to this election\'s candidacies')
+    parser.add_argument('--dry-run', action='store_true', help='With --election-id: show, don\'t write')
+    parser.add_argument('--json', action='store_true', help='Print the result as JSON')
+    parser.add_argument('--benchmark', action='store_true', help='Tabulate synthetic ballots')
+    parser.add_argument('--ballots', type=int, default=400000, help='Synthetic ballot count')
+    parser.add_argument('--candidates', type=int, default=6, help='Synthetic candidate count')
+    parser.add_argument('--save-cvr', help='--benchmark: also write the synthetic ballots as a CSV CVR')
+    args = parser.parse_args()
+
+    if args.benchmark:
+        names = [f'Candidate {chr(65 + i)}' for i in range(args.candidates)]
+        ranks = synthetic_ranks(args.ballots, args.candidates)
+        if args.save_cvr:
+            save_cvr(args.save_cvr, ranks, names)
+            print(f'Wrote {args.ballots:,} ballots to {args.save_cvr}')
+        t0 = time.perf_counter()
+        unique, weights = collapse(ranks)
+        t1 = time.perf_counter()
+        choices = clean_ballots(unique, len(names), overvote=args.overvote, max_skipped=args.max_skipped)
+        t2 = time.perf_counter()
+        result = tabulate(choices, weights, names, seats=args.seats, seed=args.seed)
+        t3 = time.perf_counter()
+        print_result(result)
+        print(f'\nBallots: {args.ballots:,} ({len(unique):,} distinct), {args.candidates} candidates, '
+              f'{len(result["rounds"])} rounds')
+        print(f'  collapse:  {t1 - t0:6.3f}s')
+        print(f'  clean:     {t2 - t1:6.3f}s')
+        print(f'  tabulate:  {t3 - t2:6.3f}s')
+        print(f'  total:     {t3 - t0:6.3f}s')
+        return
+
+    if not args.cvr:
+        parser.error('pass --cvr FILE (or --benchmark)')
+    if not os.path.exists(args.cvr):
+        parser.error(f'{args.cvr} not found')
+
+    result = tabulate_cvr(args.cvr, seats=args.seats, overvote=args.overvote,
+                          max_skipped=args.max_skipped, seed=args.seed)
+    if args.json:
+        json.dump(result, sys.stdout, indent=2)
+        print()
+    else:
+        print_result(result)
+
+    if args.election_id:
+        write_candidacies(args.election_id, result, dry_run=args.dry_run)
+
+
+if __name__ == '__main__':
+    main()
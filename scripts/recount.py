@@ -0,0 +1,475 @@
+#!/usr/bin/env python3
+"""
+Recount / runoff-eligibility rules shared by every exporter.
+
+One place for the per-state RECOUNT_THRESHOLDS and the badge rules that
+export_district_data.py, export_governor_pages.py and
+export_statewide_pages.py used to carry their own copies of (and that
+install_live_elections_rpc.py compiles into SQL, and supabase.js mirrors
+in checkRecountEligible for its fallback path).
+
+Three badge types, only for 'Called' or 'Unofficial' results:
+  - 'runoff_triggered': two or more candidates with result 'Runoff';
+    margin between the runoff candidates, plus the cutoff margin between
+    the last runoff candidate and the first eliminated one
+  - 'recount': top-2 margin within the state's official threshold
+  - 'close_race': top-2 margin within CLOSE_RACE_PCT, for states with no
+    margin-based rule
+
+check_recount_eligible() evaluates one election. Exporters instead queue
+every election of an export on a RecountBatch and evaluate them together:
+evaluate_recounts() works on flat NumPy columns (candidate votes, result
+codes, per-election totals) with a handful of segment reductions, and
+only builds dicts for the flagged elections.
+
+Usage:
+    python3 scripts/recount.py --check        # pinned cases + randomized vs check_recount_eligible
+    python3 scripts/recount.py --benchmark    # every historical election in the DB
+"""
+
+import sys
+import os
+import time
+import argparse
+
+import numpy as np
+
+# ── Recount threshold rules by state ──────────────────────────────────
+# States with official margin-based recount thresholds (automatic or
+# mandatory-to-grant when requested). Researched from NCSL, Ballotpedia,
+# and state statutes. Format: { state: { 'statewide': pct, 'legislative': pct } }
+#
+# States NOT listed here use the CLOSE_RACE_PCT fallback (1%).
+# These include: states with no recount provision (IL, MS, TN), states
+# where recounts are purely candidate-requested with no margin limit
+# (AR, CA, IN, LA, NV, NH, NJ, OK, WV), and states with tie-only
+# automatic recounts (AK, ME, MT, SD, TX, UT, VT).
+RECOUNT_THRESHOLDS = {
+    # Automatic recount states
+    'AL': {'statewide': 0.5, 'legislative': 0.5},
+    'AZ': {'statewide': 0.5, 'legislative': 0.5},   # Changed from 0.1% to 0.5% in 2022
+    'CO': {'statewide': 0.5, 'legislative': 0.5},
+    'CT': {'statewide': 0.5, 'legislative': 0.5},
+    'DE': {'statewide': 0.5, 'legislative': 0.5},
+    'FL': {'statewide': 0.5, 'legislative': 0.5},    # 0.5% machine, 0.25% manual
+    'HI': {'statewide': 0.25, 'legislative': 0.25},
+    'KY': {'statewide': 0.5, 'legislative': 0.5},
+    'MI': {'statewide': 0.1, 'legislative': 0.1},    # Fixed: 0.1% statewide; legislative uses fixed vote counts but ~0.1% equivalent
+    'NE': {'statewide': 1.0, 'legislative': 1.0},    # 1% for >500 votes; 2% for <=500
+    'NM': {'statewide': 0.25, 'legislative': 1.0},
+    'NY': {'statewide': 0.5, 'legislative': 0.5},
+    'ND': {'statewide': 0.5, 'legislative': 0.5},
+    'OH': {'statewide': 0.25, 'legislative': 0.5},
+    'OR': {'statewide': 0.2, 'legislative': 0.2},
+    'SC': {'statewide': 1.0, 'legislative': 1.0},
+    'WA': {'statewide': 0.5, 'legislative': 0.5},
+    'WY': {'statewide': 1.0, 'legislative': 1.0},
+    # Candidate-requested but mandatory to grant at threshold
+    'GA': {'statewide': 0.5, 'legislative': 0.5},    # Fixed: 0.5% all races (requested, not automatic)
+    'ID': {'statewide': 0.5, 'legislative': 0.5},
+    'IA': {'statewide': 1.0, 'legislative': 1.0},
+    'KS': {'statewide': 0.5, 'legislative': 0.5},    # State pays if <=0.5%
+    'MA': {'statewide': 0.5, 'legislative': 0.5},
+    'MD': {'statewide': 0.1, 'legislative': 0.1},    # Any candidate can request; state pays if <=0.1%
+    'MN': {'statewide': 0.25, 'legislative': 0.5},
+    'MO': {'statewide': 0.5, 'legislative': 1.0},
+    'NC': {'statewide': 0.5, 'legislative': 1.0},
+    'PA': {'statewide': 0.5, 'legislative': 0.5},
+    'VA': {'statewide': 1.0, 'legislative': 1.0},
+    'WI': {'statewide': 0.25, 'legislative': 0.25},  # Fixed: state pays if <=0.25%
+}
+
+# Close-race threshold for states without a specific margin-based rule
+# (e.g. AR where any candidate can request a recount regardless of margin).
+# Flags races under 1% as "close" — not a legal threshold, just notable.
+CLOSE_RACE_PCT = 1.0
+
+FLAGGED_STATUSES = ('Called', 'Unofficial')
+LEVELS = ('legislative', 'statewide')
+
+# Candidate result codes for the columnar path
+ELIMINATED, RUNOFF, ADVANCING = 0, 1, 2
+RESULT_CODES = {'Runoff': RUNOFF, 'Won': ADVANCING, 'Advanced': ADVANCING}
+
+
+def _runoff_flag(r_margin, cutoff_margin, total_votes):
+    return {
+        'type': 'runoff_triggered',
+        'margin': r_margin,
+        'margin_pct': round((r_margin / total_votes) * 100, 2),
+        'cutoff_margin': cutoff_margin,
+        'cutoff_margin_pct': (round((cutoff_margin / total_votes) * 100, 2)
+                              if cutoff_margin is not None else None),
+    }
+
+
+def _margin_flag(kind, margin, total_votes, threshold):
+    return {
+        'type': kind,
+        'margin': margin,
+        'margin_pct': round((margin / total_votes) * 100, 2),
+        'threshold_pct': threshold,
+    }
+
+
+def check_recount_eligible(state_abbr, candidates, total_votes, result_status, level='legislative'):
+    """
+    Badge dict for one election, or None.
+
+    candidates are dicts with 'votes' and 'result'. level picks the
+    'legislative' or 'statewide' threshold for states in RECOUNT_THRESHOLDS.
+    """
+    if not total_votes:
+        return None
+    if result_status not in FLAGGED_STATUSES:
+        return None
+
+    sorted_cands = sorted(
+        [c for c in candidates if c.get('votes') and c['votes'] > 0],
+        key=lambda c: c['votes'], reverse=True)
+    if len(sorted_cands) < 2:
+        return None
+
+    # Both top candidates advancing to a runoff: the margin between them
+    # doesn't decide anything, the cutoff to the first eliminated one does.
+    runoff_cands = [c for c in sorted_cands if c.get('result') == 'Runoff']
+    if len(runoff_cands) >= 2:
+        eliminated = [c for c in sorted_cands if c.get('result') not in ('Runoff', 'Won', 'Advanced')]
+        cutoff_margin = runoff_cands[-1]['votes'] - eliminated[0]['votes'] if eliminated else None
+        return _runoff_flag(runoff_cands[0]['votes'] - runoff_cands[-1]['votes'],
+                            cutoff_margin, total_votes)
+
+    margin = sorted_cands[0]['votes'] - sorted_cands[1]['votes']
+    margin_pct = (margin / total_votes) * 100
+    thresholds = RECOUNT_THRESHOLDS.get(state_abbr)
+    if thresholds:
+        threshold = thresholds.get(level)
+        if threshold is not None and margin_pct <= threshold:
+            return _margin_flag('recount', margin, total_votes, threshold)
+    elif margin_pct <= CLOSE_RACE_PCT:
+        return _margin_flag('close_race', margin, total_votes, CLOSE_RACE_PCT)
+    return None
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Columnar evaluation
+# ═══════════════════════════════════════════════════════════════════════
+
+def evaluate_recounts(states, totals, statuses, cand_election, cand_votes, cand_results,
+                      level='legislative'):
+    """
+    Badges for many elections at once. Returns a list (one entry per
+    election) of badge dicts or None, identical to check_recount_eligible.
+
+    Per election:   states, totals, statuses (lists, totals may hold None)
+    Per candidate:  cand_election (index into the election lists),
+                    cand_votes (int array, 0 for NULL),
+                    cand_results (ELIMINATED / RUNOFF / ADVANCING codes)
+    """
+    n = len(totals)
+    if n == 0:
+        return []
+    tv = np.array([t or 0 for t in totals], dtype=np.int64)
+    status_ok = np.array([s in FLAGGED_STATUSES for s in statuses], dtype=bool)
+    # Per-state lookup: NaN threshold = listed state without a rule at this level
+    lookup = {st: t.get(level) for st, t in RECOUNT_THRESHOLDS.items() if t}
+    thr = np.array([lookup.get(st, np.nan) for st in states], dtype=float)
+    has_thr = np.array([st in lookup for st in states], dtype=bool)
+
+    # Only candidates with votes take part in any rule
+    voted = cand_votes > 0
+    e = cand_election[voted]
+    v = cand_votes[voted]
+    r = cand_results[voted]
+    n_voted = np.bincount(e, minlength=n)
+
+    # Top two per election without sorting: the max, then either the max
+    # again (tied leaders) or the max of everything below it
+    top1 = np.zeros(n, dtype=np.int64)
+    np.maximum.at(top1, e, v)
+    is_top = v == top1[e]
+    tied = np.bincount(e[is_top], minlength=n) >= 2
+    top2 = np.zeros(n, dtype=np.int64)
+    np.maximum.at(top2, e[~is_top], v[~is_top])
+    top2 = np.where(tied, top1, top2)
+
+    is_runoff = r == RUNOFF
+    n_runoff = np.bincount(e[is_runoff], minlength=n)
+    runoff_hi = np.zeros(n, dtype=np.int64)
+    runoff_lo = np.full(n, np.iinfo(np.int64).max)
+    np.maximum.at(runoff_hi, e[is_runoff], v[is_runoff])
+    np.minimum.at(runoff_lo, e[is_runoff], v[is_runoff])
+    is_elim = r == ELIMINATED
+    n_elim = np.bincount(e[is_elim], minlength=n)
+    elim_hi = np.zeros(n, dtype=np.int64)
+    np.maximum.at(elim_hi, e[is_elim], v[is_elim])
+
+    eligible = (tv != 0) & status_ok & (n_voted >= 2)
+    runoff = eligible & (n_runoff >= 2)
+    margin = top1 - top2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        margin_pct = (margin / tv) * 100
+        recount = eligible & ~runoff & has_thr & (margin_pct <= thr)
+        close = eligible & ~runoff & ~has_thr & (margin_pct <= CLOSE_RACE_PCT)
+
+    flags = [None] * n
+    for i in np.flatnonzero(runoff):
+        cutoff = int(runoff_lo[i] - elim_hi[i]) if n_elim[i] else None
+        flags[i] = _runoff_flag(int(runoff_hi[i] - runoff_lo[i]), cutoff, totals[i])
+    for i in np.flatnonzero(recount):
+        flags[i] = _margin_flag('recount', int(margin[i]), totals[i], float(thr[i]))
+    for i in np.flatnonzero(close):
+        flags[i] = _margin_flag('close_race', int(margin[i]), totals[i], CLOSE_RACE_PCT)
+    return flags
+
+
+class RecountBatch:
+    """
+    Queue an export's elections, then set every recount_eligible at once.
+
+    add() reserves the 'recount_eligible' key on the election dict so it
+    keeps its place among the other keys; apply() fills it in or removes it.
+    Call apply() before anything reads or serializes the queued dicts.
+    """
+
+    def __init__(self, level='legislative'):
+        if level not in LEVELS:
+            raise ValueError(f'level must be one of {LEVELS}')
+        self.level = level
+        self.targets = []
+        self.states = []
+        self.totals = []
+        self.statuses = []
+        self.cand_election = []
+        self.cand_votes = []
+        self.cand_results = []
+
+    def add(self, elec_obj, state_abbr, candidates, total_votes, result_status):
+        # Certified / empty results can never be flagged; most history is
+        # certified, so only live elections are ever queued.
+        if not total_votes or result_status not in FLAGGED_STATUSES:
+            return
+        i = len(self.targets)
+        elec_obj['recount_eligible'] = None
+        self.targets.append(elec_obj)
+        self.states.append(state_abbr)
+        self.totals.append(total_votes)
+        self.statuses.append(result_status)
+        self.cand_election.extend([i] * len(candidates))
+        self.cand_votes.extend([c.get('votes') or 0 for c in candidates])
+        self.cand_results.extend([RESULT_CODES.get(c.get('result'), ELIMINATED) for c in candidates])
+
+    def evaluate(self):
+        return evaluate_recounts(
+            self.states, self.totals, self.statuses,
+            np.array(self.cand_election, dtype=np.int64),
+            np.array(self.cand_votes, dtype=np.int64),
+            np.array(self.cand_results, dtype=np.int8),
+            self.level)
+
+    def apply(self):
+        """Write the badges into the queued election dicts. Returns the number flagged."""
+        flagged = 0
+        for elec_obj, flag in zip(self.targets, self.evaluate()):
+            if flag:
+                elec_obj['recount_eligible'] = flag
+                flagged += 1
+            else:
+                del elec_obj['recount_eligible']
+        self.__init__(self.level)
+        return flagged
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Self-check and benchmark
+# ═══════════════════════════════════════════════════════════════════════
+
+def _c(votes, result='Lost'):
+    return {'votes': votes, 'result': result}
+
+
+# (state, candidates, total, status, level) -> expected badge. Pins the
+# outputs of the exporters' former _check_recount_eligible copies.
+PINNED_CASES = [
+    # not flagged: status, totals, fewer than two candidates with votes
+    (('NC', [_c(500, 'Won'), _c(499)], 999, 'Certified', 'legislative'), None),
+    (('NC', [_c(500, 'Won'), _c(499)], 999, None, 'legislative'), None),
+    (('NC', [_c(500, 'Won'), _c(499)], 0, 'Called', 'legislative'), None),
+    (('NC', [_c(500, 'Won'), _c(499)], None, 'Called', 'legislative'), None),
+    (('NC', [_c(500, 'Won'), _c(0), _c(None)], 500, 'Called', 'legislative'), None),
+    # recount: NC legislative 1.0%, statewide 0.5%
+    (('NC', [_c(5040, 'Won'), _c(4960)], 10000, 'Called', 'legislative'),
+     {'type': 'recount', 'margin': 80, 'margin_pct': 0.8, 'threshold_pct': 1.0}),
+    (('NC', [_c(5040, 'Won'), _c(4960)], 10000, 'Called', 'statewide'), None),
+    (('NC', [_c(5020, 'Won'), _c(4980)], 10000, 'Unofficial', 'statewide'),
+     {'type': 'recount', 'margin': 40, 'margin_pct': 0.4, 'threshold_pct': 0.5}),
+    # boundary is inclusive
+    (('PA', [_c(5025, 'Won'), _c(4975)], 10000, 'Called', 'legislative'),
+     {'type': 'recount', 'margin': 50, 'margin_pct': 0.5, 'threshold_pct': 0.5}),
+    (('PA', [_c(5026, 'Won'), _c(4974)], 10000, 'Called', 'legislative'), None),
+    # threshold state above threshold does not fall back to close_race
+    (('MD', [_c(5040, 'Won'), _c(4960)], 10000, 'Called', 'legislative'), None),
+    # close_race fallback (TX has no margin rule)
+    (('TX', [_c(3, 'Lost'), _c(5040, 'Won'), _c(4957)], 10000, 'Called', 'legislative'),
+     {'type': 'close_race', 'margin': 83, 'margin_pct': 0.83, 'threshold_pct': 1.0}),
+    (('TX', [_c(5100, 'Won'), _c(4900)], 10000, 'Called', 'legislative'), None),
+    # runoff: margin between runoff candidates, cutoff to first eliminated
+    (('GA', [_c(4000, 'Runoff'), _c(3000, 'Runoff'), _c(2990), _c(10)], 10000, 'Called', 'statewide'),
+     {'type': 'runoff_triggered', 'margin': 1000, 'margin_pct': 10.0,
+      'cutoff_margin': 10, 'cutoff_margin_pct': 0.1}),
+    (('TX', [_c(6000, 'Runoff'), _c(4000, 'Runoff')], 10000, 'Called', 'legislative'),
+     {'type': 'runoff_triggered', 'margin': 2000, 'margin_pct': 20.0,
+      'cutoff_margin': None, 'cutoff_margin_pct': None}),
+    # tied leaders
+    (('TX', [_c(5000, 'Won'), _c(5000), _c(12)], 10012, 'Called', 'legislative'),
+     {'type': 'close_race', 'margin': 0, 'margin_pct': 0.0, 'threshold_pct': 1.0}),
+    # a single Runoff candidate is a normal top-2 check
+    (('TX', [_c(4990, 'Runoff'), _c(4950)], 10000, 'Called', 'legislative'),
+     {'type': 'close_race', 'margin': 40, 'margin_pct': 0.4, 'threshold_pct': 1.0}),
+    # rounding to 2 places
+    (('AR', [_c(1001, 'Won'), _c(1000)], 3001, 'Called', 'legislative'),
+     {'type': 'close_race', 'margin': 1, 'margin_pct': 0.03, 'threshold_pct': 1.0}),
+]
+
+
+def _random_elections(count, seed=0):
+    import random
+    rng = random.Random(seed)
+    states = list(RECOUNT_THRESHOLDS) + ['TX', 'AR', 'CA', 'AK', 'NH']
+    results = ['Won', 'Lost', 'Runoff', 'Advanced', None, 'Withdrawn']
+    out = []
+    for _ in range(count):
+        k = rng.choice((0, 1, 2, 2, 3, 4, 7))
+        base = rng.choice((50, 1000, 20000, 300000))
+        cands = [_c(rng.choice((None, 0, base + rng.randint(-base // 50, base // 50),
+                                rng.randint(1, base))),
+                    rng.choice(results)) for _ in range(k)]
+        voted = sum(c['votes'] or 0 for c in cands)
+        total = rng.choice((voted, voted + rng.randint(0, 50), 0, None)) if cands else 0
+        status = rng.choice(('Called', 'Unofficial', 'Certified', None))
+        out.append((rng.choice(states), cands, total, status))
+    return out
+
+
+def run_check():
+    failures = 0
+    for args, expected in PINNED_CASES:
+        state, cands, total, status, level = args
+        scalar = check_recount_eligible(state, cands, total, status, level)
+        vector = evaluate_recounts([state], [total], [status], *_columns([cands]), level)[0]
+        if scalar != expected or vector != expected:
+            failures += 1
+            print(f'  FAIL {args}\n    expected {expected}\n    scalar   {scalar}\n    vector   {vector}')
+    print(f'Pinned cases: {len(PINNED_CASES) - failures}/{len(PINNED_CASES)} OK')
+
+    elections = _random_elections(50000)
+    for level in LEVELS:
+        expected = [check_recount_eligible(st, c, t, s, level) for st, c, t, s in elections]
+        got = evaluate_recounts([x[0] for x in elections], [x[2] for x in elections],
+                                [x[3] for x in elections], *_columns([x[1] for x in elections]), level)
+        batch = RecountBatch(level)
+        targets = [{} for _ in elections]
+        for obj, (st, c, t, s) in zip(targets, elections):
+            batch.add(obj, st, c, t, s)
+        batch.apply()
+        bad = [i for i, (a, b, obj) in enumerate(zip(expected, got, targets))
+               if a != b or a != obj.get('recount_eligible')]
+        flagged = sum(1 for f in expected if f)
+        print(f'Randomized ({level}): {len(elections) - len(bad)}/{len(elections)} match, '
+              f'{flagged} flagged')
+        for i in bad[:5]:
+            print(f'  FAIL {elections[i]}\n    scalar {expected[i]}\n    vector {got[i]}'
+                  f'\n    batch  {targets[i].get("recount_eligible")}')
+        failures += len(bad)
+    return failures
+
+
+def _columns(candidate_lists):
+    idx, votes, results = [], [], []
+    for i, cands in enumerate(candidate_lists):
+        for c in cands:
+            idx.append(i)
+            votes.append(c.get('votes') or 0)
+            results.append(RESULT_CODES.get(c.get('result'), ELIMINATED))
+    return (np.array(idx, dtype=np.int64), np.array(votes, dtype=np.int64),
+            np.array(results, dtype=np.int8))
+
+
+def run_sql(query, retries=5):
+    # Only the benchmark touches the DB; exporters import this module without credentials.
+    import httpx
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+    from db_config import TOKEN, API_URL
+    for attempt in range(retries):
+        resp = httpx.post(
+            API_URL,
+            headers={'Authorization': f'Bearer {TOKEN}', 'Content-Type': 'application/json'},
+            json={'query': query},
+            timeout=300
+        )
+        if resp.status_code == 201:
+            return resp.json()
+        if resp.status_code == 429 and attempt < retries - 1:
+            wait = 10 * (attempt + 1)
+            print(f'  Rate limited, waiting {wait}s...')
+            time.sleep(wait)
+            continue
+        print(f'SQL ERROR: {resp.status_code} - {resp.text[:500]}')
+        sys.exit(1)
+
+
+def run_benchmark():
+    """Evaluate every election in the DB both ways (as if all were still uncertified)."""
+    rows = run_sql("""
+        SELECT st.abbreviation AS state, e.total_votes_cast AS total,
+               COALESCE(json_agg(json_build_object('votes', cy.votes_received, 'result', cy.result))
+                        FILTER (WHERE cy.id IS NOT NULL), '[]') AS candidates
+        FROM elections e
+        JOIN seats s ON e.seat_id = s.id
+        JOIN districts d ON s.district_id = d.id
+        JOIN states st ON d.state_id = st.id
+        LEFT JOIN candidacies cy ON cy.election_id = e.id
+        GROUP BY e.id, st.abbreviation
+    """)
+    n_cands = sum(len(r['candidates']) for r in rows)
+    print(f'{len(rows):,} elections, {n_cands:,} candidacies')
+
+    t0 = time.perf_counter()
+    scalar = [check_recount_eligible(r['state'], r['candidates'], r['total'], 'Called')
+              for r in rows]
+    t1 = time.perf_counter()
+    batch = RecountBatch()
+    targets = [{} for _ in rows]
+    for obj, r in zip(targets, rows):
+        batch.add(obj, r['state'], r['candidates'], r['total'], 'Called')
+    t2 = time.perf_counter()
+    flagged = batch.apply()
+    t3 = time.perf_counter()
+    mismatches = sum(1 for a, b in zip(scalar, targets) if a != b.get('recount_eligible'))
+    print(f'  per-election:  {(t1 - t0) * 1000:8.1f} ms')
+    print(f'  batch:         {(t3 - t1) * 1000:8.1f} ms  '
+          f'(queue {(t2 - t1) * 1000:.1f} ms, evaluate {(t3 - t2) * 1000:.1f} ms)')
+    print(f'  {flagged:,} flagged, {mismatches} mismatches')
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Shared recount/runoff-eligibility rules')
+    parser.add_argument('--check', action='store_true',
+                        help='Verify pinned cases and randomized batch-vs-scalar agreement')
+    parser.add_argument('--benchmark', action='store_true',
+                        help='Time both paths on every election in the DB')
+    args = parser.parse_args()
+    if not (args.check or args.benchmark):
+        parser.print_help()
+        return
+    failures = 0
+    if args.check:
+        failures += run_check()
+    if args.benchmark:
+        failures += run_benchmark()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
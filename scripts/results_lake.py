@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Local results lake: downloaded source results in one SQLite file.
+
+Downloaders used to dump one large pretty-printed JSON blob each to /tmp
+(/tmp/ak_sos_results.json, /tmp/ma_sos_elections.json, /tmp/pres_margins.json)
+and every populate run re-parsed the whole blob to use one state or year.
+They now write here instead, and populate scripts read back only the slice
+they need with the filters applied in SQL.
+
+Every source shares one schema:
+
+  races     one row per contest: source, state, year, election_type,
+            chamber, district, office, plus payload (the source's own
+            record as compact JSON, so populate scripts keep their parsing)
+  results   one row per candidate: race_id, candidate, party, votes
+  loads     one row per slice written, with counts
+
+The view results_flat joins them into the common columnar shape
+(source, state, year, election_type, chamber, district, office, candidate,
+party, votes) for ad-hoc queries across sources.
+
+Writing replaces whatever the lake held for the same (source, state, year,
+chamber, office) slices, so re-downloading one year or office leaves the
+rest alone.
+
+Usage:
+    python3 scripts/results_lake.py --summary
+    python3 scripts/results_lake.py --rows --source ak_sos --year 2012 --chamber House
+    python3 scripts/results_lake.py --import-json ma_sos /tmp/ma_sos_elections.json   # migrate an old blob
+    sqlite3 tmp/results_lake.sqlite "SELECT state, SUM(votes) FROM results_flat GROUP BY 1"
+"""
+
+import os
+import sys
+import csv
+import json
+import sqlite3
+import argparse
+import importlib
+from datetime import datetime, timezone
+
+LAKE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tmp', 'results_lake.sqlite')
+
+# source → downloader module providing lake_races(records) for --import-json
+SOURCES = {
+    'ak_sos': 'download_ak_sos_results',
+    'ma_sos': 'download_ma_sos_elections',
+    'pres_margins': 'download_pres_margins',
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS races (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    state TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    election_type TEXT,
+    chamber TEXT,
+    district TEXT,
+    office TEXT,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS races_slice ON races (source, state, year, election_type, chamber);
+CREATE INDEX IF NOT EXISTS races_year ON races (source, year);
+
+CREATE TABLE IF NOT EXISTS results (
+    race_id INTEGER NOT NULL REFERENCES races(id) ON DELETE CASCADE,
+    candidate TEXT,
+    party TEXT,
+    votes INTEGER
+);
+CREATE INDEX IF NOT EXISTS results_race ON results (race_id);
+
+CREATE TABLE IF NOT EXISTS loads (
+    source TEXT NOT NULL,
+    state TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    chamber TEXT NOT NULL,
+    office TEXT NOT NULL,
+    loaded_at TEXT NOT NULL,
+    races INTEGER NOT NULL,
+    results INTEGER NOT NULL,
+    PRIMARY KEY (source, state, year, chamber, office)
+);
+
+CREATE VIEW IF NOT EXISTS results_flat AS
+    SELECT r.source, r.state, r.year, r.election_type, r.chamber, r.district, r.office,
+           x.candidate, x.party, x.votes
+    FROM results x JOIN races r ON r.id = x.race_id;
+"""
+
+FILTERS = ('state', 'year', 'election_type', 'chamber', 'district', 'office')
+
+
+class ResultsLake:
+    def __init__(self, path=LAKE_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA foreign_keys = ON')
+        self.conn.execute('PRAGMA journal_mode = WAL')
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ── writing ───────────────────────────────────────────────────────
+
+    def write(self, source, races):
+        """Store races for a source, replacing every slice they cover.
+
+        A slice is (source, state, year, chamber, office), so downloading one
+        year or one office leaves the rest of the source alone. Each race is
+        a dict with state, year, election_type, chamber, district, office
+        (optional), candidates as [(name, party, votes), …] and payload (the
+        source record). Returns {(state, year, chamber, office): n_races}.
+        """
+        slices = {}
+        for race in races:
+            key = (race['state'], int(race['year']), race.get('chamber'), race.get('office'))
+            slices.setdefault(key, []).append(race)
+        loaded_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        with self.conn:
+            for (state, year, chamber, office), group in slices.items():
+                self.conn.execute(
+                    'DELETE FROM races WHERE source = ? AND state = ? AND year = ? AND chamber IS ? AND office IS ?',
+                    (source, state, year, chamber, office))
+                n_results = 0
+                for race in group:
+                    district = race.get('district')
+                    cur = self.conn.execute(
+                        'INSERT INTO races (source, state, year, election_type, chamber, district, office, payload) '
+                        'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                        (source, state, year, race.get('election_type'), chamber,
+                         None if district is None else str(district), office,
+                         json.dumps(race['payload'], separators=(',', ':'), default=str)))
+                    rows = [(cur.lastrowid, name, party, votes) for name, party, votes in race['candidates']]
+                    self.conn.executemany(
+                        'INSERT INTO results (race_id, candidate, party, votes) VALUES (?, ?, ?, ?)', rows)
+                    n_results += len(rows)
+                self.conn.execute('INSERT OR REPLACE INTO loads VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                                  (source, state, year, chamber or '', office or '', loaded_at,
+                                   len(group), n_results))
+        return {k: len(v) for k, v in slices.items()}
+
+    # ── reading ───────────────────────────────────────────────────────
+
+    def _where(self, source, year_from=None, year_to=None, **filters):
+        clauses, params = [], []
+        if source is not None:
+            clauses.append('source = ?')
+            params.append(source)
+        for col in FILTERS:
+            value = filters.get(col)
+            if value is None:
+                continue
+            if isinstance(value, (list, tuple, set)):
+                clauses.append(f'{col} IN ({", ".join("?" * len(value))})')
+                params.extend(value)
+            else:
+                clauses.append(f'{col} = ?')
+                params.append(value)
+        if year_from is not None:
+            clauses.append('year >= ?')
+            params.append(year_from)
+        if year_to is not None:
+            clauses.append('year <= ?')
+            params.append(year_to)
+        return ' AND '.join(clauses) or '1 = 1', params
+
+    def read(self, source, year_from=None, year_to=None, **filters):
+        """Source records (payloads) for the matching slice, in load order.
+
+        Filters are column=value or column=[values] on state, year,
+        election_type, chamber, district, office; all run in SQLite.
+        """
+        where, params = self._where(source, year_from, year_to, **filters)
+        cur = self.conn.execute(f'SELECT payload FROM races WHERE {where} ORDER BY id', params)
+        return [json.loads(payload) for payload, in cur]
+
+    def rows(self, source=None, year_from=None, year_to=None, **filters):
+        """Flat candidate rows (dicts in the common schema) for the matching slice."""
+        where, params = self._where(source, year_from, year_to, **filters)
+        cur = self.conn.execute(f'SELECT * FROM results_flat WHERE {where}', params)
+        cols = [d[0] for d in cur.description]
+        return [dict(zip(cols, r)) for r in cur]
+
+    def has(self, source):
+        return self.conn.execute('SELECT 1 FROM loads WHERE source = ? LIMIT 1', (source,)).fetchone() is not None
+
+    def summary(self):
+        return self.conn.execute("""
+            SELECT source, COUNT(DISTINCT state), MIN(year), MAX(year), SUM(races), SUM(results),
+                   MAX(loaded_at)
+            FROM loads GROUP BY source ORDER BY source
+        """).fetchall()
+
+
+def read_source(source, what, year_from=None, year_to=None, **filters):
+    """Populate-script helper: the records for one slice, or exit with a hint."""
+    with ResultsLake() as lake:
+        if not lake.has(source):
+            print(f'ERROR: no {source} data in {LAKE_PATH}. Run {SOURCES[source]}.py first.')
+            sys.exit(1)
+        records = lake.read(source, year_from, year_to, **filters)
+    print(f'Loaded {len(records)} {what} from the results lake ({source})')
+    return records
+
+
+def write_source(source, races):
+    """Downloader helper: write races to the lake and report the slices replaced."""
+    with ResultsLake() as lake:
+        slices = lake.write(source, races)
+    states = sorted({k[0] for k in slices})
+    years = sorted({k[1] for k in slices})
+    span = f'{years[0]}-{years[-1]}' if len(years) > 1 else (str(years[0]) if years else '-')
+    print(f'Wrote {sum(slices.values())} races to the results lake ({source}: '
+          f'{", ".join(states) if len(states) <= 5 else f"{len(states)} states"}, {span})')
+    return slices
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect the local results lake')
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument('--summary', action='store_true', help='Slices loaded per source')
+    mode.add_argument('--rows', action='store_true', help='Print flat candidate rows as CSV')
+    mode.add_argument('--import-json', nargs=2, metavar=('SOURCE', 'PATH'),
+                      help='Load a JSON blob written by an older downloader')
+    parser.add_argument('--source', choices=sorted(SOURCES))
+    for col in ('state', 'election_type', 'chamber', 'district', 'office'):
+        parser.add_argument(f'--{col.replace("_", "-")}', dest=col)
+    parser.add_argument('--year', type=int)
+    args = parser.parse_args()
+
+    if args.summary:
+        with ResultsLake() as lake:
+            rows = lake.summary()
+        print(f'  {"source":<16} {"states":>6} {"years":>11} {"races":>8} {"results":>9}  loaded')
+        for source, states, y0, y1, races, results, loaded_at in rows:
+            print(f'  {source:<16} {states:>6} {f"{y0}-{y1}":>11} {races:>8} {results:>9}  {loaded_at}')
+    elif args.rows:
+        filters = {col: getattr(args, col) for col in FILTERS}
+        with ResultsLake() as lake:
+            rows = lake.rows(args.source, **filters)
+        if rows:
+            writer = csv.DictWriter(sys.stdout, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        source, path = args.import_json
+        if source not in SOURCES:
+            parser.error(f'unknown source {source} (known: {", ".join(sorted(SOURCES))})')
+        with open(path) as f:
+            records = json.load(f)
+        write_source(source, importlib.import_module(SOURCES[source]).lake_races(records))
+
+
+if __name__ == '__main__':
+    main()
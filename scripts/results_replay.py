@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+"""
+Record and replay election-night result feeds for import_primary_results.py.
+
+The NC, AR and TX downloaders hit live SoS endpoints, so the import loop
+can only be exercised on the night itself. This records the full sequence
+of responses a night produces and plays it back later through a local HTTP
+stand-in, faster than real time, so the parse → match → update loop can be
+benchmarked under a realistic update cadence.
+
+  --record   poll a state's downloader every --interval seconds and append
+             every response (NC results_0.txt, AR contest JSON, TX base64
+             sections, …) to a capture directory
+  --serve    serve a capture on localhost; each URL returns the latest
+             response recorded at or before the replay clock, which runs
+             --speed times faster than the night did
+  --bench    serve a capture in-process and run the import loop against it
+             every --poll capture-seconds, reporting per-cycle step timings
+             and end-to-end latency (result published at the source →
+             matched and updated)
+
+Capture layout (/tmp/captures/{ST}_{YYYYMMDD}_{recorded}/):
+  manifest.jsonl   one line per response: seq, t (seconds since the
+                   capture started), url (as sent), status, content_type,
+                   sha256. URLs are compared through canonical_url, so a
+                   replayed request matches however its query was escaped
+                   or ordered.
+  bodies/{sha256}.gz
+                   response bodies, gzip-compressed and stored once per
+                   distinct content
+
+import_primary_results.py --replay URL points its downloads at a running
+--serve instance instead of the SoS sites.
+
+--bench needs --dsn: run_sql is answered from that local Postgres (see
+bench_exports.py), never from the production database, since every poll
+loads and matches the state's elections. It is dry-run by default; --write
+applies the updates to the local database.
+
+Usage:
+    python3 scripts/results_replay.py --record --state NC --date 2026-03-03 --interval 60
+    python3 scripts/results_replay.py --list
+    python3 scripts/results_replay.py --serve NC_20260303_20260303_190002 --speed 30
+    python3 scripts/import_primary_results.py --state NC --dry-run --replay http://127.0.0.1:8765
+    python3 scripts/results_replay.py --bench NC_20260303_20260303_190002 --dsn postgresql://localhost/elections_bench --speed 30 --poll 60
+    python3 scripts/results_replay.py --bench NC_20260303_20260303_190002 --dsn postgresql://localhost/elections_bench --write
+"""
+
+import io
+import os
+import sys
+import json
+import gzip
+import time
+import shutil
+import hashlib
+import argparse
+import tempfile
+import threading
+import statistics
+import contextlib
+from datetime import datetime, timezone
+from urllib.parse import urlsplit, parse_qsl, unquote
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from snapshot_store import SNAPSHOT_DIR
+
+CAPTURE_DIR = '/tmp/captures'
+DEFAULT_PORT = 8765
+
+
+def replay_url(base, url):
+    """https://host/path?q → {base}/host/path?q, the URL a replay server answers."""
+    parts = urlsplit(url)
+    path = f'/{parts.netloc}{parts.path}' + (f'?{parts.query}' if parts.query else '')
+    return base.rstrip('/') + path
+
+
+def canonical_url(url):
+    """
+    Lookup key for a captured or replayed URL: host, path unquoted once,
+    query pairs decoded and sorted. The manifest holds the URL as httpx sent
+    it and the replay server sees it re-encoded (e.g. contestType=State%20Senate),
+    so both sides go through here. The scheme is dropped; a replayed request
+    doesn't carry it.
+    """
+    parts = urlsplit(url)
+    query = '&'.join(f'{k}={v}' for k, v in sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return f'{parts.netloc}{unquote(parts.path)}' + (f'?{query}' if query else '')
+
+
+def capture_path(name):
+    """A capture given by path or by name under CAPTURE_DIR."""
+    if os.path.isdir(name):
+        return name
+    path = os.path.join(CAPTURE_DIR, name)
+    if not os.path.isdir(path):
+        sys.exit(f'No capture {name!r} (see --list)')
+    return path
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Recording
+# ═══════════════════════════════════════════════════════════════════════
+
+class Capture:
+    """Append-only response log; import_primary_results.http_get calls add()."""
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.join(path, 'bodies'), exist_ok=True)
+        self.t0 = time.time()
+        self.seq = 0
+        self.new_bodies = 0
+        self.bytes = 0
+        self._manifest = open(os.path.join(path, 'manifest.jsonl'), 'a')
+
+    def add(self, resp):
+        body = resp.content
+        sha = hashlib.sha256(body).hexdigest()
+        body_path = os.path.join(self.path, 'bodies', f'{sha}.gz')
+        if not os.path.exists(body_path):
+            with gzip.open(body_path + '.tmp', 'wb') as f:
+                f.write(body)
+            os.replace(body_path + '.tmp', body_path)
+            self.new_bodies += 1
+            self.bytes += len(body)
+        self.seq += 1
+        entry = {
+            'seq': self.seq,
+            't': round(time.time() - self.t0, 3),
+            'fetched_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'url': str(resp.request.url),
+            'status': resp.status_code,
+            'content_type': resp.headers.get('content-type', ''),
+            'sha256': sha,
+        }
+        self._manifest.write(json.dumps(entry) + '\n')
+        self._manifest.flush()
+
+    def close(self):
+        self._manifest.close()
+
+
+def record(state, election_date, interval, duration):
+    import import_primary_results as ipr
+    handler = ipr.STATE_HANDLERS[state]
+    name = f'{state}_{election_date.replace("-", "")}_{datetime.now().strftime("%Y%m%d_%H%M%S")}'
+    capture = ipr.CAPTURE = Capture(os.path.join(CAPTURE_DIR, name))
+    print(f'Recording {state} {election_date} every {interval}s into {capture.path}')
+    deadline = time.time() + duration if duration else None
+    polls = 0
+    try:
+        while deadline is None or time.time() < deadline:
+            started = time.time()
+            before = capture.new_bodies
+            with contextlib.redirect_stdout(io.StringIO()):
+                handler['download'](election_date)
+            polls += 1
+            print(f'  poll {polls} at +{started - capture.t0:.0f}s: {capture.seq} responses, '
+                  f'{capture.new_bodies - before} new bodies, {capture.bytes / 1e6:.1f} MB stored',
+                  flush=True)
+            time.sleep(max(0.0, interval - (time.time() - started)))
+    except KeyboardInterrupt:
+        print('  Stopped.')
+    finally:
+        ipr.CAPTURE = None
+        capture.close()
+    print(f'Capture: {name} ({polls} polls)')
+
+
+def list_captures():
+    if not os.path.isdir(CAPTURE_DIR):
+        print(f'No captures in {CAPTURE_DIR}')
+        return
+    print(f'  {"capture":<36} {"responses":>9} {"distinct":>8} {"span":>8} {"MB gz":>7}')
+    for name in sorted(os.listdir(CAPTURE_DIR)):
+        path = os.path.join(CAPTURE_DIR, name)
+        manifest = os.path.join(path, 'manifest.jsonl')
+        if not os.path.exists(manifest):
+            continue
+        entries = load_manifest(path)
+        bodies = os.path.join(path, 'bodies')
+        size = sum(os.path.getsize(os.path.join(bodies, f)) for f in os.listdir(bodies))
+        span = entries[-1]['t'] if entries else 0
+        print(f'  {name:<36} {len(entries):>9} {len({e["sha256"] for e in entries}):>8} '
+              f'{span / 3600:>7.1f}h {size / 1e6:>7.1f}')
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Replay
+# ═══════════════════════════════════════════════════════════════════════
+
+def load_manifest(path):
+    with open(os.path.join(path, 'manifest.jsonl')) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class ReplayServer:
+    """Serves a capture on localhost against an accelerated replay clock."""
+
+    def __init__(self, path, speed=1.0, port=DEFAULT_PORT, start_at=0.0):
+        self.path = path
+        self.speed = speed
+        self.start_at = start_at
+        self.timeline = {}   # canonical_url -> [(t, entry)] in capture order
+        for e in load_manifest(path):
+            self.timeline.setdefault(canonical_url(e['url']), []).append((e['t'], e))
+        self.end_t = max((e[-1][0] for e in self.timeline.values()), default=0.0)
+        self._bodies = {}
+        self.served = []     # (entry, capture time it became current), appended per request
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), self._handler_class())
+        self.base_url = f'http://127.0.0.1:{self.httpd.server_address[1]}'
+        self.t0 = None
+
+    def clock(self):
+        """Current replay position in capture seconds."""
+        return self.start_at + (time.monotonic() - self.t0) * self.speed
+
+    def wall_time_of(self, t):
+        """time.monotonic() at which capture time t is (or was) reached."""
+        return self.t0 + (t - self.start_at) / self.speed
+
+    def finished(self):
+        return self.clock() > self.end_t
+
+    def lookup(self, url):
+        """Latest entry for url at the current replay clock, or None before the first."""
+        now = self.clock()
+        current = None
+        for t, e in self.timeline.get(canonical_url(url), ()):
+            if t > now:
+                break
+            current = e
+        return current
+
+    def body(self, sha):
+        if sha not in self._bodies:
+            with gzip.open(os.path.join(self.path, 'bodies', f'{sha}.gz'), 'rb') as f:
+                self._bodies[sha] = f.read()
+        return self._bodies[sha]
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                host, _, rest = self.path.lstrip('/').partition('/')
+                entry = server.lookup(f'//{host}/{rest}')
+                if entry is None:
+                    self.send_error(404, 'Not published yet at this replay time')
+                    return
+                with server._lock:
+                    server.served.append(entry)
+                body = server.body(entry['sha256'])
+                self.send_response(entry['status'])
+                self.send_header('Content-Type', entry['content_type'] or 'application/octet-stream')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('X-Replay-Seq', str(entry['seq']))
+                self.send_header('X-Replay-T', str(entry['t']))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, fmt, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self.t0 = time.monotonic()
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def serve(path, speed, port, start_at):
+    server = ReplayServer(path, speed, port, start_at).start()
+    print(f'Replaying {os.path.basename(path)} at {speed}x on {server.base_url} '
+          f'({len(server.timeline)} URLs, {server.end_t / 3600:.1f}h of capture)')
+    print(f'  python3 scripts/import_primary_results.py --state {os.path.basename(path)[:2]} '
+          f'--dry-run --replay {server.base_url}')
+    try:
+        while not server.finished():
+            time.sleep(min(30.0, max(1.0, 60 / speed)))
+            print(f'  replay clock +{server.clock() / 60:.0f} min', flush=True)
+        print('  End of capture; final responses stay available (Ctrl-C to stop)')
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Benchmark
+# ═══════════════════════════════════════════════════════════════════════
+
+def pctile(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+def bench(path, speed, poll, start_at, dsn, write=False, verbose=False):
+    import httpx
+    from bench_exports import LocalManagementAPI, connect
+    os.environ.setdefault('SUPABASE_MANAGEMENT_TOKEN', 'local-bench')
+    httpx.post = LocalManagementAPI(connect(dsn))
+    import import_primary_results as ipr
+
+    name = os.path.basename(os.path.normpath(path))
+    state, date_str = name.split('_')[:2]
+    election_date = f'{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]}'
+    year = int(date_str[:4])
+    handler = ipr.STATE_HANDLERS[state]
+
+    server = ReplayServer(path, speed, 0, start_at)
+    ipr.REPLAY_URL = server.base_url
+    ipr.SNAPSHOT_ROOT = tempfile.mkdtemp(prefix='replay_snapshots_')  # keep the real archive clean
+    server.start()
+    print(f'Benchmarking {state} import loop on {name}: {speed}x, poll every {poll}s of capture time, '
+          f'{"writing to " + dsn if write else "dry run"}')
+
+    cycles = []
+    seen = set()
+    quiet = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    try:
+        while True:
+            started = time.monotonic()
+            clock = server.clock()
+            n_served = len(server.served)
+            timings = {}
+            with quiet:
+                t = time.perf_counter()
+                raw = handler['download'](election_date)
+                timings['download'] = time.perf_counter() - t
+                stats = None
+                if raw:
+                    t = time.perf_counter()
+                    contests = handler['parse'](raw)
+                    timings['parse'] = time.perf_counter() - t
+                    t = time.perf_counter()
+                    db_elections = ipr.load_db_elections(state, year, include_statewide=True)
+                    timings['load_db'] = time.perf_counter() - t
+                    t = time.perf_counter()
+                    stats = ipr.match_and_update(contests, db_elections or [], state=state,
+                                                 dry_run=not write)
+                    timings['match_update'] = time.perf_counter() - t
+            done = time.monotonic()
+
+            # Latency: from when the oldest newly seen response was published
+            # at the (replayed) source until this cycle finished applying it.
+            # Waiting for the poll runs on the replay clock; the cycle's own
+            # work is real time, so only the wait is scaled back up.
+            fresh = [e for e in server.served[n_served:] if e['sha256'] not in seen]
+            seen.update(e['sha256'] for e in fresh)
+            latency = None
+            if fresh:
+                published = min(server.wall_time_of(e['t']) for e in fresh)
+                latency = max(0.0, started - published) * speed + (done - started)
+            cycle = {
+                'clock_s': round(clock, 1),
+                'new_responses': len(fresh),
+                'seconds': {k: round(v, 4) for k, v in timings.items()},
+                'cycle_s': round(done - started, 4),
+                'latency_s': None if latency is None else round(latency, 1),
+                'matched': stats['matched'] if stats else 0,
+                'updated_votes': stats['updated_votes'] if stats else 0,
+            }
+            cycles.append(cycle)
+            print(f'  +{clock / 60:6.1f} min  {cycle["cycle_s"]:6.2f}s  '
+                  + '  '.join(f'{k}={v:.2f}' for k, v in timings.items())
+                  + (f'  new={len(fresh)} latency={latency:.0f}s' if fresh else '  (no change)'),
+                  flush=True)
+            if server.finished():
+                break
+            time.sleep(max(0.0, poll / speed - (time.monotonic() - started)))
+    finally:
+        server.stop()
+        ipr.REPLAY_URL = None
+        shutil.rmtree(ipr.SNAPSHOT_ROOT, ignore_errors=True)
+        ipr.SNAPSHOT_ROOT = SNAPSHOT_DIR
+
+    latencies = [c['latency_s'] for c in cycles if c['latency_s'] is not None]
+    report = {
+        'capture': name,
+        'speed': speed,
+        'poll_s': poll,
+        'write': write,
+        'started_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'cycles': cycles,
+        'summary': {
+            'cycles': len(cycles),
+            'mean_cycle_s': round(statistics.mean(c['cycle_s'] for c in cycles), 4),
+            'max_cycle_s': max(c['cycle_s'] for c in cycles),
+            'latency_p50_s': pctile(latencies, 50) if latencies else None,
+            'latency_p95_s': pctile(latencies, 95) if latencies else None,
+            'latency_max_s': max(latencies) if latencies else None,
+        },
+    }
+    s = report['summary']
+    print(f'\n  {s["cycles"]} cycles, mean {s["mean_cycle_s"]:.2f}s, max {s["max_cycle_s"]:.2f}s per cycle')
+    if latencies:
+        print(f'  latency: p50 {s["latency_p50_s"]:.0f}s, '
+              f'p95 {s["latency_p95_s"]:.0f}s, max {s["latency_max_s"]:.0f}s')
+    out = os.path.join('/tmp/bench', f'replay_{name}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json')
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    with open(out, 'w') as f:
+        json.dump(report, f, indent=1)
+    print(f'  Report: {out}')
+
+
+def parse_duration(text):
+    """'90', '45m', '8h' → seconds."""
+    units = {'s': 1, 'm': 60, 'h': 3600}
+    if text[-1] in units:
+        return float(text[:-1]) * units[text[-1]]
+    return float(text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Record and replay election-night result feeds')
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument('--record', action='store_true', help='Record a state feed into a new capture')
+    mode.add_argument('--list', action='store_true', help='List captures')
+    mode.add_argument('--serve', metavar='CAPTURE', help='Serve a capture on localhost')
+    mode.add_argument('--bench', metavar='CAPTURE', help='Benchmark the import loop against a capture')
+    parser.add_argument('--state', type=str, help='State to record (NC, AR, TX)')
+    parser.add_argument('--date', type=str, help='Election date to record (YYYY-MM-DD)')
+    parser.add_argument('--interval', type=float, default=60, help='Recording poll interval, seconds (default 60)')
+    parser.add_argument('--duration', type=parse_duration, help='Stop recording after this long (e.g. 8h)')
+    parser.add_argument('--speed', type=float, default=30, help='Replay speed-up (default 30)')
+    parser.add_argument('--start-at', type=parse_duration, default=0.0, help='Start replay this far into the capture')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'--serve port (default {DEFAULT_PORT})')
+    parser.add_argument('--poll', type=float, default=60, help='--bench poll interval in capture seconds (default 60)')
+    parser.add_argument('--dsn', type=str, help='--bench: answer run_sql from this local Postgres (required)')
+    parser.add_argument('--write', action='store_true', help='--bench: apply updates (requires --dsn)')
+    parser.add_argument('--verbose', action='store_true', help='--bench: show import output')
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    if args.record:
+        if not args.state or not args.date:
+            parser.error('--record needs --state and --date')
+        record(args.state.upper(), args.date, args.interval, args.duration)
+    elif args.list:
+        list_captures()
+    elif args.serve:
+        serve(capture_path(args.serve), args.speed, args.port, args.start_at)
+    else:
+        if not args.dsn:
+            parser.error('--bench runs against a local database only (--dsn)')
+        bench(capture_path(args.bench), args.speed, args.poll, args.start_at,
+              dsn=args.dsn, write=args.write, verbose=args.verbose)
+
+
+if __name__ == '__main__':
+    main()
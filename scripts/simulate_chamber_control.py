@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Simulate 2026 chamber control for all 99 legislative chambers.
+
+Uses the raw StateNavigate win probabilities kept in forecasts.notes
+(win_pct=…; proj_margin=…, written by populate_forecasts_leg.py) rather than
+the collapsed categorical ratings. Seats up in 2026 without a StateNavigate
+forecast fall back to elections.forecast_rating, then to the district's 2024
+presidential margin. Seats not up are fixed at their current caucus.
+
+Runs correlated national + state + district draws via chamber_simulator.py
+and exports P(control) / P(supermajority) and the D seat-count distribution
+for every chamber.
+
+Generates:
+  - site/data/control_probabilities.json
+
+Usage:
+    python3 scripts/simulate_chamber_control.py
+    python3 scripts/simulate_chamber_control.py --sims 50000 --seed 7
+    python3 scripts/simulate_chamber_control.py --state WV --dry-run
+    python3 scripts/simulate_chamber_control.py --national-sd 0.04 --state-sd 0.02
+"""
+
+import sys
+import os
+import re
+import json
+import time
+import argparse
+from datetime import datetime
+
+import httpx
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from db_config import TOKEN, PROJECT_REF, API_URL
+from chamber_simulator import (
+    NATIONAL_SD, STATE_SD, seat_from_forecast, seat_from_rating,
+    seat_from_pres_margin, fixed_seat, simulate_d_seats, summarize,
+)
+from export_site_data import EP, parse_veto_threshold, normalize_chamber_name
+
+SITE_DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'site', 'data')
+OUTPUT_FILE = os.path.join(SITE_DATA_DIR, 'control_probabilities.json')
+
+SOURCE = 'StateNavigate'
+
+def run_sql(query, exit_on_error=True, retries=5):
+    for attempt in range(retries):
+        resp = httpx.post(
+            API_URL,
+            headers={'Authorization': f'Bearer {TOKEN}', 'Content-Type': 'application/json'},
+            json={'query': query},
+            timeout=120
+        )
+        if resp.status_code == 201:
+            return resp.json()
+        if resp.status_code == 429 and attempt < retries - 1:
+            wait = 10 * (attempt + 1)
+            print(f'  Rate limited, waiting {wait}s...')
+            time.sleep(wait)
+            continue
+        print(f'SQL ERROR: {resp.status_code} - {resp.text[:500]}')
+        if exit_on_error:
+            sys.exit(1)
+        return None
+
+def parse_forecast_notes(notes):
+    """Pull win_pct / proj_margin out of 'win_pct=0.9999; proj_margin=0.3741; …'."""
+    if not notes:
+        return None, None
+    win = re.search(r'win_pct=([0-9.]+)', notes)
+    margin = re.search(r'proj_margin=(-?[0-9.]+)', notes)
+    return (float(win.group(1)) if win else None,
+            float(margin.group(1)) if margin else None)
+
+def load_seats(state=None):
+    """One query: every legislative seat with its 2026 General forecast inputs."""
+    state_filter = f"AND st.abbreviation = '{state}'" if state else ''
+    return run_sql(f"""
+        SELECT st.abbreviation AS state, d.chamber, s.id AS seat_id,
+               {EP} AS holder_party,
+               d.pres_2024_margin,
+               e.id AS election_id, e.forecast_rating,
+               f.rating AS sn_rating, f.notes AS sn_notes
+        FROM seats s
+        JOIN districts d ON s.district_id = d.id
+        JOIN states st ON d.state_id = st.id
+        LEFT JOIN elections e ON e.seat_id = s.id
+              AND e.election_year = 2026 AND e.election_type = 'General'
+        LEFT JOIN LATERAL (
+            SELECT rating, notes FROM forecasts
+            WHERE election_id = e.id AND source = '{SOURCE}'
+            ORDER BY date_of_forecast DESC, id DESC
+            LIMIT 1
+        ) f ON TRUE
+        WHERE s.office_level = 'Legislative'
+          {state_filter}
+        ORDER BY st.abbreviation, d.chamber, s.id
+    """)
+
+def load_thresholds(state=None):
+    """Majority from the latest chamber_control row; supermajority from veto override."""
+    state_filter = f"WHERE st.abbreviation = '{state}'" if state else ''
+    control = run_sql(f"""
+        SELECT DISTINCT ON (cc.state_id, cc.chamber)
+               st.abbreviation AS state, cc.chamber, cc.total_seats, cc.majority_threshold
+        FROM chamber_control cc
+        JOIN states st ON cc.state_id = st.id
+        {state_filter}
+        ORDER BY cc.state_id, cc.chamber, cc.effective_date DESC
+    """) or []
+    supermajority = run_sql(f"""
+        SELECT st.abbreviation AS state, sm.chamber, sm.veto_override
+        FROM supermajority_thresholds sm
+        JOIN states st ON sm.state_id = st.id
+        {state_filter}
+    """) or []
+    return ({(r['state'], r['chamber']): r for r in control},
+            {(r['state'], r['chamber']): r['veto_override'] for r in supermajority})
+
+def build_seats(rows):
+    """Turn seat rows into simulator seats. Returns (seats, source Counter dict)."""
+    seats = []
+    sources = {'statenavigate': 0, 'rating': 0, 'pres_margin': 0, 'fixed': 0}
+    for r in rows:
+        st, ch = r['state'], r['chamber']
+        seat = None
+        if r['election_id']:
+            win_pct, proj_margin = parse_forecast_notes(r['sn_notes'])
+            rating = r['sn_rating'] or r['forecast_rating']
+            if win_pct is not None:
+                leading = rating.rsplit(' ', 1)[-1] if rating else None
+                seat = seat_from_forecast(st, ch, leading, win_pct, proj_margin)
+                sources['statenavigate'] += 1
+            elif rating:
+                seat = seat_from_rating(st, ch, rating)
+                if seat:
+                    sources['rating'] += 1
+            if seat is None:
+                seat = seat_from_pres_margin(st, ch, r['pres_2024_margin'])
+                if seat:
+                    sources['pres_margin'] += 1
+        if seat is None:
+            seat = fixed_seat(st, ch, r['holder_party'])
+            sources['fixed'] += 1
+        seats.append(seat)
+    return seats, sources
+
+def main():
+    parser = argparse.ArgumentParser(description='Monte Carlo chamber-control simulation')
+    parser.add_argument('--state', type=str, help='Single state only (e.g., WV)')
+    parser.add_argument('--sims', type=int, default=20000, help='Number of draws (default 20000)')
+    parser.add_argument('--seed', type=int, help='RNG seed for reproducible output')
+    parser.add_argument('--national-sd', type=float, default=NATIONAL_SD,
+                        help=f'National swing sd in margin units (default {NATIONAL_SD})')
+    parser.add_argument('--state-sd', type=float, default=STATE_SD,
+                        help=f'State swing sd in margin units (default {STATE_SD})')
+    parser.add_argument('--dry-run', action='store_true', help='Print results, do not write JSON')
+    args = parser.parse_args()
+    state = args.state.upper() if args.state else None
+
+    t0 = time.time()
+    rows = load_seats(state)
+    control, supermajority = load_thresholds(state)
+    seats, sources = build_seats(rows)
+    print(f'Loaded {len(seats):,} seats in {time.time() - t0:.1f}s')
+    print(f'  StateNavigate: {sources["statenavigate"]:,}  rating: {sources["rating"]:,}  '
+          f'pres margin: {sources["pres_margin"]:,}  not up/fixed: {sources["fixed"]:,}')
+
+    t1 = time.time()
+    packed, d_seats = simulate_d_seats(seats, n_sims=args.sims, national_sd=args.national_sd,
+                                       state_sd=args.state_sd, seed=args.seed)
+    print(f'Simulated {args.sims:,} draws in {time.time() - t1:.1f}s')
+
+    thresholds = {}
+    for ci, key in enumerate(packed['chamber_keys']):
+        total = int(packed['totals'][ci])
+        cc = control.get(key, {})
+        veto_str = supermajority.get((key[0], normalize_chamber_name(key[1])))
+        thresholds[key] = {
+            'majority': cc.get('majority_threshold') or total // 2 + 1,
+            'supermajority': parse_veto_threshold(veto_str, total),
+        }
+    results = summarize(packed, d_seats, thresholds)
+
+    print(f'\n{"Chamber":<28} {"Up":>4} {"P(D)":>7} {"P(R)":>7} {"P(D sm)":>8} {"P(R sm)":>8}')
+    for (st, ch), r in sorted(results.items()):
+        sm = r.get('p_supermajority', {})
+        print(f'{st + " " + ch:<28} {r["seats_up"]:>4} {r["p_control"]["D"]:>7.1%} '
+              f'{r["p_control"]["R"]:>7.1%} {sm.get("D", 0):>8.1%} {sm.get("R", 0):>8.1%}')
+
+    if args.dry_run:
+        print('\n[DRY RUN] No file written.')
+        return
+
+    chambers = {}
+    for (st, ch), r in sorted(results.items()):
+        chambers.setdefault(st, {})[ch] = r
+    output = {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'simulations': args.sims,
+        'national_sd': args.national_sd,
+        'state_sd': args.state_sd,
+        'seat_sources': sources,
+        'chambers': chambers,
+    }
+    os.makedirs(SITE_DATA_DIR, exist_ok=True)
+    with open(OUTPUT_FILE, 'w') as f:
+        json.dump(output, f, separators=(',', ':'))
+    print(f'\nWrote {OUTPUT_FILE} ({os.path.getsize(OUTPUT_FILE) / 1024:.0f} KB)')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Compact in-memory row model shared by the bulk exporters.
+
+run_sql() hands back one dict per row, and every string value in it is a
+fresh object — 'General', 'Certified', an election date or a candidate name
+is allocated again on every row it appears in. For the all-states district
+and candidate exports that is several hundred thousand dicts alive at once.
+
+This module replaces those dicts with __slots__ records:
+  - only the declared columns are kept (extra query columns are dropped),
+  - repeated strings (parties, election types, results, dates, names) are
+    interned through one shared pool, so each distinct value exists once,
+  - records support r['col'] and r.get('col'), so exporter code that was
+    written against row dicts works unchanged.
+
+Typical use — decode the Management API response straight into records so
+the full list of row dicts never exists at all:
+
+    elections = run_sql(q_elections, record=Election)
+    elections_by_seat = group_by(elections, 'seat_id')
+
+(run_sql passes resp.content to Election.from_json.) Record.from_rows()
+converts an already-decoded list.
+
+Usage (memory benchmark with synthetic rows):
+    python3 scripts/site_model.py --benchmark
+    python3 scripts/site_model.py --benchmark --rows 500000
+"""
+
+import sys
+import json
+import time
+import argparse
+import resource
+
+# Shared string pool. A plain dict rather than sys.intern() so the pool can
+# be dropped between runs (tests, long-lived processes).
+_POOL = {}
+
+
+def intern_value(value):
+    """Return the pooled copy of a string value; other types pass through."""
+    if type(value) is str:
+        return _POOL.setdefault(value, value)
+    return value
+
+
+def clear_pool():
+    """Drop pooled strings (records built earlier keep their own references)."""
+    _POOL.clear()
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB.
+
+    Reads VmHWM on Linux — ru_maxrss survives exec, so a child started from a
+    large parent would otherwise report the parent's peak.
+    """
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        peak /= 1024  # bytes on macOS, KB elsewhere
+    return peak / 1024
+
+
+class Record:
+    """Base class for slotted row records. Build subclasses with record_type()."""
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def __repr__(self):
+        fields = ', '.join(f'{k}={getattr(self, k)!r}' for k in self.__slots__)
+        return f'{type(self).__name__}({fields})'
+
+    def as_dict(self):
+        return {k: getattr(self, k) for k in self.__slots__}
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Convert a decoded run_sql() result to records. Returns [] for None."""
+        if not rows:
+            return []
+        from_row = cls.from_row
+        return [from_row(r) for r in rows]
+
+    @classmethod
+    def from_json(cls, payload):
+        """Decode a JSON array of row objects directly into records.
+
+        Each row dict is converted as soon as the decoder finishes it, so only
+        one raw row is alive at a time instead of the whole result set.
+        """
+        return json.loads(payload, object_hook=cls.from_row)
+
+
+def record_type(name, fields):
+    """Create a Record subclass with the given column names as slots.
+
+    __init__ takes the columns positionally, in order. It and from_row() are
+    generated per type (as namedtuple does) so building a record is straight-
+    line code with no per-field loop.
+    """
+    fields = tuple(fields)
+    args = ', '.join(fields)
+    init_body = '\n'.join(f'    self.{f} = {f}' for f in fields) or '    pass'
+    row_body = '\n'.join(
+        f'    v = get({f!r})\n'
+        f'    self.{f} = pool(v, v) if v.__class__ is str else v'
+        for f in fields) or '    pass'
+    namespace = {'pool': _POOL.setdefault}
+    exec(f'def __init__(self, {args}):\n{init_body}\n', namespace)
+    exec(f'def from_row(row):\n'
+         f'    self = new(cls)\n'
+         f'    get = row.get\n'
+         f'{row_body}\n'
+         f'    return self\n', namespace)
+    cls = type(name, (Record,), {'__slots__': fields, '__init__': namespace['__init__']})
+    namespace['cls'] = cls
+    namespace['new'] = object.__new__
+    from_row = namespace['from_row']
+    from_row.__doc__ = 'Build a record from one row dict, pooling string values.'
+    cls.from_row = staticmethod(from_row)
+    return cls
+
+
+def group_by(records, key):
+    """Index records by one column → {value: [records in input order]}."""
+    out = {}
+    for r in records:
+        k = getattr(r, key)
+        bucket = out.get(k)
+        if bucket is None:
+            out[k] = [r]
+        else:
+            bucket.append(r)
+    return out
+
+
+# ══════════════════════════════════════════════════════════════════════
+# SHARED ROW SHAPES
+# ══════════════════════════════════════════════════════════════════════
+
+Election = record_type('Election', (
+    'election_id', 'seat_id', 'election_date', 'election_year',
+    'election_type', 'total_votes_cast', 'is_open_seat', 'result_status',
+    'filing_deadline', 'forecast_rating', 'precincts_reporting',
+    'precincts_total',
+))
+
+Candidacy = record_type('Candidacy', (
+    'election_id', 'candidate_id', 'name', 'party', 'caucus', 'votes',
+    'pct', 'result', 'is_incumbent', 'is_write_in', 'candidate_status',
+    'running_mate_candidacy_id',
+))
+
+SeatTerm = record_type('SeatTerm', (
+    'seat_id', 'holder_name', 'holder_party', 'holder_caucus',
+    'start_date', 'end_date', 'start_reason', 'end_reason', 'notes',
+))
+
+PartySwitch = record_type('PartySwitch', (
+    'seat_id', 'name', 'old_party', 'new_party', 'old_caucus', 'new_caucus',
+    'switch_year', 'switch_date', 'bp_profile_url',
+))
+
+
+# ══════════════════════════════════════════════════════════════════════
+# BENCHMARK
+# ══════════════════════════════════════════════════════════════════════
+
+def _synthetic_candidacy_payload(n, seed=0):
+    """JSON bytes shaped like export_district_data's candidacies query result."""
+    import random
+    rng = random.Random(seed)
+    parties = ['D', 'R', 'L', 'G', 'I']
+    results = ['Won', 'Lost', 'Advanced']
+    types = ['General', 'Primary_D', 'Primary_R']
+    rows = []
+    for i in range(n):
+        rows.append({
+            'state': 'TX',
+            'election_id': 100000 + i // 3,
+            'candidate_id': 100000 + rng.randrange(n // 2),
+            'name': f'Candidate {rng.randrange(n // 4)}',
+            'party': parties[i % 5],
+            'caucus': None,
+            'votes': rng.randrange(20000),
+            'pct': round(rng.random() * 100, 2),
+            'result': results[i % 3],
+            'is_incumbent': i % 4 == 0,
+            'is_write_in': False,
+            'candidate_status': None,
+            'election_type': types[(i // 3) % 3],
+            'election_date': f'20{10 + (i // 3) % 16}-11-0{1 + i % 8}',
+        })
+    return json.dumps(rows).encode()
+
+
+def _measure(variant, path):
+    """Decode and index a synthetic payload file; print elapsed time and peak RSS."""
+    with open(path, 'rb') as f:
+        payload = f.read()
+    base = peak_rss_mb()
+    t0 = time.time()
+    if variant == 'records':
+        rows = Candidacy.from_json(payload)
+        by_election = group_by(rows, 'election_id')
+    else:
+        rows = json.loads(payload)
+        by_election = {}
+        for r in rows:
+            by_election.setdefault(r['election_id'], []).append(r)
+    print(f'{len(by_election):,} elections  {time.time() - t0:.2f}s  '
+          f'peak RSS {peak_rss_mb():.0f} MB (+{peak_rss_mb() - base:.0f} MB over payload)')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Slotted row model utilities')
+    parser.add_argument('--benchmark', action='store_true',
+                        help='Compare dict rows vs Candidacy records on synthetic data')
+    parser.add_argument('--rows', type=int, default=300000)
+    parser.add_argument('--variant', choices=['dict', 'records'], help=argparse.SUPPRESS)
+    parser.add_argument('--payload', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        _measure(args.variant, args.payload)
+        return
+    if not args.benchmark:
+        parser.print_help()
+        return
+
+    # One process per variant so the peak RSS readings are independent.
+    import subprocess
+    import tempfile
+    with tempfile.NamedTemporaryFile(suffix='.json') as tmp:
+        tmp.write(_synthetic_candidacy_payload(args.rows))
+        tmp.flush()
+        print(f'{args.rows:,} candidacy rows ({tmp.tell() / 1e6:.0f} MB JSON)')
+        for variant in ('dict', 'records'):
+            out = subprocess.run(
+                [sys.executable, __file__, '--variant', variant, '--payload', tmp.name],
+                capture_output=True, text=True)
+            print(f'  {variant:<8} {out.stdout.strip() or out.stderr.strip()}')
+
+
+if __name__ == '__main__':
+    main()
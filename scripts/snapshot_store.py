@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Append-only archive of raw results snapshots, with per-contest vote series.
+
+import_primary_results.py saves every download here instead of overwriting
+a pretty-printed tmp/{ST}_{date}_primary_results.json, so the history of
+how counts moved through the night is kept. A store is one directory per
+source ({ST}_{YYYYMMDD}) under tmp/snapshots/:
+
+  objects/{sha256[:2]}/{sha256}.zst|.gz
+                 snapshot content (compact JSON), compressed with zstd when
+                 the zstandard package is installed and gzip otherwise;
+                 identical snapshots are stored once
+  index.jsonl    one line per fetch: fetched_at, sha256, codec, bytes,
+                 stored_bytes, new (false when the content was already
+                 stored)
+  series.jsonl   derived vote time series: one line per snapshot that
+                 changed any contest, holding only the contests that changed
+                 ({"t", "sha256", "contests": {key: [[name, votes], …]}})
+
+Contest keys are "{chamber}|{district}|{party}" from the state's parse
+function, so vote_series() returns chart-ready points for every contest
+without decompressing a single snapshot.
+
+Usage:
+    python3 scripts/snapshot_store.py --list
+    python3 scripts/snapshot_store.py --latest NC_20260303 | head
+    python3 scripts/snapshot_store.py --series NC_20260303 --contest "State House|7|D"
+    python3 scripts/snapshot_store.py --series NC_20260303 --out /tmp/nc_series.json
+    python3 scripts/snapshot_store.py --rebuild-series NC_20260303    # re-derive from snapshots
+"""
+
+import os
+import sys
+import gzip
+import json
+import hashlib
+import argparse
+from datetime import datetime, timezone
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+import profiling
+
+SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tmp', 'snapshots')
+ZSTD_LEVEL = 10
+GZIP_LEVEL = 6
+
+
+def _compress(payload):
+    if zstandard is not None:
+        return 'zst', zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(payload)
+    return 'gz', gzip.compress(payload, compresslevel=GZIP_LEVEL)
+
+
+def _decompress(codec, blob):
+    if codec == 'gz':
+        return gzip.decompress(blob)
+    if zstandard is None:
+        raise RuntimeError('snapshot is zstd-compressed: pip install zstandard')
+    return zstandard.ZstdDecompressor().decompress(blob)
+
+
+def contest_key(contest):
+    district = contest.get('office_type') or contest['district']
+    return f'{contest["chamber"]}|{district}|{contest["party"]}'
+
+
+class SnapshotStore:
+    def __init__(self, source, root=SNAPSHOT_DIR):
+        self.source = source
+        self.dir = os.path.join(root, source)
+        self.index_path = os.path.join(self.dir, 'index.jsonl')
+        self.series_path = os.path.join(self.dir, 'series.jsonl')
+
+    # ── snapshots ─────────────────────────────────────────────────────
+
+    def save(self, data, fetched_at=None):
+        """Archive one fetched snapshot. Returns its index entry."""
+        with profiling.span('serialize', self.source):
+            payload = json.dumps(data, separators=(',', ':')).encode()
+        sha = hashlib.sha256(payload).hexdigest()
+        existing = self._object_path(sha)
+        entry = {
+            'fetched_at': fetched_at or datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'sha256': sha,
+            'bytes': len(payload),
+        }
+        with profiling.span('write', self.source):
+            if existing:
+                entry.update(codec=existing[0], stored_bytes=0, new=False)
+            else:
+                codec, blob = _compress(payload)
+                path = os.path.join(self.dir, 'objects', sha[:2], f'{sha}.{codec}')
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path + '.tmp', 'wb') as f:
+                    f.write(blob)
+                os.replace(path + '.tmp', path)
+                entry.update(codec=codec, stored_bytes=len(blob), new=True)
+                profiling.count('bytes_out', len(blob))
+                profiling.count('files_written')
+            with open(self.index_path, 'a') as f:
+                f.write(json.dumps(entry) + '\n')
+        return entry
+
+    def _object_path(self, sha):
+        for codec in ('zst', 'gz'):
+            path = os.path.join(self.dir, 'objects', sha[:2], f'{sha}.{codec}')
+            if os.path.exists(path):
+                return codec, path
+        return None
+
+    def entries(self):
+        if not os.path.exists(self.index_path):
+            return []
+        with open(self.index_path) as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def load(self, sha):
+        found = self._object_path(sha)
+        if found is None:
+            raise KeyError(f'{self.source}: no snapshot {sha}')
+        codec, path = found
+        with open(path, 'rb') as f:
+            return json.loads(_decompress(codec, f.read()))
+
+    def latest(self):
+        entries = self.entries()
+        return self.load(entries[-1]['sha256']) if entries else None
+
+    def iter_snapshots(self):
+        """(entry, data) for each distinct snapshot, in fetch order."""
+        for entry in self.entries():
+            if entry['new']:
+                yield entry, self.load(entry['sha256'])
+
+    # ── vote series ───────────────────────────────────────────────────
+
+    def _series_state(self):
+        """Latest [[name, votes], …] per contest key."""
+        state = {}
+        if os.path.exists(self.series_path):
+            with open(self.series_path) as f:
+                for line in f:
+                    state.update(json.loads(line)['contests'])
+        return state
+
+    def append_series(self, contests, entry=None, series_state=None):
+        """Record the contests that changed in the snapshot `entry` (default: the latest).
+
+        Contests missing from `contests` (e.g. filtered out) are left as they
+        were. Returns the number of contests that changed.
+        """
+        entry = entry or (self.entries() or [None])[-1]
+        if entry is None:
+            return 0
+        state = self._series_state() if series_state is None else series_state
+        changed = {}
+        for contest in contests:
+            key = contest_key(contest)
+            votes = [[c['name'], c['votes']] for c in contest['candidates']]
+            if state.get(key) != votes:
+                changed[key] = state[key] = votes
+        if changed:
+            with open(self.series_path, 'a') as f:
+                f.write(json.dumps({'t': entry['fetched_at'], 'sha256': entry['sha256'],
+                                    'contests': changed}, separators=(',', ':')) + '\n')
+        return len(changed)
+
+    def rebuild_series(self, parse):
+        """Re-derive series.jsonl from every stored snapshot with a parse function."""
+        if os.path.exists(self.series_path):
+            os.remove(self.series_path)
+        state = {}
+        points = 0
+        for entry, data in self.iter_snapshots():
+            points += bool(self.append_series(parse(data), entry, series_state=state))
+        return points
+
+    def vote_series(self, key=None):
+        """{contest key: {'candidates': [names], 'points': [[t, [votes per candidate]], …]}}"""
+        series = {}
+        if not os.path.exists(self.series_path):
+            return series
+        with open(self.series_path) as f:
+            for line in f:
+                point = json.loads(line)
+                for k, votes in point['contests'].items():
+                    if key and k != key:
+                        continue
+                    s = series.setdefault(k, {'candidates': [], 'points': []})
+                    for name, _ in votes:
+                        if name not in s['candidates']:
+                            s['candidates'].append(name)
+                    by_name = dict((n, v) for n, v in votes)
+                    s['points'].append([point['t'], [by_name.get(n) for n in s['candidates']]])
+        return series
+
+
+def list_stores(root=SNAPSHOT_DIR):
+    if not os.path.isdir(root):
+        print(f'No snapshots in {root}')
+        return
+    print(f'  {"source":<16} {"fetches":>8} {"distinct":>8} {"raw MB":>8} {"stored MB":>9} {"first":>26} {"last":>26}')
+    for source in sorted(os.listdir(root)):
+        entries = SnapshotStore(source, root).entries()
+        if not entries:
+            continue
+        new = [e for e in entries if e['new']]
+        print(f'  {source:<16} {len(entries):>8} {len(new):>8} '
+              f'{sum(e["bytes"] for e in entries) / 1e6:>8.1f} '
+              f'{sum(e["stored_bytes"] for e in new) / 1e6:>9.2f} '
+              f'{entries[0]["fetched_at"]:>26} {entries[-1]["fetched_at"]:>26}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect the raw results snapshot archive')
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument('--list', action='store_true', help='List snapshot stores')
+    mode.add_argument('--latest', metavar='SOURCE', help='Print the latest snapshot as JSON')
+    mode.add_argument('--series', metavar='SOURCE', help='Print or export the vote time series')
+    mode.add_argument('--rebuild-series', metavar='SOURCE', help='Re-derive series.jsonl from the snapshots')
+    parser.add_argument('--contest', help='Only this contest key (e.g. "State House|7|D")')
+    parser.add_argument('--out', help='--series: write JSON here instead of printing')
+    args = parser.parse_args()
+
+    if args.list:
+        list_stores()
+    elif args.latest:
+        json.dump(SnapshotStore(args.latest).latest(), sys.stdout, indent=2)
+        print()
+    elif args.series:
+        series = SnapshotStore(args.series).vote_series(args.contest)
+        if args.out:
+            with open(args.out, 'w') as f:
+                json.dump(series, f, separators=(',', ':'))
+            print(f'Wrote {len(series)} contests to {args.out}')
+            return
+        for key, s in sorted(series.items()):
+            print(f'{key}  ({len(s["points"])} points)')
+            for t, votes in s['points']:
+                print(f'  {t}  ' + '  '.join(f'{n}: {v if v is not None else "-"}'
+                                           for n, v in zip(s['candidates'], votes)))
+    else:
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+        import import_primary_results
+        state = args.rebuild_series[:2]
+        parse = import_primary_results.STATE_HANDLERS[state]['parse']
+        points = SnapshotStore(args.rebuild_series).rebuild_series(parse)
+        print(f'Rebuilt {args.rebuild_series} series: {points} points')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,511 @@
+"""
+Source monitoring scheduler.
+
+Fetches every source in data/trusted_sources.json on its check_frequency
+(daily / weekly / biweekly / monthly), fingerprints the part of the page that
+matters, and queues a diff for review whenever that part changes. Replaces
+the manual weekly/monthly checks in docs/special_election_monitoring.md.
+
+Each check does as little work as it can:
+  1. Conditional GET (ETag / Last-Modified) — a 304 costs no download.
+  2. SHA-256 of the raw body — identical bytes are never re-parsed.
+  3. SHA-256 of the watched region (e.g. Ballotpedia's article body, a
+     Google Sheet as CSV) — churn outside it (ads, sidebars, footers) is
+     ignored.
+Only when the region changes is the previous copy diffed against the new one
+and the diff appended to tmp/source_monitor/queue.jsonl, with added lines
+that look like vacancies or special elections flagged.
+
+Fetches run in a bounded thread pool with at most one request per host at a
+time; this thread is the only writer of the state. Schedule state lives under
+"sources" in data/monitoring_state.json next to the briefing's manual checks,
+and election_briefing.py reports the pending queue.
+
+A source can narrow what is watched with an optional "watch" object in
+trusted_sources.json: {"url": ..., "start": ..., "end": ...} (a different
+URL to fetch, and markers bounding the region in the HTML). Sources with
+event-driven frequencies (as_needed, election_night, ...), URL templates,
+local paths or JS-only social feeds are listed but not scheduled.
+
+Usage:
+    python3 scripts/source_monitor.py --list                  # Schedule and last results
+    python3 scripts/source_monitor.py --once                  # Check whatever is due, then exit (cron)
+    python3 scripts/source_monitor.py --once --force          # Check every schedulable source now
+    python3 scripts/source_monitor.py --once --source NCSL    # Sources whose name contains NCSL
+    python3 scripts/source_monitor.py --daemon                # Run checks as they come due
+    python3 scripts/source_monitor.py --daemon --workers 8 --poll 600
+    python3 scripts/source_monitor.py --queue                 # Pending diffs
+    python3 scripts/source_monitor.py --queue --verbose       # ... with the diff text
+    python3 scripts/source_monitor.py --ack 3                 # Mark queue item 3 reviewed
+    python3 scripts/source_monitor.py --ack all
+"""
+import sys
+import os
+import re
+import csv
+import io
+import json
+import time
+import difflib
+import hashlib
+import argparse
+import threading
+import html as htmlmod
+from datetime import datetime, timedelta
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import httpx
+
+try:
+    import pdfplumber
+except ImportError:
+    pdfplumber = None
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+SOURCES_PATH = os.path.join(ROOT, 'data', 'trusted_sources.json')
+MONITORING_STATE_PATH = os.path.join(ROOT, 'data', 'monitoring_state.json')
+MONITOR_DIR = os.path.join(ROOT, 'tmp', 'source_monitor')
+QUEUE_PATH = os.path.join(MONITOR_DIR, 'queue.jsonl')
+
+FREQUENCY_DAYS = {'daily': 1, 'weekly': 7, 'biweekly': 14, 'monthly': 30}
+RETRY_AFTER = timedelta(hours=1)        # after a failed fetch
+JS_ONLY_HOSTS = {'x.com', 'twitter.com', 'bsky.app'}
+USER_AGENT = 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36'
+
+# Region defaults by host when a source has no "watch" markers
+HOST_REGIONS = {
+    'ballotpedia.org': ('id="mw-content-text"', 'class="printfooter"'),
+}
+
+SIGNAL_RE = re.compile(
+    r'special (?:election|primary)|vacan|resign|died|death|passed away|appointed|'
+    r'sworn in|recall|expel', re.IGNORECASE)
+
+MAX_DIFF_LINES = 200
+
+# ══════════════════════════════════════════════════════════════════════
+# SOURCES + SCHEDULE
+# ══════════════════════════════════════════════════════════════════════
+
+def slugify(name):
+    return re.sub(r'[^a-z0-9]+', '_', name.lower()).strip('_')
+
+
+def watch_kind(url):
+    if '/spreadsheets/d/' in url:
+        return 'sheet'
+    if urlparse(url).path.lower().endswith('.pdf'):
+        return 'pdf'
+    return 'html'
+
+
+def load_sources(path=SOURCES_PATH):
+    """Trusted sources with their resolved watch config, or why they are skipped."""
+    with open(path) as f:
+        entries = json.load(f)
+    sources = []
+    for entry in entries:
+        watch = entry.get('watch', {})
+        url = watch.get('url', entry['url'])
+        src = {
+            'name': entry['name'],
+            'slug': slugify(entry['name']),
+            'url': url,
+            'frequency': entry.get('check_frequency'),
+            'interval': FREQUENCY_DAYS.get(entry.get('check_frequency')),
+            'kind': watch.get('kind') or watch_kind(url),
+            'start': watch.get('start'),
+            'end': watch.get('end'),
+            'skip': None,
+        }
+        host = urlparse(url).netloc.lower().removeprefix('www.')
+        if not url.startswith(('http://', 'https://')):
+            src['skip'] = 'local path'
+        elif '{' in url:
+            src['skip'] = 'URL template'
+        elif host in JS_ONLY_HOSTS:
+            src['skip'] = 'JS-only feed'
+        elif src['interval'] is None:
+            src['skip'] = f'{src["frequency"]} (event-driven)'
+        if src['kind'] == 'html' and src['start'] is None and host in HOST_REGIONS:
+            src['start'], src['end'] = HOST_REGIONS[host]
+        src['host'] = host
+        sources.append(src)
+    return sources
+
+
+def next_due(src, entry):
+    """When a source should next be checked (None = now)."""
+    if not entry.get('last_checked'):
+        return None
+    last = datetime.fromisoformat(entry['last_checked'])
+    if entry.get('status') == 'error':
+        return last + RETRY_AFTER
+    return last + timedelta(days=src['interval'])
+
+
+def due_sources(sources, state, now, force=False):
+    due = []
+    for src in sources:
+        if src['skip']:
+            continue
+        when = next_due(src, state.get(src['slug'], {}))
+        if force or when is None or when <= now:
+            due.append(src)
+    return due
+
+# ══════════════════════════════════════════════════════════════════════
+# STATE + QUEUE
+# ══════════════════════════════════════════════════════════════════════
+
+def load_monitor_state():
+    """The "sources" section of monitoring_state.json."""
+    if os.path.exists(MONITORING_STATE_PATH):
+        with open(MONITORING_STATE_PATH) as f:
+            return json.load(f).get('sources', {})
+    return {}
+
+
+def save_monitor_state(sources_state):
+    """Write back only the "sources" section, keeping the briefing's keys as they are on disk."""
+    if os.path.exists(MONITORING_STATE_PATH):
+        with open(MONITORING_STATE_PATH) as f:
+            mon = json.load(f)
+    else:
+        mon = {'format_version': 1, 'last_briefing': None, 'checks': {}, 'candidacy_scrape_status': {}}
+    mon['sources'] = sources_state
+    os.makedirs(os.path.dirname(MONITORING_STATE_PATH), exist_ok=True)
+    tmp_path = MONITORING_STATE_PATH + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(mon, f, indent=2)
+        f.write('\n')
+    os.replace(tmp_path, MONITORING_STATE_PATH)
+
+
+def region_path(slug):
+    return os.path.join(MONITOR_DIR, 'regions', f'{slug}.txt')
+
+
+def load_queue():
+    if not os.path.exists(QUEUE_PATH):
+        return []
+    with open(QUEUE_PATH) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def append_queue(item):
+    os.makedirs(MONITOR_DIR, exist_ok=True)
+    with open(QUEUE_PATH, 'a') as f:
+        f.write(json.dumps(item) + '\n')
+
+
+def pending_count():
+    """Unreviewed queue items (used by election_briefing.py)."""
+    return sum(1 for item in load_queue() if not item.get('reviewed'))
+
+# ══════════════════════════════════════════════════════════════════════
+# FETCH + FINGERPRINT
+# ══════════════════════════════════════════════════════════════════════
+
+def fetch_url(src):
+    if src['kind'] == 'sheet':
+        sheet_id = src['url'].split('/spreadsheets/d/')[1].split('/')[0]
+        return f'https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv'
+    return src['url']
+
+
+def html_region(text, start=None, end=None):
+    """Visible text lines between the markers, one line per block element."""
+    if start:
+        i = text.find(start)
+        if i >= 0:
+            text = text[i:]
+    if end:
+        j = text.find(end)
+        if j >= 0:
+            text = text[:j]
+    text = re.sub(r'(?is)<(script|style|noscript|svg|nav|header|footer)\b.*?</\1\s*>', ' ', text)
+    text = re.sub(r'(?is)<!--.*?-->', ' ', text)
+    text = re.sub(r'(?i)<(?:br|/p|/div|/tr|/li|/h[1-6]|/table|/caption)\b[^>]*>', '\n', text)
+    text = re.sub(r'(?i)</t[dh]\s*>', ' | ', text)
+    text = htmlmod.unescape(re.sub(r'<[^>]+>', ' ', text))
+    lines = (' '.join(line.split()).strip(' |') for line in text.split('\n'))
+    return [line for line in lines if line]
+
+
+def sheet_region(text):
+    return [' | '.join(c.strip() for c in row) for row in csv.reader(io.StringIO(text))
+            if any(c.strip() for c in row)]
+
+
+def pdf_region(content):
+    if pdfplumber is None:
+        return None
+    with pdfplumber.open(io.BytesIO(content)) as pdf:
+        text = '\n'.join(page.extract_text() or '' for page in pdf.pages)
+    return [' '.join(line.split()) for line in text.split('\n') if line.strip()]
+
+
+def extract_region(src, resp):
+    if src['kind'] == 'sheet':
+        return sheet_region(resp.text)
+    if src['kind'] == 'pdf':
+        return pdf_region(resp.content)
+    return html_region(resp.text, src['start'], src['end'])
+
+
+class HostLimiter:
+    """At most `per_host` concurrent requests to any one host."""
+
+    def __init__(self, per_host=1):
+        self.per_host = per_host
+        self.lock = threading.Lock()
+        self.sems = {}
+
+    def __call__(self, host):
+        with self.lock:
+            if host not in self.sems:
+                self.sems[host] = threading.Semaphore(self.per_host)
+            return self.sems[host]
+
+
+def check_source(src, entry, limiter, timeout=60):
+    """
+    Fetch one source and compare it with its last fingerprint.
+
+    Runs in a worker thread and touches no shared state: returns the updated
+    state entry plus, when the watched region changed, the new region lines
+    and a queue item for the main thread to record.
+    """
+    entry = dict(entry)
+    now = datetime.now().isoformat(timespec='seconds')
+    headers = {'User-Agent': USER_AGENT}
+    if entry.get('etag'):
+        headers['If-None-Match'] = entry['etag']
+    if entry.get('last_modified'):
+        headers['If-Modified-Since'] = entry['last_modified']
+
+    t0 = time.time()
+    try:
+        with limiter(src['host']):
+            resp = httpx.get(fetch_url(src), headers=headers, follow_redirects=True, timeout=timeout)
+    except httpx.HTTPError as e:
+        entry.update(last_checked=now, status='error', error=str(e) or type(e).__name__)
+        return entry, None, None
+    entry['last_checked'] = now
+    entry['fetch_seconds'] = round(time.time() - t0, 2)
+    entry.pop('error', None)
+
+    if resp.status_code == 304:
+        entry['status'] = 'not modified'
+        return entry, None, None
+    if resp.status_code != 200:
+        entry.update(status='error', error=f'HTTP {resp.status_code}')
+        return entry, None, None
+
+    entry['etag'] = resp.headers.get('etag')
+    entry['last_modified'] = resp.headers.get('last-modified')
+    body_sha = hashlib.sha256(resp.content).hexdigest()
+    if body_sha == entry.get('body_sha'):
+        entry['status'] = 'unchanged'
+        return entry, None, None
+    entry['body_sha'] = body_sha
+    entry['bytes'] = len(resp.content)
+
+    lines = extract_region(src, resp)
+    if lines is None:
+        # No extractor available (PDF without pdfplumber): the body hash is the region
+        lines = [f'[{src["kind"]} body {body_sha[:16]}, {len(resp.content):,} bytes — '
+                 f'install pdfplumber for a text diff]']
+    region_sha = hashlib.sha256('\n'.join(lines).encode()).hexdigest()
+    first = entry.get('region_sha') is None
+    if region_sha == entry.get('region_sha'):
+        entry['status'] = 'region unchanged'
+        return entry, None, None
+    entry['region_sha'] = region_sha
+    entry['region_lines'] = len(lines)
+    entry['last_changed'] = now
+
+    if first:
+        entry['status'] = 'baseline'
+        return entry, lines, None
+
+    entry['status'] = 'changed'
+    old = []
+    if os.path.exists(region_path(src['slug'])):
+        with open(region_path(src['slug'])) as f:
+            old = f.read().split('\n')
+    diff = list(difflib.unified_diff(old, lines, 'previous', 'current', n=1, lineterm=''))
+    added = [l[1:] for l in diff if l.startswith('+') and not l.startswith('+++')]
+    removed = [l[1:] for l in diff if l.startswith('-') and not l.startswith('---')]
+    item = {
+        'detected_at': now,
+        'source': src['name'],
+        'url': src['url'],
+        'added': len(added),
+        'removed': len(removed),
+        'signals': [l for l in added if SIGNAL_RE.search(l)][:20],
+        'diff': diff[:MAX_DIFF_LINES],
+        'truncated': len(diff) > MAX_DIFF_LINES,
+        'reviewed': False,
+    }
+    return entry, lines, item
+
+
+def run_checks(due, state, workers=4, per_host=1):
+    """Check the due sources concurrently; record results as they finish."""
+    if not due:
+        return []
+    limiter = HostLimiter(per_host)
+    queue_ids = [item['id'] for item in load_queue()]
+    next_id = max(queue_ids, default=0) + 1
+    queued = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(check_source, src, state.get(src['slug'], {}), limiter): src for src in due}
+        for fut in as_completed(futures):
+            src = futures[fut]
+            entry, lines, item = fut.result()
+            if lines is not None:
+                os.makedirs(os.path.dirname(region_path(src['slug'])), exist_ok=True)
+                with open(region_path(src['slug']), 'w') as f:
+                    f.write('\n'.join(lines))
+            if item is not None:
+                item['id'] = next_id
+                next_id += 1
+                append_queue(item)
+                queued.append(item)
+            state[src['slug']] = entry
+            save_monitor_state(state)
+            detail = entry.get('error') or (f'+{item["added"]}/-{item["removed"]} lines, '
+                                            f'{len(item["signals"])} flagged' if item else '')
+            print(f'  {entry["status"]:<17} {src["name"][:44]:<44} {detail}')
+    return queued
+
+# ══════════════════════════════════════════════════════════════════════
+# OUTPUT
+# ══════════════════════════════════════════════════════════════════════
+
+def print_schedule(sources, state):
+    now = datetime.now()
+    print(f'  {"Source":<46} {"Every":>6} {"Last checked":<20} {"Status":<17} Next')
+    for src in sources:
+        entry = state.get(src['slug'], {})
+        if src['skip']:
+            print(f'  {src["name"][:46]:<46} {"-":>6} {"":<20} {"skipped":<17} {src["skip"]}')
+            continue
+        when = next_due(src, entry)
+        nxt = 'due now' if when is None or when <= now else when.strftime('%Y-%m-%d %H:%M')
+        print(f'  {src["name"][:46]:<46} {str(src["interval"]) + "d":>6} '
+              f'{entry.get("last_checked", "never"):<20} {entry.get("status", "-"):<17} {nxt}')
+    print(f'\n  {pending_count()} change(s) pending review ({QUEUE_PATH})')
+
+
+def print_queue(verbose=False):
+    pending = [item for item in load_queue() if not item.get('reviewed')]
+    if not pending:
+        print('No changes pending review.')
+        return
+    for item in pending:
+        print(f'#{item["id"]}  {item["detected_at"]}  {item["source"]}  '
+              f'(+{item["added"]}/-{item["removed"]} lines)')
+        print(f'    {item["url"]}')
+        for line in item['signals']:
+            print(f'    ! {line[:150]}')
+        if verbose:
+            for line in item['diff']:
+                print(f'      {line[:150]}')
+            if item['truncated']:
+                print('      ... (diff truncated)')
+        print()
+    print(f'{len(pending)} pending. Mark reviewed with --ack ID (or --ack all).')
+
+
+def ack(which):
+    items = load_queue()
+    n = 0
+    for item in items:
+        if not item.get('reviewed') and (which == 'all' or str(item['id']) == which):
+            item['reviewed'] = True
+            n += 1
+    os.makedirs(MONITOR_DIR, exist_ok=True)
+    tmp_path = QUEUE_PATH + '.tmp'
+    with open(tmp_path, 'w') as f:
+        for item in items:
+            f.write(json.dumps(item) + '\n')
+    os.replace(tmp_path, QUEUE_PATH)
+    print(f'Marked {n} item(s) reviewed.')
+
+# ══════════════════════════════════════════════════════════════════════
+# CLI ENTRY POINT
+# ══════════════════════════════════════════════════════════════════════
+
+def main():
+    parser = argparse.ArgumentParser(description='Scheduled change monitoring for trusted sources')
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument('--list', action='store_true', help='Show the schedule and last results')
+    mode.add_argument('--once', action='store_true', help='Check due sources, then exit')
+    mode.add_argument('--daemon', action='store_true', help='Keep checking sources as they come due')
+    mode.add_argument('--queue', action='store_true', help='Show changes pending review')
+    mode.add_argument('--ack', metavar='ID', help="Mark a queued change reviewed ('all' for every one)")
+    parser.add_argument('--source', help='Only sources whose name contains this (case-insensitive)')
+    parser.add_argument('--force', action='store_true', help='Check sources even if not due')
+    parser.add_argument('--workers', type=int, default=4, help='Concurrent fetches (default: 4)')
+    parser.add_argument('--per-host', type=int, default=1, help='Concurrent fetches per host (default: 1)')
+    parser.add_argument('--poll', type=int, default=900,
+                        help='Daemon: longest sleep between schedule checks, seconds (default: 900)')
+    parser.add_argument('--sources-file', default=SOURCES_PATH, help=argparse.SUPPRESS)
+    parser.add_argument('--verbose', action='store_true', help='Queue: print diffs')
+    args = parser.parse_args()
+
+    if args.queue:
+        print_queue(args.verbose)
+        return
+    if args.ack:
+        ack(args.ack)
+        return
+
+    sources = load_sources(args.sources_file)
+    if args.source:
+        sources = [s for s in sources if args.source.lower() in s['name'].lower()]
+        if not sources:
+            print(f'No source matches {args.source!r}')
+            sys.exit(1)
+    state = load_monitor_state()
+
+    if args.list:
+        print_schedule(sources, state)
+        return
+
+    if args.once:
+        due = due_sources(sources, state, datetime.now(), force=args.force)
+        print(f'Checking {len(due)} of {sum(1 for s in sources if not s["skip"])} scheduled sources...')
+        queued = run_checks(due, state, args.workers, args.per_host)
+        print(f'{len(queued)} change(s) queued; {pending_count()} pending review.')
+        return
+
+    print(f'Monitoring {sum(1 for s in sources if not s["skip"])} sources '
+          f'({args.workers} workers, {args.per_host} per host). Ctrl-C to stop.')
+    force = args.force
+    try:
+        while True:
+            now = datetime.now()
+            due = due_sources(sources, state, now, force=force)
+            force = False
+            if due:
+                print(f'[{now.strftime("%Y-%m-%d %H:%M:%S")}] checking {len(due)} source(s)')
+                queued = run_checks(due, state, args.workers, args.per_host)
+                if queued:
+                    print(f'  {len(queued)} change(s) queued; {pending_count()} pending review')
+            upcoming = [next_due(s, state.get(s['slug'], {})) for s in sources if not s['skip']]
+            upcoming = [w for w in upcoming if w is not None]
+            wait = args.poll
+            if upcoming:
+                wait = min(wait, max((min(upcoming) - datetime.now()).total_seconds(), 1))
+            time.sleep(wait)
+    except KeyboardInterrupt:
+        print('\nStopped.')
+
+
+if __name__ == '__main__':
+    main()
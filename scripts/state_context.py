@@ -0,0 +1,376 @@
+"""
+Shared state-context loader — seats, elections and current terms for a state
+in one round trip, cached on disk.
+
+Ingest scripts (populate_candidacies, parse_wiki_elections, parse_nh_sos,
+populate_district_history, audit_seat_gaps, import_primary_results) all need
+the same seats/elections/incumbents picture of a state. This module fetches
+it with one JSON-aggregating statement and keeps a copy in
+/tmp/state_context/{ST}.json keyed by a DB change watermark, so a re-run
+against an unchanged database only pays for a tiny "has anything changed?"
+check (folded into the same statement). The watermark comes from the
+trigger-maintained data_versions table (scripts/install_data_versions.py),
+limited to the tables in the payload and to writes scoped to the state (or
+to every state), so populating one state leaves the others' caches valid.
+
+Usage:
+    from state_context import load_state_context
+
+    ctx = load_state_context('NH', run_sql)
+    ctx.seats_for(chamber='House')                    # list of seat dicts
+    ctx.seats_by_district[('House', '5', 'A')]        # seat dict
+    ctx.election_map(2026)                            # {seat_id → {type → election_id}}
+    ctx.current_terms[seat_id]                        # current seat_term dict
+
+    # Multi-state (states are fetched together, 10 per round trip)
+    contexts = load_state_contexts(['AL', 'AK'], run_sql)
+
+    # Include candidacies for one election year (election-night imports)
+    ctx = load_state_context('TX', run_sql, candidacies_year=2026)
+"""
+
+import os
+import json
+from collections import defaultdict
+
+CACHE_DIR = '/tmp/state_context'
+STATES_PER_QUERY = 10
+
+# Column order of the compact row arrays returned by the server.
+SEAT_COLUMNS = (
+    'seat_id', 'seat_label', 'seat_designator', 'office_level', 'office_type',
+    'selection_method', 'next_regular_election_year', 'current_holder',
+    'current_holder_party', 'current_holder_caucus', 'district_id', 'chamber',
+    'district_number', 'district_name', 'num_seats', 'is_floterial',
+    'redistricting_cycle',
+)
+ELECTION_COLUMNS = (
+    'election_id', 'seat_id', 'election_year', 'election_date', 'election_type',
+    'result_status', 'total_votes_cast',
+)
+TERM_COLUMNS = (
+    'seat_term_id', 'seat_id', 'candidate_id', 'full_name', 'last_name', 'party',
+    'caucus', 'start_date', 'start_reason', 'election_id',
+)
+CANDIDACY_COLUMNS = (
+    'candidacy_id', 'election_id', 'candidate_id', 'cand_party', 'votes_received',
+    'vote_percentage', 'result', 'is_incumbent', 'full_name',
+)
+
+# Tables with data_versions triggers (scripts/install_data_versions.py)
+VERSIONED_TABLES = ('states', 'districts', 'seats', 'elections', 'seat_terms',
+                    'candidates', 'candidacies', 'ballot_measures', 'forecasts')
+OPERATIONS = ('INSERT', 'UPDATE', 'DELETE', 'TRUNCATE')
+
+# Writes that can change a cached context: anything on the tables it is built
+# from, except new candidates, which only appear once a term or candidacy
+# (itself tracked) links them to the state.
+CONTEXT_VERSIONS = ([(t, op) for t in ('states', 'districts', 'seats', 'elections', 'seat_terms')
+                     for op in OPERATIONS]
+                    + [('candidates', op) for op in ('UPDATE', 'DELETE', 'TRUNCATE')])
+CANDIDACY_VERSIONS = [('candidacies', op) for op in OPERATIONS]
+
+_checked_tables = set()
+
+
+def watermark_sql(versions, state_id_sql=None):
+    """
+    Change watermark over (table, operation) pairs, from data_versions
+    (scripts/install_data_versions.py). With state_id_sql (e.g. 'st.id' in a
+    correlated subquery) only writes scoped to that state or to every state
+    count.
+
+    The counters are bumped by triggers in the writing transaction, so a
+    watermark read in the same statement as the data it guards always
+    matches that data. xmin changes on every bump too, so a re-created
+    table never repeats an old watermark.
+    """
+    pairs = ', '.join(f"('{t}', '{op}')" for t, op in versions)
+    scope = f'\n      AND state_id IN (0, {state_id_sql})' if state_id_sql else ''
+    return f"""
+    SELECT md5(COALESCE(string_agg(
+               table_name || ':' || operation || ':' || state_id || ':' || shard || ':'
+               || version || ':' || xmin::text,
+               ',' ORDER BY table_name, operation, state_id, shard), '')) AS v
+    FROM data_versions
+    WHERE (table_name, operation) IN ({pairs}){scope}
+"""
+
+
+def require_data_versions(run_sql, tables=VERSIONED_TABLES):
+    """
+    Raise unless data_versions and its triggers are installed on tables.
+
+    Without the triggers every watermark stays put and caches are served
+    stale forever, so callers check once per process before trusting one.
+    """
+    missing = set(tables) - _checked_tables
+    if not missing:
+        return
+    rows = run_sql("""
+        SELECT EXISTS (SELECT 1 FROM information_schema.columns
+                       WHERE table_schema = 'public' AND table_name = 'data_versions'
+                         AND column_name = 'shard') AS installed,
+               (SELECT COALESCE(json_agg(DISTINCT c.relname), '[]')
+                FROM pg_trigger t JOIN pg_class c ON c.oid = t.tgrelid
+                WHERE t.tgname = 'trg_data_version_insert') AS tracked
+    """)
+    if not rows:
+        raise RuntimeError('could not check for data_versions')
+    tracked = rows[0]['tracked']
+    if isinstance(tracked, str):
+        tracked = json.loads(tracked)
+    untracked = missing - set(tracked)
+    if not rows[0]['installed'] or untracked:
+        raise RuntimeError(
+            'data_versions change tracking is not installed'
+            + (f' (no triggers on {", ".join(sorted(untracked))})' if rows[0]['installed'] else '')
+            + '; run python3 scripts/install_data_versions.py')
+    _checked_tables.update(missing)
+
+
+def esc(value):
+    """Quote-escape a value read back from a cache file for a SQL literal."""
+    return str(value).replace("'", "''")
+
+
+def _cache_path(state, candidacies_year):
+    suffix = f'_cy{candidacies_year}' if candidacies_year else ''
+    return os.path.join(CACHE_DIR, f'{state}{suffix}.json')
+
+
+def _read_cache(state, candidacies_year):
+    try:
+        with open(_cache_path(state, candidacies_year)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cache(state, candidacies_year, watermark, payload):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = _cache_path(state, candidacies_year)
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump({'watermark': watermark, 'payload': payload}, f, separators=(',', ':'))
+    os.replace(tmp, path)
+
+
+def _payload_sql(candidacies_year):
+    """Server-side JSON aggregation of one state's context (correlated on st.id)."""
+    candidacies = ''
+    if candidacies_year:
+        candidacies = f""",
+            'candidacies', (
+                SELECT COALESCE(json_agg(json_build_array(
+                           cy.id, cy.election_id, cy.candidate_id, cy.party,
+                           cy.votes_received, cy.vote_percentage, cy.result,
+                           cy.is_incumbent, c.full_name)
+                       ORDER BY cy.election_id, cy.votes_received DESC NULLS LAST), '[]')
+                FROM candidacies cy
+                JOIN elections e ON cy.election_id = e.id
+                JOIN seats s ON e.seat_id = s.id
+                JOIN districts d ON s.district_id = d.id
+                JOIN candidates c ON cy.candidate_id = c.id
+                WHERE d.state_id = st.id AND e.election_year = {int(candidacies_year)}
+            )"""
+    return f"""json_build_object(
+            'seats', (
+                SELECT COALESCE(json_agg(json_build_array(
+                           s.id, s.seat_label, s.seat_designator, s.office_level, s.office_type,
+                           s.selection_method, s.next_regular_election_year, s.current_holder,
+                           s.current_holder_party, s.current_holder_caucus, d.id, d.chamber,
+                           d.district_number, d.district_name, d.num_seats, d.is_floterial,
+                           d.redistricting_cycle)
+                       ORDER BY d.chamber, d.district_number, s.seat_designator), '[]')
+                FROM seats s
+                JOIN districts d ON s.district_id = d.id
+                WHERE d.state_id = st.id
+            ),
+            'elections', (
+                SELECT COALESCE(json_agg(json_build_array(
+                           e.id, e.seat_id, e.election_year, e.election_date, e.election_type,
+                           e.result_status, e.total_votes_cast)
+                       ORDER BY e.seat_id, e.election_date, e.id), '[]')
+                FROM elections e
+                JOIN seats s ON e.seat_id = s.id
+                JOIN districts d ON s.district_id = d.id
+                WHERE d.state_id = st.id
+            ),
+            'terms', (
+                SELECT COALESCE(json_agg(json_build_array(
+                           t.id, t.seat_id, t.candidate_id, c.full_name, c.last_name, t.party,
+                           t.caucus, t.start_date, t.start_reason, t.election_id)
+                       ORDER BY t.seat_id, t.start_date), '[]')
+                FROM seat_terms t
+                JOIN seats s ON t.seat_id = s.id
+                JOIN districts d ON s.district_id = d.id
+                JOIN candidates c ON t.candidate_id = c.id
+                WHERE d.state_id = st.id AND t.end_date IS NULL
+            ){candidacies}
+        )"""
+
+
+def fetch_contexts(states, run_sql, cached_watermarks=None, candidacies_year=None):
+    """
+    One statement for many states. Returns {state: (watermark, payload or None)}.
+
+    payload is None for states whose cached watermark still matches — the
+    CASE short-circuits, so the server skips the aggregation entirely.
+    """
+    cached_watermarks = cached_watermarks or {}
+    values = ', '.join(
+        f"('{st}', '{esc(cached_watermarks.get(st) or '')}')" for st in states
+    )
+    versions = CONTEXT_VERSIONS + (CANDIDACY_VERSIONS if candidacies_year else [])
+    require_data_versions(run_sql, {t for t, _ in versions})
+    rows = run_sql(f"""
+        WITH req (abbreviation, cached) AS (VALUES {values})
+        SELECT st.abbreviation AS state, wm.v AS watermark,
+               CASE WHEN req.cached = wm.v THEN NULL
+                    ELSE {_payload_sql(candidacies_year)}
+               END AS payload
+        FROM req
+        JOIN states st ON st.abbreviation = req.abbreviation
+        CROSS JOIN LATERAL ({watermark_sql(versions, 'st.id').strip()}) wm
+    """)
+    if rows is None:
+        raise RuntimeError('state context query failed')
+    out = {}
+    for r in rows:
+        payload = r['payload']
+        if isinstance(payload, str):
+            payload = json.loads(payload)
+        out[r['state']] = (r['watermark'], payload)
+    return out
+
+
+def load_state_contexts(states, run_sql, use_cache=True, candidacies_year=None):
+    """
+    Load contexts for several states — one round trip per STATES_PER_QUERY
+    states. Returns {state: StateContext}.
+    """
+    states = [s.upper() for s in states]
+    cached = {}
+    if use_cache:
+        for st in states:
+            entry = _read_cache(st, candidacies_year)
+            if entry:
+                cached[st] = entry
+    # Bounded groups keep all-states payloads well under API response limits
+    fetched = {}
+    for i in range(0, len(states), STATES_PER_QUERY):
+        group = states[i:i + STATES_PER_QUERY]
+        fetched.update(fetch_contexts(
+            group, run_sql,
+            cached_watermarks={st: cached[st]['watermark'] for st in group if st in cached},
+            candidacies_year=candidacies_year,
+        ))
+    contexts = {}
+    for st in states:
+        if st not in fetched:
+            continue  # unknown state abbreviation
+        watermark, payload = fetched[st]
+        if payload is None:
+            payload = cached[st]['payload']
+        elif use_cache:
+            _write_cache(st, candidacies_year, watermark, payload)
+        contexts[st] = StateContext(st, payload, watermark)
+    return contexts
+
+
+def load_state_context(state, run_sql, use_cache=True, candidacies_year=None):
+    """Load one state's context (see load_state_contexts). Returns StateContext or None."""
+    return load_state_contexts([state], run_sql, use_cache=use_cache,
+                               candidacies_year=candidacies_year).get(state.upper())
+
+
+class StateContext:
+    """
+    Seats, elections and current terms for one state, with lookup indexes.
+
+    Rows are plain dicts keyed like the per-script queries they replace
+    (seat_id, district_number, election_id, election_type, ...).
+
+    Indexes:
+        seats_by_id:        {seat_id → seat}
+        seats_by_district:  {(chamber, district_number, seat_designator) → seat}
+        seats_by_key:       {(chamber, district_number) → [seats sorted by designator]}
+        elections_by_seat:  {seat_id → [elections by date]}
+        election_ids:       {(seat_id, election_year, election_type) → election_id}
+        current_terms:      {seat_id → current seat_term}
+        candidacies_by_election: {election_id → [candidacies]} (if loaded)
+    """
+
+    def __init__(self, state, payload, watermark=None):
+        self.state = state
+        self.watermark = watermark
+        self.seats = [dict(zip(SEAT_COLUMNS, r)) for r in payload['seats']]
+        self.elections = [dict(zip(ELECTION_COLUMNS, r)) for r in payload['elections']]
+        self.terms = [dict(zip(TERM_COLUMNS, r)) for r in payload['terms']]
+        self.candidacies = [dict(zip(CANDIDACY_COLUMNS, r))
+                            for r in payload.get('candidacies', [])]
+
+        self.seats_by_id = {s['seat_id']: s for s in self.seats}
+        self.seats_by_district = {}
+        self.seats_by_key = defaultdict(list)
+        for s in self.seats:
+            self.seats_by_district[(s['chamber'], s['district_number'], s['seat_designator'])] = s
+            self.seats_by_key[(s['chamber'], s['district_number'])].append(s)
+
+        self.elections_by_seat = defaultdict(list)
+        self.election_ids = {}
+        for e in self.elections:
+            self.elections_by_seat[e['seat_id']].append(e)
+            self.election_ids.setdefault(
+                (e['seat_id'], e['election_year'], e['election_type']), e['election_id'])
+
+        self.current_terms = {}
+        for t in self.terms:
+            # Latest-starting open term wins if a seat has more than one
+            self.current_terms[t['seat_id']] = t
+
+        self.candidacies_by_election = defaultdict(list)
+        for c in self.candidacies:
+            self.candidacies_by_election[c['election_id']].append(c)
+
+    def seats_for(self, chamber=None, office_type=None, office_level=None,
+                  selection_method=None, next_election_year=None, redistricting_cycle=None):
+        """Filter seats; every argument left as None matches anything."""
+        out = []
+        for s in self.seats:
+            if chamber is not None and s['chamber'] != chamber:
+                continue
+            if office_type is not None and s['office_type'] != office_type:
+                continue
+            if office_level is not None and s['office_level'] != office_level:
+                continue
+            if selection_method is not None and s['selection_method'] != selection_method:
+                continue
+            if next_election_year is not None and s['next_regular_election_year'] != next_election_year:
+                continue
+            if redistricting_cycle is not None and s['redistricting_cycle'] != redistricting_cycle:
+                continue
+            out.append(s)
+        return out
+
+    def elections_for(self, seats=None, year=None, election_types=None):
+        """Elections for the given seats (default all), optionally by year / type set."""
+        seat_ids = None if seats is None else {s['seat_id'] for s in seats}
+        out = []
+        for e in self.elections:
+            if seat_ids is not None and e['seat_id'] not in seat_ids:
+                continue
+            if year is not None and e['election_year'] != year:
+                continue
+            if election_types is not None and e['election_type'] not in election_types:
+                continue
+            out.append(e)
+        return out
+
+    def election_map(self, year, seats=None):
+        """{seat_id → {election_type → election_id}} for one election year."""
+        out = defaultdict(dict)
+        for e in self.elections_for(seats=seats, year=year):
+            out[e['seat_id']].setdefault(e['election_type'], e['election_id'])
+        return out
@@ -14,8 +14,9 @@ Pages generated per topic:
 """
 
 import os
+import argparse
 
-SITE_DIR = '/home/billkramer/elections/site'
+from map_build import PageBuilder
 
 
 def read_inline_block(topic):
@@ -156,14 +157,12 @@ def build_placeholder_page(topic, page_type):
     label = topic['label']
 
     if page_type == 'data':
-        filename = f'{slug}.html'
         title = topic['title_data']
         subtitle = topic['subtitle_data']
         placeholder_text = topic['placeholder_data']
         bc_trail = f'<a href="{slug}-101.html">{label}</a> &rsaquo; 2026 Elections'
         active = 'elections'
     elif page_type == 'analytics':
-        filename = f'{slug}-analytics.html'
         title = topic['title_analytics']
         subtitle = topic['subtitle_analytics']
         placeholder_text = topic['placeholder_analytics']
@@ -265,10 +264,7 @@ def build_placeholder_page(topic, page_type):
 </body>
 </html>'''
 
-    outpath = f'{SITE_DIR}/{filename}'
-    with open(outpath, 'w') as f:
-        f.write(html)
-    print(f'  Written: {filename}')
+    return html
 
 
 def build_101_page(topic):
@@ -487,10 +483,7 @@ def build_101_page(topic):
 </body>
 </html>'''
 
-    outpath = f'{SITE_DIR}/{slug}-101.html'
-    with open(outpath, 'w') as f:
-        f.write(html)
-    print(f'  Written: {slug}-101.html')
+    return html
 
 
 # ── Main ─────────────────────────────────────────────────────────────
@@ -498,8 +491,8 @@ def build_101_page(topic):
 # Topics with hand-crafted pages (skip generating these)
 CUSTOM_PAGES = {'governors'}  # All 3 governor pages are hand-crafted
 
-if __name__ == '__main__':
-    generated = 0
+
+def build_all(builder):
     for topic in TOPICS:
         name = topic['label']
         slug = topic['slug']
@@ -507,8 +500,21 @@ if __name__ == '__main__':
             print(f'Skipping {name} (all pages hand-crafted)')
             continue
         print(f'Building {name} pages...')
-        build_placeholder_page(topic, 'data')
-        build_placeholder_page(topic, 'analytics')
-        build_101_page(topic)
-        generated += 3
-    print(f'Done! {generated} pages generated.')
+        builder.page(f'{slug}.html', {'topic': topic, 'page': 'data'},
+                     lambda: build_placeholder_page(topic, 'data'), sources=[__file__])
+        builder.page(f'{slug}-analytics.html', {'topic': topic, 'page': 'analytics'},
+                     lambda: build_placeholder_page(topic, 'analytics'), sources=[__file__])
+        builder.page(f'{slug}-101.html',
+                     {'topic': topic, 'page': '101', 'inline': read_inline_block(topic['inline_topic'])},
+                     lambda: build_101_page(topic), sources=[__file__])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build topic data/analytics/101 pages')
+    parser.add_argument('--force', action='store_true', help='Rebuild pages even if inputs are unchanged')
+    args = parser.parse_args()
+
+    builder = PageBuilder(force=args.force)
+    build_all(builder)
+    builder.save()
+    builder.report()
@@ -1,64 +1,17 @@
 #!/usr/bin/env python3
-"""Build ballot measure initiative + referendum maps from AG partisan map template.
-Reads state classification data from data/ballot_auth.json (exported from DB)."""
+"""Build ballot measure initiative + referendum maps from the shared map geometry.
+Reads state classification data from data/ballot_auth.json (exported from DB).
+Pages whose inputs are unchanged since the last build are skipped (--force to rebuild)."""
 
-import re, json
+import json
+import argparse
+
+from map_build import SITE_DIR, STATE_NAMES, ALL_STATES, load_geometry, PageBuilder
 
 # Read ballot authorization data from DB export
-with open('/home/billkramer/elections/site/data/ballot_auth.json') as f:
+with open(f'{SITE_DIR}/data/ballot_auth.json') as f:
     auth_data = json.load(f)
 
-# Read the AG map template
-with open('/home/billkramer/elections/site/ag_partisan.html', 'r') as f:
-    template = f.read()
-
-# Extract just the SVG portion (state paths + labels)
-svg_match = re.search(r'(<svg class="us-map".*?</svg>)', template, re.DOTALL)
-svg_block = svg_match.group(1)
-
-# Get all state path data
-state_paths = {}
-for m in re.finditer(r'<g class="state-group" data-state="(\w{2})"[^>]*>(.*?)\n\s*</g>', template, re.DOTALL):
-    abbr = m.group(1)
-    inner = m.group(2)
-    # Extract fill group content (may contain multiple paths)
-    fill_match = re.search(r'<g class="state-fill"[^>]*>(.*?)</g>', inner, re.DOTALL)
-    stroke_match = re.search(r'<g class="state-stroke"[^>]*>(.*?)</g>', inner, re.DOTALL)
-    # Extract any extra paths outside fill/stroke groups (e.g. small state label paths)
-    extra = ''
-    stroke_g_match = re.search(r'<g class="state-stroke"[^>]*>.*?</g>', inner, re.DOTALL)
-    if stroke_g_match:
-        remainder = inner[stroke_g_match.end():]
-        extra_paths = re.findall(r'<path [^>]+/>', remainder)
-        if extra_paths:
-            extra = '\n      '.join(extra_paths)
-
-    if fill_match and stroke_match:
-        state_paths[abbr] = {
-            'fill_content': fill_match.group(1).strip(),
-            'stroke_content': stroke_match.group(1).strip(),
-            'extra': extra
-        }
-
-# Extract labels section
-labels = re.findall(r'<text[^>]*class="state-label"[^>]*>\w{2}</text>', template)
-
-# State name lookup
-STATE_NAMES = {
-    'AL':'Alabama','AK':'Alaska','AZ':'Arizona','AR':'Arkansas','CA':'California',
-    'CO':'Colorado','CT':'Connecticut','DE':'Delaware','FL':'Florida','GA':'Georgia',
-    'HI':'Hawaii','ID':'Idaho','IL':'Illinois','IN':'Indiana','IA':'Iowa',
-    'KS':'Kansas','KY':'Kentucky','LA':'Louisiana','ME':'Maine','MD':'Maryland',
-    'MA':'Massachusetts','MI':'Michigan','MN':'Minnesota','MS':'Mississippi','MO':'Missouri',
-    'MT':'Montana','NE':'Nebraska','NV':'Nevada','NH':'New Hampshire','NJ':'New Jersey',
-    'NM':'New Mexico','NY':'New York','NC':'North Carolina','ND':'North Dakota','OH':'Ohio',
-    'OK':'Oklahoma','OR':'Oregon','PA':'Pennsylvania','RI':'Rhode Island','SC':'South Carolina',
-    'SD':'South Dakota','TN':'Tennessee','TX':'Texas','UT':'Utah','VT':'Vermont',
-    'VA':'Virginia','WA':'Washington','WV':'West Virginia','WI':'Wisconsin','WY':'Wyoming'
-}
-
-ALL_STATES = sorted(STATE_NAMES.keys())
-
 # Build data dicts from JSON
 INITIATIVE_COLORS = auth_data['initiative']['colors']
 REFERENDUM_COLORS = auth_data['referendum']['colors']
@@ -81,42 +34,27 @@ INITIATIVE_NOTES = {k: v for k, v in auth_data['notes'].items() if k != 'DE'}
 REFERENDUM_NOTES = {'DE': auth_data['notes'].get('DE', '')}
 
 
-def build_map_html(title, subtitle, state_categories, colors, default_category, tooltips, notes, legend_items, nav_active, filename):
-    """Build a complete map HTML page."""
-
-    # Build state SVG groups
-    state_groups = []
+def state_infos(state_categories, default_category, tooltips, notes):
+    """Tooltip payload (data-info) per state."""
+    infos = {}
     for abbr in ALL_STATES:
-        if abbr not in state_paths:
-            continue
-
         category = state_categories.get(abbr, default_category)
-        color = colors[category]
-        type_desc = tooltips.get(category, '')
-        note = notes.get(abbr, '')
-
-        data_info = json.dumps({
+        infos[abbr] = {
             'state': abbr,
             'name': STATE_NAMES.get(abbr, abbr),
-            'type': type_desc,
+            'type': tooltips.get(category, ''),
             'category': category,
-            'note': note,
-        })
-
-        paths = state_paths[abbr]
-        extra = ''
-        if paths['extra']:
-            extra = f'\n      {paths["extra"]}'
+            'note': notes.get(abbr, ''),
+        }
+    return infos
 
-        group = f'''<g class="state-group" data-state="{abbr}" data-category="{category}" data-info='{data_info}'>
-      <g class="state-fill" fill="{color}">{paths['fill_content']}</g>
-      <g class="state-stroke" fill="none" stroke="#ffffff" stroke-width="1.0">{paths['stroke_content']}</g>{extra}
 
-    </g>'''
-        state_groups.append(group)
+def build_map_html(geometry, title, subtitle, state_categories, colors, default_category, tooltips, notes, legend_items, nav_active, filename):
+    """Build a complete map HTML page."""
 
-    states_svg = '\n'.join(state_groups)
-    labels_svg = '\n          '.join(labels)
+    infos = state_infos(state_categories, default_category, tooltips, notes)
+    states_svg = geometry.render_states(state_categories, colors, infos, default=default_category)
+    labels_svg = geometry.labels_svg
 
     # Build legend HTML (horizontal layout)
     legend_html = ''
@@ -302,45 +240,51 @@ Source: MultiState. Data as of <span id="data-date"></span>.{subtitle}
 </body>
 </html>'''
 
-    with open(f'/home/billkramer/elections/site/{filename}', 'w') as f:
-        f.write(html)
-    print(f'  Written: {filename}')
-
-
-# ============================================================
-# Build Initiative Map
-# ============================================================
-print('Building Initiative Authorization map...')
-init_states = auth_data['initiative']['states']
-build_map_html(
-    title='Ballot Measures <span class="separator">|</span> Initiative Authorization',
-    subtitle='<br><strong>Note:</strong> The Mississippi state supreme court blocked the state\'s constitutional initiative process in 2021.',
-    state_categories=init_states,
-    colors=INITIATIVE_COLORS,
-    default_category='none',
-    tooltips=INITIATIVE_TOOLTIPS,
-    notes=INITIATIVE_NOTES,
-    legend_items=auth_data['initiative']['legend'],
-    nav_active='initiative',
-    filename='ballot-measures-initiative-map.html',
-)
-
-# ============================================================
-# Build Referendum Map
-# ============================================================
-print('Building Referendum Authorization map...')
-ref_states = auth_data['referendum']['states']
-build_map_html(
-    title='Ballot Measures <span class="separator">|</span> Referendum Authorization',
-    subtitle='',
-    state_categories=ref_states,
-    colors=REFERENDUM_COLORS,
-    default_category='amendments_only',
-    tooltips=REFERENDUM_TOOLTIPS,
-    notes=REFERENDUM_NOTES,
-    legend_items=auth_data['referendum']['legend'],
-    nav_active='referendum',
-    filename='ballot-measures-referendum-map.html',
-)
-
-print('Done!')
+    return html
+
+
+MAPS = [
+    ('Initiative Authorization', dict(
+        title='Ballot Measures <span class="separator">|</span> Initiative Authorization',
+        subtitle='<br><strong>Note:</strong> The Mississippi state supreme court blocked the state\'s constitutional initiative process in 2021.',
+        state_categories=auth_data['initiative']['states'],
+        colors=INITIATIVE_COLORS,
+        default_category='none',
+        tooltips=INITIATIVE_TOOLTIPS,
+        notes=INITIATIVE_NOTES,
+        legend_items=auth_data['initiative']['legend'],
+        nav_active='initiative',
+        filename='ballot-measures-initiative-map.html',
+    )),
+    ('Referendum Authorization', dict(
+        title='Ballot Measures <span class="separator">|</span> Referendum Authorization',
+        subtitle='',
+        state_categories=auth_data['referendum']['states'],
+        colors=REFERENDUM_COLORS,
+        default_category='amendments_only',
+        tooltips=REFERENDUM_TOOLTIPS,
+        notes=REFERENDUM_NOTES,
+        legend_items=auth_data['referendum']['legend'],
+        nav_active='referendum',
+        filename='ballot-measures-referendum-map.html',
+    )),
+]
+
+
+def build_all(builder):
+    for name, spec in MAPS:
+        print(f'Building {name} map...')
+        builder.page(spec['filename'], spec,
+                     lambda: build_map_html(builder.geometry, **spec),
+                     sources=[__file__])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build ballot measure authorization maps')
+    parser.add_argument('--force', action='store_true', help='Rebuild pages even if inputs are unchanged')
+    args = parser.parse_args()
+
+    builder = PageBuilder(load_geometry(), force=args.force)
+    build_all(builder)
+    builder.save()
+    builder.report()
@@ -4,6 +4,8 @@ Each block contains an SVG map with JS-driven tab switching between views.
 
 Outputs to /tmp/inline_{topic}_block.html for each topic.
 These blocks get injected into the corresponding 101 pages.
+The SVG is rendered gray from the shared map geometry (map_build.py); blocks
+whose inputs are unchanged since the last build are skipped (--force to rebuild).
 
 Topics:
   - governors: Partisan + 2026 Elections tabs
@@ -14,43 +16,16 @@ Topics:
   - sos: Partisan only (single view, no tabs)
 """
 
-import re, json
+import json
+import argparse
 
-SITE_DIR = '/home/billkramer/elections/site'
+from map_build import SITE_DIR, STATE_NAMES, load_geometry, PageBuilder
 
 # Read state summary data
 with open(f'{SITE_DIR}/data/states_summary.json') as f:
     summary = json.load(f)
 STATES_DATA = summary['states']
 
-# Read a generated map to get SVG with correct state groups
-with open(f'{SITE_DIR}/ag_partisan.html') as f:
-    content = f.read()
-
-# Extract the full SVG
-svg_match = re.search(r'(<svg class="us-map".*?</svg>)', content, re.DOTALL)
-svg = svg_match.group(1)
-
-# Strip data-category and data-info attributes (JS will handle coloring)
-svg = re.sub(r' data-category="[^"]*"', '', svg)
-svg = re.sub(r" data-info='[^']*'", '', svg)
-
-# Reset all fills to gray
-svg = re.sub(r'(<g class="state-fill" fill=")[^"]*"', r'\1#d9d9d9"', svg)
-
-STATE_NAMES = {
-    'AL':'Alabama','AK':'Alaska','AZ':'Arizona','AR':'Arkansas','CA':'California',
-    'CO':'Colorado','CT':'Connecticut','DE':'Delaware','FL':'Florida','GA':'Georgia',
-    'HI':'Hawaii','ID':'Idaho','IL':'Illinois','IN':'Indiana','IA':'Iowa',
-    'KS':'Kansas','KY':'Kentucky','LA':'Louisiana','ME':'Maine','MD':'Maryland',
-    'MA':'Massachusetts','MI':'Michigan','MN':'Minnesota','MS':'Mississippi','MO':'Missouri',
-    'MT':'Montana','NE':'Nebraska','NV':'Nevada','NH':'New Hampshire','NJ':'New Jersey',
-    'NM':'New Mexico','NY':'New York','NC':'North Carolina','ND':'North Dakota','OH':'Ohio',
-    'OK':'Oklahoma','OR':'Oregon','PA':'Pennsylvania','RI':'Rhode Island','SC':'South Carolina',
-    'SD':'South Dakota','TN':'Tennessee','TX':'Texas','UT':'Utah','VT':'Vermont',
-    'VA':'Virginia','WA':'Washington','WV':'West Virginia','WI':'Wisconsin','WY':'Wyoming'
-}
-
 LOWER_NAMES = {'CA':'Assembly','NV':'Assembly','NY':'Assembly','WI':'Assembly','NJ':'Assembly',
                'MD':'House of Delegates','VA':'House of Delegates','WV':'House of Delegates',
                'NE':'Legislature'}
@@ -139,7 +114,7 @@ def get_officer_states(office_key):
     return states
 
 
-def build_governors_block():
+def build_governors_block(geometry):
     """Governors: 2 tabs — Partisan + 2026 Elections."""
     partisan, elec_2026 = get_governor_states()
 
@@ -148,7 +123,7 @@ def build_governors_block():
     p_states = {k: v for k, v in partisan.items() if v == 'dem'}
     e_states = elec_2026  # all states needed since 5 categories
 
-    map_svg = svg.replace('class="us-map"', 'class="us-map" id="gov-map"', 1)
+    map_svg = geometry.render_svg(map_id='gov-map')
 
     return f'''    <!-- Inline Governors Map -->
     <div class="inline-map-section" style="margin:28px 0">
@@ -223,7 +198,7 @@ def build_governors_block():
     </script>'''
 
 
-def build_legislatures_block():
+def build_legislatures_block(geometry):
     """Legislatures/Trifectas: 2 tabs — Legislative Control + Trifectas."""
     partisan, trifecta = get_legislature_states()
 
@@ -231,7 +206,7 @@ def build_legislatures_block():
     p_states = {k: v for k, v in partisan.items() if v != 'gop'}
     t_states = {k: v for k, v in trifecta.items() if v != 'gop_trifecta'}
 
-    map_svg = svg.replace('class="us-map"', 'class="us-map" id="leg-map"', 1)
+    map_svg = geometry.render_svg(map_id='leg-map')
 
     return f'''    <!-- Inline Legislatures Map -->
     <div class="inline-map-section" style="margin:28px 0">
@@ -306,7 +281,7 @@ def build_legislatures_block():
     </script>'''
 
 
-def build_officer_block(topic, office_key, title, map_id):
+def build_officer_block(geometry, topic, office_key, title, map_id):
     """Single-view officer map (no tabs)."""
     states = get_officer_states(office_key)
     has_none = any(v == 'none' for v in states.values())
@@ -324,7 +299,7 @@ def build_officer_block(topic, office_key, title, map_id):
         tooltips += ", none: 'No office or vacant'"
     legend += "]"
 
-    map_svg = svg.replace('class="us-map"', f'class="us-map" id="{map_id}"', 1)
+    map_svg = geometry.render_svg(map_id=map_id)
 
     return f'''    <!-- Inline {title} Map -->
     <div class="inline-map-section" style="margin:28px 0">
@@ -382,21 +357,33 @@ def build_officer_block(topic, office_key, title, map_id):
 
 # ── Main ─────────────────────────────────────────────────────────────
 
-if __name__ == '__main__':
-    blocks = {
-        'governors': ('Governors', build_governors_block),
-        'legislatures': ('Legislatures/Trifectas', build_legislatures_block),
-        'ag': ('Attorneys General', lambda: build_officer_block('ag', 'Attorney General', 'Attorneys General', 'ag-map')),
-        'ltgov': ('Lt. Governors', lambda: build_officer_block('ltgov', 'Lt. Governor', 'Lt. Governors', 'ltgov-map')),
-        'sos': ('Secretaries of State', lambda: build_officer_block('sos', 'Secretary of State', 'Secretaries of State', 'sos-map')),
-    }
+BLOCKS = {
+    'governors': ('Governors', build_governors_block),
+    'legislatures': ('Legislatures/Trifectas', build_legislatures_block),
+    'ag': ('Attorneys General', lambda g: build_officer_block(g, 'ag', 'Attorney General', 'Attorneys General', 'ag-map')),
+    'ltgov': ('Lt. Governors', lambda g: build_officer_block(g, 'ltgov', 'Lt. Governor', 'Lt. Governors', 'ltgov-map')),
+    'sos': ('Secretaries of State', lambda g: build_officer_block(g, 'sos', 'Secretary of State', 'Secretaries of State', 'sos-map')),
+}
 
-    for topic, (label, fn) in blocks.items():
+
+def block_path(topic):
+    return f'/tmp/inline_{topic}_block.html'
+
+
+def build_all(builder):
+    # Every block is derived from STATES_DATA alone
+    for topic, (label, fn) in BLOCKS.items():
         print(f'Building inline {label} block...')
-        html = fn()
-        outpath = f'/tmp/inline_{topic}_block.html'
-        with open(outpath, 'w') as f:
-            f.write(html)
-        print(f'  Written: {outpath} ({len(html)} chars)')
+        builder.page(block_path(topic), {'topic': topic, 'states': STATES_DATA},
+                     lambda: fn(builder.geometry), sources=[__file__])
 
-    print('Done! All inline blocks generated.')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build inline map blocks for 101 pages')
+    parser.add_argument('--force', action='store_true', help='Rebuild blocks even if inputs are unchanged')
+    args = parser.parse_args()
+
+    builder = PageBuilder(load_geometry(), force=args.force)
+    build_all(builder)
+    builder.save()
+    builder.report()
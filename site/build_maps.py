@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Build every map page in one process.
+
+Parses the state geometry once (map_build.load_geometry, cached across runs)
+and runs, in dependency order:
+  1. build_partisan_maps   — 7 standalone partisan maps
+  2. build_ballot_maps     — initiative + referendum authorization maps
+  3. build_inline_maps     — /tmp/inline_{topic}_block.html
+  4. build_101_pages       — topic data/analytics/101 pages (embed the inline blocks)
+
+Pages whose inputs are unchanged since the last build are skipped; a
+per-page timing table is printed at the end.
+
+Usage:
+    python3 site/build_maps.py
+    python3 site/build_maps.py --force
+    python3 site/build_maps.py --only partisan --only inline
+"""
+
+import time
+import argparse
+
+from map_build import load_geometry, PageBuilder
+
+STAGES = ['partisan', 'ballot', 'inline', '101']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build all map pages')
+    parser.add_argument('--force', action='store_true', help='Rebuild pages even if inputs are unchanged')
+    parser.add_argument('--only', action='append', choices=STAGES,
+                        help='Run only these stages (repeatable; default all)')
+    args = parser.parse_args()
+    stages = args.only or STAGES
+
+    t0 = time.perf_counter()
+    geometry = load_geometry()
+    print(f'Geometry: {len(geometry.state_paths)} states ({(time.perf_counter() - t0) * 1000:.0f} ms)')
+    builder = PageBuilder(geometry, force=args.force)
+
+    # Imported lazily: each module loads its data file at import time.
+    if 'partisan' in stages:
+        import build_partisan_maps
+        build_partisan_maps.build_all(builder)
+    if 'ballot' in stages:
+        import build_ballot_maps
+        build_ballot_maps.build_all(builder)
+    if 'inline' in stages:
+        import build_inline_maps
+        build_inline_maps.build_all(builder)
+    if '101' in stages:
+        import build_101_pages
+        build_101_pages.build_all(builder)
+
+    builder.save()
+    builder.report()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """Build all partisan standalone maps from states_summary.json.
-Reads SVG state paths from ag_partisan.html as template.
+State geometry comes from map_build (parsed once from ag_partisan.html and cached).
 Outputs legend-on-top layout matching the ballot measures map pattern.
+Pages whose inputs are unchanged since the last build are skipped (--force to rebuild).
 
 Maps generated:
   1. trifectas_partisan.html
@@ -13,57 +14,16 @@ Maps generated:
   7. sos_partisan.html
 """
 
-import re, json
+import json
+import argparse
 
-SITE_DIR = '/home/billkramer/elections/site'
+from map_build import SITE_DIR, STATE_NAMES, ALL_STATES, load_geometry, PageBuilder
 
 # Read state summary data
 with open(f'{SITE_DIR}/data/states_summary.json') as f:
     summary = json.load(f)
 STATES_DATA = summary['states']
 
-# Read AG map as SVG template (has all 50 state paths)
-with open(f'{SITE_DIR}/ag_partisan.html') as f:
-    template = f.read()
-
-# Extract state path data
-state_paths = {}
-for m in re.finditer(r'<g class="state-group" data-state="(\w{2})"[^>]*>(.*?)\n\s*</g>', template, re.DOTALL):
-    abbr = m.group(1)
-    inner = m.group(2)
-    fill_match = re.search(r'<g class="state-fill"[^>]*>(.*?)</g>', inner, re.DOTALL)
-    stroke_match = re.search(r'<g class="state-stroke"[^>]*>(.*?)</g>', inner, re.DOTALL)
-    extra = ''
-    stroke_g_match = re.search(r'<g class="state-stroke"[^>]*>.*?</g>', inner, re.DOTALL)
-    if stroke_g_match:
-        remainder = inner[stroke_g_match.end():]
-        extra_paths = re.findall(r'<path [^>]+/>', remainder)
-        if extra_paths:
-            extra = '\n      '.join(extra_paths)
-    if fill_match and stroke_match:
-        state_paths[abbr] = {
-            'fill_content': fill_match.group(1).strip(),
-            'stroke_content': stroke_match.group(1).strip(),
-            'extra': extra,
-        }
-
-# Extract label elements
-labels = re.findall(r'<text[^>]*class="state-label"[^>]*>\w{2}</text>', template)
-
-STATE_NAMES = {
-    'AL':'Alabama','AK':'Alaska','AZ':'Arizona','AR':'Arkansas','CA':'California',
-    'CO':'Colorado','CT':'Connecticut','DE':'Delaware','FL':'Florida','GA':'Georgia',
-    'HI':'Hawaii','ID':'Idaho','IL':'Illinois','IN':'Indiana','IA':'Iowa',
-    'KS':'Kansas','KY':'Kentucky','LA':'Louisiana','ME':'Maine','MD':'Maryland',
-    'MA':'Massachusetts','MI':'Michigan','MN':'Minnesota','MS':'Mississippi','MO':'Missouri',
-    'MT':'Montana','NE':'Nebraska','NV':'Nevada','NH':'New Hampshire','NJ':'New Jersey',
-    'NM':'New Mexico','NY':'New York','NC':'North Carolina','ND':'North Dakota','OH':'Ohio',
-    'OK':'Oklahoma','OR':'Oregon','PA':'Pennsylvania','RI':'Rhode Island','SC':'South Carolina',
-    'SD':'South Dakota','TN':'Tennessee','TX':'Texas','UT':'Utah','VT':'Vermont',
-    'VA':'Virginia','WA':'Washington','WV':'West Virginia','WI':'Wisconsin','WY':'Wyoming'
-}
-ALL_STATES = sorted(STATE_NAMES.keys())
-
 # NE unicameral chamber name
 LOWER_NAMES = {'CA':'Assembly','NV':'Assembly','NY':'Assembly','WI':'Assembly','NJ':'Assembly',
                'MD':'House of Delegates','VA':'House of Delegates','WV':'House of Delegates',
@@ -490,31 +450,12 @@ def build_nav_html(active_key):
     return '\n'.join(parts)
 
 
-def build_map_html(config):
+def build_map_html(config, geometry, infos):
     """Build a complete standalone map HTML page."""
-    categories = config['categories']
     colors = config['colors']
-    tooltip_fn = config['tooltip_fn']
-
-    # Build state SVG groups
-    state_groups = []
-    for abbr in ALL_STATES:
-        if abbr not in state_paths:
-            continue
-        cat = categories.get(abbr, list(colors.keys())[0])
-        color = colors[cat]
-        data_info = json.dumps(tooltip_fn(abbr, cat))
-        paths = state_paths[abbr]
-        extra = f'\n      {paths["extra"]}' if paths['extra'] else ''
-        group = f'''<g class="state-group" data-state="{abbr}" data-category="{cat}" data-info='{data_info}'>
-      <g class="state-fill" fill="{color}">{paths['fill_content']}</g>
-      <g class="state-stroke" fill="none" stroke="#ffffff" stroke-width="1.0">{paths['stroke_content']}</g>{extra}
-
-    </g>'''
-        state_groups.append(group)
-
-    states_svg = '\n'.join(state_groups)
-    labels_svg = '\n          '.join(labels)
+    states_svg = geometry.render_states(config['categories'], colors, infos,
+                                        default=list(colors.keys())[0])
+    labels_svg = geometry.labels_svg
 
     # Build legend
     legend_html = ''
@@ -734,28 +675,47 @@ def build_map_html(config):
 </body>
 </html>'''
 
-    outpath = f'{SITE_DIR}/{config["filename"]}'
-    with open(outpath, 'w') as f:
-        f.write(html)
-    print(f'  Written: {config["filename"]}')
+    return html
 
 
-# ── Main ─────────────────────────────────────────────────────────────
+def build_page(builder, config):
+    """Build one map page through the PageBuilder (skipped if inputs unchanged)."""
+    colors = config['colors']
+    default = list(colors.keys())[0]
+    infos = {abbr: config['tooltip_fn'](abbr, config['categories'].get(abbr, default))
+             for abbr in ALL_STATES if abbr in builder.geometry.state_paths}
+    inputs = {k: v for k, v in config.items() if k != 'tooltip_fn'}
+    inputs['infos'] = infos
+    builder.page(config['filename'], inputs,
+                 lambda: build_map_html(config, builder.geometry, infos),
+                 sources=[__file__])
+
+
+CONFIGS = [
+    ('Trifectas', get_trifecta_config),
+    ('Governors (partisan)', get_governors_config),
+    ('Governors 2026', get_governors_2026_config),
+    ('Lt. Governors', get_ltgov_config),
+    ('Attorneys General', get_ag_config),
+    ('Secretaries of State', get_sos_config),
+    ('Legislatures', get_legislatures_config),
+]
 
-if __name__ == '__main__':
-    configs = [
-        ('Trifectas', get_trifecta_config),
-        ('Governors (partisan)', get_governors_config),
-        ('Governors 2026', get_governors_2026_config),
-        ('Lt. Governors', get_ltgov_config),
-        ('Attorneys General', get_ag_config),
-        ('Secretaries of State', get_sos_config),
-        ('Legislatures', get_legislatures_config),
-    ]
 
-    for name, fn in configs:
+def build_all(builder):
+    for name, fn in CONFIGS:
         print(f'Building {name} map...')
-        config = fn()
-        build_map_html(config)
+        build_page(builder, fn())
 
-    print('Done! All 7 maps rebuilt.')
+
+# ── Main ─────────────────────────────────────────────────────────────
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build partisan standalone maps')
+    parser.add_argument('--force', action='store_true', help='Rebuild pages even if inputs are unchanged')
+    args = parser.parse_args()
+
+    builder = PageBuilder(load_geometry(), force=args.force)
+    build_all(builder)
+    builder.save()
+    builder.report()
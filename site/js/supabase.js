@@ -1,6 +1,8 @@
 /* ============================================================
    Elections Site — Supabase Live Data
-   Fetches uncertified 2026 elections directly from PostgREST
+   Loads uncertified 2026 elections from the per-state election-night
+   snapshot (data/live/{ST}.json, scripts/publish_live_snapshot.py),
+   or directly from PostgREST when no snapshot is published,
    to avoid needing a full static export on every data update.
    Falls back silently to static data on any failure.
    ============================================================ */
@@ -11,6 +13,9 @@ const POSTGREST_BASE = SUPABASE_URL + '/rest/v1';
 const LIVE_ELECTION_YEAR = 2026;
 const LIVE_QUERY_TIMEOUT_MS = 5000;
 const LIVE_CACHE_TTL_MS = 60000; // 60 seconds
+// Snapshots are refreshed every 5 minutes while publishing (publish_live_snapshot.py
+// REFRESH_SECONDS); older ones are stale and the RPC is used instead.
+const LIVE_SNAPSHOT_MAX_AGE_MS = 15 * 60 * 1000;
 
 /**
  * Check if a district has any 2026 elections that aren't certified yet.
@@ -29,7 +34,7 @@ function needsLiveData(district) {
 
 /** Build a sessionStorage cache key from sorted seat IDs. */
 function liveCacheKey(seatIds) {
-  return 'live_elections_' + seatIds.slice().sort((a, b) => a - b).join(',');
+  return 'live_elections_v2_' + seatIds.slice().sort((a, b) => a - b).join(',');
 }
 
 /** Get cached live data if still fresh (< TTL). Returns null if stale or missing. */
@@ -58,32 +63,33 @@ function setCachedLiveData(seatIds, data) {
 }
 
 /**
- * Fetch 2026 elections for given seat IDs from Supabase PostgREST.
- * Uses resource embedding to include candidacies + candidate names in one query.
+ * Fetch 2026 elections for given seat IDs in the shape the page renders.
+ * One call to the live_elections() RPC (scripts/install_live_elections_rpc.py),
+ * which joins, sorts and computes recount / incumbent-defeated flags in the
+ * database. If the RPC isn't installed (404), falls back to the embedded
+ * PostgREST select and shapes the rows client-side.
  * 5-second timeout via AbortController.
  */
-async function fetchLiveElections(seatIds) {
+async function fetchLiveElections(seatIds, stateAbbr) {
   const controller = new AbortController();
   const timer = setTimeout(() => controller.abort(), LIVE_QUERY_TIMEOUT_MS);
-
-  const select = 'id,seat_id,election_type,election_date,election_year,' +
-    'result_status,total_votes_cast,is_open_seat,filing_deadline,forecast_rating,' +
-    'precincts_reporting,precincts_total,' +
-    'candidacies(candidate_id,party,caucus,votes_received,vote_percentage,result,is_incumbent,is_write_in,' +
-    'candidates(full_name))';
-
-  const seatList = seatIds.join(',');
-  const url = `${POSTGREST_BASE}/elections?select=${select}` +
-    `&election_year=eq.${LIVE_ELECTION_YEAR}&seat_id=in.(${seatList})`;
+  const headers = {
+    'apikey': SUPABASE_ANON_KEY,
+    'Authorization': 'Bearer ' + SUPABASE_ANON_KEY,
+  };
 
   try {
-    const resp = await fetch(url, {
-      headers: {
-        'apikey': SUPABASE_ANON_KEY,
-        'Authorization': 'Bearer ' + SUPABASE_ANON_KEY,
-      },
+    const resp = await fetch(`${POSTGREST_BASE}/rpc/live_elections`, {
+      method: 'POST',
+      headers: Object.assign({'Content-Type': 'application/json'}, headers),
+      body: JSON.stringify({p_seat_ids: seatIds, p_year: LIVE_ELECTION_YEAR}),
       signal: controller.signal,
     });
+    if (resp.status === 404) {
+      const rows = await fetchLiveElectionsEmbedded(seatIds, headers, controller.signal);
+      clearTimeout(timer);
+      return shapeLiveElections(rows, stateAbbr);
+    }
     clearTimeout(timer);
     if (!resp.ok) throw new Error('PostgREST ' + resp.status);
     return await resp.json();
@@ -93,7 +99,67 @@ async function fetchLiveElections(seatIds) {
   }
 }
 
-// ── Recount thresholds (mirrors export_district_data.py) ──────────────
+/**
+ * Fetch this state's published election-night snapshot and keep the given seats.
+ * Returns null when no snapshot exists or it is older than LIVE_SNAPSHOT_MAX_AGE_MS
+ * (caller falls back to fetchLiveElections).
+ * 'no-cache' revalidates with the server, so an unchanged snapshot is a 304.
+ */
+async function fetchLiveSnapshot(stateAbbr, seatIds) {
+  const controller = new AbortController();
+  const timer = setTimeout(() => controller.abort(), LIVE_QUERY_TIMEOUT_MS);
+  try {
+    const resp = await fetch(`data/live/${stateAbbr}.json`, {
+      cache: 'no-cache',
+      signal: controller.signal,
+    });
+    clearTimeout(timer);
+    if (!resp.ok) return null;
+    const snapshot = await resp.json();
+    if (snapshot.year !== LIVE_ELECTION_YEAR) return null;
+    const generatedAt = Date.parse(snapshot.generated_at);
+    if (!(Date.now() - generatedAt <= LIVE_SNAPSHOT_MAX_AGE_MS)) return null;
+    const wanted = new Set(seatIds);
+    return snapshot.elections.filter(e => wanted.has(e.seat_id));
+  } catch (err) {
+    clearTimeout(timer);
+    return null;
+  }
+}
+
+/** Legacy path: elections → candidacies → candidates via resource embedding. */
+async function fetchLiveElectionsEmbedded(seatIds, headers, signal) {
+  const select = 'id,seat_id,election_type,election_date,election_year,' +
+    'result_status,total_votes_cast,is_open_seat,filing_deadline,forecast_rating,' +
+    'precincts_reporting,precincts_total,' +
+    'candidacies(candidate_id,party,caucus,votes_received,vote_percentage,result,is_incumbent,is_write_in,' +
+    'candidates(full_name))';
+
+  const seatList = seatIds.join(',');
+  const url = `${POSTGREST_BASE}/elections?select=${select}` +
+    `&election_year=eq.${LIVE_ELECTION_YEAR}&seat_id=in.(${seatList})`;
+  const resp = await fetch(url, { headers: headers, signal: signal });
+  if (!resp.ok) throw new Error('PostgREST ' + resp.status);
+  return await resp.json();
+}
+
+/** Shape embedded rows like live_elections(): transformElection + seat_id + flags. */
+function shapeLiveElections(rows, stateAbbr) {
+  return rows.map(function(pg) {
+    var transformed = transformElection(pg);
+    transformed.seat_id = pg.seat_id;
+    var recount = checkRecountEligible(stateAbbr, transformed);
+    if (recount) transformed.recount_eligible = recount;
+    // Incumbent defeated in primary
+    if (transformed.type && transformed.type.indexOf('Primary') >= 0) {
+      var incLost = transformed.candidates.some(function(c) { return c.is_incumbent && c.result === 'Lost'; });
+      if (incLost) transformed.incumbent_defeated = true;
+    }
+    return transformed;
+  });
+}
+
+// ── Recount thresholds (mirrors scripts/recount.py) ───────────────────
 const RECOUNT_THRESHOLDS = {
   AL: {sw: 0.5, leg: 0.5}, AZ: {sw: 0.5, leg: 0.5}, CO: {sw: 0.5, leg: 0.5},
   CT: {sw: 0.5, leg: 0.5}, DE: {sw: 0.5, leg: 0.5}, FL: {sw: 0.5, leg: 0.5},
@@ -197,25 +263,19 @@ function transformElection(pg) {
 
 /**
  * Merge live 2026 elections into the district's static data (mutates in place).
+ * liveElections come from fetchLiveElections (already shaped, with seat_id).
  * For each seat with live data, removes static 2026 elections and appends live ones.
  * Seats with no live results keep their static elections unchanged.
- * Also computes recount_eligible on each live election.
  */
-function mergeLiveElections(district, liveElections, stateAbbr) {
+function mergeLiveElections(district, liveElections) {
   // Group live elections by seat_id
   var bySeat = {};
   for (var i = 0; i < liveElections.length; i++) {
-    var pg = liveElections[i];
-    if (!bySeat[pg.seat_id]) bySeat[pg.seat_id] = [];
-    var transformed = transformElection(pg);
-    var recount = checkRecountEligible(stateAbbr, transformed);
-    if (recount) transformed.recount_eligible = recount;
-    // Incumbent defeated in primary
-    if (transformed.type && transformed.type.indexOf('Primary') >= 0) {
-      var incLost = transformed.candidates.some(function(c) { return c.is_incumbent && c.result === 'Lost'; });
-      if (incLost) transformed.incumbent_defeated = true;
-    }
-    bySeat[pg.seat_id].push(transformed);
+    var el0 = Object.assign({}, liveElections[i]);
+    var seatId = el0.seat_id;
+    delete el0.seat_id;
+    if (!bySeat[seatId]) bySeat[seatId] = [];
+    bySeat[seatId].push(el0);
   }
 
   for (var j = 0; j < district.seats.length; j++) {
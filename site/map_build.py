@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""Shared map-build subsystem for the standalone and inline US maps.
+
+The map builders used to re-read ag_partisan.html with regexes in every
+script to recover the 50 state path groups, then string-concatenate each
+page from scratch. This module does that work once:
+
+  - load_geometry() parses the state fill/stroke paths and labels from the
+    template page and caches them in GEOMETRY_CACHE (keyed by the template's
+    hash), so later runs skip the regex pass entirely,
+  - MapGeometry precompiles each state's <g> group into fixed string pieces;
+    rendering a map is a join over 50 (prefix, color, info, suffix) tuples,
+  - PageBuilder writes a page only when the hash of its inputs (data, the
+    geometry, and the builder source files) changed since the last build,
+    and reports per-page build time.
+
+Usage (build everything in one process):
+    python3 site/build_maps.py
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+
+SITE_DIR = os.path.dirname(os.path.abspath(__file__))
+TEMPLATE_PATH = os.path.join(SITE_DIR, 'ag_partisan.html')
+CACHE_DIR = '/tmp/map_build'
+GEOMETRY_CACHE = os.path.join(CACHE_DIR, 'geometry.json')
+MANIFEST_PATH = os.path.join(CACHE_DIR, 'manifest.json')
+
+STATE_NAMES = {
+    'AL':'Alabama','AK':'Alaska','AZ':'Arizona','AR':'Arkansas','CA':'California',
+    'CO':'Colorado','CT':'Connecticut','DE':'Delaware','FL':'Florida','GA':'Georgia',
+    'HI':'Hawaii','ID':'Idaho','IL':'Illinois','IN':'Indiana','IA':'Iowa',
+    'KS':'Kansas','KY':'Kentucky','LA':'Louisiana','ME':'Maine','MD':'Maryland',
+    'MA':'Massachusetts','MI':'Michigan','MN':'Minnesota','MS':'Mississippi','MO':'Missouri',
+    'MT':'Montana','NE':'Nebraska','NV':'Nevada','NH':'New Hampshire','NJ':'New Jersey',
+    'NM':'New Mexico','NY':'New York','NC':'North Carolina','ND':'North Dakota','OH':'Ohio',
+    'OK':'Oklahoma','OR':'Oregon','PA':'Pennsylvania','RI':'Rhode Island','SC':'South Carolina',
+    'SD':'South Dakota','TN':'Tennessee','TX':'Texas','UT':'Utah','VT':'Vermont',
+    'VA':'Virginia','WA':'Washington','WV':'West Virginia','WI':'Wisconsin','WY':'Wyoming'
+}
+ALL_STATES = sorted(STATE_NAMES.keys())
+
+SVG_OPEN = '<svg class="us-map" viewBox="480 0 1760 1115.45" xmlns="http://www.w3.org/2000/svg">'
+
+
+def _sha(data):
+    return hashlib.sha256(data if isinstance(data, bytes) else data.encode()).hexdigest()
+
+
+def file_digest(path):
+    with open(path, 'rb') as f:
+        return _sha(f.read())
+
+
+# ── Geometry ─────────────────────────────────────────────────────────
+
+def parse_template(template):
+    """Extract {abbr: {fill_content, stroke_content, extra}} and label elements."""
+    state_paths = {}
+    for m in re.finditer(r'<g class="state-group" data-state="(\w{2})"[^>]*>(.*?)\n\s*</g>', template, re.DOTALL):
+        abbr = m.group(1)
+        inner = m.group(2)
+        fill_match = re.search(r'<g class="state-fill"[^>]*>(.*?)</g>', inner, re.DOTALL)
+        stroke_match = re.search(r'<g class="state-stroke"[^>]*>(.*?)</g>', inner, re.DOTALL)
+        # Extra paths outside fill/stroke groups (e.g. small state label leaders)
+        extra = ''
+        stroke_g_match = re.search(r'<g class="state-stroke"[^>]*>.*?</g>', inner, re.DOTALL)
+        if stroke_g_match:
+            remainder = inner[stroke_g_match.end():]
+            extra_paths = re.findall(r'<path [^>]+/>', remainder)
+            if extra_paths:
+                extra = '\n      '.join(extra_paths)
+        if fill_match and stroke_match:
+            state_paths[abbr] = {
+                'fill_content': fill_match.group(1).strip(),
+                'stroke_content': stroke_match.group(1).strip(),
+                'extra': extra,
+            }
+    labels = re.findall(r'<text[^>]*class="state-label"[^>]*>\w{2}</text>', template)
+    return state_paths, labels
+
+
+class MapGeometry:
+    """State paths + labels, with each state's <g> group precompiled."""
+
+    def __init__(self, state_paths, labels, digest):
+        self.state_paths = state_paths
+        self.labels = labels
+        self.digest = digest
+        self.labels_svg = '\n          '.join(labels)
+        # Everything but the category, color and tooltip is fixed per state:
+        # (head, between-info-and-color, tail) around the variable parts.
+        self._groups = []
+        for abbr in ALL_STATES:
+            paths = state_paths.get(abbr)
+            if not paths:
+                continue
+            extra = f'\n      {paths["extra"]}' if paths['extra'] else ''
+            self._groups.append((
+                abbr,
+                f'<g class="state-group" data-state="{abbr}"',
+                '>\n      <g class="state-fill" fill="',
+                f'">{paths["fill_content"]}</g>\n'
+                f'      <g class="state-stroke" fill="none" stroke="#ffffff" stroke-width="1.0">'
+                f'{paths["stroke_content"]}</g>{extra}\n\n    </g>',
+            ))
+
+    def render_states(self, categories=None, colors=None, infos=None, default=None, fill='#d9d9d9'):
+        """The joined state groups.
+
+        With categories, each group gets data-category, data-info (JSON from
+        infos[abbr]) and its category color; without, every state is drawn
+        in `fill` with no data attributes (JS-colored inline maps).
+        """
+        parts = []
+        if categories is None:
+            for _abbr, head, mid, tail in self._groups:
+                parts.append(f'{head}{mid}{fill}{tail}')
+        else:
+            for abbr, head, mid, tail in self._groups:
+                cat = categories.get(abbr, default)
+                info = json.dumps(infos[abbr])
+                parts.append(f"{head} data-category=\"{cat}\" data-info='{info}'{mid}{colors[cat]}{tail}")
+        return '\n'.join(parts)
+
+    def render_svg(self, map_id=None, **kwargs):
+        """A complete <svg class="us-map"> block (states + labels)."""
+        svg_open = SVG_OPEN
+        if map_id:
+            svg_open = svg_open.replace('class="us-map"', f'class="us-map" id="{map_id}"', 1)
+        return f'''{svg_open}
+        <g id="states">
+          {self.render_states(**kwargs)}
+        </g>
+        <g id="labels">
+          {self.labels_svg}
+        </g>
+      </svg>'''
+
+
+def load_geometry(template_path=TEMPLATE_PATH, cache_path=GEOMETRY_CACHE):
+    """MapGeometry from the cache, re-parsing the template only when it changed.
+
+    Regenerating ag_partisan.html changes its bytes (colors, tooltips) but
+    not its geometry; the reparse then just refreshes the cache key.
+    """
+    digest = file_digest(template_path)
+    try:
+        with open(cache_path) as f:
+            cached = json.load(f)
+        if cached['template_digest'] == digest:
+            return MapGeometry(cached['state_paths'], cached['labels'], cached['geometry_digest'])
+    except (OSError, ValueError, KeyError):
+        pass
+    with open(template_path) as f:
+        state_paths, labels = parse_template(f.read())
+    geometry_digest = _sha(json.dumps([state_paths, labels], sort_keys=True))
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    with open(cache_path, 'w') as f:
+        json.dump({'template_digest': digest, 'geometry_digest': geometry_digest,
+                   'state_paths': state_paths, 'labels': labels}, f)
+    return MapGeometry(state_paths, labels, geometry_digest)
+
+
+# ── Incremental page builds ──────────────────────────────────────────
+
+class PageBuilder:
+    """Write pages whose input hash changed; time every page.
+
+    inputs is any JSON-serializable description of what the page depends
+    on; the geometry digest and the given source files are hashed with it.
+    """
+
+    def __init__(self, geometry=None, force=False, manifest_path=MANIFEST_PATH):
+        self.geometry = geometry
+        self.force = force
+        self.manifest_path = manifest_path
+        self.timings = []
+        try:
+            with open(manifest_path) as f:
+                self.manifest = json.load(f)
+        except (OSError, ValueError):
+            self.manifest = {}
+        self._source_digests = {}
+
+    def _sources_digest(self, sources):
+        out = []
+        for path in (__file__,) + tuple(sources):
+            path = os.path.abspath(path)
+            if path not in self._source_digests:
+                self._source_digests[path] = file_digest(path)
+            out.append(self._source_digests[path])
+        return out
+
+    def page(self, path, inputs, render, sources=()):
+        """Build one page. render() returns the HTML. Returns True if written."""
+        t0 = time.perf_counter()
+        path = path if os.path.isabs(path) else os.path.join(SITE_DIR, path)
+        key = _sha(json.dumps({
+            'inputs': inputs,
+            'geometry': self.geometry.digest if self.geometry else None,
+            'sources': self._sources_digest(sources),
+        }, sort_keys=True, default=str))
+        name = os.path.relpath(path, SITE_DIR) if path.startswith(SITE_DIR) else path
+        if not self.force and self.manifest.get(path) == key and os.path.exists(path):
+            self.timings.append((name, time.perf_counter() - t0, False))
+            return False
+        html = render()
+        with open(path, 'w') as f:
+            f.write(html)
+        self.manifest[path] = key
+        self.timings.append((name, time.perf_counter() - t0, True))
+        print(f'  Written: {name}')
+        return True
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+        with open(self.manifest_path, 'w') as f:
+            json.dump(self.manifest, f, indent=1, sort_keys=True)
+
+    def report(self):
+        built = sum(1 for _, _, w in self.timings if w)
+        print(f'\n{"Page":<48} {"ms":>8}')
+        for name, secs, written in self.timings:
+            print(f'{name:<48} {secs * 1000:>8.1f}{"" if written else "  (unchanged)"}')
+        print(f'{built} built, {len(self.timings) - built} unchanged, '
+              f'{sum(s for _, s, _ in self.timings):.2f}s total')